@@ -96,6 +96,37 @@ class Cache:
         json_str = json.dumps(value)
         return await self.set(key, json_str, expire_seconds)
 
+    async def hget_json(self, key: str, field: str) -> dict | list | None:
+        """Get JSON value from a hash field"""
+        import json
+
+        value = await self.client.hget(key, field)
+        if value:
+            return json.loads(value)
+        return None
+
+    async def hset_json(
+        self,
+        key: str,
+        field: str,
+        value: dict | list,
+        expire_seconds: int | None = None,
+    ) -> int:
+        """Set JSON value in a hash field (expiration applies to the whole hash)"""
+        import json
+
+        result = await self.client.hset(key, field, json.dumps(value))
+        if expire_seconds:
+            await self.client.expire(key, expire_seconds)
+        return result
+
+    async def hgetall_json(self, key: str) -> dict[str, Any]:
+        """Get all hash fields with JSON-decoded values"""
+        import json
+
+        values = await self.client.hgetall(key)
+        return {field: json.loads(value) for field, value in values.items()}
+
     async def incr(self, key: str) -> int:
         """Increment counter"""
         return await self.client.incr(key)
@@ -119,6 +150,40 @@ class CacheKeys:
     # Extracted blocks (cached for 24 hours)
     BLOCKS = "blocks:{translation_id}"
 
+    # Translated blocks and per-block updates (edits, scoped tone) keyed by block index
+    TRANSLATED_BLOCKS = "blocks:{translation_id}_translated"
+    BLOCK_UPDATES = "blocks:{translation_id}_updates"
+
+    # Versioned layout IR from extraction, reused by reconstruction
+    DOCUMENT_IR = "blocks:{translation_id}_ir"
+
+    # Bulk tone batch handles (one per job) and the set of jobs awaiting results
+    TONE_BATCH = "tone_batch:{job_id}"
+    TONE_BATCHES_PENDING = "tone_batches:pending"
+
+    # Page fingerprint of each cached reconstructed page, keyed by page number
+    PAGE_ARTIFACTS = "page_artifacts:{job_id}"
+
+    # Manifest of the job's published per-page text-layer shards
+    TEXT_LAYER = "text_layer:{job_id}"
+
+    # Page preview manifests of the job's original and translated PDFs
+    PREVIEWS = "previews:{job_id}"
+
+    # Final download artifacts keyed by a digest of the document content
+    DOWNLOAD_ARTIFACT = "download_artifact:{job_id}:{digest}"
+
+    # Rolling tone usage statistics per model and target language
+    TONE_STATS = "tone_stats:{model}:{target_lang}"
+    TONE_STATS_LOCK = "tone_stats:{model}:{target_lang}:lock"
+
+    # Single-flight request coalescing (short-lived lock and result per request hash)
+    SINGLE_FLIGHT_LOCK = "singleflight:{namespace}:{key}:lock"
+    SINGLE_FLIGHT_RESULT = "singleflight:{namespace}:{key}:result"
+
+    # Direct-to-storage uploads awaiting their completion call
+    PENDING_UPLOAD = "pending_upload:{job_id}"
+
     # Rate limiting
     RATE_LIMIT = "ratelimit:{user_id}:{action}"
 
@@ -141,6 +206,75 @@ class CacheKeys:
     def blocks(cls, translation_id: str) -> str:
         return cls.BLOCKS.format(translation_id=translation_id)
 
+    @classmethod
+    def translated_blocks(cls, translation_id: str) -> str:
+        return cls.TRANSLATED_BLOCKS.format(translation_id=translation_id)
+
+    @classmethod
+    def block_updates(cls, translation_id: str) -> str:
+        return cls.BLOCK_UPDATES.format(translation_id=translation_id)
+
+    @classmethod
+    def document_ir(cls, translation_id: str) -> str:
+        return cls.DOCUMENT_IR.format(translation_id=translation_id)
+
+    @classmethod
+    def tone_batch(cls, job_id: str) -> str:
+        return cls.TONE_BATCH.format(job_id=job_id)
+
+    @classmethod
+    def page_artifacts(cls, job_id: str) -> str:
+        return cls.PAGE_ARTIFACTS.format(job_id=job_id)
+
+    @classmethod
+    def text_layer(cls, job_id: str) -> str:
+        return cls.TEXT_LAYER.format(job_id=job_id)
+
+    @classmethod
+    def previews(cls, job_id: str) -> str:
+        return cls.PREVIEWS.format(job_id=job_id)
+
+    @classmethod
+    def download_artifact(cls, job_id: str, digest: str) -> str:
+        return cls.DOWNLOAD_ARTIFACT.format(job_id=job_id, digest=digest)
+
+    @classmethod
+    def tone_stats(cls, model: str, target_lang: str) -> str:
+        return cls.TONE_STATS.format(model=model, target_lang=target_lang)
+
+    @classmethod
+    def tone_stats_lock(cls, model: str, target_lang: str) -> str:
+        return cls.TONE_STATS_LOCK.format(model=model, target_lang=target_lang)
+
+    @classmethod
+    def single_flight_lock(cls, namespace: str, key: str) -> str:
+        return cls.SINGLE_FLIGHT_LOCK.format(namespace=namespace, key=key)
+
+    @classmethod
+    def single_flight_result(cls, namespace: str, key: str) -> str:
+        return cls.SINGLE_FLIGHT_RESULT.format(namespace=namespace, key=key)
+
+    @classmethod
+    def job_keys(cls, job_id: str) -> list[str]:
+        """Every fixed key holding a job's state (content-addressed keys expire on their own)"""
+        return [
+            cls.job_status(job_id),
+            cls.job_progress(job_id),
+            cls.blocks(job_id),
+            cls.translated_blocks(job_id),
+            cls.block_updates(job_id),
+            cls.document_ir(job_id),
+            cls.tone_batch(job_id),
+            cls.page_artifacts(job_id),
+            cls.text_layer(job_id),
+            cls.previews(job_id),
+            cls.pending_upload(job_id),
+        ]
+
+    @classmethod
+    def pending_upload(cls, job_id: str) -> str:
+        return cls.PENDING_UPLOAD.format(job_id=job_id)
+
     @classmethod
     def rate_limit(cls, user_id: str, action: str) -> str:
         return cls.RATE_LIMIT.format(user_id=user_id, action=action)
@@ -17,6 +17,9 @@ celery_app = Celery(
         "app.tasks.extract_pdf",
         "app.tasks.translate_blocks",
         "app.tasks.orchestrator",
+        "app.tasks.customize_tone",
+        "app.tasks.sweep_expired",
+        "app.tasks.render_previews",
     ],
 )
 
@@ -63,6 +66,21 @@ celery_app.conf.task_routes = {
     "app.tasks.extract_pdf.*": {"queue": "extraction"},
     "app.tasks.translate_blocks.*": {"queue": "translation"},
     "app.tasks.orchestrator.*": {"queue": "default"},
+    # Own queue (keyed by task name), so preview rendering can be given
+    # dedicated workers; workers must consume it (-Q celery,previews)
+    "render_previews": {"queue": "previews"},
+}
+
+# Periodic tasks (run with `celery -A app.celery_app beat`)
+celery_app.conf.beat_schedule = {
+    "poll-tone-batches": {
+        "task": "poll_tone_batches",
+        "schedule": float(settings.tone_batch_poll_interval_seconds),
+    },
+    "sweep-expired-translations": {
+        "task": "sweep_expired_translations",
+        "schedule": float(settings.expiry_sweep_interval_seconds),
+    },
 }
 
 
@@ -26,6 +26,35 @@ class Settings(BaseSettings):
     s3_endpoint_url: str | None = "http://localhost:9000"  # None for real AWS S3
     # Frontend-accessible S3 URL (for browser presigned URL generation)
     s3_public_url: str = "http://localhost:9000"
+    # Multipart uploads of large files (parts are uploaded in parallel)
+    s3_multipart_threshold_mb: int = 16
+    s3_multipart_chunk_mb: int = 8
+    s3_multipart_concurrency: int = 4
+    # Blocking S3 calls run on a dedicated thread pool of this size (further
+    # calls queue), sharing a pool of HTTP connections
+    s3_io_workers: int = 16
+    s3_max_pool_connections: int = 32
+    # Browser uploads straight to S3: part size and lifetime of the presigned
+    # part URLs (the pending upload expires with them)
+    s3_direct_upload_part_mb: int = 16
+    s3_direct_upload_expires_seconds: int = 3600
+    # Uploads proxied through the API are forwarded in parts of this size
+    # while they are read (S3 minimum: 5)
+    s3_stream_part_mb: int = 5
+    # Storage backend: "s3" (S3/MinIO, above) or "local" (files on this
+    # node's disk, for single-node deployments, benchmarks and tests)
+    storage_backend: str = "s3"
+    local_storage_path: str = "./storage"
+    # Base URL of this API, for the signed links that serve local files
+    local_storage_public_url: str = "http://localhost:8000"
+    # Give the viewer API links that stream files from storage instead of
+    # presigned storage URLs (for deployments where browsers can't reach
+    # the object store)
+    proxy_file_downloads: bool = False
+    # Public base URL (e.g. a CDN) in front of the bucket, for the viewer's
+    # static artifacts (text-layer shards, page previews); empty to hand
+    # out presigned URLs
+    static_public_url: str = ""
 
     # Authentication
     jwt_secret: str = "dev_secret_change_in_production"
@@ -38,6 +67,47 @@ class Settings(BaseSettings):
     deepl_api_key: str = ""
     claude_api_key: str = ""
 
+    # Bulk tone customization (Message Batches)
+    tone_batch_provider: str = "anthropic"  # "anthropic" or "local" (tests/dev)
+    tone_batch_poll_interval_seconds: int = 60
+
+    # Tone job planning (concurrency is sized to finish near the target time)
+    tone_max_concurrency: int = 8
+    tone_target_seconds: int = 60
+
+    # Single-flight coalescing for /alternatives and /retranslate
+    single_flight_result_ttl_seconds: int = 60
+    single_flight_lock_ttl_seconds: int = 30
+    single_flight_wait_timeout_seconds: int = 30
+
+    # PDF reconstruction (page-parallel above the page threshold; 0 workers = CPU count)
+    pdf_reconstruction_workers: int = 0
+    pdf_parallel_min_pages: int = 48
+    # Comma-separated TTF/OTF files for non-Latin text, tried before PyMuPDF's built-in CJK font
+    pdf_unicode_fonts: str = ""
+    # Save profiles ("interactive" = fast, "archival" = fully optimized) per endpoint
+    pdf_download_save_profile: str = "interactive"
+    pdf_pipeline_save_profile: str = "archival"
+    # Write final PDFs linearized, so viewers show page 1 after one range
+    # request (needs pikepdf; skipped without it)
+    pdf_linearize_output: bool = True
+
+    # Page previews for the review UI, rendered in a process pool (0 workers
+    # = CPU count): a thumbnail per page plus tiles at each zoom level
+    # (scale factors over 72 dpi). "webp" needs Pillow; PNG otherwise.
+    preview_workers: int = 0
+    preview_thumbnail_width: int = 240
+    preview_zoom_levels: str = "1.5,3"
+    preview_tile_size: int = 512
+    preview_image_format: str = "webp"
+
+    # Expired job sweeper: runs every interval, deleting at most
+    # batch_size * max_batches jobs per run with a pause between batches
+    expiry_sweep_interval_seconds: int = 3600
+    expiry_sweep_batch_size: int = 200
+    expiry_sweep_max_batches: int = 10
+    expiry_sweep_pause_seconds: float = 1.0
+
     # OpenTelemetry
     otel_exporter_jaeger_agent_host: str = "localhost"
     otel_exporter_jaeger_agent_port: int = 6831
@@ -0,0 +1,224 @@
+"""Local filesystem storage: the Storage interface on this node's disk"""
+
+import hashlib
+import hmac
+import os
+import shutil
+import tempfile
+import time
+from typing import BinaryIO, List, Optional, Tuple
+from urllib.parse import quote, urlencode
+
+from app.storage import Storage, StorageWriter
+
+# API route that serves locally stored files (see routers/files.py)
+FILES_ROUTE = "/api/v1/files"
+
+_COPY_CHUNK_SIZE = 1024 * 1024
+
+
+class _LocalWriter(StorageWriter):
+    """Writes straight to a temporary file that is renamed into place on complete"""
+
+    def __init__(self, storage: "LocalStorage", key: str, bucket: str):
+        self.storage = storage
+        self.key = key
+        self.bucket = bucket
+        self._file = storage.open_temp(key, bucket)
+
+    def write(self, data: bytes) -> None:
+        self._file.write(data)
+
+    def complete(self) -> None:
+        self.storage.commit(self._file, self.key, self.bucket)
+
+    def abort(self) -> None:
+        self.storage.discard(self._file)
+
+
+class LocalStorage(Storage):
+    """
+    Stores each object as a file at ``{root}/{bucket}/{key}``.
+
+    Features:
+    - Writes go to a temporary file next to the destination and are
+      renamed into place, so readers never see a partial file
+    - Copies are hard links: no data is copied, and since files are only
+      ever replaced (never modified in place), deleting or overwriting one
+      name leaves the other intact
+    - Downloads are served by the API straight from disk through signed,
+      expiring links, the local counterpart of presigned URLs
+    - No direct uploads: clients upload through the API
+    """
+
+    def __init__(self, root: str, secret: str, public_url: str):
+        self.root = os.path.abspath(root)
+        self.secret = secret.encode()
+        self.public_url = public_url.rstrip("/")
+
+    def path(self, key: str, bucket: str) -> str:
+        """
+        File path of an object.
+
+        Raises:
+            ValueError: If the key points outside the bucket directory
+        """
+        bucket_dir = os.path.join(self.root, bucket)
+        path = os.path.abspath(os.path.join(bucket_dir, key))
+        if not path.startswith(bucket_dir + os.sep):
+            raise ValueError(f"Invalid storage key: {key}")
+        return path
+
+    def open_temp(self, key: str, bucket: str) -> BinaryIO:
+        """Open a temporary file in the object's directory (see commit)"""
+        directory = os.path.dirname(self.path(key, bucket))
+        os.makedirs(directory, exist_ok=True)
+        return tempfile.NamedTemporaryFile(dir=directory, prefix=".tmp-", delete=False)
+
+    def commit(self, temp: BinaryIO, key: str, bucket: str) -> None:
+        """Close a file from open_temp and atomically move it into place"""
+        temp.close()
+        os.replace(temp.name, self.path(key, bucket))
+
+    def discard(self, temp: BinaryIO) -> None:
+        """Close and remove a file from open_temp"""
+        temp.close()
+        try:
+            os.unlink(temp.name)
+        except FileNotFoundError:
+            pass
+
+    def write(
+        self,
+        data: bytes | BinaryIO,
+        key: str,
+        bucket: str,
+        content_type: str = "application/octet-stream",
+        content_encoding: Optional[str] = None,
+        cache_control: Optional[str] = None,
+    ) -> None:
+        """Store bytes or the rest of a file-like object (headers are derived from the key when served)"""
+        temp = self.open_temp(key, bucket)
+        try:
+            if isinstance(data, bytes):
+                temp.write(data)
+            else:
+                shutil.copyfileobj(data, temp, _COPY_CHUNK_SIZE)
+        except BaseException:
+            self.discard(temp)
+            raise
+        self.commit(temp, key, bucket)
+
+    def write_from_path(
+        self,
+        source_path: str,
+        key: str,
+        bucket: str,
+        content_type: str = "application/octet-stream",
+    ) -> None:
+        """Store a copy of a local file"""
+        with open(source_path, "rb") as source:
+            self.write(source, key, bucket)
+
+    def open_writer(self, key: str, bucket: str, content_type: str, part_size: int) -> StorageWriter:
+        """Start storing a file of unknown size (data goes to disk as it is written)"""
+        return _LocalWriter(self, key, bucket)
+
+    def read(self, key: str, bucket: str) -> bytes:
+        with open(self.path(key, bucket), "rb") as f:
+            return f.read()
+
+    def read_range(self, key: str, start: int, end: int, bucket: str) -> bytes:
+        """Bytes [start, end] (inclusive, clamped to the file size)"""
+        with open(self.path(key, bucket), "rb") as f:
+            f.seek(start)
+            return f.read(max(0, end - start + 1))
+
+    def open_range(self, key: str, start: int, end: Optional[int], bucket: str) -> BinaryIO:
+        f = open(self.path(key, bucket), "rb")
+        f.seek(start)
+        return f
+
+    def size(self, key: str, bucket: str) -> int:
+        return os.path.getsize(self.path(key, bucket))
+
+    def stat(self, key: str, bucket: str) -> Tuple[int, str]:
+        """Size and entity tag (from size and modification time; the file is replaced on every write)"""
+        st = os.stat(self.path(key, bucket))
+        return st.st_size, f'"{st.st_size:x}-{st.st_mtime_ns:x}"'
+
+    def exists(self, key: str, bucket: str) -> bool:
+        return os.path.isfile(self.path(key, bucket))
+
+    def delete(self, key: str, bucket: str) -> None:
+        """Remove an object (missing objects count as deleted)"""
+        try:
+            os.unlink(self.path(key, bucket))
+        except FileNotFoundError:
+            pass
+
+    def copy(self, source_key: str, dest_key: str, bucket: str) -> None:
+        """Hard-link an object under a second key (copies across filesystems)"""
+        source = self.path(source_key, bucket)
+        temp = self.open_temp(dest_key, bucket)
+        temp.close()
+        try:
+            os.unlink(temp.name)
+            try:
+                os.link(source, temp.name)
+            except OSError:
+                shutil.copyfile(source, temp.name)
+            os.replace(temp.name, self.path(dest_key, bucket))
+        except BaseException:
+            if os.path.exists(temp.name):
+                os.unlink(temp.name)
+            raise
+
+    def list(self, prefix: str, bucket: str) -> List[str]:
+        """Keys starting with ``prefix`` (temporary files excluded)"""
+        bucket_dir = os.path.join(self.root, bucket)
+        # Only walk the directory the prefix points into
+        start_dir = os.path.join(bucket_dir, os.path.dirname(prefix))
+        keys = []
+        for directory, _, files in os.walk(start_dir):
+            for name in files:
+                if name.startswith(".tmp-"):
+                    continue
+                key = os.path.relpath(os.path.join(directory, name), bucket_dir).replace(os.sep, "/")
+                if key.startswith(prefix):
+                    keys.append(key)
+        return sorted(keys)
+
+    def create_bucket(self, bucket: str) -> None:
+        os.makedirs(os.path.join(self.root, bucket), exist_ok=True)
+
+    def _signature(self, key: str, bucket: str, expires: int, filename: Optional[str]) -> str:
+        message = f"{bucket}\n{key}\n{expires}\n{filename or ''}".encode()
+        return hmac.new(self.secret, message, hashlib.sha256).hexdigest()
+
+    def signed_url(
+        self,
+        key: str,
+        bucket: str,
+        expires_in: int,
+        filename: Optional[str] = None,
+    ) -> str:
+        """Expiring link to download an object from the API"""
+        expires = int(time.time()) + expires_in
+        params = {"expires": expires, "signature": self._signature(key, bucket, expires, filename)}
+        if filename:
+            params["filename"] = filename
+        return f"{self.public_url}{FILES_ROUTE}/{quote(bucket)}/{quote(key)}?{urlencode(params)}"
+
+    def verify(
+        self,
+        key: str,
+        bucket: str,
+        expires: int,
+        signature: str,
+        filename: Optional[str] = None,
+    ) -> bool:
+        """Check a link made by signed_url"""
+        if expires < time.time():
+            return False
+        return hmac.compare_digest(signature, self._signature(key, bucket, expires, filename))
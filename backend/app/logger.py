@@ -139,6 +139,10 @@ class StructuredLogger:
             context: Additional context fields
             exc_info: Optional exception info
         """
+        # logging expects a (type, value, traceback) tuple, not the exception itself
+        if isinstance(exc_info, BaseException):
+            exc_info = (type(exc_info), exc_info, exc_info.__traceback__)
+        
         record = self.logger.makeRecord(
             self.logger.name,
             level,
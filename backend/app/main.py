@@ -16,7 +16,8 @@ from app.routers.upload import router as upload_router
 from app.routers.status import router as status_router
 from app.routers.translation import router as translation_router
 from app.routers.download import router as download_router
-from app.s3 import create_bucket_if_not_exists
+from app.routers.files import router as files_router
+from app.s3 import create_bucket_if_not_exists, get_s3_metrics
 from app.otel_config import init_telemetry, instrument_app
 from app.logger import info, error
 
@@ -80,6 +81,7 @@ app.include_router(upload_router)
 app.include_router(status_router)
 app.include_router(translation_router)
 app.include_router(download_router)
+app.include_router(files_router)
 
 
 @app.get("/")
@@ -107,7 +109,8 @@ async def health_detailed(
     """
     Detailed health check including database and Redis connectivity.
     
-    Returns status of all infrastructure components.
+    Returns status of all infrastructure components, and timing of the
+    S3 calls made by this process.
     """
     health_status = {
         "status": "healthy",
@@ -147,6 +150,8 @@ async def health_detailed(
         }
         health_status["status"] = "degraded"
 
+    health_status["s3_operations"] = get_s3_metrics()
+
     return health_status
 
 
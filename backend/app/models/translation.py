@@ -67,6 +67,11 @@ class Translation(Base):
         Integer,
         nullable=False,
     )
+    # SHA-256 of the uploaded file (hex), for reusing identical uploads
+    content_hash: Mapped[str | None] = mapped_column(
+        String(64),
+        nullable=True,
+    )
     page_count: Mapped[int | None] = mapped_column(
         Integer,
         nullable=True,
@@ -170,6 +175,7 @@ class Translation(Base):
         Index("ix_translations_tenant_status", "tenant_id", "status"),
         Index("ix_translations_user_created", "user_id", "created_at"),
         Index("ix_translations_expires", "expires_at"),
+        Index("ix_translations_tenant_hash", "tenant_id", "content_hash"),
     )
 
     def __repr__(self) -> str:
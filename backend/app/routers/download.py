@@ -1,20 +1,27 @@
 """Download router for PDF download with user edits"""
 
+import os
+import tempfile
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.cache import Cache, CacheKeys, get_redis_client
+from app.cache import get_redis_client
+from app.config import get_settings
 from app.database import get_db
 from app.logger import error as log_error, info
 from app.middleware.auth_middleware import get_current_user
 from app.models.translation import Translation, TranslationStatus
 from app.models.user import User
-from app.s3 import S3Keys, download_file, get_presigned_url, upload_file
+from app.s3 import S3Keys, download_file, get_presigned_url, upload_file_from_path
 from app.schemas.download import DownloadRequest, DownloadResponse
-from app.services.pdf_reconstruction import PDFReconstructionService
+from app.services.block_store import TranslatedBlockStore, block_display_text
+from app.services.document_ir import DocumentIRStore
+from app.services.download_cache import DownloadArtifactCache
+from app.services.page_cache import PageArtifactCache
+from app.services.save_profiles import get_save_profile
 from app.schemas.pdf import Block, Coordinates, TranslatedBlock
 
 router = APIRouter(prefix="/api/v1", tags=["download"])
@@ -32,16 +39,20 @@ async def download_translated_pdf(
     
     This endpoint:
     1. Verifies user owns the translation
-    2. Loads original PDF from S3
-    3. Loads translated blocks from Redis cache
-    4. Applies user edits to translated blocks
-    5. Reconstructs PDF with edited translations
-    6. Uploads final PDF to S3
+    2. Loads translated blocks from Redis cache
+    3. Applies user edits to translated blocks
+    4. Returns the stored PDF if the same final content was downloaded
+       before; otherwise loads the original PDF from S3 and
+    5. Reconstructs PDF with edited translations into a temporary file,
+       re-rendering only pages whose blocks changed since the last
+       reconstruction (composed with the original pages for bilingual
+       layouts), linearized for fast first-page display
+    6. Streams the final PDF to S3 (multipart for large files)
     7. Returns presigned download URL (valid for 1 hour)
     
     Args:
         job_id: Translation job ID (UUID)
-        request: Download request with user edits
+        request: Download request with user edits and output layout
         db: Database session
         current_user: Authenticated user
         
@@ -98,27 +109,10 @@ async def download_translated_pdf(
     
     # Get Redis client
     redis = get_redis_client()
-    cache = Cache(redis)
     
     try:
-        # Load original PDF from S3
-        original_s3_key = S3Keys.upload_path(
-            user_id=str(translation.user_id),
-            job_id=job_id,
-            filename=translation.file_name,
-        )
-        
-        info("Loading original PDF from S3", job_id=job_id, s3_key=original_s3_key)
-        original_pdf_bytes = await download_file(original_s3_key)
-        info(
-            "Original PDF loaded",
-            job_id=job_id,
-            size_bytes=len(original_pdf_bytes),
-        )
-        
-        # Load translated blocks from Redis cache
-        cache_key = f"{CacheKeys.blocks(job_id)}_translated"
-        cached_translation = await cache.get_json(cache_key)
+        # Load translated blocks from Redis cache (with per-block updates applied)
+        cached_translation = await TranslatedBlockStore(redis).load(job_id)
         
         if not cached_translation:
             raise HTTPException(
@@ -143,8 +137,8 @@ async def download_translated_pdf(
             original_data = block_data.get("original", {})
             coords_data = original_data.get("coordinates", {})
             
-            # Get translated text, preferring tone-customized if available
-            translated_text = block_data.get("tone_customized_text") or block_data.get("translated_text", "")
+            # Get translated text, preferring the latest saved edit or tone run
+            translated_text = block_display_text(block_data)
             
             # Apply user edit if exists (edits override translated text)
             block_id_str = str(idx)  # Use index as block_id (matching frontend)
@@ -190,29 +184,92 @@ async def download_translated_pdf(
             edited_blocks=len(edits_map),
         )
         
-        # Reconstruct PDF with edited translations
-        info("Reconstructing PDF with user edits", job_id=job_id)
-        reconstructed_pdf_bytes = PDFReconstructionService.reconstruct_pdf(
-            original_pdf_bytes=original_pdf_bytes,
-            translated_blocks=translated_blocks,
+        # Layout analysed at extraction time, so the PDF isn't parsed again
+        # (it also decides the reconstruction engine)
+        document_ir = await DocumentIRStore(redis).load(job_id)
+        settings = get_settings()
+        save_profile = get_save_profile(settings.pdf_download_save_profile)
+        
+        # Reuse the final PDF if this exact content was downloaded before
+        artifact_cache = DownloadArtifactCache(redis)
+        digest = DownloadArtifactCache.digest(
+            job_id,
+            [block.translated_text for block in translated_blocks],
+            request.layout,
+            save_profile=save_profile,
+            linearize=settings.pdf_linearize_output,
+            engine=PageArtifactCache.engine(document_ir),
         )
+        artifact = await artifact_cache.get(job_id, digest)
+        if artifact:
+            info(
+                "Download artifact cache hit",
+                job_id=job_id,
+                s3_key=artifact["s3_key"],
+            )
+            return DownloadResponse(
+                download_url=get_presigned_url(key=artifact["s3_key"], expires_in=3600),
+                expires_at=None,
+                file_size=artifact["file_size"],
+            )
         
-        info(
-            "PDF reconstructed successfully",
+        # Load original PDF from S3
+        original_s3_key = S3Keys.upload_path(
+            user_id=str(translation.user_id),
             job_id=job_id,
-            output_size=len(reconstructed_pdf_bytes),
+            filename=translation.file_name,
         )
         
-        # Upload final PDF to S3 (use downloads path to distinguish from auto-reconstructed)
-        download_s3_key = f"downloads/{translation.user_id}/{job_id}/{translation.file_name}"
+        info("Loading original PDF from S3", job_id=job_id, s3_key=original_s3_key)
+        original_pdf_bytes = await download_file(original_s3_key)
+        info(
+            "Original PDF loaded",
+            job_id=job_id,
+            size_bytes=len(original_pdf_bytes),
+        )
         
-        info("Uploading final PDF to S3", job_id=job_id, s3_key=download_s3_key)
-        uploaded_key = await upload_file(
-            file_data=reconstructed_pdf_bytes,
-            key=download_s3_key,
-            content_type="application/pdf",
+        # Upload final PDF to S3 under its content digest (downloads path to
+        # distinguish from auto-reconstructed)
+        download_s3_key = S3Keys.download_path(
+            user_id=str(translation.user_id),
+            job_id=job_id,
+            digest=digest,
+            filename=translation.file_name,
         )
         
+        # Reconstruct into a temporary file and stream it to S3, so the output
+        # is never held in memory (only pages that changed are re-rendered)
+        with tempfile.TemporaryDirectory(prefix="transkeep-download-") as work_dir:
+            output_path = os.path.join(work_dir, "output.pdf")
+            info("Reconstructing PDF with user edits", job_id=job_id, layout=request.layout.value)
+            file_size = await PageArtifactCache(redis).reconstruct_to_file(
+                job_id=job_id,
+                user_id=str(translation.user_id),
+                original_pdf_bytes=original_pdf_bytes,
+                translated_blocks=translated_blocks,
+                output_path=output_path,
+                document_ir=document_ir,
+                save_profile=save_profile,
+                layout=request.layout,
+                linearize=settings.pdf_linearize_output,
+            )
+            # The original is no longer needed while uploading
+            del original_pdf_bytes
+            
+            info(
+                "PDF reconstructed successfully",
+                job_id=job_id,
+                output_size=file_size,
+            )
+            
+            info("Uploading final PDF to S3", job_id=job_id, s3_key=download_s3_key)
+            uploaded_key = await upload_file_from_path(
+                path=output_path,
+                key=download_s3_key,
+                content_type="application/pdf",
+            )
+        await artifact_cache.put(job_id, digest, uploaded_key, file_size)
+        
         info(
             "Final PDF uploaded to S3",
             job_id=job_id,
@@ -234,7 +291,7 @@ async def download_translated_pdf(
         return DownloadResponse(
             download_url=download_url,
             expires_at=None,  # Could calculate from expires_in if needed
-            file_size=len(reconstructed_pdf_bytes),
+            file_size=file_size,
         )
         
     except HTTPException:
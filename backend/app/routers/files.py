@@ -0,0 +1,76 @@
+"""Serves locally stored files through signed links (STORAGE_BACKEND=local)"""
+
+import mimetypes
+import os
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import FileResponse
+
+from app import s3
+from app.local_storage import LocalStorage
+
+router = APIRouter(prefix="/api/v1", tags=["files"])
+
+
+@router.get("/files/{bucket}/{key:path}")
+async def get_stored_file(
+    bucket: str,
+    key: str,
+    expires: int,
+    signature: str,
+    filename: Optional[str] = None,
+) -> FileResponse:
+    """
+    Download a locally stored file.
+    
+    The local counterpart of an S3 presigned URL: links come from
+    ``get_presigned_url`` and carry their own expiry and signature, so no
+    login is needed. The file is sent straight from disk, never read into
+    memory.
+    
+    Args:
+        bucket: Storage bucket
+        key: Object key
+        expires: Link expiry (Unix time)
+        signature: Link signature
+        filename: Download filename (Content-Disposition), if signed
+        
+    Returns:
+        The file
+        
+    Raises:
+        403: Invalid or expired link
+        404: Local storage disabled or file not found
+    """
+    storage = s3.storage
+    if not isinstance(storage, LocalStorage):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Not found",
+        )
+    if not storage.verify(key, bucket, expires, signature, filename):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid or expired link",
+        )
+    
+    try:
+        path = storage.path(key, bucket)
+    except ValueError:
+        path = None
+    if path is None or not os.path.isfile(path):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="File not found",
+        )
+    
+    media_type, encoding = mimetypes.guess_type(key)
+    # Pre-compressed files (".json.gz") are sent as stored, for the client to decode
+    headers = {"Content-Encoding": encoding} if encoding == "gzip" else None
+    return FileResponse(
+        path,
+        media_type=media_type or "application/octet-stream",
+        filename=filename,
+        headers=headers,
+    )
@@ -1,31 +1,53 @@
 """Translation details and download endpoints"""
 
+import json
+from typing import Literal, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.cache import Cache, CacheKeys, get_redis_client
+from app.cache import get_redis_client
+from app.config import get_settings
 from app.database import get_db
-from app.logger import error as log_error, info
+from app.logger import error as log_error, info, warning
 from app.middleware.auth_middleware import get_current_user
 from app.models.translation import Translation, TranslationStatus
 from app.models.user import User
-from app.s3 import S3Keys, get_presigned_url
+from app.s3 import S3Keys, get_file_info, get_presigned_url, stream_file
 from app.schemas.translation import (
     AlternativesRequest,
     AlternativesResponse,
     ApplyToneRequest,
+    BlockEditRequest,
+    BlockEditResponse,
+    BulkAlternativesRequest,
     ApplyToneResponse,
+    PreviewLevel,
+    PreviewPage,
+    PreviewsResponse,
     RetranslateRequest,
     RetranslateResponse,
+    TextLayerPage,
+    TextLayerResponse,
     ToneEstimateResponse,
     TranslationDetailsResponse,
 )
 from app.services.alternatives_service import AlternativesService
+from app.services.block_store import TranslatedBlockStore, select_block_indices
+from app.services.file_proxy import etag_matches, parse_range
+from app.services.previews import PreviewRenderer
+from app.services.single_flight import SingleFlight, content_hash
+from app.services.text_layer import TextLayerPublisher
+from app.services.tone_planner import TonePlanner
 from app.services.tone_service import ToneService
-from app.tasks.customize_tone import customize_tone_task
+from app.tasks.customize_tone import (
+    customize_tone_blocks_task,
+    customize_tone_task,
+    submit_tone_batch_task,
+)
 
 router = APIRouter(prefix="/api/v1", tags=["translation"])
 
@@ -33,6 +55,7 @@ router = APIRouter(prefix="/api/v1", tags=["translation"])
 @router.get("/translation/{job_id}", response_model=TranslationDetailsResponse)
 async def get_translation_details(
     job_id: str,
+    request: Request,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> TranslationDetailsResponse:
@@ -40,10 +63,13 @@ async def get_translation_details(
     Get translation details including PDF URLs.
     
     Returns presigned S3 URLs for both original and translated PDFs.
-    URLs are valid for 1 hour.
+    URLs are valid for 1 hour. With PROXY_FILE_DOWNLOADS, the URLs point
+    to ``GET /translation/{job_id}/file/{kind}`` instead, which streams
+    the files through the API (authenticated, range requests supported).
     
     Args:
         job_id: Translation job ID (UUID)
+        request: Incoming request (to build proxy URLs)
         db: Database session
         current_user: Authenticated user
         
@@ -82,27 +108,33 @@ async def get_translation_details(
             detail="You don't have permission to access this translation",
         )
     
-    # Generate presigned URLs for PDFs (valid for 1 hour)
-    original_s3_key = S3Keys.upload_path(
-        user_id=str(translation.user_id),
-        job_id=str(translation.id),
-        filename=translation.file_name,
-    )
-    original_pdf_url = get_presigned_url(original_s3_key, expires_in=3600)
-    
-    # Translated PDF URL (only if translation is complete)
     translated_pdf_url = None
-    if translation.status.value == "completed":
-        translated_s3_key = S3Keys.result_path(
+    if get_settings().proxy_file_downloads:
+        # Browsers can't reach the object store: the API streams the files
+        original_pdf_url = str(request.url_for("stream_translation_file", job_id=job_id, kind="original"))
+        if translation.status.value == "completed":
+            translated_pdf_url = str(request.url_for("stream_translation_file", job_id=job_id, kind="translated"))
+    else:
+        # Generate presigned URLs for PDFs (valid for 1 hour)
+        original_s3_key = S3Keys.upload_path(
             user_id=str(translation.user_id),
             job_id=str(translation.id),
             filename=translation.file_name,
         )
-        try:
-            translated_pdf_url = get_presigned_url(translated_s3_key, expires_in=3600)
-        except Exception as e:
-            log_error("Failed to generate presigned URL for translated PDF", exc=e, job_id=job_id)
-            # Don't fail the request if translated PDF isn't ready yet
+        original_pdf_url = get_presigned_url(original_s3_key, expires_in=3600)
+        
+        # Translated PDF URL (only if translation is complete)
+        if translation.status.value == "completed":
+            translated_s3_key = S3Keys.result_path(
+                user_id=str(translation.user_id),
+                job_id=str(translation.id),
+                filename=translation.file_name,
+            )
+            try:
+                translated_pdf_url = get_presigned_url(translated_s3_key, expires_in=3600)
+            except Exception as e:
+                log_error("Failed to generate presigned URL for translated PDF", exc=e, job_id=job_id)
+                # Don't fail the request if translated PDF isn't ready yet
     
     # Calculate total cost (translation + tone)
     total_cost = None
@@ -213,6 +245,131 @@ async def download_translated_pdf(
     return {"download_url": download_url}
 
 
+@router.get("/translation/{job_id}/file/{kind}")
+async def stream_translation_file(
+    job_id: str,
+    kind: Literal["original", "translated"],
+    range_header: Optional[str] = Header(None, alias="Range"),
+    if_range: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> Response:
+    """
+    Stream the original or translated PDF through the API.
+    
+    For deployments where browsers can't reach the object store. Chunks
+    are forwarded as they are read from storage, never buffering the
+    file. Supports:
+    - ``Range`` (one byte range, 206 Partial Content), so a viewer can
+      fetch just the pages it shows from a linearized PDF
+    - ``If-Range``, so a range of a changed file isn't mixed with the old
+    - ``ETag`` / ``If-None-Match`` (304 Not Modified)
+    
+    Args:
+        job_id: Translation job ID (UUID)
+        kind: "original" or "translated"
+        range_header: Requested byte range
+        if_range: Only honour the range if the file still has this ETag
+        if_none_match: ETag(s) the client already has
+        db: Database session
+        current_user: Authenticated user
+        
+    Returns:
+        The file or the requested range
+        
+    Raises:
+        404: Translation or file not found
+        403: User doesn't own this translation
+        400: Translated file requested before the translation completed
+    """
+    # Validate UUID format
+    try:
+        job_uuid = UUID(job_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid job ID format",
+        )
+    
+    # Get translation from database
+    result = await db.execute(
+        select(Translation).where(Translation.id == job_uuid)
+    )
+    translation = result.scalar_one_or_none()
+    
+    if not translation:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Translation not found",
+        )
+    
+    # Check ownership
+    if translation.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have permission to access this translation",
+        )
+    
+    if kind == "translated" and translation.status != TranslationStatus.COMPLETED:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Translation is not yet completed",
+        )
+    
+    key_path = S3Keys.upload_path if kind == "original" else S3Keys.result_path
+    key = key_path(
+        user_id=str(translation.user_id),
+        job_id=str(translation.id),
+        filename=translation.file_name,
+    )
+    try:
+        file_info = await get_file_info(key)
+    except Exception as e:
+        warning("Proxied file not found", exc=e, job_id=job_id, s3_key=key)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="File not found",
+        )
+    
+    headers = {
+        "Accept-Ranges": "bytes",
+        "ETag": file_info.etag,
+        # Cached copies are revalidated with If-None-Match
+        "Cache-Control": "private, no-cache",
+    }
+    if etag_matches(if_none_match, file_info.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    byte_range = None
+    if not if_range or if_range.strip() == file_info.etag:
+        try:
+            byte_range = parse_range(range_header, file_info.size)
+        except ValueError:
+            return Response(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                headers={**headers, "Content-Range": f"bytes */{file_info.size}"},
+            )
+    
+    if byte_range is None:
+        chunks = stream_file(key)
+        status_code = status.HTTP_200_OK
+        headers["Content-Length"] = str(file_info.size)
+    else:
+        start, end = byte_range
+        chunks = stream_file(key, start, end)
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+        headers["Content-Range"] = f"bytes {start}-{end}/{file_info.size}"
+        headers["Content-Length"] = str(end - start + 1)
+    
+    return StreamingResponse(
+        chunks,
+        status_code=status_code,
+        media_type="application/pdf",
+        headers=headers,
+    )
+
+
 @router.post("/translation/{job_id}/tone", response_model=ApplyToneResponse)
 async def apply_tone(
     job_id: str,
@@ -278,56 +435,106 @@ async def apply_tone(
     
     # Get cost estimate
     redis = get_redis_client()
-    cache = Cache(redis)
+    store = TranslatedBlockStore(redis)
     
     try:
         # Load translated blocks to estimate cost
-        cache_key = f"{CacheKeys.blocks(job_id)}_translated"
-        cached_translation = await cache.get_json(cache_key)
+        cached_translation = await store.load(job_id)
+        
+        block_indices = None
+        if request.selector is not None:
+            if not cached_translation:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Translation blocks not found. Translation may not be complete.",
+                )
+            block_indices = select_block_indices(
+                cached_translation,
+                block_ids=request.selector.block_ids,
+                pages=request.selector.pages,
+                edited_since_last_tone=request.selector.edited_since_last_tone,
+            )
+            if not block_indices:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="No blocks match the selector",
+                )
         
         estimated_cost = None
         if cached_translation:
-            blocks_data = cached_translation.get("blocks", [])
-            total_chars = sum(
-                len(block.get("translated_text", ""))
-                for block in blocks_data
+            plan = await TonePlanner(redis).plan(
+                _tone_texts(cached_translation, block_indices),
+                translation.target_language,
+                batch=request.bulk and block_indices is None,
             )
-            tone_service = ToneService()
-            estimated_cost = tone_service.get_cost_estimate(total_chars)
+            estimated_cost = plan.cost_usd
         
-        # Trigger Celery task
-        customize_tone_task.delay(job_id, request.tone)
+        # Trigger Celery task: scoped jobs only touch the selected blocks,
+        # bulk jobs are submitted as one provider batch
+        if block_indices is not None:
+            customize_tone_blocks_task.delay(job_id, request.tone, block_indices)
+            message = f"Tone customization started for {len(block_indices)} blocks"
+        elif request.bulk:
+            submit_tone_batch_task.delay(job_id, request.tone)
+            message = "Bulk tone customization submitted"
+        else:
+            customize_tone_task.delay(job_id, request.tone)
+            message = "Tone customization started"
         
         info(
             "Tone customization task triggered",
             job_id=job_id,
             tone=request.tone,
+            bulk=request.bulk,
+            selected_blocks=len(block_indices) if block_indices is not None else None,
             estimated_cost=estimated_cost,
         )
         
         return ApplyToneResponse(
             success=True,
             job_id=job_id,
-            message="Tone customization started",
+            message=message,
             estimated_cost_usd=estimated_cost,
         )
     finally:
         await redis.aclose()
 
 
+def _tone_texts(cached_translation: dict, block_indices: list[int] | None = None) -> list[str]:
+    """Texts a tone run would send (all blocks or the selected ones)"""
+    blocks_data = cached_translation.get("blocks", [])
+    if block_indices is not None:
+        blocks_data = [blocks_data[idx] for idx in block_indices if idx < len(blocks_data)]
+        # Scoped runs re-tone the user's edit when there is one
+        return [
+            block.get("edited_text") or block.get("translated_text", "")
+            for block in blocks_data
+        ]
+    return [block.get("translated_text", "") for block in blocks_data]
+
+
 @router.get("/translation/{job_id}/tone/estimate", response_model=ToneEstimateResponse)
 async def get_tone_estimate(
     job_id: str,
     tone: str,
+    block_ids: list[int] = Query(default=[]),
+    pages: list[int] = Query(default=[]),
+    edited_since_last_tone: bool = False,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> ToneEstimateResponse:
     """
     Get cost estimate for tone customization.
     
+    If any selector parameter is given, the estimate covers only the
+    selected blocks (as a scoped tone request would).
+    
     Args:
         job_id: Translation job ID (UUID)
         tone: Tone preset or custom description
+        block_ids: Optional block IDs to include
+        pages: Optional page numbers to include
+        edited_since_last_tone: Include blocks edited after their last tone run
         db: Database session
         current_user: Authenticated user
         
@@ -368,11 +575,10 @@ async def get_tone_estimate(
     
     # Load translated blocks to calculate estimate
     redis = get_redis_client()
-    cache = Cache(redis)
+    store = TranslatedBlockStore(redis)
     
     try:
-        cache_key = f"{CacheKeys.blocks(job_id)}_translated"
-        cached_translation = await cache.get_json(cache_key)
+        cached_translation = await store.load(job_id)
         
         if not cached_translation:
             raise HTTPException(
@@ -380,18 +586,29 @@ async def get_tone_estimate(
                 detail="Translation not yet completed. Cannot estimate cost.",
             )
         
-        blocks_data = cached_translation.get("blocks", [])
-        total_chars = sum(
-            len(block.get("translated_text", ""))
-            for block in blocks_data
-        )
+        block_indices = None
+        if block_ids or pages or edited_since_last_tone:
+            block_indices = select_block_indices(
+                cached_translation,
+                block_ids=block_ids,
+                pages=pages,
+                edited_since_last_tone=edited_since_last_tone,
+            )
         
-        tone_service = ToneService()
-        estimated_cost = tone_service.get_cost_estimate(total_chars)
+        texts = _tone_texts(cached_translation, block_indices)
+        
+        # Learned per-language token and latency stats (see TonePlanner)
+        plan = await TonePlanner(redis).plan(texts, translation.target_language)
         
         return ToneEstimateResponse(
-            estimated_cost_usd=estimated_cost,
-            character_count=total_chars,
+            estimated_cost_usd=plan.cost_usd,
+            estimated_seconds=plan.wall_clock_seconds,
+            character_count=sum(len(text) for text in texts),
+            block_count=(
+                len(block_indices)
+                if block_indices is not None
+                else len(cached_translation.get("blocks", []))
+            ),
         )
     finally:
         await redis.aclose()
@@ -452,11 +669,10 @@ async def get_tone_comparison(
     
     # Load tone-customized blocks from cache
     redis = get_redis_client()
-    cache = Cache(redis)
+    store = TranslatedBlockStore(redis)
     
     try:
-        cache_key = f"{CacheKeys.blocks(job_id)}_translated"
-        cached_translation = await cache.get_json(cache_key)
+        cached_translation = await store.load(job_id)
         
         if not cached_translation:
             raise HTTPException(
@@ -554,11 +770,10 @@ async def get_translation_blocks(
     
     # Load translated blocks from cache
     redis = get_redis_client()
-    cache = Cache(redis)
+    store = TranslatedBlockStore(redis)
     
     try:
-        cache_key = f"{CacheKeys.blocks(job_id)}_translated"
-        cached_translation = await cache.get_json(cache_key)
+        cached_translation = await store.load(job_id)
         
         if not cached_translation:
             raise HTTPException(
@@ -578,6 +793,7 @@ async def get_translation_blocks(
                 "original_text": block.get("original_text", ""),
                 "translated_text": block.get("translated_text", ""),
                 "tone_customized_text": block.get("tone_customized_text"),
+                "edited_text": block.get("edited_text"),
             })
         
         return {
@@ -590,6 +806,289 @@ async def get_translation_blocks(
         await redis.aclose()
 
 
+def _static_url(key: str) -> str:
+    """Public (CDN) URL of a static viewer artifact, or a presigned URL"""
+    public_url = get_settings().static_public_url
+    if public_url:
+        return f"{public_url.rstrip('/')}/{key}"
+    return get_presigned_url(key, expires_in=3600)
+
+
+@router.get("/translation/{job_id}/text-layer", response_model=TextLayerResponse)
+async def get_text_layer(
+    job_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> TextLayerResponse:
+    """
+    Get the URLs of the viewer's per-page text-layer shards.
+    
+    Shards are static gzipped JSON in the object store (or behind a CDN),
+    so the viewer fetches only the pages it displays without going
+    through the API. They are published when the PDF is reconstructed and
+    republished here, on the first request after blocks change.
+    
+    Args:
+        job_id: Translation job ID (UUID)
+        db: Database session
+        current_user: Authenticated user
+        
+    Returns:
+        TextLayerResponse with the manifest and per-page shard URLs
+        
+    Raises:
+        404: Translation not found
+        403: User doesn't own this translation
+        400: Translation blocks not available
+    """
+    try:
+        job_uuid = UUID(job_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid job ID format",
+        )
+    
+    result = await db.execute(
+        select(Translation).where(Translation.id == job_uuid)
+    )
+    translation = result.scalar_one_or_none()
+    
+    if not translation:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Translation not found",
+        )
+    
+    if translation.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have permission to access this translation",
+        )
+    
+    user_id = str(translation.user_id)
+    redis = get_redis_client()
+    publisher = TextLayerPublisher(redis)
+    
+    try:
+        manifest = await publisher.load_manifest(job_id)
+        if manifest is None:
+            manifest = await publisher.publish(job_id, user_id)
+        if manifest is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Translation blocks not found. Translation may not be complete.",
+            )
+    finally:
+        await redis.aclose()
+    
+    return TextLayerResponse(
+        job_id=job_id,
+        version=manifest["version"],
+        manifest_url=_static_url(
+            S3Keys.text_layer_manifest_path(user_id, job_id, manifest["version"])
+        ),
+        pages=[
+            TextLayerPage(
+                page=page,
+                url=_static_url(S3Keys.text_layer_shard_path(user_id, job_id, page, digest)),
+            )
+            for page, digest in sorted(manifest["pages"].items())
+        ],
+    )
+
+
+@router.get("/translation/{job_id}/previews/{kind}", response_model=PreviewsResponse)
+async def get_page_previews(
+    job_id: str,
+    kind: Literal["original", "translated"],
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> PreviewsResponse:
+    """
+    Get the URLs of pre-rendered page thumbnails and zoom tiles.
+    
+    Previews of the original are rendered right after upload, those of
+    the translated PDF after reconstruction, so the review UI shows pages
+    without rasterizing PDFs itself. Until they are ready the response has
+    `ready: false`; poll again.
+    
+    Args:
+        job_id: Translation job ID (UUID)
+        kind: "original" or "translated"
+        db: Database session
+        current_user: Authenticated user
+        
+    Returns:
+        PreviewsResponse with per-page thumbnail and tile URLs
+        
+    Raises:
+        404: Translation not found
+        403: User doesn't own this translation
+    """
+    try:
+        job_uuid = UUID(job_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid job ID format",
+        )
+    
+    result = await db.execute(
+        select(Translation).where(Translation.id == job_uuid)
+    )
+    translation = result.scalar_one_or_none()
+    
+    if not translation:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Translation not found",
+        )
+    
+    if translation.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have permission to access this translation",
+        )
+    
+    redis = get_redis_client()
+    try:
+        manifest = await PreviewRenderer(redis).load_manifest(job_id, kind)
+    finally:
+        await redis.aclose()
+    
+    if manifest is None:
+        return PreviewsResponse(job_id=job_id, kind=kind, ready=False)
+    
+    def url(name: str) -> str:
+        return _static_url(
+            S3Keys.preview_path(str(translation.user_id), job_id, kind, f"{manifest['version']}/{name}")
+        )
+    
+    return PreviewsResponse(
+        job_id=job_id,
+        kind=kind,
+        ready=True,
+        version=manifest["version"],
+        format=manifest["format"],
+        tile_size=manifest["tile_size"],
+        manifest_url=url("manifest.json"),
+        pages=[
+            PreviewPage(
+                page=page["page"],
+                width=page["width"],
+                height=page["height"],
+                thumbnail_url=url(manifest["thumbnail"].format(page=page["page"])),
+                levels=[
+                    PreviewLevel(
+                        **level,
+                        tile_urls=[
+                            url(manifest["tile"].format(
+                                page=page["page"],
+                                zoom=f"{level['zoom']:g}",
+                                column=column,
+                                row=row,
+                            ))
+                            for row in range(level["rows"])
+                            for column in range(level["columns"])
+                        ],
+                    )
+                    for level in page["levels"]
+                ],
+            )
+            for page in manifest["pages"]
+        ],
+    )
+
+
+@router.put("/translation/{job_id}/blocks/{block_id}", response_model=BlockEditResponse)
+async def save_block_edit(
+    job_id: str,
+    block_id: int,
+    request: BlockEditRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> BlockEditResponse:
+    """
+    Save a user edit for a single block.
+    
+    Only this block's entry is written; the document payload is untouched.
+    Saved edits are picked up by scoped tone requests using
+    `edited_since_last_tone`.
+    
+    Args:
+        job_id: Translation job ID (UUID)
+        block_id: Block ID (as returned by the blocks endpoint)
+        request: Edited text
+        db: Database session
+        current_user: Authenticated user
+        
+    Returns:
+        BlockEditResponse with the saved edit
+        
+    Raises:
+        404: Translation or block not found
+        403: User doesn't own this translation
+    """
+    # Validate UUID format
+    try:
+        job_uuid = UUID(job_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid job ID format",
+        )
+    
+    # Get translation from database
+    result = await db.execute(
+        select(Translation).where(Translation.id == job_uuid)
+    )
+    translation = result.scalar_one_or_none()
+    
+    if not translation:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Translation not found",
+        )
+    
+    # Check ownership
+    if translation.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have permission to modify this translation",
+        )
+    
+    redis = get_redis_client()
+    store = TranslatedBlockStore(redis)
+    
+    try:
+        cached_translation = await store.load(job_id)
+        
+        if not cached_translation:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Translation blocks not found. Translation may not be complete.",
+            )
+        
+        if not 0 <= block_id < len(cached_translation.get("blocks", [])):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Block not found",
+            )
+        
+        update = await store.set_block_edit(job_id, block_id, request.text)
+        
+        info("Block edit saved", job_id=job_id, block_id=block_id)
+        
+        return BlockEditResponse(
+            block_id=str(block_id),
+            edited_text=update["edited_text"],
+            edited_at=update["edited_at"],
+        )
+    finally:
+        await redis.aclose()
+
+
 @router.post("/alternatives", response_model=AlternativesResponse)
 async def get_alternatives(
     request: AlternativesRequest,
@@ -612,22 +1111,32 @@ async def get_alternatives(
         400: Invalid request
         500: API error
     """
-    try:
+    async def generate() -> dict:
         alternatives_service = AlternativesService()
         alternatives, cost = await alternatives_service.generate_alternatives(
             text=request.text,
             target_lang=request.target_lang,
             count=request.count,
         )
+        return {"alternatives": alternatives, "cost_usd": cost}
+    
+    redis = get_redis_client()
+    try:
+        # Identical concurrent requests (double-clicks, tabs, retries) share one call
+        result, shared = await SingleFlight(redis, "alternatives").do(
+            content_hash(request.text, request.target_lang.upper(), request.count),
+            generate,
+        )
         
         # Filter out empty alternatives
-        alternatives = [alt for alt in alternatives if alt.strip()]
+        alternatives = [alt for alt in result["alternatives"] if alt.strip()]
         
         info(
             "Alternatives generated",
             user_id=str(current_user.id),
             alternatives_count=len(alternatives),
-            cost_usd=cost,
+            cost_usd=0.0 if shared else result["cost_usd"],
+            coalesced=shared,
         )
         
         return AlternativesResponse(alternatives=alternatives)
@@ -643,6 +1152,60 @@ async def get_alternatives(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to generate alternatives",
         )
+    finally:
+        await redis.aclose()
+
+
+@router.post("/alternatives/bulk")
+async def get_bulk_alternatives(
+    request: BulkAlternativesRequest,
+    current_user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    """
+    Generate alternative translations for many blocks in one call.
+    
+    Blocks are packed into a few token-budgeted Claude prompts instead of
+    one request per block. Results are streamed as newline-delimited JSON,
+    one line per block as soon as it is parsed (in completion order):
+    
+        {"index": 0, "alternatives": ["...", "..."]}
+        {"index": 3, "alternatives": [], "error": "generation_failed"}
+        {"done": true, "cost_usd": 0.0012}
+    
+    Args:
+        request: Block texts, target language, and count per block
+        current_user: Authenticated user
+        
+    Returns:
+        StreamingResponse of NDJSON lines
+        
+    Raises:
+        400: Invalid request
+    """
+    try:
+        alternatives_service = AlternativesService()
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    
+    async def stream():
+        async for result in alternatives_service.stream_bulk_alternatives(
+            texts=request.texts,
+            target_lang=request.target_lang,
+            count=request.count,
+        ):
+            if result.get("done"):
+                info(
+                    "Bulk alternatives streamed",
+                    user_id=str(current_user.id),
+                    block_count=len(request.texts),
+                    cost_usd=result["cost_usd"],
+                )
+            yield json.dumps(result, ensure_ascii=False) + "\n"
+    
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
 
 
 @router.post("/retranslate", response_model=RetranslateResponse)
@@ -668,25 +1231,36 @@ async def retranslate_text(
         400: Invalid request
         500: API error
     """
-    try:
+    async def retranslate() -> dict:
         tone_service = ToneService()
-        
         # Apply tone customization (which effectively re-translates with tone)
         translated_text, cost = await tone_service.apply_tone(
             text=request.text,
             tone=request.tone,
             target_lang=request.target_lang,
         )
+        return {"translated_text": translated_text, "cost_usd": cost}
+    
+    redis = get_redis_client()
+    try:
+        # Identical concurrent requests share one call; only the caller that
+        # made it is charged
+        result, shared = await SingleFlight(redis, "retranslate").do(
+            content_hash(request.text, request.tone, request.target_lang.upper()),
+            retranslate,
+        )
+        cost = 0.0 if shared else result["cost_usd"]
         
         info(
             "Text re-translated",
             user_id=str(current_user.id),
             tone=request.tone,
             cost_usd=cost,
+            coalesced=shared,
         )
         
         return RetranslateResponse(
-            translated_text=translated_text,
+            translated_text=result["translated_text"],
             cost_usd=cost,
         )
         
@@ -711,4 +1285,6 @@ async def retranslate_text(
             degraded_mode=True,
             degraded_message="Tone customization temporarily unavailable. Original text returned.",
         )
+    finally:
+        await redis.aclose()
 
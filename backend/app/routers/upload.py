@@ -1,19 +1,45 @@
 """Upload router for file uploads"""
 
+import hashlib
 import uuid
 from pathlib import Path
 
+from botocore.exceptions import ClientError
 from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
+from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache import get_redis
+from app.config import get_settings
 from app.database import get_db
 from app.middleware.auth_middleware import get_current_user
 from app.models.translation import Translation, TranslationStatus
 from app.models.user import User
-from app.s3 import S3Keys, upload_file
-from app.schemas.upload import UploadResponse
-from app.logger import info, error as log_error
+from app.s3 import (
+    MultipartUploadWriter,
+    S3Keys,
+    complete_multipart_upload,
+    create_multipart_upload,
+    delete_file,
+    supports_direct_uploads,
+)
+from app.schemas.upload import (
+    CompleteUploadRequest,
+    DirectUploadRequest,
+    DirectUploadResponse,
+    UploadResponse,
+)
+from app.services.direct_upload import (
+    PDF_HEADER_SEARCH_BYTES,
+    PDF_MAGIC,
+    PendingUploadStore,
+    presign_upload_parts,
+    verify_uploaded_pdf,
+)
+from app.services.upload_dedup import UploadDeduplicator
+from app.logger import info, warning, error as log_error
 from app.tasks.orchestrator import trigger_translation_pipeline
+from app.tasks.render_previews import trigger_preview_rendering
 
 router = APIRouter(prefix="/api/v1", tags=["upload"])
 
@@ -22,6 +48,9 @@ MAX_FILE_SIZE = 100 * 1024 * 1024  # 100MB in bytes
 ALLOWED_CONTENT_TYPES = ["application/pdf"]
 ALLOWED_EXTENSIONS = [".pdf"]
 
+# Uploads are read (and hashed) in chunks of this size
+UPLOAD_READ_CHUNK_SIZE = 1024 * 1024
+
 
 def sanitize_filename(filename: str) -> str:
     """
@@ -49,7 +78,10 @@ def sanitize_filename(filename: str) -> str:
 
 async def validate_file(file: UploadFile) -> None:
     """
-    Validate uploaded file type and size.
+    Validate uploaded file type, and size when the client declared it.
+    
+    The content is checked while it is streamed to storage
+    (see stream_to_storage).
     
     Args:
         file: Uploaded file object
@@ -73,28 +105,193 @@ async def validate_file(file: UploadFile) -> None:
                 detail=f"Invalid file extension. Only .pdf files are supported. Received: {ext}",
             )
     
-    # Check file size by reading the content
-    contents = await file.read()
-    file_size = len(contents)
+    if file.size is not None and file.size > MAX_FILE_SIZE:
+        _raise_too_large(file.size)
+
+
+def _raise_too_large(file_size: int) -> None:
+    file_size_mb = file_size / (1024 * 1024)
+    max_size_mb = MAX_FILE_SIZE / (1024 * 1024)
+    raise HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"File too large. Maximum size is {max_size_mb}MB. Your file is {file_size_mb:.2f}MB",
+    )
+
+
+async def stream_to_storage(file: UploadFile, s3_key: str) -> tuple[int, str]:
+    """
+    Validate an uploaded file's content while forwarding it to S3.
     
-    if file_size == 0:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="File is empty",
-        )
+    The file is read in chunks: the PDF header is checked on the first
+    chunk, the size limit as chunks arrive, and each full part is uploaded
+    before more is read. At most one part is held in memory, whatever the
+    file size. A rejected file is discarded from storage.
+    
+    Args:
+        file: Uploaded file object
+        s3_key: Destination S3 key
+        
+    Returns:
+        Tuple of (file size in bytes, SHA-256 hex digest of the content)
+        
+    Raises:
+        HTTPException 400: Empty file or not a PDF
+        HTTPException 413: File too large
+    """
+    writer = MultipartUploadWriter(key=s3_key, content_type="application/pdf")
+    digest = hashlib.sha256()
+    try:
+        while chunk := await file.read(UPLOAD_READ_CHUNK_SIZE):
+            if writer.size == 0 and PDF_MAGIC not in chunk[:PDF_HEADER_SEARCH_BYTES]:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid file content. The file is not a PDF.",
+                )
+            if writer.size + len(chunk) > MAX_FILE_SIZE:
+                _raise_too_large(writer.size + len(chunk))
+            digest.update(chunk)
+            await writer.write(chunk)
+        
+        if writer.size == 0:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="File is empty",
+            )
+        await writer.complete()
+    except BaseException:
+        try:
+            await writer.abort()
+        except Exception as e:
+            warning("Failed to abort rejected upload", exc=e, s3_key=s3_key)
+        raise
     
-    if file_size > MAX_FILE_SIZE:
-        file_size_mb = file_size / (1024 * 1024)
-        max_size_mb = MAX_FILE_SIZE / (1024 * 1024)
+    return writer.size, digest.hexdigest()
+
+
+async def _create_translation(
+    db: AsyncSession,
+    current_user: User,
+    job_id: uuid.UUID,
+    file_name: str,
+    file_size: int,
+    source_language: str,
+    target_language: str,
+    s3_key: str,
+    content_hash: str | None = None,
+    redis: Redis | None = None,
+) -> Translation:
+    """
+    Create the translation record for a stored file and trigger the pipeline.
+    
+    Page previews of the original are queued alongside, so they are ready
+    before the translation is.
+    
+    When the content hash is known and the tenant already has a completed
+    translation of the same file and languages, the record is created
+    completed from that translation's results instead, and no pipeline
+    work is queued.
+    
+    The stored file is deleted if the record can't be created.
+    
+    Raises:
+        HTTPException 500: Database error
+    """
+    try:
+        translation = Translation(
+            id=job_id,
+            tenant_id=current_user.tenant_id,
+            user_id=current_user.id,
+            file_name=file_name,
+            file_size_bytes=file_size,
+            source_language=source_language.lower().strip(),
+            target_language=target_language.lower().strip(),
+            status=TranslationStatus.PENDING,
+            progress_percent=0,
+            original_file_path=s3_key,
+            content_hash=content_hash,
+        )
+        
+        cloned = False
+        if content_hash and redis is not None:
+            cloned = await _clone_identical_upload(db, redis, translation)
+        
+        db.add(translation)
+        await db.commit()
+        await db.refresh(translation)
+        
+        info(
+            "Translation record created",
+            job_id=str(job_id),
+            user_id=str(current_user.id),
+            status=translation.status.value,
+        )
+        
+        _queue_previews(str(job_id), cloned)
+        
+        if cloned:
+            return translation
+        
+        # Trigger Celery pipeline to process the translation
+        try:
+            task_id = trigger_translation_pipeline(str(job_id))
+            info(
+                "Translation pipeline triggered",
+                job_id=str(job_id),
+                task_id=task_id,
+            )
+        except Exception as e:
+            log_error("Failed to trigger translation pipeline", exc=e, job_id=str(job_id))
+            # Don't fail the upload if pipeline trigger fails
+            # User can retry or admin can manually trigger
+        
+    except Exception as e:
+        log_error("Database record creation failed", exc=e, job_id=str(job_id))
+        # Try to clean up S3 file if DB fails
+        try:
+            await delete_file(s3_key)
+        except Exception:
+            pass  # Best effort cleanup
+        
         raise HTTPException(
-            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail=f"File too large. Maximum size is {max_size_mb}MB. Your file is {file_size_mb:.2f}MB",
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to create translation record",
         )
     
-    # Reset file pointer for subsequent reads
-    await file.seek(0)
-    
-    return contents, file_size
+    return translation
+
+
+def _queue_previews(job_id: str, completed: bool) -> None:
+    """Queue preview rendering of the original (and result, if already completed); never raises"""
+    for kind in ("original", "translated") if completed else ("original",):
+        try:
+            trigger_preview_rendering(job_id, kind)
+        except Exception as e:
+            warning("Failed to trigger preview rendering", exc=e, job_id=job_id, kind=kind)
+
+
+async def _clone_identical_upload(db: AsyncSession, redis: Redis, translation: Translation) -> bool:
+    """Complete a new translation from an identical earlier one, if any (never raises)"""
+    try:
+        dedup = UploadDeduplicator(db, redis)
+        source = await dedup.find_source(translation)
+        return source is not None and await dedup.clone(source, translation)
+    except Exception as e:
+        warning("Upload deduplication failed, running the pipeline", exc=e, job_id=str(translation.id))
+        return False
+
+
+def _upload_response(translation: Translation) -> UploadResponse:
+    if translation.status == TranslationStatus.COMPLETED:
+        message = "Identical document already translated. Results are ready."
+    else:
+        message = "File uploaded successfully. Translation will begin shortly."
+    return UploadResponse(
+        job_id=str(translation.id),
+        status=translation.status.value,
+        message=message,
+        file_name=translation.file_name,
+        file_size_bytes=translation.file_size_bytes,
+    )
 
 
 @router.post("/upload", response_model=UploadResponse, status_code=status.HTTP_201_CREATED)
@@ -104,16 +301,23 @@ async def upload_document(
     source_language: str = Form(default="auto", description="Source language code or 'auto' for auto-detect"),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
 ) -> UploadResponse:
     """
     Upload a PDF file for translation.
     
     This endpoint:
-    1. Validates the file (type, size, content)
-    2. Uploads to S3 with organized key structure
-    3. Creates a database record with 'pending' status
+    1. Validates the file type
+    2. Streams it to S3 in parts with organized key structure, checking
+       size and content as it is read
+    3. Creates a database record with 'pending' status, or 'completed'
+       when the tenant already translated the identical file to the same
+       language (results are copied, nothing is queued)
     4. Returns job_id for status polling
     
+    The file passes through the API; ``POST /uploads`` sends it straight
+    to storage instead.
+    
     Rate limits:
     - Free tier: 10 files/month
     - Pro tier: 100 files/month
@@ -124,6 +328,7 @@ async def upload_document(
         source_language: Source language code or 'auto'
         current_user: Authenticated user (from JWT)
         db: Database session
+        redis: Redis client (cached results of identical uploads)
         
     Returns:
         UploadResponse with job_id and status
@@ -141,9 +346,9 @@ async def upload_document(
         content_type=file.content_type,
     )
     
-    # Validate file
+    # Validate file type
     try:
-        contents, file_size = await validate_file(file)
+        await validate_file(file)
     except HTTPException:
         raise
     except Exception as e:
@@ -166,19 +371,18 @@ async def upload_document(
         filename=safe_filename,
     )
     
-    # Upload to S3
+    # Validate the content while streaming it to S3
     try:
-        await upload_file(
-            file_data=contents,
-            key=s3_key,
-            content_type="application/pdf",
-        )
+        file_size, content_hash = await stream_to_storage(file, s3_key)
         info(
             "File uploaded to S3",
             job_id=str(job_id),
             s3_key=s3_key,
             file_size=file_size,
+            content_hash=content_hash,
         )
+    except HTTPException:
+        raise
     except Exception as e:
         log_error("S3 upload failed", exc=e, job_id=str(job_id), s3_key=s3_key)
         raise HTTPException(
@@ -186,64 +390,248 @@ async def upload_document(
             detail="Failed to upload file to storage",
         )
     
-    # Create database record
+    # Create database record and start the pipeline (or reuse an identical upload)
+    translation = await _create_translation(
+        db=db,
+        current_user=current_user,
+        job_id=job_id,
+        file_name=safe_filename,
+        file_size=file_size,
+        source_language=source_language,
+        target_language=target_language,
+        s3_key=s3_key,
+        content_hash=content_hash,
+        redis=redis,
+    )
+    
+    # Return response
+    return _upload_response(translation)
+
+
+@router.post("/uploads", response_model=DirectUploadResponse, status_code=status.HTTP_201_CREATED)
+async def start_direct_upload(
+    request: DirectUploadRequest,
+    current_user: User = Depends(get_current_user),
+    redis: Redis = Depends(get_redis),
+) -> DirectUploadResponse:
+    """
+    Start an upload that the browser sends straight to S3.
+    
+    Step 1 of 2: returns presigned URLs for the parts of a multipart
+    upload. The client PUTs each part to its URL, then calls
+    ``POST /uploads/{job_id}/complete`` with the returned ETags. The file
+    never passes through the API.
+    
+    Args:
+        request: File name, size and languages
+        current_user: Authenticated user (from JWT)
+        redis: Redis client (pending uploads)
+        
+    Returns:
+        DirectUploadResponse with job_id and part URLs
+        
+    Raises:
+        HTTPException 400: Invalid file extension
+        HTTPException 413: File too large
+        HTTPException 500: Storage error
+        HTTPException 501: Storage backend without direct uploads (local)
+    """
+    if not supports_direct_uploads():
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Direct uploads need S3 storage. Use POST /upload instead.",
+        )
+    if Path(request.file_name).suffix.lower() not in ALLOWED_EXTENSIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid file extension. Only .pdf files are supported.",
+        )
+    if request.file_size_bytes > MAX_FILE_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File too large. Maximum size is {MAX_FILE_SIZE / (1024 * 1024)}MB",
+        )
+    
+    settings = get_settings()
+    job_id = uuid.uuid4()
+    safe_filename = sanitize_filename(request.file_name)
+    s3_key = S3Keys.upload_path(
+        user_id=str(current_user.id),
+        job_id=str(job_id),
+        filename=safe_filename,
+    )
+    part_size = settings.s3_direct_upload_part_mb * 1024 * 1024
+    expires_in = settings.s3_direct_upload_expires_seconds
+    
     try:
-        translation = Translation(
-            id=job_id,
-            tenant_id=current_user.tenant_id,
-            user_id=current_user.id,
-            file_name=safe_filename,
-            file_size_bytes=file_size,
-            source_language=source_language.lower().strip(),
-            target_language=target_language.lower().strip(),
-            status=TranslationStatus.PENDING,
-            progress_percent=0,
-            original_file_path=s3_key,
+        upload_id = await create_multipart_upload(key=s3_key, content_type="application/pdf")
+        parts = presign_upload_parts(s3_key, upload_id, request.file_size_bytes, part_size, expires_in)
+        await PendingUploadStore(redis, expires_in).save(
+            str(job_id),
+            {
+                "user_id": str(current_user.id),
+                "s3_key": s3_key,
+                "upload_id": upload_id,
+                "file_name": safe_filename,
+                "file_size": request.file_size_bytes,
+                "source_language": request.source_language,
+                "target_language": request.target_language,
+            },
+        )
+    except Exception as e:
+        log_error("Failed to start direct upload", exc=e, job_id=str(job_id), s3_key=s3_key)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to start upload",
         )
+    
+    info(
+        "Direct upload started",
+        job_id=str(job_id),
+        user_id=str(current_user.id),
+        file_size=request.file_size_bytes,
+        part_count=len(parts),
+    )
+    
+    return DirectUploadResponse(
+        job_id=str(job_id),
+        upload_id=upload_id,
+        part_size_bytes=part_size,
+        parts=parts,
+        expires_in=expires_in,
+    )
+
+
+@router.post("/uploads/{job_id}/complete", response_model=UploadResponse, status_code=status.HTTP_201_CREATED)
+async def complete_direct_upload(
+    job_id: str,
+    request: CompleteUploadRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
+) -> UploadResponse:
+    """
+    Finalize a direct upload and start translating.
+    
+    Step 2 of 2:
+    1. Assembles the uploaded parts in S3
+    2. Verifies the size and the PDF header with a ranged read (the file
+       isn't downloaded)
+    3. Creates the database record and triggers the pipeline
+    
+    The pending upload is kept until the record is committed: after a
+    storage error during verification the client can call this again
+    (the parts aren't assembled twice). A rejected file or a failed
+    record discards both the stored file and the pending upload.
+    
+    Args:
+        job_id: Job ID returned by ``POST /uploads``
+        request: Part numbers and ETags of the uploaded parts
+        current_user: Authenticated user (from JWT)
+        db: Database session
+        redis: Redis client (pending uploads)
         
-        db.add(translation)
-        await db.commit()
-        await db.refresh(translation)
+    Returns:
+        UploadResponse with job_id and status
         
-        info(
-            "Translation record created",
-            job_id=str(job_id),
-            user_id=str(current_user.id),
-            status=translation.status.value,
+    Raises:
+        HTTPException 400: Parts missing (retry after uploading them) or
+            not a valid PDF (the upload is discarded)
+        HTTPException 403: Upload started by another user
+        HTTPException 404: Unknown or expired upload
+        HTTPException 500: Storage or database error
+    """
+    store = PendingUploadStore(redis, get_settings().s3_direct_upload_expires_seconds)
+    upload = await store.load(job_id)
+    if not upload:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload not found or expired",
         )
-        
-        # Trigger Celery pipeline to process the translation
+    if upload["user_id"] != str(current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have permission to complete this upload",
+        )
+    
+    s3_key = upload["s3_key"]
+    if not upload.get("completed"):
         try:
-            task_id = trigger_translation_pipeline(str(job_id))
-            info(
-                "Translation pipeline triggered",
-                job_id=str(job_id),
-                task_id=task_id,
+            await complete_multipart_upload(
+                key=s3_key,
+                upload_id=upload["upload_id"],
+                parts=[(part.part_number, part.etag) for part in request.parts],
+            )
+        except ClientError as e:
+            # Keep the pending upload: the client can upload the missing parts and retry
+            warning("Direct upload could not be completed", exc=e, job_id=job_id)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Upload is incomplete: some parts are missing or don't match",
             )
         except Exception as e:
-            log_error("Failed to trigger translation pipeline", exc=e, job_id=str(job_id))
-            # Don't fail the upload if pipeline trigger fails
-            # User can retry or admin can manually trigger
-        
+            log_error("Failed to complete direct upload", exc=e, job_id=job_id, s3_key=s3_key)
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to complete upload",
+            )
+        # The upload ID is spent: a retry goes straight to verification
+        upload["completed"] = True
+        await store.save(job_id, upload)
+    
+    try:
+        await verify_uploaded_pdf(s3_key, upload["file_size"])
+    except ValueError as e:
+        warning("Uploaded file rejected", exc=e, job_id=job_id, s3_key=s3_key)
+        await _discard_direct_upload(store, job_id, s3_key)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid upload: {e}",
+        )
     except Exception as e:
-        log_error("Database record creation failed", exc=e, job_id=str(job_id))
-        # Try to clean up S3 file if DB fails
-        try:
-            from app.s3 import delete_file
-            await delete_file(s3_key)
-        except Exception:
-            pass  # Best effort cleanup
-        
+        # Keep the file and the pending upload, so the client can retry
+        log_error("Failed to verify direct upload", exc=e, job_id=job_id, s3_key=s3_key)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to create translation record",
+            detail="Failed to verify upload",
         )
     
-    # Return response
+    info(
+        "Direct upload completed",
+        job_id=job_id,
+        s3_key=s3_key,
+        file_size=upload["file_size"],
+    )
+    
+    try:
+        await _create_translation(
+            db=db,
+            current_user=current_user,
+            job_id=uuid.UUID(job_id),
+            file_name=upload["file_name"],
+            file_size=upload["file_size"],
+            source_language=upload["source_language"],
+            target_language=upload["target_language"],
+            s3_key=s3_key,
+        )
+    except Exception:
+        await _discard_direct_upload(store, job_id, s3_key)
+        raise
+    await store.delete(job_id)
+    
     return UploadResponse(
-        job_id=str(job_id),
+        job_id=job_id,
         status="pending",
         message="File uploaded successfully. Translation will begin shortly.",
-        file_name=safe_filename,
-        file_size_bytes=file_size,
+        file_name=upload["file_name"],
+        file_size_bytes=upload["file_size"],
     )
+
+
+async def _discard_direct_upload(store: PendingUploadStore, job_id: str, s3_key: str) -> None:
+    """Delete a completed direct upload that won't become a translation, and forget it"""
+    try:
+        await delete_file(s3_key)
+    except Exception as e:
+        warning("Failed to delete discarded upload", exc=e, job_id=job_id, s3_key=s3_key)
+    await store.delete(job_id)
@@ -1,13 +1,23 @@
-"""S3/MinIO file storage utilities"""
+"""File storage utilities (S3/MinIO, or local disk with STORAGE_BACKEND=local)"""
 
+import asyncio
+import functools
 import io
-from typing import BinaryIO
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import AsyncIterator, BinaryIO, Callable, Dict, List, Optional, Tuple
 
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config
 from botocore.exceptions import ClientError
 
 from app.config import get_settings
+from app.local_storage import LocalStorage
+from app.storage import Storage, StorageWriter
 
 settings = get_settings()
 
@@ -15,6 +25,7 @@ settings = get_settings()
 _s3_config = Config(
     signature_version="s3v4",
     retries={"max_attempts": 3, "mode": "standard"},
+    max_pool_connections=settings.s3_max_pool_connections,
 )
 
 # Create S3 client for backend operations (uses internal endpoint)
@@ -44,12 +55,338 @@ s3_public_client = boto3.client(
 # Default bucket name
 DEFAULT_BUCKET = settings.aws_bucket_name
 
+# Files above the threshold are uploaded in parts, several at a time, read
+# from disk one part per thread
+_MB = 1024 * 1024
+_transfer_config = TransferConfig(
+    multipart_threshold=settings.s3_multipart_threshold_mb * _MB,
+    multipart_chunksize=settings.s3_multipart_chunk_mb * _MB,
+    max_concurrency=settings.s3_multipart_concurrency,
+    use_threads=True,
+)
+
+# boto3 is blocking: calls run on this pool so the event loop keeps serving
+# requests (status polls) while files move. Its size bounds concurrent S3
+# calls; further calls wait for a free thread.
+_io_executor = ThreadPoolExecutor(
+    max_workers=settings.s3_io_workers,
+    thread_name_prefix="s3-io",
+)
+
+# DeleteObjects accepts at most this many keys per request
+DELETE_BATCH_SIZE = 1000
+
+
+class _S3PartWriter(StorageWriter):
+    """
+    Multipart upload fed while the file is read.
+
+    Buffers at most one part: each part is uploaded as soon as it is full
+    (S3 requires 5 MB or more for every part but the last). A file smaller
+    than one part is sent with a single PUT.
+    """
+
+    def __init__(self, storage: "S3Storage", key: str, bucket: str, content_type: str, part_size: int):
+        self.storage = storage
+        self.key = key
+        self.bucket = bucket
+        self.content_type = content_type
+        self.part_size = part_size
+        self._buffer = bytearray()
+        self._upload_id: Optional[str] = None
+        self._parts: List[Tuple[int, str]] = []
+
+    def write(self, data: bytes) -> None:
+        self._buffer += data
+        while len(self._buffer) >= self.part_size:
+            part = bytes(self._buffer[:self.part_size])
+            del self._buffer[:self.part_size]
+            self._upload_part(part)
+
+    def _upload_part(self, data: bytes) -> None:
+        if self._upload_id is None:
+            self._upload_id = self.storage.create_multipart_upload(self.key, self.bucket, self.content_type)
+        part_number = len(self._parts) + 1
+        response = self.storage.client.upload_part(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self._upload_id,
+            PartNumber=part_number,
+            Body=data,
+        )
+        self._parts.append((part_number, response["ETag"]))
+
+    def complete(self) -> None:
+        remaining, self._buffer = bytes(self._buffer), bytearray()
+        if self._upload_id is None:
+            self.storage.write(remaining, self.key, self.bucket, self.content_type)
+            return
+        if remaining:
+            self._upload_part(remaining)
+        self.storage.complete_multipart_upload(self.key, self._upload_id, self._parts, self.bucket)
+
+    def abort(self) -> None:
+        self._buffer = bytearray()
+        if self._upload_id is not None:
+            self.storage.abort_multipart_upload(self.key, self._upload_id, self.bucket)
+            self._upload_id = None
+
+
+class S3Storage(Storage):
+    """
+    Stores objects in S3 or MinIO.
+
+    Features:
+    - Files from disk above the multipart threshold are uploaded in
+      parts, several at a time (see the S3_MULTIPART_* settings)
+    - Copies are server-side
+    - Download links and direct uploads use presigned URLs from the
+      public endpoint, so browsers can reach them
+    """
+
+    supports_direct_uploads = True
+
+    def __init__(self, client, public_client, transfer_config: TransferConfig):
+        self.client = client
+        self.public_client = public_client
+        self.transfer_config = transfer_config
+
+    def write(
+        self,
+        data: bytes | BinaryIO,
+        key: str,
+        bucket: str,
+        content_type: str = "application/octet-stream",
+        content_encoding: Optional[str] = None,
+        cache_control: Optional[str] = None,
+    ) -> None:
+        extra_args = {"ContentType": content_type}
+        if content_encoding:
+            extra_args["ContentEncoding"] = content_encoding
+        if cache_control:
+            extra_args["CacheControl"] = cache_control
+        if isinstance(data, bytes):
+            data = io.BytesIO(data)
+        self.client.upload_fileobj(data, bucket, key, ExtraArgs=extra_args)
+
+    def write_from_path(
+        self,
+        source_path: str,
+        key: str,
+        bucket: str,
+        content_type: str = "application/octet-stream",
+    ) -> None:
+        self.client.upload_file(
+            source_path,
+            bucket,
+            key,
+            ExtraArgs={"ContentType": content_type},
+            Config=self.transfer_config,
+        )
+
+    def open_writer(self, key: str, bucket: str, content_type: str, part_size: int) -> StorageWriter:
+        return _S3PartWriter(self, key, bucket, content_type, part_size)
+
+    def read(self, key: str, bucket: str) -> bytes:
+        response = self.client.get_object(Bucket=bucket, Key=key)
+        return response["Body"].read()
+
+    def read_range(self, key: str, start: int, end: int, bucket: str) -> bytes:
+        response = self.client.get_object(Bucket=bucket, Key=key, Range=f"bytes={start}-{end}")
+        return response["Body"].read()
+
+    def open_range(self, key: str, start: int, end: Optional[int], bucket: str) -> BinaryIO:
+        response = self.client.get_object(
+            Bucket=bucket,
+            Key=key,
+            Range=f"bytes={start}-{'' if end is None else end}",
+        )
+        return response["Body"]
+
+    def stat(self, key: str, bucket: str) -> Tuple[int, str]:
+        response = self.client.head_object(Bucket=bucket, Key=key)
+        return response["ContentLength"], response["ETag"]
+
+    def exists(self, key: str, bucket: str) -> bool:
+        try:
+            self.client.head_object(Bucket=bucket, Key=key)
+            return True
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "404":
+                return False
+            raise
+
+    def delete(self, key: str, bucket: str) -> None:
+        self.client.delete_object(Bucket=bucket, Key=key)
+
+    def delete_many(self, keys: List[str], bucket: str) -> List[str]:
+        """Remove objects with batched DeleteObjects requests"""
+        failed: List[str] = []
+        for start in range(0, len(keys), DELETE_BATCH_SIZE):
+            batch = keys[start:start + DELETE_BATCH_SIZE]
+            response = self.client.delete_objects(
+                Bucket=bucket,
+                Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+            )
+            failed.extend(error["Key"] for error in response.get("Errors", []))
+        return failed
+
+    def copy(self, source_key: str, dest_key: str, bucket: str) -> None:
+        self.client.copy_object(
+            Bucket=bucket,
+            Key=dest_key,
+            CopySource={"Bucket": bucket, "Key": source_key},
+        )
+
+    def list(self, prefix: str, bucket: str) -> List[str]:
+        paginator = self.client.get_paginator("list_objects_v2")
+        return [
+            obj["Key"]
+            for page in paginator.paginate(Bucket=bucket, Prefix=prefix)
+            for obj in page.get("Contents", [])
+        ]
+
+    def create_bucket(self, bucket: str) -> None:
+        try:
+            self.client.head_bucket(Bucket=bucket)
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "404":
+                raise
+            self.client.create_bucket(Bucket=bucket)
+
+    def signed_url(
+        self,
+        key: str,
+        bucket: str,
+        expires_in: int,
+        filename: Optional[str] = None,
+    ) -> str:
+        params = {"Bucket": bucket, "Key": key}
+        if filename:
+            params["ResponseContentDisposition"] = f'attachment; filename="{filename}"'
+        return self.public_client.generate_presigned_url(
+            "get_object",
+            Params=params,
+            ExpiresIn=expires_in,
+        )
+
+    def create_multipart_upload(self, key: str, bucket: str, content_type: str) -> str:
+        response = self.client.create_multipart_upload(
+            Bucket=bucket,
+            Key=key,
+            ContentType=content_type,
+        )
+        return response["UploadId"]
+
+    def presigned_url(self, key: str, bucket: str, method: str, params: dict, expires_in: int) -> str:
+        return self.public_client.generate_presigned_url(
+            method,
+            Params={"Bucket": bucket, "Key": key, **params},
+            ExpiresIn=expires_in,
+        )
+
+    def complete_multipart_upload(
+        self,
+        key: str,
+        upload_id: str,
+        parts: List[Tuple[int, str]],
+        bucket: str,
+    ) -> None:
+        self.client.complete_multipart_upload(
+            Bucket=bucket,
+            Key=key,
+            UploadId=upload_id,
+            MultipartUpload={
+                "Parts": [
+                    {"PartNumber": part_number, "ETag": etag}
+                    for part_number, etag in sorted(parts)
+                ],
+            },
+        )
+
+    def abort_multipart_upload(self, key: str, upload_id: str, bucket: str) -> None:
+        self.client.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id)
+
+
+def create_storage(settings) -> Storage:
+    """Storage backend selected by STORAGE_BACKEND ("s3" or "local")"""
+    if settings.storage_backend == "local":
+        return LocalStorage(
+            root=settings.local_storage_path,
+            secret=settings.jwt_secret,
+            public_url=settings.local_storage_public_url,
+        )
+    return S3Storage(s3_client, s3_public_client, _transfer_config)
+
+
+# Backend behind the functions below (tests swap it for a LocalStorage)
+storage: Storage = create_storage(settings)
+
+
+@dataclass
+class S3OperationStats:
+    """Timing of one kind of S3 operation since process start"""
+    count: int = 0
+    errors: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    bytes: int = 0
+
+
+_operation_stats: Dict[str, S3OperationStats] = {}
+_stats_lock = threading.Lock()
+
+
+def _record(operation: str, seconds: float, size: Optional[int], failed: bool) -> None:
+    with _stats_lock:
+        stats = _operation_stats.setdefault(operation, S3OperationStats())
+        stats.count += 1
+        stats.errors += int(failed)
+        stats.total_seconds += seconds
+        stats.max_seconds = max(stats.max_seconds, seconds)
+        stats.bytes += size or 0
+
+
+def get_s3_metrics() -> Dict[str, dict]:
+    """
+    Per-operation timing of S3 calls made by this process.
+
+    Returns:
+        Operation name -> count, errors, total/max seconds and bytes moved
+    """
+    with _stats_lock:
+        return {operation: asdict(stats) for operation, stats in _operation_stats.items()}
+
+
+async def _run(operation: str, func: Callable, *args, size: Optional[int] = None, **kwargs):
+    """
+    Run a blocking S3 call on the I/O pool and record its timing.
+
+    Args:
+        operation: Metrics name of the call
+        func: Blocking function
+        size: Bytes sent (uploads); for downloads the result length is used
+    """
+    loop = asyncio.get_running_loop()
+    start = time.monotonic()
+    failed = True
+    try:
+        result = await loop.run_in_executor(_io_executor, functools.partial(func, *args, **kwargs))
+        failed = False
+        if size is None and isinstance(result, bytes):
+            size = len(result)
+        return result
+    finally:
+        _record(operation, time.monotonic() - start, size, failed)
+
 
 async def upload_file(
     file_data: bytes | BinaryIO,
     key: str,
     bucket: str = DEFAULT_BUCKET,
     content_type: str = "application/octet-stream",
+    content_encoding: str | None = None,
+    cache_control: str | None = None,
 ) -> str:
     """
     Upload a file to S3/MinIO.
@@ -59,21 +396,61 @@ async def upload_file(
         key: S3 object key (path)
         bucket: Bucket name (defaults to configured bucket)
         content_type: MIME type of the file
-        
+        content_encoding: Content-Encoding served with the file (e.g. "gzip")
+        cache_control: Cache-Control served with the file
+
     Returns:
         The S3 key of the uploaded file
-        
+
     Raises:
         ClientError: If upload fails
     """
-    if isinstance(file_data, bytes):
-        file_data = io.BytesIO(file_data)
-
-    s3_client.upload_fileobj(
+    await _run(
+        "upload",
+        storage.write,
         file_data,
+        key,
         bucket,
+        content_type=content_type,
+        content_encoding=content_encoding,
+        cache_control=cache_control,
+        size=len(file_data) if isinstance(file_data, bytes) else None,
+    )
+    return key
+
+
+async def upload_file_from_path(
+    path: str,
+    key: str,
+    bucket: str = DEFAULT_BUCKET,
+    content_type: str = "application/octet-stream",
+) -> str:
+    """
+    Upload a file from disk to S3/MinIO without loading it into memory.
+    
+    Large files are sent as a multipart upload with parts uploaded in
+    parallel (see the S3_MULTIPART_* settings).
+    
+    Args:
+        path: Local file path
+        key: S3 object key (path)
+        bucket: Bucket name (defaults to configured bucket)
+        content_type: MIME type of the file
+
+    Returns:
+        The S3 key of the uploaded file
+
+    Raises:
+        ClientError: If upload fails
+    """
+    await _run(
+        "upload_from_path",
+        storage.write_from_path,
+        path,
         key,
-        ExtraArgs={"ContentType": content_type},
+        bucket,
+        content_type=content_type,
+        size=os.path.getsize(path),
     )
     return key
 
@@ -88,15 +465,15 @@ async def download_file(
     Args:
         key: S3 object key (path)
         bucket: Bucket name (defaults to configured bucket)
-        
+
     Returns:
         File content as bytes
-        
+
     Raises:
         ClientError: If download fails or file not found
     """
-    response = s3_client.get_object(Bucket=bucket, Key=key)
-    return response["Body"].read()
+    # The body is read on the I/O thread as well
+    return await _run("download", storage.read, key, bucket)
 
 
 async def delete_file(
@@ -109,17 +486,42 @@ async def delete_file(
     Args:
         key: S3 object key (path)
         bucket: Bucket name (defaults to configured bucket)
-        
+
     Returns:
         True if deleted successfully
-        
+
     Raises:
         ClientError: If deletion fails
     """
-    s3_client.delete_object(Bucket=bucket, Key=key)
+    await _run("delete", storage.delete, key, bucket)
     return True
 
 
+async def copy_file(
+    source_key: str,
+    dest_key: str,
+    bucket: str = DEFAULT_BUCKET,
+) -> str:
+    """
+    Copy a file within S3/MinIO without downloading it (server-side copy).
+    
+    Local storage hard-links the file instead.
+    
+    Args:
+        source_key: S3 object key to copy from
+        dest_key: S3 object key to copy to
+        bucket: Bucket name (defaults to configured bucket)
+
+    Returns:
+        The destination key
+
+    Raises:
+        ClientError: If the copy fails
+    """
+    await _run("copy", storage.copy, source_key, dest_key, bucket)
+    return dest_key
+
+
 async def file_exists(
     key: str,
     bucket: str = DEFAULT_BUCKET,
@@ -130,17 +532,280 @@ async def file_exists(
     Args:
         key: S3 object key (path)
         bucket: Bucket name (defaults to configured bucket)
-        
+
     Returns:
         True if file exists, False otherwise
     """
+    return await _run("exists", storage.exists, key, bucket)
+
+
+@dataclass
+class FileInfo:
+    """Size and version of a stored file"""
+    size: int
+    etag: str  # Quoted entity tag, changes whenever the content does
+
+
+async def get_file_info(
+    key: str,
+    bucket: str = DEFAULT_BUCKET,
+) -> FileInfo:
+    """
+    Get the size and ETag of a stored file without downloading it.
+    
+    Args:
+        key: S3 object key (path)
+        bucket: Bucket name (defaults to configured bucket)
+
+    Returns:
+        FileInfo
+
+    Raises:
+        ClientError: If the file is not found
+    """
+    size, etag = await _run("head", storage.stat, key, bucket)
+    return FileInfo(size=size, etag=etag)
+
+
+# Proxied downloads are read from storage and sent in chunks of this size
+STREAM_CHUNK_SIZE = 256 * 1024
+
+
+async def stream_file(
+    key: str,
+    start: int = 0,
+    end: Optional[int] = None,
+    bucket: str = DEFAULT_BUCKET,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> AsyncIterator[bytes]:
+    """
+    Read bytes [start, end] (inclusive) of a file chunk by chunk.
+    
+    One chunk is held in memory at a time, so the caller can forward a
+    file of any size as it is read.
+    
+    Args:
+        key: S3 object key (path)
+        start: First byte offset
+        end: Last byte offset (inclusive; None for the end of the file)
+        bucket: Bucket name (defaults to configured bucket)
+        chunk_size: Bytes per chunk
+
+    Yields:
+        Consecutive chunks of the range
+
+    Raises:
+        ClientError: If the file is not found
+    """
+    remaining = None if end is None else end - start + 1
+    body = await _run("stream", storage.open_range, key, start, end, bucket)
     try:
-        s3_client.head_object(Bucket=bucket, Key=key)
-        return True
-    except ClientError as e:
-        if e.response["Error"]["Code"] == "404":
-            return False
-        raise
+        while remaining is None or remaining > 0:
+            size = chunk_size if remaining is None else min(chunk_size, remaining)
+            chunk = await _run("stream_chunk", body.read, size)
+            if not chunk:
+                break
+            if remaining is not None:
+                remaining -= len(chunk)
+            yield chunk
+    finally:
+        body.close()
+
+
+async def get_file_size(
+    key: str,
+    bucket: str = DEFAULT_BUCKET,
+) -> int:
+    """
+    Get the size of a stored file without downloading it.
+    
+    Args:
+        key: S3 object key (path)
+        bucket: Bucket name (defaults to configured bucket)
+
+    Returns:
+        File size in bytes
+
+    Raises:
+        ClientError: If the file is not found
+    """
+    return await _run("head", storage.size, key, bucket)
+
+
+async def download_range(
+    key: str,
+    start: int,
+    end: int,
+    bucket: str = DEFAULT_BUCKET,
+) -> bytes:
+    """
+    Download bytes [start, end] (inclusive) of a file.
+    
+    Args:
+        key: S3 object key (path)
+        start: First byte offset
+        end: Last byte offset (inclusive, clamped to the file size by S3)
+        bucket: Bucket name (defaults to configured bucket)
+
+    Returns:
+        The requested bytes
+
+    Raises:
+        ClientError: If download fails or file not found
+    """
+    return await _run("download_range", storage.read_range, key, start, end, bucket)
+
+
+def supports_direct_uploads() -> bool:
+    """Whether clients can upload straight to storage (S3 only, see create_multipart_upload)"""
+    return storage.supports_direct_uploads
+
+
+async def create_multipart_upload(
+    key: str,
+    bucket: str = DEFAULT_BUCKET,
+    content_type: str = "application/octet-stream",
+) -> str:
+    """
+    Start a multipart upload whose parts are sent by the client.
+    
+    Only available when supports_direct_uploads() is True.
+
+    Args:
+        key: S3 object key (path)
+        bucket: Bucket name (defaults to configured bucket)
+        content_type: MIME type of the file
+
+    Returns:
+        Upload ID for presigning parts and completing the upload
+
+    Raises:
+        NotImplementedError: If the storage backend has no direct uploads
+    """
+    return await _run("create_multipart_upload", storage.create_multipart_upload, key, bucket, content_type)
+
+
+async def complete_multipart_upload(
+    key: str,
+    upload_id: str,
+    parts: List[Tuple[int, str]],
+    bucket: str = DEFAULT_BUCKET,
+) -> None:
+    """
+    Assemble the uploaded parts into the final object.
+    
+    Args:
+        key: S3 object key (path)
+        upload_id: Upload ID from create_multipart_upload
+        parts: ``(part_number, etag)`` of every uploaded part
+        bucket: Bucket name (defaults to configured bucket)
+
+    Raises:
+        ClientError: If a part is missing or an ETag doesn't match
+    """
+    await _run("complete_multipart_upload", storage.complete_multipart_upload, key, upload_id, parts, bucket)
+
+
+async def abort_multipart_upload(
+    key: str,
+    upload_id: str,
+    bucket: str = DEFAULT_BUCKET,
+) -> None:
+    """Discard a multipart upload and the parts uploaded so far"""
+    await _run("abort_multipart_upload", storage.abort_multipart_upload, key, upload_id, bucket)
+
+
+async def list_keys(
+    prefix: str,
+    bucket: str = DEFAULT_BUCKET,
+) -> List[str]:
+    """
+    List every key under a prefix.
+    
+    Args:
+        prefix: Key prefix (e.g. "downloads/{user_id}/{job_id}/")
+        bucket: Bucket name (defaults to configured bucket)
+
+    Returns:
+        Matching keys
+    """
+    return await _run("list", storage.list, prefix, bucket)
+
+
+async def delete_files(
+    keys: List[str],
+    bucket: str = DEFAULT_BUCKET,
+) -> List[str]:
+    """
+    Delete many files with batched DeleteObjects requests.
+    
+    Args:
+        keys: S3 object keys (missing keys count as deleted)
+        bucket: Bucket name (defaults to configured bucket)
+
+    Returns:
+        Keys that could not be deleted
+    """
+    return await _run("delete_batch", storage.delete_many, keys, bucket)
+
+
+class MultipartUploadWriter:
+    """
+    Uploads a file of unknown size while it is being read.
+
+    Features:
+    - Buffers at most one part: each part is uploaded as soon as it is
+      full (S3 requires 5 MB or more for every part but the last)
+    - A file smaller than one part is sent with a single PUT
+    - ``abort`` discards the parts uploaded so far
+    - With local storage, data goes straight to a temporary file that is
+      renamed into place on ``complete``
+    """
+
+    def __init__(
+        self,
+        key: str,
+        bucket: str = DEFAULT_BUCKET,
+        content_type: str = "application/octet-stream",
+        part_size: Optional[int] = None,
+    ):
+        self.key = key
+        self.bucket = bucket
+        self.content_type = content_type
+        self.part_size = part_size or settings.s3_stream_part_mb * _MB
+        self.size = 0
+        self._writer: Optional[StorageWriter] = None
+
+    async def write(self, data: bytes) -> None:
+        """Append data, uploading every part that fills up"""
+        if self._writer is None:
+            self._writer = storage.open_writer(self.key, self.bucket, self.content_type, self.part_size)
+        await _run("upload_part", self._writer.write, data, size=len(data))
+        self.size += len(data)
+
+    async def complete(self) -> str:
+        """
+        Upload the remaining data and create the object.
+
+        Returns:
+            The S3 key of the uploaded file
+        """
+        if self._writer is None:
+            return await upload_file(
+                file_data=b"",
+                key=self.key,
+                bucket=self.bucket,
+                content_type=self.content_type,
+            )
+        writer, self._writer = self._writer, None
+        await _run("complete_upload", writer.complete)
+        return self.key
+
+    async def abort(self) -> None:
+        """Discard the upload"""
+        writer, self._writer = self._writer, None
+        if writer is not None:
+            await _run("abort_upload", writer.abort)
 
 
 def get_presigned_url(
@@ -148,25 +813,32 @@ def get_presigned_url(
     bucket: str = DEFAULT_BUCKET,
     expires_in: int = 3600,
     method: str = "get_object",
+    extra_params: dict | None = None,
 ) -> str:
     """
     Generate a presigned URL for temporary access.
-    Uses the public-facing S3 endpoint for browser compatibility.
+    Uses the public-facing S3 endpoint for browser compatibility (local
+    storage returns a signed download link served by the API).
     
     Args:
         key: S3 object key (path)
         bucket: Bucket name (defaults to configured bucket)
         expires_in: URL expiration time in seconds (default 1 hour)
-        method: S3 method ('get_object' for download, 'put_object' for upload)
-        
+        method: S3 method ('get_object' for download, 'put_object' for upload,
+            'upload_part' for one part of a multipart upload)
+        extra_params: Additional request parameters to sign (e.g. UploadId
+            and PartNumber for 'upload_part')
+
     Returns:
         Presigned URL string
+
+    Raises:
+        NotImplementedError: For upload methods, if supports_direct_uploads()
+            is False
     """
-    return s3_public_client.generate_presigned_url(
-        method,
-        Params={"Bucket": bucket, "Key": key},
-        ExpiresIn=expires_in,
-    )
+    if method == "get_object" and not extra_params:
+        return storage.signed_url(key, bucket, expires_in)
+    return storage.presigned_url(key, bucket, method, extra_params or {}, expires_in)
 
 
 def get_presigned_download_url(
@@ -184,19 +856,11 @@ def get_presigned_download_url(
         bucket: Bucket name (defaults to configured bucket)
         expires_in: URL expiration time in seconds (default 1 hour)
         filename: Optional filename for Content-Disposition header
-        
+
     Returns:
         Presigned URL string
     """
-    params = {"Bucket": bucket, "Key": key}
-    if filename:
-        params["ResponseContentDisposition"] = f'attachment; filename="{filename}"'
-
-    return s3_public_client.generate_presigned_url(
-        "get_object",
-        Params=params,
-        ExpiresIn=expires_in,
-    )
+    return storage.signed_url(key, bucket, expires_in, filename)
 
 
 async def create_bucket_if_not_exists(bucket: str = DEFAULT_BUCKET) -> bool:
@@ -205,18 +869,12 @@ async def create_bucket_if_not_exists(bucket: str = DEFAULT_BUCKET) -> bool:
     
     Args:
         bucket: Bucket name to create
-        
+
     Returns:
         True if bucket was created or already exists
     """
-    try:
-        s3_client.head_bucket(Bucket=bucket)
-        return True
-    except ClientError as e:
-        if e.response["Error"]["Code"] == "404":
-            s3_client.create_bucket(Bucket=bucket)
-            return True
-        raise
+    await _run("create_bucket", storage.create_bucket, bucket)
+    return True
 
 
 # S3 key path helpers
@@ -227,6 +885,29 @@ class S3Keys:
     UPLOADS = "uploads/{user_id}/{job_id}/{filename}"
     RESULTS = "results/{user_id}/{job_id}/{filename}"
 
+    # User downloads, one per distinct final document
+    DOWNLOADS = "downloads/{user_id}/{job_id}/{digest}/{filename}"
+
+    # Reconstructed single pages, keyed by page fingerprint
+    PAGE_ARTIFACTS = "pages/{user_id}/{job_id}/{page}-{fingerprint}.pdf"
+
+    # Per-page viewer text layers and their manifests, keyed by content digest
+    TEXT_LAYER_SHARDS = "text-layers/{user_id}/{job_id}/pages/{page}-{digest}.json.gz"
+    TEXT_LAYER_MANIFESTS = "text-layers/{user_id}/{job_id}/manifest-{version}.json.gz"
+
+    # Page thumbnails and zoom tiles of the original or translated PDF
+    PREVIEWS = "previews/{user_id}/{job_id}/{kind}/{name}"
+
+    # Everything stored for one job lives under these prefixes
+    JOB_PREFIXES = (
+        "uploads/{user_id}/{job_id}/",
+        "results/{user_id}/{job_id}/",
+        "downloads/{user_id}/{job_id}/",
+        "pages/{user_id}/{job_id}/",
+        "text-layers/{user_id}/{job_id}/",
+        "previews/{user_id}/{job_id}/",
+    )
+
     @classmethod
     def upload_path(cls, user_id: str, job_id: str, filename: str) -> str:
         """Generate upload path for original files"""
@@ -245,3 +926,42 @@ class S3Keys:
             filename=filename,
         )
 
+    @classmethod
+    def download_path(cls, user_id: str, job_id: str, digest: str, filename: str) -> str:
+        """Generate path for a downloadable final PDF"""
+        return cls.DOWNLOADS.format(
+            user_id=user_id,
+            job_id=job_id,
+            digest=digest,
+            filename=filename,
+        )
+
+    @classmethod
+    def job_prefixes(cls, user_id: str, job_id: str) -> List[str]:
+        """Generate the prefixes holding every file of a job"""
+        return [prefix.format(user_id=user_id, job_id=job_id) for prefix in cls.JOB_PREFIXES]
+
+    @classmethod
+    def page_artifact_path(cls, user_id: str, job_id: str, page: int, fingerprint: str) -> str:
+        """Generate path for a reconstructed page artifact"""
+        return cls.PAGE_ARTIFACTS.format(
+            user_id=user_id,
+            job_id=job_id,
+            page=page,
+            fingerprint=fingerprint,
+        )
+
+    @classmethod
+    def text_layer_shard_path(cls, user_id: str, job_id: str, page: int, digest: str) -> str:
+        """Generate path for one page's text-layer shard"""
+        return cls.TEXT_LAYER_SHARDS.format(user_id=user_id, job_id=job_id, page=page, digest=digest)
+
+    @classmethod
+    def text_layer_manifest_path(cls, user_id: str, job_id: str, version: str) -> str:
+        """Generate path for a text-layer manifest"""
+        return cls.TEXT_LAYER_MANIFESTS.format(user_id=user_id, job_id=job_id, version=version)
+
+    @classmethod
+    def preview_path(cls, user_id: str, job_id: str, kind: str, name: str) -> str:
+        """Generate path for a preview image or manifest ("original" or "translated" PDF)"""
+        return cls.PREVIEWS.format(user_id=user_id, job_id=job_id, kind=kind, name=name)
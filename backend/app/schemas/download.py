@@ -5,6 +5,8 @@ from typing import List
 
 from pydantic import BaseModel, Field
 
+from app.schemas.pdf import OutputLayout
+
 
 class EditRequest(BaseModel):
     """User edit for a specific block"""
@@ -20,6 +22,10 @@ class DownloadRequest(BaseModel):
         default_factory=list,
         description="List of user edits to apply to translated blocks",
     )
+    layout: OutputLayout = Field(
+        OutputLayout.TRANSLATED,
+        description="Translated pages only, or bilingual: side_by_side or interleaved with the original",
+    )
 
 
 class DownloadResponse(BaseModel):
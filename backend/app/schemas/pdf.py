@@ -1,7 +1,16 @@
 """PDF extraction schemas"""
 
-from dataclasses import dataclass
-from typing import List, Optional
+import enum
+from dataclasses import dataclass, field
+from typing import ClassVar, Dict, List, Optional
+
+
+class OutputLayout(str, enum.Enum):
+    """Page layout of a reconstructed document"""
+
+    TRANSLATED = "translated"  # Translated pages only
+    SIDE_BY_SIDE = "side_by_side"  # Original and translated page on one wide page
+    INTERLEAVED = "interleaved"  # Original page followed by its translation
 
 
 @dataclass
@@ -49,6 +58,73 @@ class TranslatedBlock:
     translated_text: str  # Translated text content
 
 
+@dataclass
+class PageIR:
+    """
+    Layout of one page as analysed at extraction time.
+    
+    Boxes are in PDF points, in the page's unrotated coordinate space.
+    """
+    width: float  # Page width in points
+    height: float  # Page height in points
+    rotation: int  # Page rotation in degrees
+    # Span boxes per block_id: [x0, y0, x1, y1, font index, font size]
+    spans: Dict[int, List[list]] = field(default_factory=dict)
+
+
+@dataclass
+class DocumentIR:
+    """
+    Compact intermediate representation of a parsed document.
+    
+    Persisted next to the blocks cache so that reconstruction reuses the
+    extraction's layout analysis instead of parsing the PDF again.
+    """
+    VERSION: ClassVar[int] = 1
+
+    engine: str  # Extraction engine that produced the layout ("pymupdf" or "pdf2zh")
+    pages: Dict[int, PageIR]  # Keyed by Block.page
+    fonts: List[str]  # Font names referenced by span font index
+    version: int = VERSION
+
+    def to_dict(self) -> dict:
+        """Serialize to a JSON-compatible dict"""
+        return {
+            "version": self.version,
+            "engine": self.engine,
+            "fonts": self.fonts,
+            "pages": [
+                {
+                    "number": number,
+                    "width": page.width,
+                    "height": page.height,
+                    "rotation": page.rotation,
+                    "spans": [[block_id, spans] for block_id, spans in page.spans.items()],
+                }
+                for number, page in self.pages.items()
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Optional["DocumentIR"]:
+        """Deserialize, returning None for an IR written by another version"""
+        if data.get("version") != cls.VERSION:
+            return None
+        return cls(
+            engine=data["engine"],
+            fonts=data["fonts"],
+            pages={
+                page["number"]: PageIR(
+                    width=page["width"],
+                    height=page["height"],
+                    rotation=page["rotation"],
+                    spans={block_id: spans for block_id, spans in page["spans"]},
+                )
+                for page in data["pages"]
+            },
+        )
+
+
 @dataclass
 class PDFExtractionResult:
     """
@@ -62,3 +138,4 @@ class PDFExtractionResult:
     is_scanned: bool  # True if PDF appears to be scanned (no text)
     total_characters: int  # Total character count across all blocks
     extraction_time_ms: int  # Time taken to extract (milliseconds)
+    document_ir: Optional[DocumentIR] = None  # Parsed layout, reused by reconstruction
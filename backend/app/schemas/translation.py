@@ -43,15 +43,42 @@ class TranslationDetailsResponse(BaseModel):
         }
 
 
+class BlockSelector(BaseModel):
+    """Selects a subset of blocks (union of all given criteria)"""
+    
+    block_ids: list[int] = Field(default_factory=list, description="Block IDs (as returned by the blocks endpoint)")
+    pages: list[int] = Field(default_factory=list, description="Page numbers")
+    edited_since_last_tone: bool = Field(False, description="Include blocks edited after their last tone run")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "block_ids": [0, 1],
+                "pages": [],
+                "edited_since_last_tone": True
+            }
+        }
+
+
 class ApplyToneRequest(BaseModel):
     """Request schema for applying tone customization"""
     
     tone: str = Field(..., description="Tone preset (professional, casual, technical, creative) or custom description")
+    bulk: bool = Field(
+        False,
+        description="Submit all blocks as one provider batch (cheaper, results arrive asynchronously)",
+    )
+    selector: Optional[BlockSelector] = Field(
+        None,
+        description="Only re-tone the selected blocks (takes precedence over bulk)",
+    )
     
     class Config:
         json_schema_extra = {
             "example": {
-                "tone": "professional"
+                "tone": "professional",
+                "bulk": False,
+                "selector": None
             }
         }
 
@@ -75,17 +102,42 @@ class ApplyToneResponse(BaseModel):
         }
 
 
+class BlockEditRequest(BaseModel):
+    """Request schema for saving a user edit to one block"""
+    
+    text: str = Field(..., description="Edited text content")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "text": "これは編集されたテキストです"
+            }
+        }
+
+
+class BlockEditResponse(BaseModel):
+    """Response schema for a saved block edit"""
+    
+    block_id: str = Field(..., description="Edited block ID")
+    edited_text: str = Field(..., description="Saved text")
+    edited_at: str = Field(..., description="Edit timestamp (ISO 8601)")
+
+
 class ToneEstimateResponse(BaseModel):
     """Response schema for tone cost estimate"""
     
     estimated_cost_usd: float = Field(..., description="Estimated cost in USD")
+    estimated_seconds: Optional[float] = Field(None, description="Estimated wall-clock time in seconds")
     character_count: int = Field(..., description="Total character count")
+    block_count: Optional[int] = Field(None, description="Number of blocks included in the estimate")
     
     class Config:
         json_schema_extra = {
             "example": {
                 "estimated_cost_usd": 0.048,
-                "character_count": 50000
+                "estimated_seconds": 42.5,
+                "character_count": 50000,
+                "block_count": 120
             }
         }
 
@@ -124,6 +176,28 @@ class AlternativesResponse(BaseModel):
         }
 
 
+class BulkAlternativesRequest(BaseModel):
+    """Request schema for generating alternatives for many blocks in one call"""
+    
+    texts: list[str] = Field(
+        ...,
+        min_length=1,
+        max_length=200,
+        description="Block texts (results reference blocks by their index in this list)",
+    )
+    target_lang: str = Field(..., description="Target language code")
+    count: int = Field(3, ge=1, le=5, description="Number of alternatives per block (1-5)")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "texts": ["Hello, how are you?", "See you tomorrow."],
+                "target_lang": "JA",
+                "count": 3
+            }
+        }
+
+
 class RetranslateRequest(BaseModel):
     """Request schema for re-translating edited text"""
     
@@ -159,3 +233,64 @@ class RetranslateResponse(BaseModel):
             }
         }
 
+
+class TextLayerPage(BaseModel):
+    """One page shard of the viewer text layer"""
+
+    page: int = Field(..., description="Page number")
+    url: str = Field(..., description="URL of the page's gzipped JSON shard")
+
+
+class TextLayerResponse(BaseModel):
+    """Response schema for the viewer text layer endpoint"""
+
+    job_id: str = Field(..., description="Translation job ID")
+    version: str = Field(..., description="Text layer version (changes whenever any block does)")
+    manifest_url: str = Field(..., description="URL of the version's manifest")
+    pages: list[TextLayerPage] = Field(..., description="Page shards, by page number")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "job_id": "123e4567-e89b-12d3-a456-426614174000",
+                "version": "9f2c4e1a7b3d5e60",
+                "manifest_url": "https://cdn.example.com/text-layers/.../manifest-9f2c4e1a7b3d5e60.json.gz",
+                "pages": [
+                    {"page": 1, "url": "https://cdn.example.com/text-layers/.../pages/1-4be1c0d2a9f83e71.json.gz"},
+                ],
+            }
+        }
+
+
+class PreviewLevel(BaseModel):
+    """Tile grid of a page at one zoom level"""
+
+    zoom: float = Field(..., description="Scale factor over 72 dpi")
+    width: int = Field(..., description="Page width at this zoom (pixels)")
+    height: int = Field(..., description="Page height at this zoom (pixels)")
+    columns: int = Field(..., description="Tiles per row")
+    rows: int = Field(..., description="Rows of tiles")
+    tile_urls: list[str] = Field(..., description="Tile URLs, row by row")
+
+
+class PreviewPage(BaseModel):
+    """Rendered previews of one page"""
+
+    page: int = Field(..., description="Page number (0-indexed, as on blocks)")
+    width: float = Field(..., description="Page width (points)")
+    height: float = Field(..., description="Page height (points)")
+    thumbnail_url: str = Field(..., description="Thumbnail URL")
+    levels: list[PreviewLevel] = Field(..., description="Tile grids by zoom level")
+
+
+class PreviewsResponse(BaseModel):
+    """Response schema for the page previews endpoint"""
+
+    job_id: str = Field(..., description="Translation job ID")
+    kind: str = Field(..., description="original or translated")
+    ready: bool = Field(..., description="Whether previews have been rendered")
+    version: Optional[str] = Field(None, description="Digest of the rendered PDF")
+    format: Optional[str] = Field(None, description="Image format (webp or png)")
+    tile_size: Optional[int] = Field(None, description="Tile edge length (pixels)")
+    manifest_url: Optional[str] = Field(None, description="URL of the preview manifest")
+    pages: list[PreviewPage] = Field(default_factory=list, description="Pages, in order")
@@ -38,3 +38,40 @@ class TranslationLanguages(BaseModel):
     def validate_source_language(cls, v: str) -> str:
         """Normalize source language"""
         return v.lower().strip() if v else "auto"
+
+
+class DirectUploadRequest(TranslationLanguages):
+    """Request to upload a PDF straight to storage"""
+
+    file_name: str = Field(..., description="Original filename")
+    file_size_bytes: int = Field(..., gt=0, description="File size in bytes")
+
+
+class UploadPartURL(BaseModel):
+    """Presigned URL for one part of a direct upload"""
+
+    part_number: int = Field(..., description="Part number (1-based)")
+    url: str = Field(..., description="Presigned PUT URL for this part")
+
+
+class DirectUploadResponse(BaseModel):
+    """Presigned part URLs for a direct upload"""
+
+    job_id: str = Field(..., description="Job ID to complete the upload with")
+    upload_id: str = Field(..., description="Multipart upload ID")
+    part_size_bytes: int = Field(..., description="Bytes per part (the last part may be smaller)")
+    parts: list[UploadPartURL] = Field(..., description="One presigned URL per part, in order")
+    expires_in: int = Field(..., description="Seconds until the URLs and the pending upload expire")
+
+
+class CompletedPart(BaseModel):
+    """A part the client uploaded"""
+
+    part_number: int = Field(..., description="Part number (1-based)")
+    etag: str = Field(..., description="ETag header returned by the part upload")
+
+
+class CompleteUploadRequest(BaseModel):
+    """Request to finalize a direct upload"""
+
+    parts: list[CompletedPart] = Field(..., min_length=1, description="Every uploaded part")
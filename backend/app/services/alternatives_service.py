@@ -1,6 +1,8 @@
 """Service for generating alternative translations using Claude API"""
 
-from typing import List, Optional
+import asyncio
+import re
+from typing import AsyncIterator, Dict, List, Optional
 
 import anthropic
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
@@ -9,6 +11,63 @@ from app.config import get_settings
 from app.logger import error as log_error, info, warning
 
 
+class BulkAlternativesParser:
+    """
+    Incremental parser for bulk alternatives responses.
+
+    The bulk prompt asks for one section per block::
+
+        ### 3
+        1. first alternative
+        2. second alternative
+
+    Text deltas are fed as they stream in; a block is complete as soon as
+    the next section header arrives, so it can be delivered before the rest
+    of the response is generated.
+    """
+
+    HEADER = re.compile(r"^#{2,}\s*(\d+)\s*$")
+
+    def __init__(self):
+        self._buffer = ""
+        self._current: Optional[int] = None
+        self._lines: List[str] = []
+
+    def feed(self, delta: str) -> List[tuple[int, List[str]]]:
+        """
+        Consume a text delta.
+
+        Returns:
+            (block_id, raw alternative lines) for each block completed by this delta
+        """
+        self._buffer += delta
+        *lines, self._buffer = self._buffer.split("\n")
+        completed = []
+        for line in lines:
+            completed.extend(self._consume_line(line))
+        return completed
+
+    def close(self) -> List[tuple[int, List[str]]]:
+        """Flush the final block once the response has ended"""
+        completed = self._consume_line(self._buffer)
+        self._buffer = ""
+        if self._current is not None:
+            completed.append((self._current, self._lines))
+            self._current = None
+        return completed
+
+    def _consume_line(self, line: str) -> List[tuple[int, List[str]]]:
+        match = self.HEADER.match(line.strip())
+        if match:
+            completed = [(self._current, self._lines)] if self._current is not None else []
+            self._current = int(match.group(1))
+            self._lines = []
+            return completed
+        if self._current is not None and line.strip():
+            self._lines.append(line)
+        return []
+
+
 class AlternativesService:
     """
     Service for generating alternative translations using Claude API.
@@ -16,6 +75,8 @@ class AlternativesService:
     Features:
     - Uses Claude 3.5 Haiku for cost efficiency
     - Generates 2-5 alternative translations
+    - Bulk mode: many blocks packed into token-budgeted prompts, with
+      per-block results streamed as they are parsed
     - Cost tracking
     """
 
@@ -23,6 +84,39 @@ class AlternativesService:
     COST_PER_INPUT_TOKEN = 0.80 / 1_000_000  # $0.80 per million input tokens
     COST_PER_OUTPUT_TOKEN = 4.00 / 1_000_000  # $4.00 per million output tokens
 
+    MODEL = "claude-3-5-haiku-20241022"
+    MAX_TOKENS = 2048
+
+    # Bulk prompts: output is budgeted against the model's output limit,
+    # input is kept small enough that one slow prompt doesn't hold up a page
+    BULK_MAX_TOKENS = 8192
+    BULK_INPUT_TOKEN_BUDGET = 3000
+    BULK_MAX_CONCURRENT_PROMPTS = 4
+    # Single-block calls in flight per prompt for blocks its response skipped
+    BULK_MAX_CONCURRENT_FALLBACKS = 4
+
+    # Conservative estimate: CJK output runs close to one token per character
+    TOKENS_PER_CHAR = 0.5
+
+    SYSTEM_PROMPT = (
+        "You are a professional translator. "
+        "Generate alternative translations that are natural, accurate, and varied in style. "
+        "Each alternative should be a valid translation with slightly different phrasing or tone."
+    )
+
+    LANG_NAMES = {
+        "JA": "Japanese",
+        "ZH": "Chinese",
+        "VI": "Vietnamese",
+        "KO": "Korean",
+        "ES": "Spanish",
+        "FR": "French",
+        "DE": "German",
+        "IT": "Italian",
+        "PT": "Portuguese",
+        "RU": "Russian",
+    }
+
     def __init__(self, api_key: Optional[str] = None):
         """
         Initialize Claude API client.
@@ -36,11 +130,41 @@ class AlternativesService:
         if not self.api_key:
             raise ValueError("Claude API key not configured")
         
-        # Initialize Claude client
-        self.client = anthropic.Anthropic(api_key=self.api_key)
+        # Initialize Claude client (async, so calls never block the event loop)
+        self.async_client = anthropic.AsyncAnthropic(api_key=self.api_key)
         
         info("Alternatives service initialized", api_key_length=len(self.api_key))
 
+    @classmethod
+    def _lang_name(cls, target_lang: str) -> str:
+        return cls.LANG_NAMES.get(target_lang.upper(), target_lang)
+
+    @staticmethod
+    def _clean_alternative(line: str) -> str:
+        """Strip numbering (1., 2., etc.) and quotes from a response line"""
+        line = line.strip()
+        line = line.lstrip('0123456789. ').strip()
+        return line.strip('"\'')
+
+    @staticmethod
+    def _normalize_alternatives(alternatives: List[str], count: int) -> List[str]:
+        """Drop empty lines, then pad with empty strings or truncate to ``count``"""
+        alternatives = [alt for alt in alternatives if alt]
+        while len(alternatives) < count:
+            alternatives.append("")
+        return alternatives[:count]
+
+    @classmethod
+    def calculate_cost(cls, input_tokens: int, output_tokens: int) -> float:
+        """Calculate USD cost for a Claude call from its token usage"""
+        return (input_tokens * cls.COST_PER_INPUT_TOKEN) + \
+               (output_tokens * cls.COST_PER_OUTPUT_TOKEN)
+
+    @classmethod
+    def estimate_tokens(cls, text: str) -> int:
+        """Rough token estimate for a text (upper bound for packing)"""
+        return int(len(text) * cls.TOKENS_PER_CHAR) + 1
+
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
@@ -73,27 +197,7 @@ class AlternativesService:
             count = 3  # Default to 3
         
         try:
-            # Build prompt for generating alternatives
-            system_prompt = (
-                "You are a professional translator. "
-                "Generate alternative translations that are natural, accurate, and varied in style. "
-                "Each alternative should be a valid translation with slightly different phrasing or tone."
-            )
-            
-            lang_names = {
-                "JA": "Japanese",
-                "ZH": "Chinese",
-                "VI": "Vietnamese",
-                "KO": "Korean",
-                "ES": "Spanish",
-                "FR": "French",
-                "DE": "German",
-                "IT": "Italian",
-                "PT": "Portuguese",
-                "RU": "Russian",
-            }
-            
-            target_lang_name = lang_names.get(target_lang.upper(), target_lang)
+            target_lang_name = self._lang_name(target_lang)
             
             user_message = (
                 f"Generate exactly {count} alternative translations of the following text into {target_lang_name}.\n\n"
@@ -104,10 +208,10 @@ class AlternativesService:
             )
             
             # Call Claude API
-            message = self.client.messages.create(
-                model="claude-3-5-haiku-20241022",
-                max_tokens=2048,
-                system=system_prompt,
+            message = await self.async_client.messages.create(
+                model=self.MODEL,
+                max_tokens=self.MAX_TOKENS,
+                system=self.SYSTEM_PROMPT,
                 messages=[
                     {
                         "role": "user",
@@ -120,32 +224,15 @@ class AlternativesService:
             response_text = message.content[0].text if message.content else ""
             
             # Parse alternatives from response
-            alternatives = []
-            lines = response_text.strip().split('\n')
-            
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-                
-                # Remove numbering (1., 2., etc.) and quotes
-                line = line.lstrip('0123456789. ').strip()
-                line = line.strip('"\'')
-                
-                if line:
-                    alternatives.append(line)
-            
-            # If we got fewer alternatives than requested, pad with empty strings
-            # If we got more, take only the requested count
-            while len(alternatives) < count:
-                alternatives.append("")
-            alternatives = alternatives[:count]
+            alternatives = self._normalize_alternatives(
+                [self._clean_alternative(line) for line in response_text.strip().split('\n')],
+                count,
+            )
             
             # Calculate cost
             input_tokens = message.usage.input_tokens
             output_tokens = message.usage.output_tokens
-            cost = (input_tokens * self.COST_PER_INPUT_TOKEN) + \
-                   (output_tokens * self.COST_PER_OUTPUT_TOKEN)
+            cost = self.calculate_cost(input_tokens, output_tokens)
             
             info(
                 "Alternatives generated",
@@ -167,3 +254,204 @@ class AlternativesService:
         except Exception as e:
             log_error("Alternatives generation failed", exc=e, text_length=len(text))
             raise
+
+    @classmethod
+    def pack_prompts(cls, texts: List[str], count: int) -> List[List[int]]:
+        """
+        Group block indices into prompts that fit the bulk token budgets.
+
+        Each block costs roughly its own tokens on input and ``count`` times
+        that on output. Blocks are packed in order; a block too large for
+        any budget gets a prompt to itself.
+
+        Args:
+            texts: Block texts (empty texts are skipped)
+            count: Alternatives per block
+
+        Returns:
+            List of prompts, each a list of indices into ``texts``
+        """
+        output_budget = int(cls.BULK_MAX_TOKENS * 0.8)  # Headroom for numbering/headers
+        prompts: List[List[int]] = []
+        current: List[int] = []
+        input_tokens = output_tokens = 0
+
+        for idx, text in enumerate(texts):
+            if not text or not text.strip():
+                continue
+            block_input = cls.estimate_tokens(text) + 8  # Section header
+            block_output = cls.estimate_tokens(text) * count + 8 * (count + 1)
+            if current and (
+                input_tokens + block_input > cls.BULK_INPUT_TOKEN_BUDGET
+                or output_tokens + block_output > output_budget
+            ):
+                prompts.append(current)
+                current = []
+                input_tokens = output_tokens = 0
+            current.append(idx)
+            input_tokens += block_input
+            output_tokens += block_output
+
+        if current:
+            prompts.append(current)
+        return prompts
+
+    @classmethod
+    def build_bulk_message_params(
+        cls,
+        texts: List[str],
+        indices: List[int],
+        target_lang: str,
+        count: int,
+    ) -> dict:
+        """Build Messages API parameters for one bulk prompt"""
+        sections = "\n\n".join(f"### {idx}\n{texts[idx]}" for idx in indices)
+        user_message = (
+            f"Generate exactly {count} alternative translations into {cls._lang_name(target_lang)} "
+            "for each of the numbered texts below.\n\n"
+            "For each text, first output its header line exactly as given (e.g. \"### 4\"), "
+            f"then its {count} alternatives, numbered 1. to {count}., one per line. "
+            "Keep the same order and output nothing else.\n\n"
+            f"{sections}"
+        )
+        return {
+            "model": cls.MODEL,
+            "max_tokens": cls.BULK_MAX_TOKENS,
+            "system": cls.SYSTEM_PROMPT,
+            "messages": [{"role": "user", "content": user_message}],
+        }
+
+    async def _stream_completion(self, params: dict, usage: Dict[str, int]) -> AsyncIterator[str]:
+        """
+        Stream response text deltas for a Messages API call.
+
+        Token usage is written to ``usage`` once the response has finished.
+        """
+        async with self.async_client.messages.stream(**params) as stream:
+            async for delta in stream.text_stream:
+                yield delta
+            message = await stream.get_final_message()
+        usage["input_tokens"] = message.usage.input_tokens
+        usage["output_tokens"] = message.usage.output_tokens
+
+    async def _run_bulk_prompt(
+        self,
+        texts: List[str],
+        indices: List[int],
+        target_lang: str,
+        count: int,
+        queue: asyncio.Queue,
+    ) -> float:
+        """Stream one bulk prompt, putting each block's result on ``queue`` as it is parsed"""
+        params = self.build_bulk_message_params(texts, indices, target_lang, count)
+        pending = set(indices)
+        parser = BulkAlternativesParser()
+        usage: Dict[str, int] = {}
+        cost = 0.0
+
+        def deliver(completed: List[tuple[int, List[str]]]) -> None:
+            for block_idx, lines in completed:
+                if block_idx not in pending:
+                    continue  # Unknown or duplicate header
+                pending.discard(block_idx)
+                alternatives = self._normalize_alternatives(
+                    [self._clean_alternative(line) for line in lines],
+                    count,
+                )
+                queue.put_nowait({"index": block_idx, "alternatives": alternatives})
+
+        try:
+            async for delta in self._stream_completion(params, usage):
+                deliver(parser.feed(delta))
+            deliver(parser.close())
+            cost += self.calculate_cost(usage.get("input_tokens", 0), usage.get("output_tokens", 0))
+        except Exception as e:
+            log_error("Bulk alternatives prompt failed", exc=e, block_count=len(indices))
+            for block_idx in sorted(pending):
+                queue.put_nowait({"index": block_idx, "alternatives": [], "error": "generation_failed"})
+            return cost
+
+        # Blocks the model skipped fall back to single-block calls, run concurrently
+        if pending:
+            warning("Bulk alternatives response missing blocks", missing=len(pending))
+
+        semaphore = asyncio.Semaphore(self.BULK_MAX_CONCURRENT_FALLBACKS)
+
+        async def fallback(block_idx: int) -> float:
+            try:
+                async with semaphore:
+                    alternatives, block_cost = await self.generate_alternatives(texts[block_idx], target_lang, count)
+            except Exception as e:
+                log_error("Alternatives fallback failed", exc=e, block_index=block_idx)
+                queue.put_nowait({"index": block_idx, "alternatives": [], "error": "generation_failed"})
+                return 0.0
+            queue.put_nowait({"index": block_idx, "alternatives": alternatives})
+            return block_cost
+
+        costs = await asyncio.gather(*(fallback(block_idx) for block_idx in sorted(pending)))
+        return cost + sum(costs)
+
+    async def stream_bulk_alternatives(
+        self,
+        texts: List[str],
+        target_lang: str,
+        count: int = 3,
+    ) -> AsyncIterator[dict]:
+        """
+        Generate alternatives for many blocks, yielding each block's result as it is ready.
+
+        Blocks are packed into token-budgeted prompts that run concurrently.
+        Results arrive in completion order, not input order.
+
+        Args:
+            texts: Block texts (index = block position in the request)
+            target_lang: Target language code (e.g., "JA", "ZH", "VI")
+            count: Number of alternatives per block (1-5)
+
+        Yields:
+            ``{"index", "alternatives"}`` per block (plus ``"error"`` if
+            generation failed), then a final ``{"done": True, "cost_usd"}``
+        """
+        if count < 1 or count > 5:
+            count = 3  # Default to 3
+
+        for idx, text in enumerate(texts):
+            if not text or not text.strip():
+                yield {"index": idx, "alternatives": []}
+
+        prompts = self.pack_prompts(texts, count)
+        queue: asyncio.Queue = asyncio.Queue()
+        semaphore = asyncio.Semaphore(self.BULK_MAX_CONCURRENT_PROMPTS)
+
+        async def run(indices: List[int]) -> float:
+            async with semaphore:
+                return await self._run_bulk_prompt(texts, indices, target_lang, count, queue)
+
+        tasks = [asyncio.create_task(run(indices)) for indices in prompts]
+        remaining = sum(len(indices) for indices in prompts)
+
+        info(
+            "Bulk alternatives started",
+            block_count=remaining,
+            prompt_count=len(prompts),
+            target_lang=target_lang,
+        )
+
+        try:
+            while remaining:
+                yield await queue.get()
+                remaining -= 1
+            total_cost = sum(await asyncio.gather(*tasks))
+        finally:
+            # Client went away mid-stream: stop paying for unread results
+            for task in tasks:
+                task.cancel()
+
+        info(
+            "Bulk alternatives generated",
+            block_count=sum(len(indices) for indices in prompts),
+            prompt_count=len(prompts),
+            cost_usd=f"${total_cost:.6f}",
+        )
+
+        yield {"done": True, "cost_usd": total_cost}
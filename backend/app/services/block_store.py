@@ -0,0 +1,182 @@
+"""Translated block storage with per-block updates"""
+
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+from redis.asyncio import Redis
+
+from app.cache import Cache, CacheKeys
+
+
+class TranslatedBlockStore:
+    """
+    Read/write access to a job's translated blocks.
+
+    The full `_translated` payload is written once by the translation and
+    full-document tone stages. Later changes to individual blocks (user
+    edits, scoped tone runs) go to a Redis hash with one field per block
+    and kind of change (``{idx}:edit``, ``{idx}:tone``), so a single-block
+    update never rewrites the whole document payload, and an edit and a
+    tone run landing on the same block at once can't overwrite each other
+    (each is one HSET, with no read-modify-write).
+    ``load`` merges both into the view every reader expects. Every update
+    marks the job's published text layer stale (see services/text_layer.py).
+    """
+
+    # Same lifetime as the translated payload
+    CACHE_EXPIRATION_SECONDS = 24 * 60 * 60
+
+    def __init__(self, redis: Redis):
+        self.cache = Cache(redis)
+
+    async def load(self, job_id: str) -> Optional[dict]:
+        """
+        Load translated blocks with per-block updates applied.
+
+        Args:
+            job_id: Translation job ID
+
+        Returns:
+            Translated payload dict, or None if not cached
+        """
+        data = await self.cache.get_json(CacheKeys.translated_blocks(job_id))
+        if not data:
+            return None
+
+        updates = await self.get_updates(job_id)
+        blocks = data.get("blocks", [])
+        for idx, update in updates.items():
+            if idx >= len(blocks):
+                continue
+            block = blocks[idx]
+            if "edited_text" in update:
+                block["edited_text"] = update["edited_text"]
+                block["edited_at"] = update["edited_at"]
+            if "tone_customized_text" in update:
+                block["tone_customized_text"] = update["tone_customized_text"]
+                block["tone"] = update["tone"]
+                block["toned_at"] = update["toned_at"]
+
+        return data
+
+    async def get_updates(self, job_id: str) -> dict[int, dict]:
+        """Get per-block updates keyed by block index (edit and tone fields merged)"""
+        raw = await self.cache.hgetall_json(CacheKeys.block_updates(job_id))
+        updates: dict[int, dict] = {}
+        for field, value in raw.items():
+            idx = int(field.split(":", 1)[0])
+            updates.setdefault(idx, {}).update(value)
+        return updates
+
+    async def _invalidate_text_layer(self, job_id: str) -> None:
+        # Bumping the generation leaves the published shards in place;
+        # unchanged pages are reused on the next publish
+        key = CacheKeys.text_layer(job_id)
+        await self.cache.client.hincrby(key, "generation", 1)
+        await self.cache.expire(key, self.CACHE_EXPIRATION_SECONDS)
+
+    async def _update_block(self, job_id: str, block_idx: int, kind: str, changes: dict) -> dict:
+        await self._invalidate_text_layer(job_id)
+        await self.cache.hset_json(
+            CacheKeys.block_updates(job_id),
+            f"{block_idx}:{kind}",
+            changes,
+            expire_seconds=self.CACHE_EXPIRATION_SECONDS,
+        )
+        return changes
+
+    async def set_block_edit(self, job_id: str, block_idx: int, text: str) -> dict:
+        """Record a user edit for one block"""
+        return await self._update_block(
+            job_id,
+            block_idx,
+            "edit",
+            {"edited_text": text, "edited_at": datetime.utcnow().isoformat()},
+        )
+
+    async def set_block_tone(self, job_id: str, block_idx: int, text: str, tone: str) -> dict:
+        """Record tone-customized text for one block"""
+        return await self._update_block(
+            job_id,
+            block_idx,
+            "tone",
+            {
+                "tone_customized_text": text,
+                "tone": tone,
+                "toned_at": datetime.utcnow().isoformat(),
+            },
+        )
+
+    async def clear_block_tones(self, job_id: str) -> None:
+        """
+        Drop per-block tone overrides (after a full-document tone run).
+
+        User edits are kept.
+        """
+        # The document payload was just rewritten
+        await self._invalidate_text_layer(job_id)
+        key = CacheKeys.block_updates(job_id)
+        tone_fields = [field for field in await self.cache.client.hgetall(key) if field.endswith(":tone")]
+        if tone_fields:
+            # Only tone fields are removed, so concurrent edits are untouched
+            await self.cache.client.hdel(key, *tone_fields)
+
+
+def block_display_text(block: dict) -> str:
+    """
+    Text to show for a block: the newer of its saved edit and tone run.
+
+    A block edited after it was toned shows the edit (it is what the user
+    typed last); a block toned after its edit shows the toned rewrite of
+    that edit.
+    """
+    toned = block.get("tone_customized_text")
+    edited = block.get("edited_text")
+    if edited is not None and not (toned and (block.get("toned_at") or "") > block["edited_at"]):
+        return edited
+    return toned or block.get("translated_text", "")
+
+
+def select_block_indices(
+    data: dict,
+    block_ids: Optional[Iterable[int]] = None,
+    pages: Optional[Iterable[int]] = None,
+    edited_since_last_tone: bool = False,
+) -> List[int]:
+    """
+    Resolve a block selector to block indices (union of all criteria).
+
+    Args:
+        data: Translated payload as returned by TranslatedBlockStore.load
+        block_ids: Block indices (the block_id used by the editor)
+        pages: Page numbers (as stored on the original block)
+        edited_since_last_tone: Include blocks edited after their last tone run
+
+    Returns:
+        Sorted list of block indices
+    """
+    blocks = data.get("blocks", [])
+    selected: set[int] = set()
+
+    if block_ids:
+        selected.update(idx for idx in block_ids if 0 <= idx < len(blocks))
+
+    if pages:
+        page_set = set(pages)
+        selected.update(
+            idx
+            for idx, block in enumerate(blocks)
+            if block.get("original", {}).get("page") in page_set
+        )
+
+    if edited_since_last_tone:
+        document_toned_at = data.get("toned_at")
+        for idx, block in enumerate(blocks):
+            edited_at = block.get("edited_at")
+            if not edited_at:
+                continue
+            last_toned = block.get("toned_at") or document_toned_at
+            if not last_toned or edited_at > last_toned:
+                selected.add(idx)
+
+    return sorted(selected)
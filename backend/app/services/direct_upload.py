@@ -0,0 +1,99 @@
+"""Direct-to-storage uploads: the browser sends the PDF to S3, the API only signs and verifies"""
+
+import math
+from typing import List, Optional
+
+from redis.asyncio import Redis
+
+from app.cache import Cache, CacheKeys
+from app.s3 import download_range, get_file_size, get_presigned_url
+
+# Every PDF starts with this header (within the first kilobyte, per the spec)
+PDF_MAGIC = b"%PDF-"
+PDF_HEADER_SEARCH_BYTES = 1024
+
+
+class PendingUploadStore:
+    """
+    Uploads started by the client and not yet completed.
+
+    Features:
+    - One entry per job: owner, S3 key, multipart upload ID, declared
+      size, file name and languages
+    - Expires with the presigned part URLs; an upload that is never
+      completed leaves no Translation row
+    """
+
+    def __init__(self, redis: Redis, expire_seconds: int):
+        self.cache = Cache(redis)
+        self.expire_seconds = expire_seconds
+
+    async def save(self, job_id: str, upload: dict) -> None:
+        """Record a started upload"""
+        await self.cache.set_json(
+            CacheKeys.pending_upload(job_id),
+            upload,
+            expire_seconds=self.expire_seconds,
+        )
+
+    async def load(self, job_id: str) -> Optional[dict]:
+        """Get a started upload, or None if unknown or expired"""
+        return await self.cache.get_json(CacheKeys.pending_upload(job_id))
+
+    async def delete(self, job_id: str) -> None:
+        """Forget a completed or abandoned upload"""
+        await self.cache.delete(CacheKeys.pending_upload(job_id))
+
+
+def presign_upload_parts(
+    key: str,
+    upload_id: str,
+    file_size: int,
+    part_size: int,
+    expires_in: int,
+) -> List[dict]:
+    """
+    Presigned URLs for every part of a multipart upload.
+
+    Args:
+        key: S3 object key (path)
+        upload_id: Upload ID from create_multipart_upload
+        file_size: Declared file size in bytes
+        part_size: Bytes per part (the last part may be smaller)
+        expires_in: URL lifetime in seconds
+
+    Returns:
+        ``{"part_number", "url"}`` per part, in order
+    """
+    return [
+        {
+            "part_number": part_number,
+            "url": get_presigned_url(
+                key=key,
+                expires_in=expires_in,
+                method="upload_part",
+                extra_params={"UploadId": upload_id, "PartNumber": part_number},
+            ),
+        }
+        for part_number in range(1, max(1, math.ceil(file_size / part_size)) + 1)
+    ]
+
+
+async def verify_uploaded_pdf(key: str, expected_size: int) -> None:
+    """
+    Check a completed upload without downloading it.
+
+    Args:
+        key: S3 object key (path)
+        expected_size: Size declared when the upload started
+
+    Raises:
+        ValueError: If the size differs or the file doesn't start like a PDF
+    """
+    size = await get_file_size(key)
+    if size != expected_size:
+        raise ValueError(f"Uploaded file is {size} bytes, expected {expected_size}")
+
+    header = await download_range(key, 0, PDF_HEADER_SEARCH_BYTES - 1)
+    if PDF_MAGIC not in header:
+        raise ValueError("Uploaded file is not a PDF")
@@ -0,0 +1,101 @@
+"""Persistence of the extraction-time document layout (DocumentIR)"""
+
+from typing import Dict, List, Optional, Sequence
+
+from redis.asyncio import Redis
+
+from app.cache import Cache, CacheKeys
+from app.logger import info, warning
+from app.schemas.pdf import DocumentIR, PageIR
+
+
+class DocumentIRBuilder:
+    """Collects page and span layout while extraction walks a document"""
+
+    def __init__(self, engine: str):
+        self.engine = engine
+        self.pages: Dict[int, PageIR] = {}
+        self.fonts: List[str] = []
+        self._font_index: Dict[str, int] = {}
+
+    def add_page(self, number: int, width: float, height: float, rotation: int = 0) -> None:
+        self.pages[number] = PageIR(width=width, height=height, rotation=rotation)
+
+    def add_span(
+        self,
+        page_number: int,
+        block_id: int,
+        bbox: Sequence[float],
+        font_name: str,
+        font_size: float,
+    ) -> None:
+        font_index = self._font_index.get(font_name)
+        if font_index is None:
+            font_index = self._font_index[font_name] = len(self.fonts)
+            self.fonts.append(font_name)
+        self.pages[page_number].spans.setdefault(block_id, []).append(
+            [round(value, 2) for value in bbox[:4]] + [font_index, round(font_size, 2)]
+        )
+
+    def build(self) -> DocumentIR:
+        return DocumentIR(engine=self.engine, pages=self.pages, fonts=self.fonts)
+
+
+class DocumentIRStore:
+    """
+    Stores a job's DocumentIR next to its extracted blocks.
+
+    Features:
+    - Versioned: an IR written by another DocumentIR.VERSION loads as None,
+      and callers fall back to analysing the PDF themselves
+    - Same lifetime as the blocks cache
+    - Redis failures degrade to "no IR"
+    """
+
+    # Same lifetime as the extracted blocks
+    CACHE_EXPIRATION_SECONDS = 24 * 60 * 60
+
+    def __init__(self, redis: Redis):
+        self.cache = Cache(redis)
+
+    async def save(self, translation_id: str, document_ir: DocumentIR) -> None:
+        """Persist the IR of an extracted document"""
+        try:
+            await self.cache.set_json(
+                CacheKeys.document_ir(translation_id),
+                document_ir.to_dict(),
+                expire_seconds=self.CACHE_EXPIRATION_SECONDS,
+            )
+        except Exception as e:
+            warning("Failed to cache document IR", exc=e, translation_id=translation_id)
+            return
+        info(
+            "Document IR cached",
+            translation_id=translation_id,
+            engine=document_ir.engine,
+            pages=len(document_ir.pages),
+        )
+
+    async def load(self, translation_id: str) -> Optional[DocumentIR]:
+        """
+        Load the IR of an extracted document.
+
+        Returns:
+            DocumentIR, or None if missing, from another IR version, or
+            Redis is unavailable
+        """
+        try:
+            data = await self.cache.get_json(CacheKeys.document_ir(translation_id))
+            if not data:
+                return None
+            document_ir = DocumentIR.from_dict(data)
+        except Exception as e:
+            warning("Failed to load document IR", exc=e, translation_id=translation_id)
+            return None
+        if document_ir is None:
+            info(
+                "Ignoring document IR from another version",
+                translation_id=translation_id,
+                version=data.get("version"),
+            )
+        return document_ir
@@ -0,0 +1,95 @@
+"""Download artifact cache keyed by the content of the final document"""
+
+from typing import Optional, Sequence
+
+from redis.asyncio import Redis
+
+from app.cache import Cache, CacheKeys
+from app.logger import warning
+from app.schemas.pdf import OutputLayout
+from app.services.font_manager import FontManager
+from app.services.pdf_reconstruction import PDFReconstructionService
+from app.services.save_profiles import ARCHIVAL, SaveProfile
+from app.services.single_flight import content_hash
+
+
+class DownloadArtifactCache:
+    """
+    Reuses final PDFs for repeated downloads of the same content.
+
+    Features:
+    - Artifacts are addressed by a digest of the job, the reconstruction
+      engine that builds them, render version and fonts, the page layout,
+      save profile and linearization, and the final text of every block
+      (stored tone runs and edits with the request's edits applied)
+    - A hit returns the stored S3 key and size without fetching the
+      original or reconstructing
+    - Different edit sets land under different S3 keys, so concurrent
+      downloads never overwrite each other's file
+    - Redis failures degrade to a cache miss
+    """
+
+    # Same lifetime as the translated payload the artifacts are built from
+    ARTIFACT_EXPIRATION_SECONDS = 24 * 60 * 60
+
+    def __init__(self, redis: Redis):
+        self.cache = Cache(redis)
+
+    @staticmethod
+    def digest(
+        job_id: str,
+        final_texts: Sequence[str],
+        layout: OutputLayout = OutputLayout.TRANSLATED,
+        save_profile: SaveProfile = ARCHIVAL,
+        linearize: bool = False,
+        engine: str = "pymupdf",
+    ) -> str:
+        """
+        Digest identifying a download's final document.
+
+        Args:
+            job_id: Translation job ID
+            final_texts: Text rendered for each block, in block order
+            layout: Page layout of the document
+            save_profile: How the document is written
+            linearize: Whether the document is linearized
+            engine: Reconstruction engine that builds the document
+                (``PageArtifactCache.engine``)
+
+        Returns:
+            Hex digest
+        """
+        return content_hash(
+            job_id,
+            engine,
+            PDFReconstructionService.RENDER_VERSION,
+            FontManager.unicode_fonts(),
+            OutputLayout(layout).value,
+            save_profile.name,
+            linearize,
+            list(final_texts),
+        )
+
+    async def get(self, job_id: str, digest: str) -> Optional[dict]:
+        """
+        Look up a stored artifact.
+
+        Returns:
+            Dict with ``s3_key`` and ``file_size``, or None on a miss
+        """
+        try:
+            return await self.cache.get_json(CacheKeys.download_artifact(job_id, digest))
+        except Exception as e:
+            warning("Failed to look up download artifact", exc=e, job_id=job_id)
+            return None
+
+    async def put(self, job_id: str, digest: str, s3_key: str, file_size: int) -> None:
+        """Record an uploaded artifact for later downloads"""
+        try:
+            await self.cache.set_json(
+                CacheKeys.download_artifact(job_id, digest),
+                {"s3_key": s3_key, "file_size": file_size},
+                expire_seconds=self.ARTIFACT_EXPIRATION_SECONDS,
+            )
+        except Exception as e:
+            warning("Failed to record download artifact", exc=e, job_id=job_id)
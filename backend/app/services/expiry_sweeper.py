@@ -0,0 +1,139 @@
+"""Deletes expired translation jobs: stored files, database rows and cache keys"""
+
+import asyncio
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+from redis.asyncio import Redis
+from sqlalchemy import and_, delete, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import CacheKeys
+from app.logger import info, warning
+from app.models.translation import Translation
+from app.s3 import S3Keys, delete_files, list_keys
+
+
+class ExpirySweeper:
+    """
+    Removes translations whose ``expires_at`` has passed.
+
+    Features:
+    - Walks expired rows in ``(expires_at, id)`` keyset order, one batch
+      at a time (served by ``ix_translations_expires``)
+    - Per batch: deletes the jobs' S3 files with batched DeleteObjects,
+      unlinks their Redis keys in one pipeline, then deletes the rows with
+      one statement (document blocks cascade in the database)
+    - A job whose files can't all be deleted keeps its row and is retried
+      on the next run
+    - Rate limited: a bounded number of batches per run with a pause
+      between them, so a backlog is worked off over several runs instead
+      of competing with live traffic
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        redis: Redis,
+        batch_size: int,
+        max_batches: int,
+        pause_seconds: float = 0.0,
+    ):
+        self.db = db
+        self.redis = redis
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self.pause_seconds = pause_seconds
+
+    async def _next_batch(
+        self,
+        now: datetime,
+        after: Optional[Tuple[datetime, UUID]],
+    ) -> List[Tuple[UUID, UUID, datetime]]:
+        query = select(Translation.id, Translation.user_id, Translation.expires_at).where(
+            Translation.expires_at < now
+        )
+        if after is not None:
+            last_expires_at, last_id = after
+            query = query.where(
+                or_(
+                    Translation.expires_at > last_expires_at,
+                    and_(Translation.expires_at == last_expires_at, Translation.id > last_id),
+                )
+            )
+        query = query.order_by(Translation.expires_at, Translation.id).limit(self.batch_size)
+        result = await self.db.execute(query)
+        return [tuple(row) for row in result.all()]
+
+    async def _delete_files(self, jobs: List[Tuple[UUID, UUID, datetime]]) -> List[UUID]:
+        """Delete the batch's files; returns the jobs whose files are all gone"""
+        listings = await asyncio.gather(*(
+            asyncio.gather(*(list_keys(prefix) for prefix in S3Keys.job_prefixes(str(user_id), str(job_id))))
+            for job_id, user_id, _ in jobs
+        ))
+        keys_by_job = {
+            job_id: [key for keys in job_listings for key in keys]
+            for (job_id, _, _), job_listings in zip(jobs, listings)
+        }
+
+        failed = set(await delete_files([key for keys in keys_by_job.values() for key in keys]))
+        if failed:
+            warning("Some expired files could not be deleted", failed_count=len(failed))
+        return [
+            job_id for job_id, keys in keys_by_job.items()
+            if not failed.intersection(keys)
+        ]
+
+    async def _purge_cache(self, job_ids: List[UUID]) -> None:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for job_id in job_ids:
+                pipe.unlink(*CacheKeys.job_keys(str(job_id)))
+                pipe.srem(CacheKeys.TONE_BATCHES_PENDING, str(job_id))
+            await pipe.execute()
+
+    async def sweep(self, now: Optional[datetime] = None) -> dict:
+        """
+        Delete up to ``batch_size * max_batches`` expired jobs.
+
+        Args:
+            now: Expiry cutoff (defaults to the current time)
+
+        Returns:
+            dict with counts of deleted jobs, jobs kept for retry and batches run
+        """
+        now = now or datetime.now(timezone.utc)
+        after = None
+        deleted = kept = batches = 0
+
+        while batches < self.max_batches:
+            jobs = await self._next_batch(now, after)
+            if not jobs:
+                break
+            if batches:
+                await asyncio.sleep(self.pause_seconds)
+            batches += 1
+            after = (jobs[-1][2], jobs[-1][0])
+
+            try:
+                job_ids = await self._delete_files(jobs)
+            except Exception as e:
+                warning("Failed to delete expired files, retrying next run", exc=e, job_count=len(jobs))
+                kept += len(jobs)
+                continue
+
+            try:
+                await self._purge_cache(job_ids)
+            except Exception as e:
+                # Keys expire on their own; the rows still go
+                warning("Failed to purge expired cache keys", exc=e, job_count=len(job_ids))
+
+            if job_ids:
+                await self.db.execute(delete(Translation).where(Translation.id.in_(job_ids)))
+                await self.db.commit()
+            deleted += len(job_ids)
+            kept += len(jobs) - len(job_ids)
+
+        if batches:
+            info("Expired translations swept", deleted=deleted, kept=kept, batches=batches)
+        return {"deleted": deleted, "kept": kept, "batches": batches}
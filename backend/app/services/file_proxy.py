@@ -0,0 +1,62 @@
+"""HTTP range and conditional request handling for files streamed by the API"""
+
+import re
+from typing import Optional, Tuple
+
+_BYTE_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Byte range requested by a ``Range`` header.
+
+    Supports one range: ``bytes=500-999``, ``bytes=500-`` or the suffix
+    form ``bytes=-500``. Headers that can't be parsed, other units and
+    multiple ranges are ignored, and the whole file is sent instead, as
+    RFC 9110 allows.
+
+    Args:
+        header: Range header value
+        size: File size in bytes
+
+    Returns:
+        ``(start, end)`` with an inclusive end clamped to the file, or
+        None to send the whole file
+
+    Raises:
+        ValueError: If the range can't be satisfied (respond 416)
+    """
+    match = _BYTE_RANGE.match(header.strip()) if header else None
+    if not match or match.group(1) == match.group(2) == "":
+        return None
+
+    first, last = match.groups()
+    if first == "":
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise ValueError("Empty suffix range")
+        return max(0, size - length), size - 1
+
+    start = int(first)
+    end = size - 1 if last == "" else min(int(last), size - 1)
+    if last != "" and int(last) < start:
+        return None
+    if start >= size:
+        raise ValueError("Range starts past the end of the file")
+    return start, end
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """
+    Whether an ``If-None-Match`` header matches an entity tag.
+
+    Uses weak comparison (``W/`` prefixes are ignored); ``*`` matches any
+    existing file.
+    """
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag.removeprefix("W/") in tags
@@ -0,0 +1,273 @@
+"""Fonts for translated text: loaded once per process, embedded once per document"""
+
+from typing import Dict, List, Optional
+
+from app.config import get_settings
+from app.logger import warning
+
+# Resource name prefix of fonts embedded by reconstruction
+ALIAS_PREFIX = "TKF"
+
+# PyMuPDF's built-in CJK font (Droid Sans Fallback), the last resort for non-Latin text
+BUILTIN_UNICODE_FONT = "cjk"
+
+FONT_FILE_EXTENSIONS = (".ttf", ".otf", ".ttc")
+
+
+class FontManager:
+    """
+    Font objects and buffers shared by every reconstruction in a process.
+
+    Features:
+    - Each font (base-14 name, built-in CJK font or font file) is loaded
+      once per process, including pool workers
+    - Picks the font for a text: the original base-14 font for Latin-1
+      text, otherwise the first Unicode font that covers every character
+    - Glyph coverage memoized per font
+    """
+
+    _fonts: Dict[str, object] = {}
+    _buffers: Dict[str, bytes] = {}
+    _coverage: Dict[str, Dict[str, bool]] = {}
+    _unicode_fonts: Optional[List[str]] = None
+
+    @classmethod
+    def font(cls, key: str):
+        """
+        Get the shared PyMuPDF font for a key.
+
+        Args:
+            key: Base-14 or built-in font name, or a font file path
+        """
+        import fitz  # PyMuPDF
+
+        font = cls._fonts.get(key)
+        if font is None:
+            if key.lower().endswith(FONT_FILE_EXTENSIONS):
+                font = fitz.Font(fontfile=key)
+            else:
+                font = fitz.Font(key)
+            cls._fonts[key] = font
+        return font
+
+    @classmethod
+    def buffer(cls, key: str) -> bytes:
+        """Font file content to embed (Font.buffer copies on every access)"""
+        data = cls._buffers.get(key)
+        if data is None:
+            data = cls._buffers[key] = cls.font(key).buffer
+        return data
+
+    @staticmethod
+    def is_embedded(key: str) -> bool:
+        """True if text in this font must embed the font file (base-14 fonts don't)"""
+        return key == BUILTIN_UNICODE_FONT or key.lower().endswith(FONT_FILE_EXTENSIONS)
+
+    @classmethod
+    def unicode_fonts(cls) -> List[str]:
+        """Configured Unicode fonts that load, then the built-in CJK font"""
+        if cls._unicode_fonts is not None:
+            return cls._unicode_fonts
+        keys = []
+        for path in get_settings().pdf_unicode_fonts.split(","):
+            path = path.strip()
+            if not path:
+                continue
+            try:
+                cls.font(path)
+            except Exception as e:
+                warning("Failed to load configured font, skipping", exc=e, font_path=path)
+                continue
+            keys.append(path)
+        keys.append(BUILTIN_UNICODE_FONT)
+        cls._unicode_fonts = keys
+        return keys
+
+    @classmethod
+    def covers(cls, key: str, char: str) -> bool:
+        coverage = cls._coverage.setdefault(key, {})
+        covered = coverage.get(char)
+        if covered is None:
+            covered = coverage[char] = bool(cls.font(key).has_glyph(ord(char)))
+        return covered
+
+    @classmethod
+    def select(cls, text: str, base_font: str) -> str:
+        """
+        Choose the font to set ``text`` in.
+
+        Args:
+            text: Text to set
+            base_font: Base-14 font matching the original block
+
+        Returns:
+            Font key for FontManager.font and DocumentFonts.register
+        """
+        if all(ord(char) < 256 for char in text):
+            return base_font
+
+        chars = {char for char in text if not char.isspace()}
+        best, best_count = BUILTIN_UNICODE_FONT, -1
+        for key in cls.unicode_fonts():
+            count = sum(cls.covers(key, char) for char in chars)
+            if count == len(chars):
+                return key
+            if count > best_count:
+                best, best_count = key, count
+        return best
+
+
+class DocumentFonts:
+    """
+    Fonts registered in one output document.
+
+    The first page that uses a font embeds it; later pages link the same
+    font object into their resources instead of passing the font file to
+    PyMuPDF again.
+    """
+
+    def __init__(self, pdf_doc):
+        self.pdf_doc = pdf_doc
+        self.xrefs: Dict[str, int] = {}
+        self.aliases: Dict[str, str] = {}
+        self.pages: Dict[str, set] = {}
+
+    def register(self, page, key: str) -> str:
+        """
+        Make a font usable on a page.
+
+        Args:
+            page: PyMuPDF page of this document
+            key: Font key from FontManager.select
+
+        Returns:
+            Font name to pass to insert_textbox
+        """
+        if not FontManager.is_embedded(key):
+            return key
+
+        alias = self.aliases.get(key)
+        if alias is None:
+            alias = self.aliases[key] = f"{ALIAS_PREFIX}{len(self.aliases)}"
+        pages = self.pages.setdefault(key, set())
+        if page.number in pages:
+            return alias
+
+        xref = self.xrefs.get(key)
+        if xref is None or not self._link(page, alias, xref):
+            xref = page.insert_font(fontname=alias, fontbuffer=FontManager.buffer(key))
+            self.xrefs.setdefault(key, xref)
+        pages.add(page.number)
+        return alias
+
+    def _link(self, page, alias: str, xref: int) -> bool:
+        """Add an already embedded font to a page's own resources"""
+        doc = self.pdf_doc
+        target, key = page.xref, "Resources"
+        kind, value = doc.xref_get_key(target, key)
+        if kind == "xref":
+            target, key = int(value.split()[0]), ""
+        elif kind != "dict":
+            # Inherited resources: let PyMuPDF create the page's own
+            return False
+
+        key = f"{key}/Font" if key else "Font"
+        kind, value = doc.xref_get_key(target, key)
+        if kind == "xref":
+            target, key = int(value.split()[0]), alias
+        elif kind in ("dict", "null"):
+            key = f"{key}/{alias}"
+        else:
+            return False
+
+        doc.xref_set_key(target, key, f"{xref} 0 R")
+        return True
+
+
+def has_embedded_fonts(pdf_doc) -> bool:
+    """True if reconstruction embedded fonts in any page"""
+    return any(
+        font[4].startswith(ALIAS_PREFIX)
+        for page_num in range(pdf_doc.page_count)
+        for font in pdf_doc.get_page_fonts(page_num)
+    )
+
+
+def subset_embedded_fonts(pdf_doc) -> None:
+    """
+    Reduce embedded fonts to the glyphs used, before saving.
+
+    A no-op unless reconstruction embedded a font; failures keep the full
+    fonts.
+    """
+    if not has_embedded_fonts(pdf_doc):
+        return
+    try:
+        pdf_doc.subset_fonts()
+    except Exception as e:
+        warning("Font subsetting failed, keeping full fonts", exc=e)
+
+
+def _font_file_xref(pdf_doc, font_xref: int) -> Optional[tuple]:
+    """(font descriptor xref, FontFile key, font file xref) of an embedded Type0 font"""
+    kind, value = pdf_doc.xref_get_key(font_xref, "DescendantFonts")
+    if kind == "xref":
+        kind, value = pdf_doc.xref_get_key(int(value.split()[0]), "")
+    if kind != "array":
+        return None
+    descendant = int(value.strip("[]").split()[0])
+    kind, value = pdf_doc.xref_get_key(descendant, "FontDescriptor")
+    if kind != "xref":
+        return None
+    descriptor = int(value.split()[0])
+    for key in ("FontFile2", "FontFile3", "FontFile"):
+        kind, value = pdf_doc.xref_get_key(descriptor, key)
+        if kind == "xref":
+            return descriptor, key, int(value.split()[0])
+    return None
+
+
+def share_embedded_fonts(pdf_doc) -> None:
+    """
+    Subset each embedded font once for a document merged from subset parts.
+
+    Parts (page artifacts, parallel ranges) are subset on their own, so
+    the merged document holds a different subset of the same font for
+    every part. Each font is pointed back at one copy of the full font
+    file and subset again, keeping the glyphs of every page; glyph IDs
+    don't change when subsetting, so text renders as before. The
+    replaced part subsets are dropped when the document is saved with
+    garbage collection.
+
+    Failures keep the per-part subsets.
+    """
+    if not has_embedded_fonts(pdf_doc):
+        return
+    try:
+        keys_by_name = {
+            FontManager.font(key).name: key
+            for key in FontManager.unicode_fonts()
+            if FontManager.is_embedded(key)
+        }
+        shared: Dict[str, int] = {}
+        seen = set()
+        for page_num in range(pdf_doc.page_count):
+            for xref, _, _, basefont, alias, _ in pdf_doc.get_page_fonts(page_num):
+                if xref in seen or not alias.startswith(ALIAS_PREFIX):
+                    continue
+                seen.add(xref)
+                # Subset names carry a six-letter tag: "ABCDEF+Font Name"
+                key = keys_by_name.get(basefont.split("+", 1)[-1])
+                font_file = _font_file_xref(pdf_doc, xref)
+                if key is None or font_file is None:
+                    continue
+                descriptor, file_key, file_xref = font_file
+                if key not in shared:
+                    pdf_doc.update_stream(file_xref, FontManager.buffer(key))
+                    shared[key] = file_xref
+                else:
+                    pdf_doc.xref_set_key(descriptor, file_key, f"{shared[key]} 0 R")
+        if shared:
+            pdf_doc.subset_fonts()
+    except Exception as e:
+        warning("Font sharing failed, keeping per-part subsets", exc=e)
@@ -0,0 +1,83 @@
+"""Linearized ("fast web view") output for final PDFs"""
+
+import os
+import re
+from typing import Optional
+
+from app.logger import warning
+
+# MuPDF dropped linearization support; qpdf (through pikepdf) writes it
+try:
+    import pikepdf
+    PIKEPDF_AVAILABLE = True
+except ImportError:
+    PIKEPDF_AVAILABLE = False
+    warning("pikepdf not available, final PDFs will not be linearized")
+
+# The linearization dictionary is the first object in the file
+LINEARIZATION_HEADER_BYTES = 1024
+
+_LINEARIZED = re.compile(rb"<<\s*/Linearized\s+[\d.]+(.*?)>>", re.DOTALL)
+_INTEGER_PARAM = re.compile(rb"/([LOENT])\s+(\d+)")
+_HINT_PARAM = re.compile(rb"/H\s*\[\s*([\d\s]+?)\s*\]")
+
+
+def linearization_params(path: str) -> Optional[dict]:
+    """
+    Read the linearization parameters of a PDF.
+
+    Args:
+        path: PDF file
+
+    Returns:
+        ``{"L", "O", "E", "N", "T", "H"}`` (file length, first page object,
+        end of first page, page count, main xref offset and the hint
+        stream's ``[offset, length, ...]``), or None if the file isn't
+        linearized or was changed after linearization (``L`` no longer
+        matches its size)
+    """
+    with open(path, "rb") as f:
+        header = f.read(LINEARIZATION_HEADER_BYTES)
+    match = _LINEARIZED.search(header)
+    if not match:
+        return None
+
+    params = {name.decode(): int(value) for name, value in _INTEGER_PARAM.findall(match.group(1))}
+    hint = _HINT_PARAM.search(match.group(1))
+    if hint:
+        params["H"] = [int(value) for value in hint.group(1).split()]
+    if params.get("L") != os.path.getsize(path):
+        return None
+    return params
+
+
+def linearize_pdf(path: str) -> bool:
+    """
+    Rewrite a PDF in place as a linearized file.
+
+    The first page's objects and the page offset hint table come first,
+    so a viewer with range requests renders page 1 after one small read
+    instead of downloading the whole file. The trailer ID is derived from
+    the content, so identical input gives identical output.
+
+    Args:
+        path: PDF file
+
+    Returns:
+        False if pikepdf isn't installed or linearizing failed (the file
+        is left as it was)
+    """
+    if not PIKEPDF_AVAILABLE:
+        return False
+
+    temp_path = f"{path}.linearized"
+    try:
+        with pikepdf.open(path) as pdf:
+            pdf.save(temp_path, linearize=True, deterministic_id=True)
+        os.replace(temp_path, path)
+        return True
+    except Exception as e:
+        warning("PDF linearization failed, keeping the file as written", exc=e, path=path)
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        return False
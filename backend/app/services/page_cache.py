@@ -0,0 +1,255 @@
+"""Page-level reconstruction cache: re-render only pages whose blocks changed"""
+
+import asyncio
+import os
+from typing import Dict, List, Optional
+
+from redis.asyncio import Redis
+
+from app.cache import CacheKeys
+from app.logger import info, warning
+from app.schemas.pdf import DocumentIR, OutputLayout
+from app.s3 import S3Keys, delete_file, download_file, upload_file
+from app.services.linearize import linearize_pdf
+from app.services.pdf_reconstruction import PDF2ZH_AVAILABLE, PDFReconstructionService
+from app.services.save_profiles import ARCHIVAL, SaveProfile
+
+
+class PageArtifactCache:
+    """
+    Reconstructs documents from cached single-page artifacts.
+
+    Features:
+    - Each reconstructed page is stored in S3 under the fingerprint of its
+      final blocks (text, font, coordinates, render version)
+    - A Redis hash maps page number -> fingerprint of the cached artifact
+    - On reconstruction only pages whose fingerprint changed are rendered;
+      the rest are fetched, and pages without blocks are copied from the
+      original
+    - Pages are rendered and assembled by the same page-parallel path as
+      full PyMuPDF reconstruction, so the output is identical to it
+    - Rendered pages are uploaded concurrently, one S3 object per page:
+      the first reconstruction of a document stores every page with blocks
+    - Cache failures degrade to rendering the affected pages
+    - Bilingual layouts are composed from the same artifacts, so they
+      share the cache with translated-only downloads
+
+    A download after editing one block renders one page instead of the
+    whole document.
+    """
+
+    # Page index lifetime; refreshed by every reconstruction
+    INDEX_EXPIRATION_SECONDS = 7 * 24 * 60 * 60
+
+    def __init__(self, redis: Redis):
+        self.redis = redis
+
+    @staticmethod
+    def engine(document_ir: Optional[DocumentIR]) -> str:
+        """Engine that reconstructs a document: pdf2zh lays out whole documents, so it is only used without an IR"""
+        return "pdf2zh" if PDF2ZH_AVAILABLE and document_ir is None else "pymupdf"
+
+    async def _load_index(self, job_id: str) -> Dict[int, str]:
+        try:
+            raw = await self.redis.hgetall(CacheKeys.page_artifacts(job_id))
+            return {int(page): fingerprint for page, fingerprint in raw.items()}
+        except Exception as e:
+            warning("Failed to load page artifact index", exc=e, job_id=job_id)
+            return {}
+
+    async def _fetch(self, key: str) -> bytes | None:
+        try:
+            return await download_file(key)
+        except Exception as e:
+            warning("Cached page artifact unavailable", exc=e, s3_key=key)
+            return None
+
+    async def _store(
+        self,
+        job_id: str,
+        user_id: str,
+        page_num: int,
+        fingerprint: str,
+        artifact: bytes,
+        previous: str | None,
+    ) -> None:
+        key = S3Keys.page_artifact_path(user_id, job_id, page_num, fingerprint)
+        try:
+            await upload_file(file_data=artifact, key=key, content_type="application/pdf")
+            index_key = CacheKeys.page_artifacts(job_id)
+            await self.redis.hset(index_key, str(page_num), fingerprint)
+            await self.redis.expire(index_key, self.INDEX_EXPIRATION_SECONDS)
+        except Exception as e:
+            warning("Failed to cache page artifact", exc=e, job_id=job_id, page=page_num)
+            return
+
+        if previous and previous != fingerprint:
+            try:
+                await delete_file(S3Keys.page_artifact_path(user_id, job_id, page_num, previous))
+            except Exception as e:
+                warning("Failed to delete replaced page artifact", exc=e, job_id=job_id, page=page_num)
+
+    async def reconstruct(
+        self,
+        job_id: str,
+        user_id: str,
+        original_pdf_bytes: bytes,
+        translated_blocks: List,
+        document_ir: Optional[DocumentIR] = None,
+        save_profile: SaveProfile = ARCHIVAL,
+        layout: OutputLayout = OutputLayout.TRANSLATED,
+    ) -> bytes:
+        """
+        Reconstruct a PDF, rendering only pages not already cached.
+
+        Args:
+            job_id: Translation job ID
+            user_id: Owner of the job (S3 key prefix)
+            original_pdf_bytes: Original PDF file content
+            translated_blocks: TranslatedBlock (or compatible) objects
+            document_ir: Layout persisted at extraction time (optional)
+            save_profile: How the final document is written
+            layout: Translated pages only, or composed with the originals
+
+        Returns:
+            Reconstructed PDF as bytes
+        """
+        return await self._reconstruct(
+            job_id, user_id, original_pdf_bytes, translated_blocks, document_ir, save_profile, layout
+        )
+
+    async def reconstruct_to_file(
+        self,
+        job_id: str,
+        user_id: str,
+        original_pdf_bytes: bytes,
+        translated_blocks: List,
+        output_path: str,
+        document_ir: Optional[DocumentIR] = None,
+        save_profile: SaveProfile = ARCHIVAL,
+        layout: OutputLayout = OutputLayout.TRANSLATED,
+        linearize: bool = False,
+    ) -> int:
+        """
+        Reconstruct a PDF into a file, rendering only pages not already cached.
+
+        The final document is written by MuPDF straight to ``output_path``
+        and never held in memory as a whole, so it can be streamed to S3.
+
+        Args:
+            job_id: Translation job ID
+            user_id: Owner of the job (S3 key prefix)
+            original_pdf_bytes: Original PDF file content
+            translated_blocks: TranslatedBlock (or compatible) objects
+            output_path: File to write the reconstructed PDF to
+            document_ir: Layout persisted at extraction time (optional)
+            save_profile: How the final document is written
+            layout: Translated pages only, or composed with the originals
+            linearize: Rewrite the file linearized (fast web view)
+
+        Returns:
+            Size of the written file in bytes
+        """
+        await self._reconstruct(
+            job_id, user_id, original_pdf_bytes, translated_blocks, document_ir, save_profile, layout, output_path
+        )
+        if linearize:
+            await asyncio.to_thread(linearize_pdf, output_path)
+        return os.path.getsize(output_path)
+
+    async def _reconstruct(
+        self,
+        job_id: str,
+        user_id: str,
+        original_pdf_bytes: bytes,
+        translated_blocks: List,
+        document_ir: Optional[DocumentIR],
+        save_profile: SaveProfile,
+        layout: OutputLayout,
+        output_path: Optional[str] = None,
+    ) -> Optional[bytes]:
+        if self.engine(document_ir) == "pdf2zh":
+            # Pages can't be rendered independently
+            reconstructed_bytes = await asyncio.to_thread(
+                PDFReconstructionService.reconstruct_pdf,
+                original_pdf_bytes,
+                translated_blocks,
+                save_profile=save_profile,
+            )
+            if layout is not OutputLayout.TRANSLATED:
+                return await asyncio.to_thread(
+                    PDFReconstructionService.compose_layout,
+                    original_pdf_bytes,
+                    reconstructed_bytes,
+                    layout,
+                    save_profile,
+                    output_path,
+                )
+            if output_path is None:
+                return reconstructed_bytes
+            with open(output_path, "wb") as f:
+                f.write(reconstructed_bytes)
+            return None
+
+        blocks_by_page = PDFReconstructionService._group_blocks_by_page(translated_blocks)
+        fingerprints = {
+            page_num: PDFReconstructionService.page_fingerprint(
+                blocks,
+                document_ir.pages.get(blocks[0].original.page) if document_ir else None,
+            )
+            for page_num, blocks in blocks_by_page.items()
+        }
+
+        index = await self._load_index(job_id)
+        cached_pages = [
+            page_num for page_num, fingerprint in fingerprints.items()
+            if index.get(page_num) == fingerprint
+        ]
+        fetched = await asyncio.gather(*(
+            self._fetch(S3Keys.page_artifact_path(user_id, job_id, page_num, fingerprints[page_num]))
+            for page_num in cached_pages
+        ))
+        artifacts: Dict[int, bytes] = {
+            page_num: artifact
+            for page_num, artifact in zip(cached_pages, fetched)
+            if artifact is not None
+        }
+
+        stale = {
+            page_num: blocks
+            for page_num, blocks in blocks_by_page.items()
+            if page_num not in artifacts
+        }
+        rendered = await asyncio.to_thread(
+            PDFReconstructionService.render_page_artifacts,
+            original_pdf_bytes,
+            stale,
+            document_ir,
+        )
+        artifacts.update(rendered)
+
+        info(
+            "Reconstructing from page artifacts",
+            job_id=job_id,
+            pages_with_blocks=len(blocks_by_page),
+            cached_pages=len(artifacts) - len(rendered),
+            rendered_pages=len(rendered),
+        )
+
+        reconstructed_bytes = await asyncio.to_thread(
+            PDFReconstructionService.assemble_pages,
+            original_pdf_bytes,
+            artifacts,
+            save_profile,
+            output_path,
+            layout,
+        )
+        # Drop fetched artifacts before uploading; rendered ones are kept until stored
+        artifacts.clear()
+
+        await asyncio.gather(*(
+            self._store(job_id, user_id, page_num, fingerprints[page_num], artifact, index.get(page_num))
+            for page_num, artifact in rendered.items()
+        ))
+
+        return reconstructed_bytes
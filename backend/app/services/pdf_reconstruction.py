@@ -1,10 +1,21 @@
 """PDF reconstruction service - applies translated text to original PDF using PDFMathTranslate"""
 
-from io import BytesIO
-from typing import List
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Sequence
 
+from app.config import get_settings
 from app.logger import info, warning, error as log_error
-from app.schemas.pdf import TranslatedBlock
+from app.schemas.pdf import DocumentIR, OutputLayout, PageIR, TranslatedBlock
+from app.services.font_manager import DocumentFonts, FontManager, share_embedded_fonts, subset_embedded_fonts
+from app.services.redaction import PageTextIndex, merge_overlapping
+from app.services.save_profiles import ARCHIVAL, SaveProfile
+from app.services.single_flight import content_hash
+from app.services.text_layout import TextFitter
 
 # Try to import pdf2zh, fallback to PyMuPDF if not available
 try:
@@ -26,6 +37,54 @@ PYMUPDF_BUILTIN_FONTS = {
 }
 
 
+# Worker pool for page-parallel reconstruction (created on first use, reused after)
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_workers = 0
+
+
+def _get_process_pool(workers: int) -> ProcessPoolExecutor:
+    """Get the shared reconstruction process pool, resizing it if needed"""
+    global _process_pool, _process_pool_workers
+    if _process_pool is None or _process_pool_workers != workers:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=False)
+        # spawn: forking a threaded server process (uvicorn, MuPDF state) is unsafe
+        _process_pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        _process_pool_workers = workers
+    return _process_pool
+
+
+def _render_single_pages(
+    source_bytes: bytes,
+    pages: Sequence[int],
+    blocks_by_page: Dict[int, list],
+    ir_pages: Optional[Dict[int, PageIR]] = None,
+) -> Dict[int, bytes]:
+    """
+    Reconstruct each of ``pages`` into its own single-page PDF.
+
+    Runs in the process pool for large sets of pages, inline otherwise.
+    """
+    import fitz  # PyMuPDF
+
+    artifacts: Dict[int, bytes] = {}
+    with fitz.open(stream=source_bytes, filetype="pdf") as source_doc:
+        for page_num in pages:
+            with fitz.open() as page_doc:
+                page_doc.insert_pdf(source_doc, from_page=page_num, to_page=page_num)
+                PDFReconstructionService._render_pages(
+                    page_doc, blocks_by_page, first_page=page_num, ir_pages=ir_pages
+                )
+                # Artifacts are stored on their own, so each carries its own
+                # subset (assemble_pages subsets again across pages)
+                subset_embedded_fonts(page_doc)
+                artifacts[page_num] = page_doc.tobytes(garbage=1)
+    return artifacts
+
+
 class PDFReconstructionService:
     """
     Service for reconstructing PDFs with translated text while preserving layout.
@@ -34,8 +93,24 @@ class PDFReconstructionService:
     layouts (tables, equations, multi-column). Takes original PDF bytes and
     translated blocks, replaces text at original coordinates while maintaining
     fonts, sizes, styles, and page layout.
+    
+    Large documents are reconstructed page-parallel on the PyMuPDF path:
+    pages with blocks are rendered as single-page artifacts in a process
+    pool (fixed-size chunks per task) and assembled in page order, so the
+    output bytes depend only on the input.
+    
+    When extraction's DocumentIR is available, its layout (span boxes per
+    block) drives redaction and the PDF is not analysed again.
     """
     
+    # Pages per worker task. Fixed rather than derived from the CPU count so
+    # that the merged output is identical on every host.
+    PAGES_PER_RANGE = 16
+    
+    # Part of every page fingerprint: bump when rendering output changes so
+    # cached page artifacts are re-rendered
+    RENDER_VERSION = 3
+    
     @staticmethod
     def _get_safe_font(font_name: str | None) -> str:
         """Return a valid PyMuPDF font, falling back to helv if unknown."""
@@ -56,6 +131,8 @@ class PDFReconstructionService:
     def reconstruct_pdf(
         original_pdf_bytes: bytes,
         translated_blocks: List[TranslatedBlock],
+        document_ir: Optional[DocumentIR] = None,
+        save_profile: SaveProfile = ARCHIVAL,
     ) -> bytes:
         """
         Reconstruct PDF with translated text using PDFMathTranslate.
@@ -63,6 +140,8 @@ class PDFReconstructionService:
         Args:
             original_pdf_bytes: Original PDF file content as bytes
             translated_blocks: List of TranslatedBlock objects with translations
+            document_ir: Layout persisted at extraction time (optional)
+            save_profile: How the output is written (PyMuPDF path)
             
         Returns:
             Reconstructed PDF as bytes
@@ -74,24 +153,38 @@ class PDFReconstructionService:
         # Use PDFMathTranslate if available, otherwise fallback to PyMuPDF
         if PDF2ZH_AVAILABLE:
             return PDFReconstructionService._reconstruct_with_pdf2zh(
-                original_pdf_bytes, translated_blocks
+                original_pdf_bytes, translated_blocks, document_ir, save_profile
             )
         else:
             return PDFReconstructionService._reconstruct_with_pymupdf(
-                original_pdf_bytes, translated_blocks
+                original_pdf_bytes, translated_blocks, document_ir, save_profile
             )
     
     @staticmethod
     def _reconstruct_with_pdf2zh(
         original_pdf_bytes: bytes,
         translated_blocks: List[TranslatedBlock],
+        document_ir: Optional[DocumentIR] = None,
+        save_profile: SaveProfile = ARCHIVAL,
     ) -> bytes:
         """
         Reconstruct PDF using PDFMathTranslate (pdf2zh).
         
         Uses PDFMathTranslate's reconstruction capabilities for better
-        format preservation of complex layouts.
+        format preservation of complex layouts. If extraction persisted its
+        layout analysis (DocumentIR), that layout is rendered directly
+        instead of parsing the document with BabelDoc a second time.
         """
+        if document_ir is not None:
+            info(
+                "Reusing extraction layout, skipping BabelDoc parse",
+                engine=document_ir.engine,
+                page_count=len(document_ir.pages),
+            )
+            return PDFReconstructionService._reconstruct_with_pymupdf(
+                original_pdf_bytes, translated_blocks, document_ir, save_profile
+            )
+
         try:
             import tempfile
             from pathlib import Path
@@ -164,7 +257,7 @@ class PDFReconstructionService:
                     exc=e,
                 )
                 return PDFReconstructionService._reconstruct_with_pymupdf(
-                    original_pdf_bytes, translated_blocks
+                    original_pdf_bytes, translated_blocks, document_ir, save_profile
                 )
             finally:
                 # Clean up input temp file
@@ -173,22 +266,35 @@ class PDFReconstructionService:
         except Exception as e:
             log_error("PDFMathTranslate reconstruction failed, falling back to PyMuPDF", exc=e)
             return PDFReconstructionService._reconstruct_with_pymupdf(
-                original_pdf_bytes, translated_blocks
+                original_pdf_bytes, translated_blocks, document_ir, save_profile
             )
     
     @staticmethod
     def _reconstruct_with_pymupdf(
         original_pdf_bytes: bytes,
         translated_blocks: List[TranslatedBlock],
+        document_ir: Optional[DocumentIR] = None,
+        save_profile: SaveProfile = ARCHIVAL,
     ) -> bytes:
         """
         Fallback reconstruction using PyMuPDF (original implementation).
+        
+        With an incremental save profile the original is edited as a
+        temporary file, so the changes can be appended to it.
         """
         import fitz  # PyMuPDF
         
+        pdf_doc = None
+        temp_path = None
         try:
             # Load original PDF
-            pdf_doc = fitz.open(stream=original_pdf_bytes, filetype="pdf")
+            if save_profile.incremental:
+                fd, temp_path = tempfile.mkstemp(suffix=".pdf")
+                with os.fdopen(fd, "wb") as f:
+                    f.write(original_pdf_bytes)
+                pdf_doc = fitz.open(temp_path)
+            else:
+                pdf_doc = fitz.open(stream=original_pdf_bytes, filetype="pdf")
             info(
                 "Opened PDF for reconstruction (PyMuPDF fallback)",
                 page_count=pdf_doc.page_count,
@@ -196,57 +302,34 @@ class PDFReconstructionService:
             )
 
             # Group blocks by page for efficient processing
-            blocks_by_page = {}
-            for block in translated_blocks:
-                page_num = block.original.page - 1  # 0-indexed
-                if page_num not in blocks_by_page:
-                    blocks_by_page[page_num] = []
-                blocks_by_page[page_num].append(block)
-
-            # Process each page
-            for page_num in range(pdf_doc.page_count):
-                if page_num not in blocks_by_page:
-                    continue
-
-                page = pdf_doc[page_num]
-                blocks = blocks_by_page[page_num]
-
-                # First, add redaction annotations for all blocks on this page
-                # This marks all original text areas for removal
-                for block in blocks:
-                    PDFReconstructionService._add_redaction_for_block(
-                        page=page,
-                        translated_block=block,
-                    )
-                
-                # Apply all redactions at once (more efficient than one-by-one)
-                page.apply_redactions()
-                
-                # Additional step: Draw white rectangles to ensure original text is covered
-                # This is a fallback in case redaction doesn't fully remove text
-                for block in blocks:
-                    PDFReconstructionService._cover_block_area(
-                        page=page,
-                        translated_block=block,
-                    )
-                
-                # Now insert all translated text
-                for block in blocks:
-                    PDFReconstructionService._insert_translated_text(
-                        page=page,
-                        translated_block=block,
-                    )
+            blocks_by_page = PDFReconstructionService._group_blocks_by_page(translated_blocks)
+
+            if PDFReconstructionService._pool_workers(pdf_doc.page_count):
+                # Same page-parallel rendering as cached page artifacts,
+                # assembled in page order
+                reconstructed_bytes = PDFReconstructionService.assemble_pages(
+                    original_pdf_bytes,
+                    PDFReconstructionService.render_page_artifacts(
+                        original_pdf_bytes, blocks_by_page, document_ir
+                    ),
+                    save_profile,
+                )
+            else:
+                PDFReconstructionService._render_pages(
+                    pdf_doc,
+                    blocks_by_page,
+                    ir_pages=document_ir.pages if document_ir else None,
+                )
 
-            # Save reconstructed PDF to bytes
-            output = BytesIO()
-            pdf_doc.save(output, garbage=4, deflate=True)
-            output.seek(0)
-            reconstructed_bytes = output.getvalue()
+                # Save reconstructed PDF to bytes (keep the document ID so output is stable)
+                subset_embedded_fonts(pdf_doc)
+                reconstructed_bytes = save_profile.write(pdf_doc)
 
             info(
                 "PDF reconstruction complete",
                 page_count=pdf_doc.page_count,
                 output_size=len(reconstructed_bytes),
+                save_profile=save_profile.name,
             )
 
             return reconstructed_bytes
@@ -261,21 +344,453 @@ class PDFReconstructionService:
             else:
                 log_error("PDF reconstruction failed", exc=e)
                 raise
+        finally:
+            if temp_path is not None:
+                if pdf_doc is not None:
+                    pdf_doc.close()
+                os.remove(temp_path)
 
     @staticmethod
-    def _add_redaction_for_block(page, translated_block) -> None:
+    def _pool_workers(page_count: int) -> int:
+        """Process pool size for rendering ``page_count`` pages, or 0 to render inline"""
+        settings = get_settings()
+        workers = settings.pdf_reconstruction_workers or os.cpu_count() or 1
+        if workers > 1 and page_count >= settings.pdf_parallel_min_pages:
+            return workers
+        return 0
+
+    @staticmethod
+    def _group_blocks_by_page(translated_blocks: List) -> Dict[int, list]:
+        """Group blocks by 0-indexed page number (block pages are 1-indexed)"""
+        blocks_by_page: Dict[int, list] = {}
+        for block in translated_blocks:
+            page_num = block.original.page - 1  # 0-indexed
+            blocks_by_page.setdefault(page_num, []).append(block)
+        return blocks_by_page
+
+    @staticmethod
+    def _render_pages(
+        pdf_doc,
+        blocks_by_page: Dict[int, list],
+        first_page: int = 0,
+        ir_pages: Optional[Dict[int, PageIR]] = None,
+    ) -> None:
         """
-        Add redaction annotation to mark original text for removal.
+        Redact, cover and insert translated text on every page with blocks.
         
-        Uses both coordinate-based redaction and text search to ensure
-        the original text is properly removed.
+        Redaction rectangles come from the extraction-time span boxes when
+        ``ir_pages`` covers a block, otherwise from a per-page spatial index
+        of the text layer (one extraction per page rather than a full-page
+        search per block). Overlapping rectangles are merged before
+        annotating.
         
         Args:
-            page: PyMuPDF page object (or PDFMathTranslate page object)
-            translated_block: TranslatedBlock with original coordinates
+            pdf_doc: PyMuPDF document (may hold a sub-range of the source pages)
+            blocks_by_page: Blocks keyed by 0-indexed source page number
+            first_page: Source page number of ``pdf_doc``'s first page
+            ir_pages: DocumentIR pages keyed by Block.page (optional)
+        """
+        import fitz  # PyMuPDF
+
+        # Fonts embedded for translated text are registered once per document
+        fonts = DocumentFonts(pdf_doc)
+        for page_idx in range(pdf_doc.page_count):
+            blocks = blocks_by_page.get(first_page + page_idx)
+            if not blocks:
+                continue
+
+            page = pdf_doc[page_idx]
+            ir_page = ir_pages.get(blocks[0].original.page) if ir_pages else None
+
+            # First, add redaction annotations for all blocks on this page
+            # This marks all original text areas for removal. Without IR
+            # spans, the page's character boxes are indexed once and
+            # queried per block.
+            text_index = None
+            if ir_page is None or any(block.original.block_id not in ir_page.spans for block in blocks):
+                try:
+                    text_index = PageTextIndex.from_page(page)
+                except Exception as e:
+                    warning(
+                        "Failed to index page text, redacting block areas only",
+                        exc=e,
+                        page=first_page + page_idx + 1,
+                    )
+
+            redaction_boxes = []
+            for block in blocks:
+                redaction_boxes.extend(
+                    PDFReconstructionService._redaction_boxes_for_block(
+                        page=page,
+                        translated_block=block,
+                        text_index=text_index,
+                        ir_page=ir_page,
+                    )
+                )
+            for box in merge_overlapping(redaction_boxes):
+                page.add_redact_annot(fitz.Rect(box), fill=(1, 1, 1))
+            
+            # Apply all redactions at once (more efficient than one-by-one)
+            page.apply_redactions()
+            
+            # Additional step: Draw white rectangles to ensure original text is covered
+            # This is a fallback in case redaction doesn't fully remove text
+            for block in blocks:
+                PDFReconstructionService._cover_block_area(
+                    page=page,
+                    translated_block=block,
+                )
+            
+            # Now insert all translated text
+            for block in blocks:
+                PDFReconstructionService._insert_translated_text(
+                    page=page,
+                    translated_block=block,
+                    fonts=fonts,
+                )
+
+    @staticmethod
+    def _ir_pages_for(
+        document_ir: Optional[DocumentIR],
+        blocks_by_page: Dict[int, list],
+    ) -> Optional[Dict[int, PageIR]]:
+        """IR pages needed to render ``blocks_by_page`` (sent to workers instead of the whole IR)"""
+        if document_ir is None:
+            return None
+        ir_pages = {}
+        for blocks in blocks_by_page.values():
+            for block in blocks:
+                number = block.original.page
+                if number in document_ir.pages:
+                    ir_pages[number] = document_ir.pages[number]
+        return ir_pages
+
+    @staticmethod
+    def _portable_block(block) -> SimpleNamespace:
+        """Picklable copy of the block fields reconstruction reads"""
+        original = block.original
+        coords = original.coordinates
+        return SimpleNamespace(
+            translated_text=block.translated_text,
+            original=SimpleNamespace(
+                page=original.page,
+                block_id=original.block_id,
+                text=original.text,
+                font_size=original.font_size,
+                font_name=original.font_name,
+                coordinates=SimpleNamespace(
+                    x=coords.x,
+                    y=coords.y,
+                    width=coords.width,
+                    height=coords.height,
+                ),
+            ),
+        )
+
+    @staticmethod
+    def _merge_parts(
+        source_doc,
+        parts: List[tuple[int, int, Optional[bytes]]],
+        save_profile: SaveProfile = ARCHIVAL,
+        output_path: Optional[str] = None,
+        layout: OutputLayout = OutputLayout.TRANSLATED,
+    ) -> Optional[bytes]:
+        """
+        Merge rendered parts and untouched source ranges into one document.
+        
+        Args:
+            source_doc: Opened original document (metadata, outline and
+                untouched pages are taken from it)
+            parts: ``(start, stop, pdf_bytes)`` covering every source page in
+                order; ``pdf_bytes`` holds pages [start, stop) rendered, or
+                None to copy them from the source
+            save_profile: How the merged document is written
+            output_path: Write the document to this file instead of
+                returning it
+            layout: Translated pages only, or composed with the originals
+            
+        Returns:
+            Merged PDF as bytes, or None if written to ``output_path``
+        """
+        import fitz  # PyMuPDF
+
+        merged = fitz.open()
+        for start, stop, pdf_bytes in parts:
+            if layout is OutputLayout.TRANSLATED:
+                if pdf_bytes is not None:
+                    with fitz.open(stream=pdf_bytes, filetype="pdf") as part:
+                        merged.insert_pdf(part)
+                else:
+                    merged.insert_pdf(source_doc, from_page=start, to_page=stop - 1)
+                continue
+
+            part = fitz.open(stream=pdf_bytes, filetype="pdf") if pdf_bytes is not None else None
+            try:
+                for page_num in range(start, stop):
+                    PDFReconstructionService._compose_bilingual_page(
+                        merged,
+                        source_doc,
+                        page_num,
+                        part if part is not None else source_doc,
+                        page_num - start if part is not None else page_num,
+                        layout,
+                    )
+            finally:
+                if part is not None:
+                    part.close()
+
+        if any(pdf_bytes is not None for _, _, pdf_bytes in parts):
+            share_embedded_fonts(merged)
+
+        merged.set_metadata(source_doc.metadata)
+        toc = source_doc.get_toc()
+        if toc:
+            if layout is OutputLayout.INTERLEAVED:
+                # Entries point at the original of each pair
+                toc = [[level, title, 2 * page - 1 if page > 0 else page] for level, title, page in toc]
+            merged.set_toc(toc)
+
+        # A new document: incremental profiles fall back to a full write
+        with merged:
+            if output_path is not None:
+                save_profile.save(merged, output_path)
+                return None
+            return save_profile.write(merged)
+
+    @staticmethod
+    def _compose_bilingual_page(
+        output_doc,
+        source_doc,
+        page_num: int,
+        translated_doc,
+        translated_page_num: int,
+        layout: OutputLayout,
+    ) -> None:
+        """
+        Add one original page and its translation to a bilingual document.
+        
+        Both pages are placed with ``show_pdf_page``, which wraps each source
+        page in a Form XObject and reuses it (and its fonts and images) for
+        every later placement. A page without translated blocks is the same
+        source page on both sides, so it is stored once.
+        
+        Args:
+            output_doc: Bilingual document being built
+            source_doc: Opened original document
+            page_num: 0-indexed page in the original
+            translated_doc: Document holding the translated page (the
+                original itself for pages without blocks)
+            translated_page_num: 0-indexed page in ``translated_doc``
+            layout: SIDE_BY_SIDE or INTERLEAVED
+        """
+        import fitz  # PyMuPDF
+
+        rect = source_doc[page_num].rect
+        if layout is OutputLayout.SIDE_BY_SIDE:
+            page = output_doc.new_page(width=rect.width * 2, height=rect.height)
+            page.show_pdf_page(fitz.Rect(0, 0, rect.width, rect.height), source_doc, page_num)
+            page.show_pdf_page(
+                fitz.Rect(rect.width, 0, rect.width * 2, rect.height),
+                translated_doc,
+                translated_page_num,
+            )
+        else:
+            output_doc.new_page(width=rect.width, height=rect.height).show_pdf_page(
+                rect, source_doc, page_num
+            )
+            output_doc.new_page(width=rect.width, height=rect.height).show_pdf_page(
+                rect, translated_doc, translated_page_num
+            )
+
+    @staticmethod
+    def page_fingerprint(blocks: list, ir_page: Optional[PageIR] = None) -> str:
+        """
+        Hash of everything reconstruction reads from one page's blocks.
+        
+        Two renders of a page with the same fingerprint produce the same
+        output, so the fingerprint keys cached page artifacts.
+        """
+        return content_hash(
+            PDFReconstructionService.RENDER_VERSION,
+            FontManager.unicode_fonts(),
+            [ir_page.spans.get(block.original.block_id) for block in blocks] if ir_page else None,
+            [
+                [
+                    block.translated_text,
+                    block.original.text,
+                    block.original.font_size,
+                    block.original.font_name,
+                    block.original.coordinates.x,
+                    block.original.coordinates.y,
+                    block.original.coordinates.width,
+                    block.original.coordinates.height,
+                ]
+                for block in blocks
+            ],
+        )
+
+    @staticmethod
+    def render_page_artifacts(
+        original_pdf_bytes: bytes,
+        blocks_by_page: Dict[int, list],
+        document_ir: Optional[DocumentIR] = None,
+    ) -> Dict[int, bytes]:
+        """
+        Reconstruct every page in ``blocks_by_page`` as a single-page PDF.
+        
+        Large sets of pages are split into fixed-size chunks and rendered in
+        the process pool; serially if the pool cannot be used.
+        
+        Args:
+            original_pdf_bytes: Original PDF file content
+            blocks_by_page: Blocks keyed by 0-indexed page number (pages
+                outside the document are ignored)
+            document_ir: Layout persisted at extraction time (optional)
+            
+        Returns:
+            Single-page PDF bytes keyed by 0-indexed page number
+        """
+        import fitz  # PyMuPDF
+
+        with fitz.open(stream=original_pdf_bytes, filetype="pdf") as source_doc:
+            page_count = source_doc.page_count
+        pages = [
+            page_num for page_num in sorted(blocks_by_page)
+            if 0 <= page_num < page_count and blocks_by_page[page_num]
+        ]
+
+        workers = PDFReconstructionService._pool_workers(len(pages))
+        if workers:
+            step = PDFReconstructionService.PAGES_PER_RANGE
+            try:
+                pool = _get_process_pool(workers)
+                futures = []
+                for chunk in (pages[i:i + step] for i in range(0, len(pages), step)):
+                    chunk_blocks = {
+                        page_num: [PDFReconstructionService._portable_block(block) for block in blocks_by_page[page_num]]
+                        for page_num in chunk
+                    }
+                    futures.append(
+                        pool.submit(
+                            _render_single_pages,
+                            original_pdf_bytes,
+                            chunk,
+                            chunk_blocks,
+                            PDFReconstructionService._ir_pages_for(document_ir, chunk_blocks),
+                        )
+                    )
+                artifacts: Dict[int, bytes] = {}
+                for future in futures:
+                    artifacts.update(future.result())
+                return artifacts
+            except (AssertionError, OSError, BrokenProcessPool) as e:
+                # e.g. daemonic Celery prefork workers cannot start child processes
+                warning(
+                    "Parallel page rendering unavailable, rendering serially",
+                    exc=e,
+                    page_count=len(pages),
+                )
+
+        return _render_single_pages(
+            original_pdf_bytes,
+            pages,
+            blocks_by_page,
+            document_ir.pages if document_ir else None,
+        )
+
+    @staticmethod
+    def assemble_pages(
+        original_pdf_bytes: bytes,
+        page_artifacts: Dict[int, bytes],
+        save_profile: SaveProfile = ARCHIVAL,
+        output_path: Optional[str] = None,
+        layout: OutputLayout = OutputLayout.TRANSLATED,
+    ) -> Optional[bytes]:
+        """
+        Build the final document from single-page artifacts.
+        
+        Pages without an artifact are copied from the original in
+        contiguous runs. Bilingual layouts are composed in the same pass,
+        from the same artifacts. Embedded fonts are subset once for the
+        whole document rather than kept as one subset per artifact.
+        
+        Args:
+            original_pdf_bytes: Original PDF file content
+            page_artifacts: Single-page PDF bytes keyed by 0-indexed page number
+            save_profile: How the final document is written
+            output_path: Write the document to this file instead of
+                returning it
+            layout: Translated pages only, or composed with the originals
+            
+        Returns:
+            Reconstructed PDF as bytes, or None if written to ``output_path``
+        """
+        import fitz  # PyMuPDF
+
+        with fitz.open(stream=original_pdf_bytes, filetype="pdf") as source_doc:
+            parts: List[tuple[int, int, Optional[bytes]]] = []
+            for page_num in range(source_doc.page_count):
+                artifact = page_artifacts.get(page_num)
+                if artifact is None and parts and parts[-1][2] is None:
+                    parts[-1] = (parts[-1][0], page_num + 1, None)
+                else:
+                    parts.append((page_num, page_num + 1, artifact))
+            return PDFReconstructionService._merge_parts(
+                source_doc, parts, save_profile, output_path, layout
+            )
+
+    @staticmethod
+    def compose_layout(
+        original_pdf_bytes: bytes,
+        translated_pdf_bytes: bytes,
+        layout: OutputLayout,
+        save_profile: SaveProfile = ARCHIVAL,
+        output_path: Optional[str] = None,
+    ) -> Optional[bytes]:
+        """
+        Compose a whole translated document with its original.
+        
+        For documents reconstructed in one piece (pdf2zh); page artifacts
+        are composed by ``assemble_pages`` directly.
+        
+        Returns:
+            Composed PDF as bytes, or None if written to ``output_path``
         """
         import fitz  # PyMuPDF
+
+        with fitz.open(stream=original_pdf_bytes, filetype="pdf") as source_doc:
+            return PDFReconstructionService._merge_parts(
+                source_doc,
+                [(0, source_doc.page_count, translated_pdf_bytes)],
+                save_profile,
+                output_path,
+                layout,
+            )
+
+    @staticmethod
+    def _redaction_boxes_for_block(
+        page,
+        translated_block,
+        text_index=None,
+        ir_page: Optional[PageIR] = None,
+    ) -> List[tuple]:
+        """
+        Rectangles to redact to remove a block's original text.
+        
+        The block area itself, plus the block's span boxes from the
+        extraction-time IR or, without IR, the full glyph boxes of every
+        text line it overlaps, so characters straddling the block edge are
+        removed too.
         
+        Args:
+            page: PyMuPDF page object
+            translated_block: TranslatedBlock with original coordinates
+            text_index: PageTextIndex of the page (None to use the block area only)
+            ir_page: DocumentIR page the block was extracted from (optional)
+            
+        Returns:
+            List of (x0, y0, x1, y1) rectangles
+        """
         original = translated_block.original
 
         # Get original coordinates (normalized percentages)
@@ -288,36 +803,22 @@ class PDFReconstructionService:
         x1 = x0 + ((coords.width / 100) * page_rect.width)
         y1 = y0 + ((coords.height / 100) * page_rect.height)
         
-        text_rect = fitz.Rect(x0, y0, x1, y1)
+        text_rect = (x0, y0, x1, y1)
+        boxes = [text_rect]
 
-        try:
-            # First, try to find and redact the actual text instances
-            # Search for the original text on the page
-            original_text = original.text.strip()
-            if original_text:
-                # Search for text instances that overlap with our coordinates
-                text_instances = page.search_for(
-                    original_text,
-                    flags=fitz.TEXT_DEHYPHENATE,
-                )
-                
-                # Redact text instances that are within our block area
-                for inst in text_instances:
-                    # Check if this text instance overlaps with our block area
-                    if text_rect.intersects(inst):
-                        page.add_redact_annot(inst, fill=(1, 1, 1))
-            
-            # Also add redaction for the coordinate area as fallback
-            # This ensures we cover the area even if text search doesn't find it
-            page.add_redact_annot(text_rect, fill=(1, 1, 1))
-            
-        except Exception as e:
-            warning(
-                "Failed to add redaction for block",
-                exc=e,
-                page=original.page,
-                block_id=original.block_id,
+        ir_spans = ir_page.spans.get(original.block_id) if ir_page else None
+        if ir_spans:
+            # IR boxes are in the extraction's page space; rescale if it differs
+            scale_x = page_rect.width / ir_page.width if ir_page.width else 1.0
+            scale_y = page_rect.height / ir_page.height if ir_page.height else 1.0
+            boxes.extend(
+                (span[0] * scale_x, span[1] * scale_y, span[2] * scale_x, span[3] * scale_y)
+                for span in ir_spans
             )
+        elif text_index is not None and original.text and original.text.strip():
+            boxes.extend(text_index.query(text_rect))
+
+        return boxes
 
     @staticmethod
     def _cover_block_area(page, translated_block) -> None:
@@ -360,13 +861,19 @@ class PDFReconstructionService:
             )
 
     @staticmethod
-    def _insert_translated_text(page, translated_block) -> None:
+    def _insert_translated_text(page, translated_block, fonts: Optional[DocumentFonts] = None) -> None:
         """
         Insert translated text at the original block coordinates.
         
+        The text is wrapped and sized by TextFitter (largest font size up to
+        the original that fits the block) and inserted with one call, so it
+        never overflows the block. Text outside Latin-1 is set in a Unicode
+        font chosen by FontManager and embedded through ``fonts``.
+        
         Args:
             page: PyMuPDF page object (or PDFMathTranslate page object)
             translated_block: TranslatedBlock with original and translated info
+            fonts: Font registry of the page's document (created if omitted)
         """
         import fitz  # PyMuPDF
         
@@ -395,45 +902,65 @@ class PDFReconstructionService:
         
         text_rect = fitz.Rect(x0, y0, x1, y1)
 
+        if text_rect.is_empty:
+            warning(
+                "Block has no area, skipping text insertion",
+                page=original.page,
+                block_id=original.block_id,
+            )
+            return
+
         try:
             # Get font properties from original, with safe fallback
             font_size = original.font_size or 12
-            font_name = PDFReconstructionService._get_safe_font(original.font_name)
+            font_key = FontManager.select(
+                translated_text,
+                PDFReconstructionService._get_safe_font(original.font_name),
+            )
+            font_name = (fonts or DocumentFonts(page.parent)).register(page, font_key)
             
-            # Insert translated text at original coordinates
-            # Use insert_textbox for better text wrapping within original bounds
-            # Note: insert_textbox automatically handles overflow by not displaying text that doesn't fit
+            # Wrap and size the text to the block, then insert it once
+            fit = TextFitter(font_key).fit(
+                translated_text,
+                text_rect.width,
+                text_rect.height,
+                max_font_size=font_size,
+            )
+            if fit.truncated:
+                warning(
+                    "Text did not fit in block at minimum size, truncated",
+                    page=original.page,
+                    block_id=original.block_id,
+                    text_length=len(translated_text),
+                )
+
             result = page.insert_textbox(
                 text_rect,
-                translated_text,
-                fontsize=font_size,
+                "\n".join(fit.lines),
+                fontsize=fit.font_size,
                 fontname=font_name,
+                lineheight=fit.line_height,
                 color=(0, 0, 0),  # Black text
                 align=fitz.TEXT_ALIGN_LEFT,
             )
 
             if result < 0:
-                # insert_textbox returns negative if text doesn't fit
+                # Only if insert_textbox measures differently from the fitter
                 warning(
-                    "Text did not fit in block, trying alternative insertion",
+                    "Fitted text rejected by insert_textbox",
                     page=original.page,
                     block_id=original.block_id,
-                    text_length=len(translated_text),
-                )
-                # Try inserting without overflow constraint
-                page.insert_text(
-                    (x0, y0),
-                    translated_text,
-                    fontsize=font_size,
-                    fontname=font_name,
-                    color=(0, 0, 0),
+                    font_size=fit.font_size,
+                    deficit=-result,
                 )
+                return
 
             info(
                 "Text replaced in block",
                 page=original.page,
                 block_id=original.block_id,
                 text_length=len(translated_text),
+                font_size=fit.font_size,
                 original_preview=original.text[:30] if original.text else "",
                 translated_preview=translated_text[:30],
             )
@@ -467,6 +994,23 @@ class PDFReconstructionService:
         Returns:
             Reconstructed PDF as bytes
         """
+        return PDFReconstructionService.reconstruct_pdf(
+            original_pdf_bytes,
+            PDFReconstructionService.blocks_with_tone(translated_blocks, use_tone),
+        )
+
+    @staticmethod
+    def blocks_with_tone(translated_blocks: List, use_tone: bool = True) -> List:
+        """
+        Convert cached block dicts into TranslatedBlock-like objects.
+        
+        Args:
+            translated_blocks: List of block dicts (may have tone_customized_text)
+            use_tone: If True, use tone_customized_text when available
+            
+        Returns:
+            Blocks ready for reconstruction
+        """
         # Create TranslatedBlock objects, selecting text appropriately
         blocks_for_reconstruction = []
         
@@ -516,7 +1060,4 @@ class PDFReconstructionService:
             block_proxy = BlockProxy(block_data, selected_text)
             blocks_for_reconstruction.append(block_proxy)
         
-        return PDFReconstructionService.reconstruct_pdf(
-            original_pdf_bytes,
-            blocks_for_reconstruction,
-        )
+        return blocks_for_reconstruction
@@ -10,6 +10,7 @@ from redis.asyncio import Redis
 from app.cache import Cache, CacheKeys
 from app.schemas.pdf import Block, Coordinates, PDFExtractionResult
 from app.logger import info, warning, error as log_error
+from app.services.document_ir import DocumentIRBuilder, DocumentIRStore
 
 # Try to import pdf2zh, fallback to PyMuPDF if not available
 try:
@@ -76,6 +77,10 @@ class PDFService:
         except Exception as e:
             warning("Failed to cache PDF extraction result", exc=e, translation_id=translation_id)
         
+        # Persist the parsed layout next to the blocks so reconstruction doesn't parse again
+        if result.document_ir is not None:
+            await DocumentIRStore(redis).save(translation_id, result.document_ir)
+        
         return result
 
     @staticmethod
@@ -222,11 +227,18 @@ class PDFService:
                 blocks: List[Block] = []
                 total_characters = 0
                 page_count = len(babel_doc.pages) if hasattr(babel_doc, 'pages') else 0
+                ir_builder = DocumentIRBuilder(engine="pdf2zh")
                 
                 # Extract blocks from parsed document
                 for page_idx, page in enumerate(babel_doc.pages if hasattr(babel_doc, 'pages') else []):
                     page_width = page.width if hasattr(page, 'width') else 612  # Default letter width
                     page_height = page.height if hasattr(page, 'height') else 792  # Default letter height
+                    ir_builder.add_page(
+                        page_idx,
+                        page_width,
+                        page_height,
+                        int(getattr(page, 'rotation', 0) or 0),
+                    )
                     
                     # Get text blocks from page
                     page_blocks = page.blocks if hasattr(page, 'blocks') else []
@@ -273,6 +285,8 @@ class PDFService:
                         )
                         
                         blocks.append(extracted_block)
+                        # Layout blocks carry no span detail; the block box stands in
+                        ir_builder.add_span(page_idx, block_id, (x0, y0, x1, y1), str(font_name), float(font_size))
                         total_characters += len(text)
                         block_id += 1
                 
@@ -300,6 +314,7 @@ class PDFService:
                     is_scanned=is_scanned,
                     total_characters=total_characters,
                     extraction_time_ms=extraction_time_ms,
+                    document_ir=ir_builder.build(),
                 )
                 
             except (ImportError, AttributeError) as e:
@@ -329,12 +344,14 @@ class PDFService:
             
             blocks: List[Block] = []
             total_characters = 0
+            ir_builder = DocumentIRBuilder(engine="pymupdf")
             
             # Extract text from each page
             for page_num in range(len(doc)):
                 page = doc[page_num]
                 page_width = page.rect.width
                 page_height = page.rect.height
+                ir_builder.add_page(page_num, page_width, page_height, page.rotation)
                 
                 # Get text with detailed layout information
                 text_dict = page.get_text("dict")
@@ -349,11 +366,14 @@ class PDFService:
                     # Extract text from lines within the block
                     text_lines = []
                     font_info = None
+                    block_spans = []
                     
                     for line in block.get("lines", []):
                         line_text = ""
                         for span in line.get("spans", []):
                             line_text += span.get("text", "")
+                            if span.get("text", "").strip():
+                                block_spans.append(span)
                             # Capture font info from first span
                             if not font_info:
                                 font_info = {
@@ -408,6 +428,14 @@ class PDFService:
                     )
                     
                     blocks.append(extracted_block)
+                    for span in block_spans:
+                        ir_builder.add_span(
+                            page_num,
+                            block_id,
+                            span["bbox"],
+                            span.get("font", "Unknown"),
+                            span.get("size", 12),
+                        )
                     total_characters += len(text)
                     block_id += 1
             
@@ -444,6 +472,7 @@ class PDFService:
                 is_scanned=is_scanned,
                 total_characters=total_characters,
                 extraction_time_ms=extraction_time_ms,
+                document_ir=ir_builder.build(),
             )
             
         except fitz.EmptyFileError as e:
@@ -500,20 +529,8 @@ class PDFService:
         Returns:
             Number of pages
         """
-        # Try PDFMathTranslate first, fallback to PyMuPDF
-        if PDF2ZH_AVAILABLE:
-            try:
-                from pdf2zh_next.babeldoc import BabelDoc
-                from pdf2zh_next.settings import SettingsModel
-                
-                settings = SettingsModel()
-                babel_doc = BabelDoc(pdf_path, settings)
-                babel_doc.parse()
-                return len(babel_doc.pages) if hasattr(babel_doc, 'pages') else 0
-            except (ImportError, AttributeError, Exception):
-                pass  # Fallback to PyMuPDF
-        
-        # Fallback to PyMuPDF
+        # PyMuPDF reads the page tree only; a pdf2zh parse here would run the
+        # full layout analysis a second time
         try:
             import fitz  # PyMuPDF
             doc = fitz.open(pdf_path)
@@ -0,0 +1,308 @@
+"""Page previews: thumbnails and zoom tiles rendered in a process pool"""
+
+import asyncio
+import hashlib
+import io
+import json
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from redis.asyncio import Redis
+
+from app.cache import Cache, CacheKeys
+from app.config import get_settings
+from app.logger import info, warning
+from app.s3 import S3Keys, upload_file
+from app.services.text_layer import IMMUTABLE_CACHE_CONTROL
+
+# Pillow encodes WebP; without it previews fall back to PNG from MuPDF
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+    warning("Pillow not available, page previews will be encoded as PNG")
+
+# PDFs a job has previews for
+PREVIEW_KINDS = ("original", "translated")
+
+# Pages rendered per pool task (uploaded together when it finishes)
+PAGES_PER_RANGE = 4
+
+# Same lifetime as the page artifact index
+MANIFEST_EXPIRATION_SECONDS = 7 * 24 * 60 * 60
+
+_WEBP_QUALITY = 80
+
+# Own pool, so previews never queue behind reconstruction work
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_workers = 0
+
+
+def _get_process_pool(workers: int) -> ProcessPoolExecutor:
+    """Get the shared preview process pool, resizing it if needed"""
+    global _process_pool, _process_pool_workers
+    if _process_pool is None or _process_pool_workers != workers:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=False)
+        # spawn: forking a threaded server process (uvicorn, MuPDF state) is unsafe
+        _process_pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        _process_pool_workers = workers
+    return _process_pool
+
+
+@dataclass(frozen=True)
+class PreviewOptions:
+    """What to render for each page (sent to pool workers)"""
+
+    thumbnail_width: int = 240
+    zoom_levels: Tuple[float, ...] = (1.5, 3.0)
+    tile_size: int = 512
+    image_format: str = "png"
+
+    @classmethod
+    def from_settings(cls) -> "PreviewOptions":
+        settings = get_settings()
+        image_format = settings.preview_image_format.lower()
+        if image_format == "webp" and not PIL_AVAILABLE:
+            image_format = "png"
+        return cls(
+            thumbnail_width=settings.preview_thumbnail_width,
+            zoom_levels=tuple(
+                float(zoom) for zoom in settings.preview_zoom_levels.split(",") if zoom.strip()
+            ),
+            tile_size=settings.preview_tile_size,
+            image_format=image_format,
+        )
+
+    @property
+    def thumbnail_template(self) -> str:
+        return f"{{page}}/thumbnail.{self.image_format}"
+
+    @property
+    def tile_template(self) -> str:
+        return f"{{page}}/{{zoom}}/{{column}}-{{row}}.{self.image_format}"
+
+
+def _encode(pixmap, image_format: str) -> bytes:
+    if image_format == "webp":
+        image = Image.frombytes("RGB", (pixmap.width, pixmap.height), pixmap.samples)
+        buffer = io.BytesIO()
+        image.save(buffer, "WEBP", quality=_WEBP_QUALITY)
+        return buffer.getvalue()
+    return pixmap.tobytes("png")
+
+
+def render_page_previews(page, options: PreviewOptions) -> Tuple[dict, List[Tuple[str, bytes]]]:
+    """
+    Render one page's thumbnail and tiles.
+
+    The page is interpreted once into a display list; each zoom level is
+    rasterized once and cut into tiles.
+
+    Args:
+        page: PyMuPDF page
+        options: Preview options
+
+    Returns:
+        (manifest entry for the page, [(path relative to the manifest, image bytes)])
+    """
+    import fitz  # PyMuPDF
+
+    page_num = page.number
+    display_list = page.get_displaylist()
+    rect = page.rect
+
+    scale = options.thumbnail_width / rect.width
+    thumbnail = display_list.get_pixmap(matrix=fitz.Matrix(scale, scale), alpha=False)
+    files = [(options.thumbnail_template.format(page=page_num), _encode(thumbnail, options.image_format))]
+
+    size = options.tile_size
+    levels = []
+    for zoom in options.zoom_levels:
+        full = display_list.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+        columns = math.ceil(full.width / size)
+        rows = math.ceil(full.height / size)
+        for row in range(rows):
+            for column in range(columns):
+                x0 = full.x + column * size
+                y0 = full.y + row * size
+                tile = fitz.Pixmap(
+                    full.colorspace,
+                    fitz.IRect(x0, y0, min(x0 + size, full.x + full.width), min(y0 + size, full.y + full.height)),
+                    False,
+                )
+                tile.copy(full, tile.irect)
+                path = options.tile_template.format(page=page_num, zoom=f"{zoom:g}", column=column, row=row)
+                files.append((path, _encode(tile, options.image_format)))
+        levels.append({
+            "zoom": zoom,
+            "width": full.width,
+            "height": full.height,
+            "columns": columns,
+            "rows": rows,
+        })
+
+    entry = {
+        "page": page_num,
+        "width": round(rect.width, 2),
+        "height": round(rect.height, 2),
+        "levels": levels,
+    }
+    return entry, files
+
+
+def _render_preview_range(
+    source_bytes: bytes,
+    start: int,
+    stop: int,
+    options: PreviewOptions,
+) -> List[Tuple[dict, List[Tuple[str, bytes]]]]:
+    """Process pool worker: render previews of pages [start, stop)"""
+    import fitz  # PyMuPDF
+
+    with fitz.open(stream=source_bytes, filetype="pdf") as pdf_doc:
+        return [render_page_previews(pdf_doc[page_num], options) for page_num in range(start, stop)]
+
+
+class PreviewRenderer:
+    """
+    Renders page previews of a job's PDFs for the review UI.
+
+    Features:
+    - A thumbnail per page plus fixed-size tiles at each zoom level, as
+      WebP (PNG without Pillow), so the UI never rasterizes PDFs itself
+    - Page ranges render in a process pool (serially where a pool can't
+      start, e.g. in daemonic Celery workers); each range's images are
+      uploaded in parallel as soon as it finishes, while others render
+    - Images are stored under a digest of the PDF and served with
+      immutable caching; re-rendering the same PDF is skipped
+    - A manifest per PDF (page sizes, tile grids, path templates) is
+      stored next to the images and kept in Redis for the API
+    """
+
+    def __init__(self, redis: Redis, options: Optional[PreviewOptions] = None):
+        self.cache = Cache(redis)
+        self.options = options or PreviewOptions.from_settings()
+
+    async def load_manifest(self, job_id: str, kind: str) -> Optional[dict]:
+        """Get the manifest of a job's rendered previews, or None if not rendered"""
+        return await self.cache.hget_json(CacheKeys.previews(job_id), kind)
+
+    async def render(self, job_id: str, user_id: str, kind: str, pdf_bytes: bytes) -> dict:
+        """
+        Render and upload previews of one of a job's PDFs.
+
+        Args:
+            job_id: Translation job ID
+            user_id: Owner of the job (storage keys are per user)
+            kind: "original" or "translated"
+            pdf_bytes: PDF content
+
+        Returns:
+            Preview manifest
+        """
+        import fitz  # PyMuPDF
+
+        version = hashlib.sha256(pdf_bytes).hexdigest()[:16]
+        current = await self.load_manifest(job_id, kind)
+        if current and current["version"] == version:
+            return current
+
+        with fitz.open(stream=pdf_bytes, filetype="pdf") as pdf_doc:
+            page_count = pdf_doc.page_count
+        ranges = [
+            (start, min(start + PAGES_PER_RANGE, page_count))
+            for start in range(0, page_count, PAGES_PER_RANGE)
+        ]
+
+        def key(name: str) -> str:
+            return S3Keys.preview_path(user_id, job_id, kind, f"{version}/{name}")
+
+        workers = get_settings().preview_workers or os.cpu_count() or 1
+        pages = None
+        if workers > 1 and len(ranges) > 1:
+            try:
+                pages = await self._render_ranges(pdf_bytes, ranges, key, workers)
+            except (AssertionError, OSError, BrokenProcessPool) as e:
+                warning(
+                    "Parallel preview rendering unavailable, rendering serially",
+                    exc=e,
+                    job_id=job_id,
+                )
+        if pages is None:
+            pages = await self._render_ranges(pdf_bytes, ranges, key)
+
+        manifest = {
+            "version": version,
+            "format": self.options.image_format,
+            "tile_size": self.options.tile_size,
+            # Relative to the manifest, so they resolve under any base URL
+            "thumbnail": self.options.thumbnail_template,
+            "tile": self.options.tile_template,
+            "pages": sorted(pages, key=lambda page: page["page"]),
+        }
+        await upload_file(
+            file_data=json.dumps(manifest, separators=(",", ":")).encode(),
+            key=key("manifest.json"),
+            content_type="application/json",
+            cache_control=IMMUTABLE_CACHE_CONTROL,
+        )
+        await self.cache.hset_json(
+            CacheKeys.previews(job_id),
+            kind,
+            manifest,
+            expire_seconds=MANIFEST_EXPIRATION_SECONDS,
+        )
+
+        info(
+            "Page previews rendered",
+            job_id=job_id,
+            kind=kind,
+            version=version,
+            page_count=page_count,
+            workers=workers if len(ranges) > 1 else 1,
+        )
+        return manifest
+
+    async def _render_ranges(self, pdf_bytes: bytes, ranges, key, workers: int = 1) -> List[dict]:
+        """Render page ranges (in a pool when workers > 1), uploading each as it completes"""
+        if workers > 1:
+            loop = asyncio.get_running_loop()
+            pool = _get_process_pool(workers)
+            pending = asyncio.as_completed([
+                loop.run_in_executor(pool, _render_preview_range, pdf_bytes, start, stop, self.options)
+                for start, stop in ranges
+            ])
+        else:
+            pending = (
+                asyncio.to_thread(_render_preview_range, pdf_bytes, start, stop, self.options)
+                for start, stop in ranges
+            )
+
+        pages = []
+        for rendered_range in pending:
+            rendered = await rendered_range
+            await asyncio.gather(*(
+                self._upload(key(name), data)
+                for _, files in rendered
+                for name, data in files
+            ))
+            pages.extend(entry for entry, _ in rendered)
+        return pages
+
+    async def _upload(self, key: str, data: bytes) -> None:
+        await upload_file(
+            file_data=data,
+            key=key,
+            content_type=f"image/{self.options.image_format}",
+            cache_control=IMMUTABLE_CACHE_CONTROL,
+        )
@@ -0,0 +1,147 @@
+"""Spatial lookup of page text for redaction"""
+
+from typing import Dict, Iterable, List, Tuple
+
+# (x0, y0, x1, y1) in page coordinates
+Box = Tuple[float, float, float, float]
+
+
+def _intersects(a: Box, b: Box) -> bool:
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def _area(box: Box) -> float:
+    return max(box[2] - box[0], 0.0) * max(box[3] - box[1], 0.0)
+
+
+class PageTextIndex:
+    """
+    Uniform grid over a page's character boxes.
+
+    Features:
+    - Built from one ``rawdict`` extraction per page
+    - ``query`` returns the text covered by a rectangle as one box per
+      text line, touching only the grid cells the rectangle overlaps
+
+    Replaces a full-page text search per block, which made dense pages
+    (tables, reference lists) cost O(blocks x page text).
+    """
+
+    # Grid cell edge in points (roughly two lines of body text)
+    CELL_SIZE = 24.0
+
+    def __init__(self, chars: List[Tuple[Box, int]]):
+        """
+        Args:
+            chars: (character box, line id) pairs
+        """
+        self.chars = chars
+        self.cells: Dict[Tuple[int, int], List[int]] = {}
+        for idx, (box, _) in enumerate(chars):
+            for cell in self._cells(box):
+                self.cells.setdefault(cell, []).append(idx)
+
+    @classmethod
+    def from_page(cls, page) -> "PageTextIndex":
+        """Index the characters of a PyMuPDF page"""
+        chars: List[Tuple[Box, int]] = []
+        line_id = 0
+        for block in page.get_text("rawdict")["blocks"]:
+            if block.get("type") != 0:  # Image block
+                continue
+            for line in block["lines"]:
+                for span in line["spans"]:
+                    for char in span["chars"]:
+                        box = tuple(char["bbox"])
+                        if box[2] > box[0] and box[3] > box[1]:
+                            chars.append((box, line_id))
+                line_id += 1
+        return cls(chars)
+
+    def _cells(self, box: Box) -> Iterable[Tuple[int, int]]:
+        size = self.CELL_SIZE
+        for cx in range(int(box[0] // size), int(box[2] // size) + 1):
+            for cy in range(int(box[1] // size), int(box[3] // size) + 1):
+                yield cx, cy
+
+    def query(self, rect: Box) -> List[Box]:
+        """
+        Text covered by ``rect``.
+
+        Args:
+            rect: Query rectangle
+
+        Returns:
+            Bounding box of the intersecting characters of each text line
+            (boxes may extend past ``rect`` to whole glyphs)
+        """
+        seen = set()
+        lines: Dict[int, Box] = {}
+        for cell in self._cells(rect):
+            for idx in self.cells.get(cell, ()):
+                if idx in seen:
+                    continue
+                seen.add(idx)
+                box, line_id = self.chars[idx]
+                if not _intersects(box, rect):
+                    continue
+                current = lines.get(line_id)
+                lines[line_id] = box if current is None else (
+                    min(current[0], box[0]),
+                    min(current[1], box[1]),
+                    max(current[2], box[2]),
+                    max(current[3], box[3]),
+                )
+        return [lines[line_id] for line_id in sorted(lines)]
+
+
+def merge_overlapping(boxes: Iterable[Box], slack: float = 0.1) -> List[Box]:
+    """
+    Merge overlapping rectangles with a sweep along x.
+
+    Two overlapping rectangles are replaced by their bounding box only when
+    it covers at most ``slack`` more area than the rectangles themselves,
+    so merging never redacts much beyond what was asked for.
+
+    Args:
+        boxes: Rectangles to merge
+        slack: Allowed extra area, as a fraction of the rectangles' union
+
+    Returns:
+        Merged rectangles, sorted by x0
+    """
+    done: List[Box] = []
+    active: List[Box] = []
+    for box in sorted(boxes):
+        # Boxes arrive by x0, so anything ending left of this one is final
+        still_active = []
+        for other in active:
+            (done if other[2] < box[0] else still_active).append(other)
+        active = still_active
+
+        changed = True
+        while changed:
+            changed = False
+            for idx, other in enumerate(active):
+                if not _intersects(other, box):
+                    continue
+                bounds = (
+                    min(other[0], box[0]),
+                    min(other[1], box[1]),
+                    max(other[2], box[2]),
+                    max(other[3], box[3]),
+                )
+                overlap = (
+                    max(other[0], box[0]),
+                    max(other[1], box[1]),
+                    min(other[2], box[2]),
+                    min(other[3], box[3]),
+                )
+                union_area = _area(other) + _area(box) - _area(overlap)
+                if _area(bounds) <= union_area * (1 + slack):
+                    box = bounds
+                    del active[idx]
+                    changed = True
+                    break
+        active.append(box)
+    return sorted(done + active)
@@ -0,0 +1,97 @@
+"""Named PDF save profiles: fast output for interactive use, optimized output for storage"""
+
+import shutil
+from dataclasses import dataclass
+from typing import Dict
+
+from app.logger import warning
+
+
+@dataclass(frozen=True)
+class SaveProfile:
+    """
+    How a reconstructed document is written.
+
+    Attributes:
+        name: Profile name (SAVE_PROFILES key)
+        garbage: PyMuPDF garbage collection level (1 = drop unused objects,
+            4 = also merge duplicate objects, which is the expensive part)
+        deflate: Compress uncompressed streams
+        use_objstms: Pack objects into compressed object streams
+        incremental: Append changes to the original file instead of
+            rewriting it, when the document was opened from a file
+    """
+    name: str
+    garbage: int
+    deflate: bool = True
+    use_objstms: bool = False
+    incremental: bool = False
+
+    def _save_incremental(self, pdf_doc) -> bool:
+        """
+        Append changes to the document's own file.
+
+        MuPDF advises against incremental saves after redaction because the
+        original objects stay in the file. Reconstruction redacts to replace
+        the user's own text, not to hide it, so previews accept that; the
+        archival profile always rewrites the file.
+
+        Returns:
+            False if the profile isn't incremental, the document was opened
+            from memory or the save failed (callers then write in full)
+        """
+        import fitz  # PyMuPDF
+
+        if not (self.incremental and pdf_doc.name):
+            return False
+        try:
+            pdf_doc.save(
+                pdf_doc.name,
+                incremental=True,
+                encryption=fitz.PDF_ENCRYPT_KEEP,
+                no_new_id=True,
+            )
+            return True
+        except Exception as e:
+            warning("Incremental save failed, writing full document", exc=e, profile=self.name)
+            return False
+
+    def _options(self) -> dict:
+        # no_new_id: a random trailer ID would make every save differ
+        return {
+            "garbage": self.garbage,
+            "deflate": self.deflate,
+            "use_objstms": int(self.use_objstms),
+            "no_new_id": True,
+        }
+
+    def write(self, pdf_doc) -> bytes:
+        """Serialize a document with this profile"""
+        if self._save_incremental(pdf_doc):
+            with open(pdf_doc.name, "rb") as f:
+                return f.read()
+        return pdf_doc.tobytes(**self._options())
+
+    def save(self, pdf_doc, path: str) -> None:
+        """Write a document to ``path`` with this profile, without building it in memory"""
+        if self._save_incremental(pdf_doc):
+            shutil.copyfile(pdf_doc.name, path)
+            return
+        pdf_doc.save(path, **self._options())
+
+
+INTERACTIVE = SaveProfile(name="interactive", garbage=1, incremental=True)
+ARCHIVAL = SaveProfile(name="archival", garbage=4, use_objstms=True)
+
+SAVE_PROFILES: Dict[str, SaveProfile] = {
+    profile.name: profile for profile in (INTERACTIVE, ARCHIVAL)
+}
+
+
+def get_save_profile(name: str) -> SaveProfile:
+    """Look up a profile by name, falling back to archival for unknown names"""
+    profile = SAVE_PROFILES.get(name)
+    if profile is None:
+        warning("Unknown save profile, using archival", profile=name)
+        return ARCHIVAL
+    return profile
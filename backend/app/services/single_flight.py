@@ -0,0 +1,143 @@
+"""Request coalescing (single-flight) for idempotent provider calls"""
+
+import asyncio
+import hashlib
+import json
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from redis.asyncio import Redis
+
+from app.cache import CacheKeys
+from app.config import get_settings
+from app.logger import warning
+
+
+def content_hash(*parts: Any) -> str:
+    """Stable SHA-256 of JSON-serializable request parts"""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    """
+    Coalesce identical requests into one provider call.
+
+    Features:
+    - In-process: concurrent callers with the same key await one task
+    - Across replicas: a Redis lock elects one caller, the others poll the
+      result key written when it finishes
+    - Short-TTL result cache so retries and double-clicks are free
+    - Failures are never cached; if Redis is unavailable the call runs uncoalesced
+
+    Results must be JSON-serializable.
+    """
+
+    # In-flight tasks for this process, keyed by flight key
+    _inflight: Dict[str, asyncio.Future] = {}
+
+    def __init__(
+        self,
+        redis: Redis,
+        namespace: str,
+        result_ttl_seconds: Optional[int] = None,
+        lock_ttl_seconds: Optional[int] = None,
+        wait_timeout_seconds: Optional[float] = None,
+        poll_interval_seconds: float = 0.1,
+    ):
+        """
+        Args:
+            redis: Redis client
+            namespace: Key namespace (e.g. "alternatives")
+            result_ttl_seconds: How long finished results are reused
+            lock_ttl_seconds: Lock lifetime (bounds a crashed leader)
+            wait_timeout_seconds: How long followers wait before calling themselves
+            poll_interval_seconds: Result key polling interval for followers
+        """
+        settings = get_settings()
+        self.redis = redis
+        self.namespace = namespace
+        self.result_ttl_seconds = result_ttl_seconds or settings.single_flight_result_ttl_seconds
+        self.lock_ttl_seconds = lock_ttl_seconds or settings.single_flight_lock_ttl_seconds
+        self.wait_timeout_seconds = wait_timeout_seconds or settings.single_flight_wait_timeout_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> tuple[Any, bool]:
+        """
+        Run ``fn`` once for all concurrent callers with the same key.
+
+        Args:
+            key: Content hash of the request (see ``content_hash``)
+            fn: Coroutine factory performing the provider call
+
+        Returns:
+            Tuple of (result, shared). ``shared`` is True when the result came
+            from another caller's call or the result cache.
+        """
+        flight_key = f"{self.namespace}:{key}"
+
+        inflight = self._inflight.get(flight_key)
+        if inflight is not None:
+            return await asyncio.shield(inflight), True
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[flight_key] = future
+        try:
+            result, shared = await self._do_distributed(key, fn)
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so an unawaited failure isn't logged by asyncio
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result, shared
+        finally:
+            self._inflight.pop(flight_key, None)
+
+    async def _do_distributed(self, key: str, fn: Callable[[], Awaitable[Any]]) -> tuple[Any, bool]:
+        result_key = CacheKeys.single_flight_result(self.namespace, key)
+        lock_key = CacheKeys.single_flight_lock(self.namespace, key)
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self.wait_timeout_seconds
+
+        acquired = False
+        try:
+            while True:
+                cached = await self.redis.get(result_key)
+                if cached is not None:
+                    return json.loads(cached), True
+
+                if await self.redis.set(lock_key, token, ex=self.lock_ttl_seconds, nx=True):
+                    acquired = True
+                    break
+
+                if time.monotonic() >= deadline:
+                    warning(
+                        "Single-flight wait timed out, calling provider directly",
+                        namespace=self.namespace,
+                        key=key,
+                    )
+                    break
+
+                await asyncio.sleep(self.poll_interval_seconds)
+        except Exception as e:
+            warning("Single-flight coordination unavailable, calling provider directly", exc=e, namespace=self.namespace)
+
+        if not acquired:
+            return await fn(), False
+
+        try:
+            result = await fn()
+            try:
+                await self.redis.set(result_key, json.dumps(result), ex=self.result_ttl_seconds)
+            except Exception as e:
+                warning("Failed to cache single-flight result", exc=e, namespace=self.namespace)
+            return result, False
+        finally:
+            try:
+                if await self.redis.get(lock_key) == token:
+                    await self.redis.delete(lock_key)
+            except Exception as e:
+                warning("Failed to release single-flight lock", exc=e, namespace=self.namespace)
@@ -0,0 +1,185 @@
+"""Viewer text layer: translated blocks published as static per-page shards"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import posixpath
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from redis.asyncio import Redis
+
+from app.cache import CacheKeys
+from app.logger import info
+from app.s3 import S3Keys, upload_file
+from app.services.block_store import TranslatedBlockStore
+
+# Shards and manifests never change once written (new content gets a new key)
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Coordinates are rounded to this many decimals (sub-pixel at any zoom)
+_BOX_PRECISION = 2
+
+
+def build_page_shards(data: dict) -> Dict[int, dict]:
+    """
+    Group translated blocks into one compact text layer per page.
+
+    Args:
+        data: Translated payload as returned by TranslatedBlockStore.load
+
+    Returns:
+        Shard dict per page number, blocks in document order
+    """
+    pages: Dict[int, List[dict]] = defaultdict(list)
+    for idx, block in enumerate(data.get("blocks", [])):
+        original = block.get("original", {})
+        coords = original.get("coordinates", {})
+        entry = {
+            "id": idx,
+            "box": [
+                round(coords.get(name, 0), _BOX_PRECISION)
+                for name in ("x", "y", "width", "height")
+            ],
+            "src": original.get("text", ""),
+            "dst": block.get("translated_text", ""),
+        }
+        # Optional fields are left out rather than sent as null
+        if block.get("tone_customized_text"):
+            entry["tone"] = block["tone_customized_text"]
+        if block.get("edited_text") is not None:
+            entry["edit"] = block["edited_text"]
+        pages[original.get("page", 0)].append(entry)
+    return {page: {"page": page, "blocks": blocks} for page, blocks in sorted(pages.items())}
+
+
+def encode_shard(shard: dict) -> tuple[str, bytes]:
+    """
+    Serialize a shard as minified, gzipped JSON.
+
+    Returns:
+        (digest of the JSON, compressed bytes); equal content always gives
+        equal bytes, so unchanged pages keep their key
+    """
+    payload = json.dumps(shard, ensure_ascii=False, separators=(",", ":")).encode()
+    digest = hashlib.sha256(payload).hexdigest()[:16]
+    return digest, gzip.compress(payload, compresslevel=9, mtime=0)
+
+
+class TextLayerPublisher:
+    """
+    Publishes a job's text layer to the object store for the viewer.
+
+    Features:
+    - One shard per page (block boxes plus original, translated, tone and
+      edited text) keyed by a digest of its content, served with immutable
+      caching so a CDN or browser can keep it forever
+    - A manifest per version lists the page shards; the version is a digest
+      of the page digests
+    - Republishing uploads only pages whose content changed
+    - A Redis hash tracks the published pages; block updates bump its
+      generation, marking the manifest stale until the next publish
+
+    Old shards stay readable (viewers holding an older manifest keep
+    working) and are removed with the job.
+    """
+
+    def __init__(self, redis: Redis):
+        self.redis = redis
+
+    async def load_manifest(self, job_id: str) -> Optional[dict]:
+        """
+        Get the current published manifest.
+
+        Returns:
+            {"version": str, "pages": {page: digest}}, or None if nothing
+            is published or blocks changed since
+        """
+        raw = await self.redis.hgetall(CacheKeys.text_layer(job_id))
+        version = raw.get("version")
+        if not version or raw.get("built_from") != raw.get("generation", "0"):
+            return None
+        return {"version": version, "pages": self._page_digests(raw)}
+
+    async def publish(self, job_id: str, user_id: str) -> Optional[dict]:
+        """
+        Publish the job's current blocks.
+
+        Args:
+            job_id: Translation job ID
+            user_id: Owner of the job (storage keys are per user)
+
+        Returns:
+            Manifest as returned by load_manifest, or None if the job has
+            no cached blocks
+        """
+        index_key = CacheKeys.text_layer(job_id)
+        raw = await self.redis.hgetall(index_key)
+        # Read before the blocks, so an update landing mid-publish leaves
+        # the result stale rather than current
+        generation = raw.get("generation", "0")
+        published = self._page_digests(raw)
+
+        data = await TranslatedBlockStore(self.redis).load(job_id)
+        if not data:
+            return None
+
+        encoded = {page: encode_shard(shard) for page, shard in build_page_shards(data).items()}
+        pages = {page: digest for page, (digest, _) in encoded.items()}
+        shard_keys = {
+            page: S3Keys.text_layer_shard_path(user_id, job_id, page, digest)
+            for page, digest in pages.items()
+        }
+        changed = [page for page, digest in pages.items() if published.get(page) != digest]
+        await asyncio.gather(*(self._upload(shard_keys[page], encoded[page][1]) for page in changed))
+
+        version = hashlib.sha256(
+            ",".join(f"{page}:{digest}" for page, digest in pages.items()).encode()
+        ).hexdigest()[:16]
+        manifest_key = S3Keys.text_layer_manifest_path(user_id, job_id, version)
+        base = posixpath.dirname(manifest_key) + "/"
+        manifest = {
+            "version": version,
+            # Shard paths are relative to the manifest, so they resolve under any base URL
+            "pages": [
+                {"page": page, "path": key.removeprefix(base)}
+                for page, key in shard_keys.items()
+            ],
+        }
+        await self._upload(
+            manifest_key,
+            gzip.compress(json.dumps(manifest, separators=(",", ":")).encode(), mtime=0),
+        )
+
+        for page, digest in pages.items():
+            await self.redis.hset(index_key, f"page:{page}", digest)
+        await self.redis.hset(index_key, "version", version)
+        await self.redis.hset(index_key, "built_from", generation)
+        await self.redis.expire(index_key, TranslatedBlockStore.CACHE_EXPIRATION_SECONDS)
+
+        info(
+            "Text layer published",
+            job_id=job_id,
+            version=version,
+            page_count=len(pages),
+            uploaded_pages=len(changed),
+        )
+        return {"version": version, "pages": pages}
+
+    async def _upload(self, key: str, data: bytes) -> None:
+        await upload_file(
+            file_data=data,
+            key=key,
+            content_type="application/json",
+            content_encoding="gzip",
+            cache_control=IMMUTABLE_CACHE_CONTROL,
+        )
+
+    @staticmethod
+    def _page_digests(raw: dict) -> Dict[int, str]:
+        return {
+            int(field.removeprefix("page:")): digest
+            for field, digest in raw.items()
+            if field.startswith("page:")
+        }
@@ -0,0 +1,267 @@
+"""Text fitting for translated blocks: cached glyph metrics, line breaking and font sizing"""
+
+import math
+from dataclasses import dataclass
+from typing import Dict, List
+
+from app.services.font_manager import FontManager
+
+# Characters that may not begin a line (closing punctuation, small kana)
+NO_LINE_START = frozenset(
+    "、。，．・：；？！ー―…‥）〕］｝〉》」』】〙〗〟’”｠»"
+    "ぁぃぅぇぉっゃゅょゎゕゖァィゥェォッャュョヮヵヶㇰㇱㇲㇳㇴㇵㇶㇷㇸㇹㇺㇻㇼㇽㇾㇿ々〻"
+    ",.;:!?)]}%"
+)
+
+# Characters that may not end a line (opening punctuation)
+NO_LINE_END = frozenset("（〔［｛〈《「『【〘〖〝‘“｟«([{$")
+
+# Scripts written without spaces, where a line may break between any two characters
+_CJK_RANGES = (
+    (0x2E80, 0x2FDF),  # CJK radicals
+    (0x3000, 0x303F),  # CJK symbols and punctuation
+    (0x3040, 0x30FF),  # Hiragana, Katakana
+    (0x31F0, 0x31FF),  # Katakana phonetic extensions
+    (0x3400, 0x4DBF),  # CJK extension A
+    (0x4E00, 0x9FFF),  # CJK unified ideographs
+    (0xF900, 0xFAFF),  # CJK compatibility ideographs
+    (0xFF00, 0xFFEF),  # Half/fullwidth forms
+    (0x20000, 0x2FA1F),  # CJK extensions B-F, compatibility supplement
+)
+
+
+def is_cjk(char: str) -> bool:
+    """True if a line may break before or after ``char`` without a space"""
+    code = ord(char)
+    return any(start <= code <= end for start, end in _CJK_RANGES)
+
+
+class GlyphMetrics:
+    """
+    Advance widths of one font at size 1, cached per process.
+
+    Features:
+    - Measures the process-wide font from FontManager, loaded on first use
+    - Per-character widths memoized, so measuring a string is a dict
+      lookup per character instead of a font call
+    - Line height computed the way ``insert_textbox`` does
+    """
+
+    _by_font: Dict[str, "GlyphMetrics"] = {}
+
+    def __init__(self, fontname: str):
+        self.fontname = fontname
+        self.font = FontManager.font(fontname)
+        self.ascender = self.font.ascender
+        self.descender = self.font.descender
+        # insert_textbox uses 1.2 for fonts with a degenerate ascender/descender
+        spread = self.ascender - self.descender
+        self.line_height = spread if spread > 1 else 1.2
+        self.widths: Dict[str, float] = {}
+
+    @classmethod
+    def for_font(cls, fontname: str) -> "GlyphMetrics":
+        """Get the shared metrics for a font"""
+        metrics = cls._by_font.get(fontname)
+        if metrics is None:
+            metrics = cls._by_font[fontname] = cls(fontname)
+        return metrics
+
+    def char_width(self, char: str) -> float:
+        width = self.widths.get(char)
+        if width is None:
+            width = self.widths[char] = self.font.text_length(char, fontsize=1)
+        return width
+
+    def text_width(self, text: str) -> float:
+        """Width of ``text`` at font size 1"""
+        widths = self.widths
+        total = 0.0
+        for char in text:
+            width = widths.get(char)
+            total += width if width is not None else self.char_width(char)
+        return total
+
+    def text_height(self, line_count: int, font_size: float) -> float:
+        """Height of ``line_count`` lines, as insert_textbox measures it"""
+        return font_size * (self.line_height * line_count - self.descender)
+
+
+def break_units(text: str) -> List[str]:
+    """
+    Split one paragraph into units a line may break between.
+
+    Latin words stay whole, CJK characters stand alone, spaces are their
+    own units, and kinsoku rules keep closing punctuation off the start of
+    a line and opening punctuation off its end.
+    """
+    units: List[str] = []
+    word = ""
+    for char in text:
+        if char == " ":
+            if word:
+                units.append(word)
+                word = ""
+            units.append(" ")
+        elif is_cjk(char):
+            if word:
+                units.append(word)
+                word = ""
+            units.append(char)
+        else:
+            word += char
+    if word:
+        units.append(word)
+
+    merged: List[str] = []
+    glue_next = False
+    for unit in units:
+        if unit == " ":
+            merged.append(unit)
+            glue_next = False
+            continue
+        if glue_next or (merged and merged[-1] != " " and unit[0] in NO_LINE_START):
+            merged[-1] += unit
+        else:
+            merged.append(unit)
+        glue_next = unit[-1] in NO_LINE_END
+    return merged
+
+
+def wrap_text(text: str, max_width: float, metrics: GlyphMetrics) -> List[str]:
+    """
+    Greedy line breaking.
+
+    Args:
+        text: Text to wrap (existing newlines are kept)
+        max_width: Line width in font-size-1 units
+        metrics: Metrics of the font the text will be set in
+
+    Returns:
+        Lines, none wider than ``max_width``
+    """
+    space_width = metrics.char_width(" ")
+    lines: List[str] = []
+    for paragraph in text.splitlines() or [""]:
+        line = ""
+        width = 0.0
+        pending_space = False
+        for unit in break_units(paragraph):
+            if unit == " ":
+                pending_space = bool(line)
+                continue
+            unit_width = metrics.text_width(unit)
+            gap = space_width if pending_space else 0.0
+            if line and width + gap + unit_width <= max_width:
+                line += (" " if pending_space else "") + unit
+                width += gap + unit_width
+            else:
+                if line:
+                    lines.append(line)
+                line, width = "", 0.0
+                if unit_width <= max_width:
+                    line, width = unit, unit_width
+                else:
+                    # Unit longer than a line: break between characters
+                    for char in unit:
+                        char_width = metrics.char_width(char)
+                        if line and width + char_width > max_width:
+                            lines.append(line)
+                            line, width = "", 0.0
+                        line += char
+                        width += char_width
+            pending_space = False
+        lines.append(line)
+    return lines
+
+
+@dataclass
+class TextFit:
+    """Result of fitting text into a box"""
+    lines: List[str]
+    font_size: float
+    line_height: float  # Multiple of the font size, as insert_textbox expects
+    truncated: bool  # True if the text did not fit even at the minimum size
+
+
+class TextFitter:
+    """
+    Chooses the largest font size at which text fits a box.
+
+    Features:
+    - Measures with cached glyph widths (GlyphMetrics)
+    - Language-aware wrapping: word breaks for spaced scripts, character
+      breaks with kinsoku rules for CJK
+    - Binary search over font size between the minimum and the original
+      size, so the text is inserted with a single call
+    - Text that cannot fit at the minimum size is truncated with an
+      ellipsis instead of overflowing the block
+    """
+
+    MIN_FONT_SIZE = 4.0
+
+    # Binary search stops when the size interval is this small (points)
+    SIZE_PRECISION = 0.1
+
+    # Guard against rounding differences with insert_textbox's own measuring
+    WIDTH_MARGIN = 0.995
+
+    ELLIPSIS = "..."
+
+    def __init__(self, fontname: str):
+        self.metrics = GlyphMetrics.for_font(fontname)
+
+    def _layout(self, text: str, width: float, size: float) -> List[str]:
+        return wrap_text(text, width * self.WIDTH_MARGIN / size, self.metrics)
+
+    def _fits(self, lines: List[str], height: float, size: float) -> bool:
+        return self.metrics.text_height(len(lines), size) <= height
+
+    def fit(self, text: str, width: float, height: float, max_font_size: float) -> TextFit:
+        """
+        Fit ``text`` into a ``width`` x ``height`` box.
+
+        Args:
+            text: Text to set
+            width: Box width in points
+            height: Box height in points
+            max_font_size: Preferred (original) font size
+
+        Returns:
+            TextFit with the wrapped lines and chosen font size
+        """
+        line_height = self.metrics.line_height
+        lines = self._layout(text, width, max_font_size)
+        if self._fits(lines, height, max_font_size):
+            return TextFit(lines, max_font_size, line_height, truncated=False)
+
+        low = min(self.MIN_FONT_SIZE, max_font_size)
+        low_lines = self._layout(text, width, low)
+        if self._fits(low_lines, height, low):
+            high = max_font_size
+            while high - low > self.SIZE_PRECISION:
+                mid = (low + high) / 2
+                mid_lines = self._layout(text, width, mid)
+                if self._fits(mid_lines, height, mid):
+                    low, low_lines = mid, mid_lines
+                else:
+                    high = mid
+            return TextFit(low_lines, low, line_height, truncated=False)
+
+        # Doesn't fit even at the minimum size: keep the lines that do
+        max_lines = math.floor((height / low + self.metrics.descender) / line_height)
+        if max_lines < 1:
+            # Box shorter than one line at the minimum size: shrink to one line
+            low = height / (line_height - self.metrics.descender)
+            low_lines = self._layout(text, width, low)
+            max_lines = 1
+        kept = low_lines[:max_lines]
+        if len(low_lines) > max_lines:
+            kept[-1] = self._with_ellipsis(kept[-1], width * self.WIDTH_MARGIN / low)
+        return TextFit(kept, low, line_height, truncated=True)
+
+    def _with_ellipsis(self, line: str, max_width: float) -> str:
+        ellipsis_width = self.metrics.text_width(self.ELLIPSIS)
+        while line and self.metrics.text_width(line) + ellipsis_width > max_width:
+            line = line[:-1]
+        return line.rstrip() + self.ELLIPSIS
@@ -0,0 +1,342 @@
+"""Bulk tone customization using provider-side batch submission"""
+
+import uuid
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+import anthropic
+
+from app.config import get_settings
+from app.logger import error as log_error, info, warning
+from app.services.tone_service import ToneCallObservation, ToneService
+
+
+@dataclass
+class ToneBatchResult:
+    """
+    Result for a single request inside a tone batch.
+
+    ``text`` is None when the provider reports the request as errored,
+    canceled or expired; callers fall back to the untoned translation.
+    """
+    custom_id: str  # Request identifier supplied at submission
+    text: Optional[str]  # Tone-customized text (None on failure)
+    input_tokens: int = 0
+    output_tokens: int = 0
+    error: Optional[str] = None
+
+
+class ToneBatchProvider:
+    """
+    Interface for providers that accept a whole job's tone prompts at once.
+
+    Requests use the Anthropic Message Batches wire format:
+    ``{"custom_id": str, "params": <messages.create kwargs>}``.
+    """
+
+    name = "base"
+
+    def submit(self, requests: List[dict]) -> str:
+        """Submit requests and return the provider batch ID"""
+        raise NotImplementedError
+
+    def is_complete(self, batch_id: str) -> bool:
+        """Return True once every request in the batch has a result"""
+        raise NotImplementedError
+
+    def get_results(self, batch_id: str) -> List[ToneBatchResult]:
+        """Return per-request results for a completed batch"""
+        raise NotImplementedError
+
+
+class AnthropicToneBatchProvider(ToneBatchProvider):
+    """Tone batches submitted through the Claude Message Batches API"""
+
+    name = "anthropic"
+
+    def __init__(self, api_key: Optional[str] = None):
+        """
+        Initialize Claude API client.
+
+        Args:
+            api_key: Claude API key (defaults to config)
+        """
+        settings = get_settings()
+        self.api_key = api_key or settings.claude_api_key
+
+        if not self.api_key:
+            raise ValueError("Claude API key not configured")
+
+        self.client = anthropic.Anthropic(api_key=self.api_key)
+
+    def submit(self, requests: List[dict]) -> str:
+        batch = self.client.messages.batches.create(requests=requests)
+        return batch.id
+
+    def is_complete(self, batch_id: str) -> bool:
+        batch = self.client.messages.batches.retrieve(batch_id)
+        return batch.processing_status == "ended"
+
+    def get_results(self, batch_id: str) -> List[ToneBatchResult]:
+        results: List[ToneBatchResult] = []
+        for entry in self.client.messages.batches.results(batch_id):
+            outcome = entry.result
+            if outcome.type == "succeeded":
+                message = outcome.message
+                results.append(
+                    ToneBatchResult(
+                        custom_id=entry.custom_id,
+                        text=message.content[0].text if message.content else None,
+                        input_tokens=message.usage.input_tokens,
+                        output_tokens=message.usage.output_tokens,
+                    )
+                )
+            else:
+                error_detail = getattr(outcome, "error", None)
+                results.append(
+                    ToneBatchResult(
+                        custom_id=entry.custom_id,
+                        text=None,
+                        error=str(error_detail) if error_detail else outcome.type,
+                    )
+                )
+        return results
+
+
+class LocalToneBatchProvider(ToneBatchProvider):
+    """
+    In-process stand-in for the batch API, used by tests and local development.
+
+    Batches live in a class-level registry, so submission and polling must
+    happen in the same process (e.g. Celery eager mode). By default each
+    request is answered with the text it asked to rewrite.
+    """
+
+    name = "local"
+
+    _batches: Dict[str, dict] = {}
+
+    def __init__(
+        self,
+        responder: Optional[Callable[[dict], Optional[str]]] = None,
+        polls_until_complete: int = 0,
+    ):
+        """
+        Args:
+            responder: Maps request params to response text (None = errored)
+            polls_until_complete: Number of ``is_complete`` calls that report
+                the batch as still in progress
+        """
+        self.responder = responder or self._echo
+        self.polls_until_complete = polls_until_complete
+
+    @staticmethod
+    def _echo(params: dict) -> str:
+        content = params["messages"][0]["content"]
+        return content.split("Text to rewrite:\n", 1)[-1]
+
+    def submit(self, requests: List[dict]) -> str:
+        batch_id = f"localbatch_{uuid.uuid4().hex}"
+        self._batches[batch_id] = {
+            "requests": requests,
+            "remaining_polls": self.polls_until_complete,
+        }
+        return batch_id
+
+    def is_complete(self, batch_id: str) -> bool:
+        batch = self._batches.get(batch_id)
+        if batch is None:
+            raise KeyError(f"Unknown batch {batch_id}")
+        if batch["remaining_polls"] > 0:
+            batch["remaining_polls"] -= 1
+            return False
+        return True
+
+    def get_results(self, batch_id: str) -> List[ToneBatchResult]:
+        # Results stay available, as with the Message Batches API, so a
+        # finalize that fails after collecting can collect again
+        batch = self._batches.get(batch_id)
+        if batch is None:
+            raise KeyError(f"Unknown batch {batch_id}")
+        results: List[ToneBatchResult] = []
+        for request in batch["requests"]:
+            params = request["params"]
+            text = self.responder(params)
+            prompt_chars = len(params["system"]) + len(params["messages"][0]["content"])
+            results.append(
+                ToneBatchResult(
+                    custom_id=request["custom_id"],
+                    text=text,
+                    input_tokens=int(prompt_chars * ToneService.TOKENS_PER_CHAR),
+                    output_tokens=int(len(text or "") * ToneService.TOKENS_PER_CHAR),
+                    error=None if text is not None else "errored",
+                )
+            )
+        return results
+
+
+def get_tone_batch_provider(name: Optional[str] = None) -> ToneBatchProvider:
+    """
+    Get the configured tone batch provider.
+
+    Args:
+        name: Provider name (defaults to ``Settings.tone_batch_provider``)
+
+    Returns:
+        ToneBatchProvider instance
+
+    Raises:
+        ValueError: If the provider name is unknown
+    """
+    name = name or get_settings().tone_batch_provider
+    if name == AnthropicToneBatchProvider.name:
+        return AnthropicToneBatchProvider()
+    if name == LocalToneBatchProvider.name:
+        return LocalToneBatchProvider()
+    raise ValueError(f"Unknown tone batch provider: {name}")
+
+
+class ToneBatchService:
+    """
+    Service for submitting a job's tone prompts as one provider batch.
+
+    Features:
+    - One submission per job instead of one request per block
+    - Batch pricing (see ToneService.BATCH_DISCOUNT)
+    - Results keyed by block index so they can be stitched back in order
+    """
+
+    CUSTOM_ID_PREFIX = "block-"
+
+    def __init__(self, provider: Optional[ToneBatchProvider] = None):
+        """
+        Args:
+            provider: Batch provider (defaults to the configured provider)
+        """
+        self.provider = provider or get_tone_batch_provider()
+
+        # Token usage per succeeded request, consumed by TonePlanner.record
+        self.observations: List[ToneCallObservation] = []
+
+    @classmethod
+    def _custom_id(cls, block_idx: int) -> str:
+        return f"{cls.CUSTOM_ID_PREFIX}{block_idx}"
+
+    @classmethod
+    def _block_idx(cls, custom_id: str) -> int:
+        return int(custom_id[len(cls.CUSTOM_ID_PREFIX):])
+
+    def submit(self, texts: List[str], tone: str) -> dict:
+        """
+        Submit tone prompts for every non-empty text as one batch.
+
+        Args:
+            texts: Translated text per block (index = block position)
+            tone: Tone preset or custom description
+
+        Returns:
+            Batch handle dict (JSON-serializable, safe to persist)
+        """
+        requests = [
+            {
+                "custom_id": self._custom_id(idx),
+                "params": ToneService.build_message_params(text, tone),
+            }
+            for idx, text in enumerate(texts)
+            if text and text.strip()
+        ]
+
+        if not requests:
+            return {
+                "batch_id": None,
+                "provider": self.provider.name,
+                "tone": tone,
+                "request_count": 0,
+            }
+
+        batch_id = self.provider.submit(requests)
+
+        info(
+            "Tone batch submitted",
+            batch_id=batch_id,
+            provider=self.provider.name,
+            request_count=len(requests),
+            tone=tone,
+        )
+
+        return {
+            "batch_id": batch_id,
+            "provider": self.provider.name,
+            "tone": tone,
+            "request_count": len(requests),
+        }
+
+    def collect(
+        self,
+        handle: dict,
+        texts: Optional[List[str]] = None,
+    ) -> Optional[tuple[Dict[int, str], float]]:
+        """
+        Collect results for a submitted batch if it has finished.
+
+        Args:
+            handle: Batch handle returned by ``submit``
+            texts: Texts passed to ``submit``; when given, the token usage
+                of each succeeded request is added to ``observations``
+
+        Returns:
+            None while the batch is still processing, otherwise a tuple of
+            (customized text by block index, total_cost_usd). Blocks whose
+            request failed are omitted.
+        """
+        batch_id = handle.get("batch_id")
+        if not batch_id:
+            return {}, 0.0
+
+        if not self.provider.is_complete(batch_id):
+            return None
+
+        customized: Dict[int, str] = {}
+        total_cost = 0.0
+        failed = 0
+
+        for result in self.provider.get_results(batch_id):
+            total_cost += ToneService.calculate_cost(
+                result.input_tokens,
+                result.output_tokens,
+                batch=True,
+            )
+            try:
+                block_idx = self._block_idx(result.custom_id)
+            except ValueError:
+                log_error("Unexpected custom_id in tone batch", batch_id=batch_id, custom_id=result.custom_id)
+                continue
+            if result.text is None:
+                failed += 1
+                continue
+            customized[block_idx] = result.text
+            if texts is not None and block_idx < len(texts):
+                self.observations.append(
+                    ToneCallObservation(
+                        chars=len(texts[block_idx]),
+                        input_tokens=result.input_tokens,
+                        output_tokens=result.output_tokens,
+                    )
+                )
+
+        if failed:
+            warning(
+                "Some tone batch requests failed, using original translations",
+                batch_id=batch_id,
+                failed=failed,
+            )
+
+        info(
+            "Tone batch results collected",
+            batch_id=batch_id,
+            succeeded=len(customized),
+            failed=failed,
+            cost_usd=f"${total_cost:.6f}",
+        )
+
+        return customized, total_cost
@@ -0,0 +1,363 @@
+"""Cost and latency planning for tone jobs, learned from observed usage"""
+
+import asyncio
+import math
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from typing import List, Optional, Sequence
+
+from redis.asyncio import Redis
+
+from app.cache import Cache, CacheKeys
+from app.config import get_settings
+from app.logger import info, warning
+from app.services.tone_service import ToneCallObservation, ToneService
+
+
+@dataclass
+class ToneUsageModel:
+    """
+    Per-request usage model for one (model, target language) pair.
+
+    Input tokens = input_base_tokens + input_tokens_per_char * chars
+    Output tokens = output_tokens_per_char * chars
+    Call seconds = base_seconds + seconds_per_output_token * output tokens
+    """
+    input_base_tokens: float  # System + tone prompt overhead per request
+    input_tokens_per_char: float
+    output_tokens_per_char: float
+    base_seconds: float  # Per-request latency (network, time to first token)
+    seconds_per_output_token: float
+    samples: int = 0  # Calls observed so far
+
+    def predict(self, chars: int) -> tuple[float, float, float]:
+        """Predict (input_tokens, output_tokens, seconds) for a request of ``chars`` characters"""
+        input_tokens = self.input_base_tokens + self.input_tokens_per_char * chars
+        output_tokens = self.output_tokens_per_char * chars
+        seconds = self.base_seconds + self.seconds_per_output_token * output_tokens
+        return input_tokens, output_tokens, seconds
+
+
+@dataclass
+class TonePlan:
+    """Predicted cost and duration of a tone job, plus how to run it"""
+    block_count: int  # Blocks that will be sent (non-empty)
+    character_count: int
+    input_tokens: int
+    output_tokens: int
+    cost_usd: float
+    wall_clock_seconds: Optional[float]  # None for provider batches (async, hours)
+    concurrency: int  # Concurrent API calls
+    chunk_size: int  # Blocks per progress checkpoint
+    samples: int  # Observations behind the usage model (0 = defaults)
+
+
+class TonePlanner:
+    """
+    Plans tone jobs from rolling per-language usage statistics.
+
+    Features:
+    - Learns tokens-per-character and seconds-per-token per target
+      language and model from completed jobs (rolling averages in Redis);
+      provider batches contribute token usage only
+    - Updates are serialized per language by a short Redis lock, so
+      concurrent jobs don't overwrite each other's contribution
+    - Predicts cost and wall-clock time before a job starts
+    - Sizes concurrency so a job finishes near the target duration without
+      exceeding the configured maximum
+
+    CJK targets produce far more tokens per character than Latin scripts,
+    so the defaults used before any job has been observed are per language.
+    """
+
+    # Weight of a new job's fit in the rolling averages
+    STATS_ALPHA = 0.2
+
+    # Stats are refreshed by every job; unused languages expire
+    STATS_EXPIRATION_SECONDS = 30 * 24 * 60 * 60
+
+    # Stats update lock: lifetime (bounds a crashed worker) and how long a
+    # job waits for it before skipping its update
+    STATS_LOCK_SECONDS = 10
+    STATS_LOCK_WAIT_SECONDS = 5.0
+    STATS_LOCK_POLL_SECONDS = 0.05
+
+    # Tokens per character before any observation (Claude tokenizer, approximate)
+    DEFAULT_TOKENS_PER_CHAR = {
+        "ja": 1.0,
+        "zh": 0.9,
+        "ko": 0.8,
+        "ru": 0.35,
+        "vi": 0.35,
+    }
+
+    DEFAULT_BASE_SECONDS = 0.8
+    DEFAULT_SECONDS_PER_OUTPUT_TOKEN = 0.01  # ~100 output tokens/s
+
+    # Progress checkpoints per job
+    TARGET_CHUNKS = 10
+
+    def __init__(
+        self,
+        redis: Redis,
+        model: str = ToneService.MODEL,
+        max_concurrency: Optional[int] = None,
+        target_seconds: Optional[float] = None,
+    ):
+        """
+        Args:
+            redis: Redis client
+            model: Model whose statistics are used
+            max_concurrency: Upper bound for concurrent API calls
+            target_seconds: Desired wall-clock time for a job
+        """
+        settings = get_settings()
+        self.redis = redis
+        self.cache = Cache(redis)
+        self.model = model
+        self.max_concurrency = max_concurrency or settings.tone_max_concurrency
+        self.target_seconds = target_seconds or settings.tone_target_seconds
+
+    @classmethod
+    def default_model(cls, target_lang: str) -> ToneUsageModel:
+        """Usage model used until a language has been observed"""
+        tokens_per_char = cls.DEFAULT_TOKENS_PER_CHAR.get(
+            target_lang.lower(), ToneService.TOKENS_PER_CHAR
+        )
+        prompt_params = ToneService.build_message_params("", "professional")
+        prompt_chars = len(prompt_params["system"]) + len(prompt_params["messages"][0]["content"])
+        return ToneUsageModel(
+            input_base_tokens=prompt_chars * ToneService.TOKENS_PER_CHAR,
+            input_tokens_per_char=tokens_per_char,
+            output_tokens_per_char=tokens_per_char,
+            base_seconds=cls.DEFAULT_BASE_SECONDS,
+            seconds_per_output_token=cls.DEFAULT_SECONDS_PER_OUTPUT_TOKEN,
+        )
+
+    def _stats_key(self, target_lang: str) -> str:
+        return CacheKeys.tone_stats(self.model, target_lang.lower())
+
+    async def get_model(self, target_lang: str) -> ToneUsageModel:
+        """Get the learned usage model for a language (defaults if unseen or Redis fails)"""
+        try:
+            stats = await self.cache.get_json(self._stats_key(target_lang))
+        except Exception as e:
+            warning("Failed to load tone stats, using defaults", exc=e, target_lang=target_lang)
+            stats = None
+        if not stats:
+            return self.default_model(target_lang)
+        return ToneUsageModel(**stats)
+
+    async def plan(
+        self,
+        texts: Sequence[str],
+        target_lang: str,
+        batch: bool = False,
+    ) -> TonePlan:
+        """
+        Predict cost and duration of toning ``texts`` and size the run.
+
+        Args:
+            texts: Text of each block to tone (empty blocks are skipped, as
+                ToneService does)
+            target_lang: Target language code
+            batch: True if the job will run through the Message Batches API
+
+        Returns:
+            TonePlan
+        """
+        usage_model = await self.get_model(target_lang)
+        sizes = [len(text) for text in texts if text and text.strip()]
+
+        input_tokens = output_tokens = 0.0
+        call_seconds: List[float] = []
+        for chars in sizes:
+            block_input, block_output, seconds = usage_model.predict(chars)
+            input_tokens += block_input
+            output_tokens += block_output
+            call_seconds.append(seconds)
+
+        cost = ToneService.calculate_cost(input_tokens, output_tokens, batch=batch)
+
+        sequential_seconds = sum(call_seconds)
+        concurrency = min(
+            self.max_concurrency,
+            max(1, math.ceil(sequential_seconds / self.target_seconds)),
+            max(1, len(sizes)),
+        )
+        wall_clock_seconds = None
+        if not batch:
+            # Calls overlap perfectly at best; the longest call is a floor
+            wall_clock_seconds = max(sequential_seconds / concurrency, max(call_seconds, default=0.0))
+
+        # Chunks of whole concurrency "waves" so every checkpoint keeps all slots busy
+        chunk_size = max(len(texts), 1)
+        if len(texts) > concurrency:
+            waves = max(1, math.ceil(len(texts) / (concurrency * self.TARGET_CHUNKS)))
+            chunk_size = concurrency * waves
+
+        return TonePlan(
+            block_count=len(sizes),
+            character_count=sum(sizes),
+            input_tokens=round(input_tokens),
+            output_tokens=round(output_tokens),
+            cost_usd=cost,
+            wall_clock_seconds=wall_clock_seconds,
+            concurrency=concurrency,
+            chunk_size=chunk_size,
+            samples=usage_model.samples,
+        )
+
+    @staticmethod
+    def _fit(xs: Sequence[float], ys: Sequence[float]) -> Optional[tuple[float, float]]:
+        """Least-squares (intercept, slope); None if xs don't vary"""
+        n = len(xs)
+        mean_x = sum(xs) / n
+        mean_y = sum(ys) / n
+        var_x = sum((x - mean_x) ** 2 for x in xs)
+        if var_x == 0:
+            return None
+        slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var_x
+        return mean_y - slope * mean_x, slope
+
+    @classmethod
+    def _fit_job(
+        cls,
+        observations: Sequence[ToneCallObservation],
+        prior: ToneUsageModel,
+    ) -> ToneUsageModel:
+        """Fit a usage model to one job's calls, keeping prior terms that can't be identified"""
+        chars = [obs.chars for obs in observations]
+        input_tokens = [obs.input_tokens for obs in observations]
+        output_tokens = [obs.output_tokens for obs in observations]
+        total_chars = sum(chars) or 1
+
+        input_fit = cls._fit(chars, input_tokens)
+        if input_fit and input_fit[0] >= 0 and input_fit[1] > 0:
+            input_base, input_per_char = input_fit
+        else:
+            # Same-sized blocks: keep the prompt overhead, attribute the rest to text
+            input_base = prior.input_base_tokens
+            input_per_char = max(
+                (sum(input_tokens) - input_base * len(observations)) / total_chars,
+                0.0,
+            ) or prior.input_tokens_per_char
+
+        timed = [obs for obs in observations if obs.seconds is not None]
+        timed_tokens = [obs.output_tokens for obs in timed]
+        seconds = [obs.seconds for obs in timed]
+        latency_fit = cls._fit(timed_tokens, seconds) if timed else None
+        if latency_fit and latency_fit[0] >= 0 and latency_fit[1] > 0:
+            base_seconds, seconds_per_token = latency_fit
+        elif timed:
+            base_seconds = prior.base_seconds
+            seconds_per_token = max(
+                (sum(seconds) - base_seconds * len(timed)) / (sum(timed_tokens) or 1),
+                0.0,
+            ) or prior.seconds_per_output_token
+        else:
+            # Batch requests: no per-call latency
+            base_seconds = prior.base_seconds
+            seconds_per_token = prior.seconds_per_output_token
+
+        return ToneUsageModel(
+            input_base_tokens=input_base,
+            input_tokens_per_char=input_per_char,
+            output_tokens_per_char=sum(output_tokens) / total_chars,
+            base_seconds=base_seconds,
+            seconds_per_output_token=seconds_per_token,
+            samples=len(observations),
+        )
+
+    async def record(
+        self,
+        target_lang: str,
+        observations: Sequence[ToneCallObservation],
+    ) -> Optional[ToneUsageModel]:
+        """
+        Fold a completed job's API calls into the rolling statistics.
+
+        Args:
+            target_lang: Target language code
+            observations: Calls made by the job (ToneService.observations or
+                ToneBatchService.observations)
+
+        Returns:
+            Updated usage model, or None if nothing was recorded
+        """
+        observations = [obs for obs in observations if obs.chars > 0]
+        if not observations:
+            return None
+
+        lock_key = CacheKeys.tone_stats_lock(self.model, target_lang.lower())
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self.STATS_LOCK_WAIT_SECONDS
+        try:
+            while not await self.redis.set(lock_key, token, ex=self.STATS_LOCK_SECONDS, nx=True):
+                if time.monotonic() >= deadline:
+                    warning("Tone stats busy, skipping update", target_lang=target_lang)
+                    return None
+                await asyncio.sleep(self.STATS_LOCK_POLL_SECONDS)
+        except Exception as e:
+            warning("Failed to lock tone stats", exc=e, target_lang=target_lang)
+            return None
+
+        try:
+            return await self._update(target_lang, observations)
+        finally:
+            try:
+                if await self.redis.get(lock_key) == token:
+                    await self.redis.delete(lock_key)
+            except Exception as e:
+                warning("Failed to release tone stats lock", exc=e, target_lang=target_lang)
+
+    async def _update(
+        self,
+        target_lang: str,
+        observations: Sequence[ToneCallObservation],
+    ) -> Optional[ToneUsageModel]:
+        """Blend one job's fit into the stored statistics (caller holds the lock)"""
+        prior = await self.get_model(target_lang)
+        fitted = self._fit_job(observations, prior)
+
+        if prior.samples:
+            alpha = self.STATS_ALPHA
+            fields = (
+                "input_base_tokens",
+                "input_tokens_per_char",
+                "output_tokens_per_char",
+                "base_seconds",
+                "seconds_per_output_token",
+            )
+            updated = ToneUsageModel(
+                **{
+                    field: (1 - alpha) * getattr(prior, field) + alpha * getattr(fitted, field)
+                    for field in fields
+                },
+                samples=prior.samples + fitted.samples,
+            )
+        else:
+            updated = fitted
+
+        try:
+            await self.cache.set_json(
+                self._stats_key(target_lang),
+                asdict(updated),
+                expire_seconds=self.STATS_EXPIRATION_SECONDS,
+            )
+        except Exception as e:
+            warning("Failed to store tone stats", exc=e, target_lang=target_lang)
+            return None
+
+        info(
+            "Tone usage stats updated",
+            model=self.model,
+            target_lang=target_lang,
+            calls=len(observations),
+            samples=updated.samples,
+            input_tokens_per_char=round(updated.input_tokens_per_char, 4),
+            output_tokens_per_char=round(updated.output_tokens_per_char, 4),
+            seconds_per_output_token=round(updated.seconds_per_output_token, 5),
+        )
+        return updated
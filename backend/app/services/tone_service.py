@@ -1,7 +1,9 @@
 """Tone customization service using Claude API"""
 
+import asyncio
 import time
-from typing import List, Optional
+from dataclasses import dataclass
+from typing import Awaitable, Callable, List, Optional
 
 import anthropic
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
@@ -11,6 +13,15 @@ from app.logger import error as log_error, info, warning
 from app.services.translation_service import TranslatedBlock
 
 
+@dataclass
+class ToneCallObservation:
+    """Measured usage of one tone API call (input for TonePlanner)"""
+    chars: int  # Characters of text sent for rewriting
+    input_tokens: int
+    output_tokens: int
+    seconds: Optional[float] = None  # Wall-clock duration of the API call (None for batch requests)
+
+
 class ToneService:
     """
     Service for customizing translation tone using Claude API.
@@ -27,9 +38,22 @@ class ToneService:
     COST_PER_INPUT_TOKEN = 0.80 / 1_000_000  # $0.80 per million input tokens
     COST_PER_OUTPUT_TOKEN = 4.00 / 1_000_000  # $4.00 per million output tokens
 
+    # Message Batches are billed at half the per-token price
+    BATCH_DISCOUNT = 0.5
+
     # Average tokens per character (approximate)
     TOKENS_PER_CHAR = 0.25  # Rough estimate: 4 chars per token
 
+    MODEL = "claude-3-5-haiku-20241022"
+    MAX_TOKENS = 4096
+
+    SYSTEM_PROMPT = (
+        "You are a professional translator and editor. "
+        "Your task is to rewrite translated text to match a specific tone "
+        "while preserving all meaning, technical accuracy, and important details. "
+        "Only change the tone and style, not the factual content."
+    )
+
     def __init__(self, api_key: Optional[str] = None):
         """
         Initialize Claude API client.
@@ -46,9 +70,13 @@ class ToneService:
         # Initialize Claude client
         self.client = anthropic.Anthropic(api_key=self.api_key)
         
+        # Per-call usage, consumed by TonePlanner.record after a job
+        self.observations: List[ToneCallObservation] = []
+        
         info("Tone service initialized", api_key_length=len(self.api_key))
 
-    def _get_tone_prompt(self, tone: str) -> str:
+    @staticmethod
+    def _get_tone_prompt(tone: str) -> str:
         """
         Get the prompt template for a given tone preset.
         
@@ -95,6 +123,58 @@ class ToneService:
             "Only change the tone and style, not the content."
         )
 
+    @classmethod
+    def build_message_params(cls, text: str, tone: str) -> dict:
+        """
+        Build Claude Messages API parameters for a tone rewrite.
+        
+        Shared by the per-request path and the batch submission path so both
+        send identical prompts.
+        
+        Args:
+            text: Text to customize
+            tone: Tone preset or custom description
+            
+        Returns:
+            Keyword arguments for ``messages.create``
+        """
+        prompt = cls._get_tone_prompt(tone)
+        return {
+            "model": cls.MODEL,
+            "max_tokens": cls.MAX_TOKENS,
+            "system": cls.SYSTEM_PROMPT,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": f"{prompt}\n\nText to rewrite:\n{text}",
+                }
+            ],
+        }
+
+    @classmethod
+    def calculate_cost(
+        cls,
+        input_tokens: int,
+        output_tokens: int,
+        batch: bool = False,
+    ) -> float:
+        """
+        Calculate USD cost for a Claude call from its token usage.
+        
+        Args:
+            input_tokens: Billed input tokens
+            output_tokens: Billed output tokens
+            batch: True if the call was made through the Message Batches API
+            
+        Returns:
+            Cost in USD
+        """
+        cost = (input_tokens * cls.COST_PER_INPUT_TOKEN) + \
+               (output_tokens * cls.COST_PER_OUTPUT_TOKEN)
+        if batch:
+            cost *= cls.BATCH_DISCOUNT
+        return cost
+
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
@@ -124,30 +204,13 @@ class ToneService:
             return "", 0.0
         
         try:
-            prompt = self._get_tone_prompt(tone)
-            
-            # Build the full prompt
-            system_prompt = (
-                "You are a professional translator and editor. "
-                "Your task is to rewrite translated text to match a specific tone "
-                "while preserving all meaning, technical accuracy, and important details. "
-                "Only change the tone and style, not the factual content."
-            )
-            
-            user_message = f"{prompt}\n\nText to rewrite:\n{text}"
-            
-            # Call Claude API
-            message = self.client.messages.create(
-                model="claude-3-5-haiku-20241022",
-                max_tokens=4096,
-                system=system_prompt,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": user_message
-                    }
-                ]
+            # Call Claude API (in a thread so concurrent calls don't block the event loop)
+            call_start = time.monotonic()
+            message = await asyncio.to_thread(
+                self.client.messages.create,
+                **self.build_message_params(text, tone),
             )
+            call_seconds = time.monotonic() - call_start
             
             # Extract response
             customized_text = message.content[0].text if message.content else text
@@ -155,8 +218,15 @@ class ToneService:
             # Calculate cost
             input_tokens = message.usage.input_tokens
             output_tokens = message.usage.output_tokens
-            cost = (input_tokens * self.COST_PER_INPUT_TOKEN) + \
-                   (output_tokens * self.COST_PER_OUTPUT_TOKEN)
+            cost = self.calculate_cost(input_tokens, output_tokens)
+            self.observations.append(
+                ToneCallObservation(
+                    chars=len(text),
+                    input_tokens=input_tokens,
+                    output_tokens=output_tokens,
+                    seconds=call_seconds,
+                )
+            )
             
             info(
                 "Tone applied",
@@ -184,13 +254,22 @@ class ToneService:
         self,
         blocks: List[TranslatedBlock],
         tone: str,
+        concurrency: int = 1,
+        chunk_size: Optional[int] = None,
+        on_chunk_complete: Optional[Callable[[int, int], Awaitable[None]]] = None,
     ) -> tuple[List[TranslatedBlock], float]:
         """
         Apply tone customization to multiple translated blocks.
         
+        Blocks are processed in chunks; within a chunk up to ``concurrency``
+        API calls run at once. Output order always matches input order.
+        
         Args:
             blocks: List of TranslatedBlock objects
             tone: Tone preset or custom description
+            concurrency: Maximum concurrent API calls (see TonePlanner)
+            chunk_size: Blocks per chunk (defaults to all blocks)
+            on_chunk_complete: Awaited with (blocks_done, total_blocks) after each chunk
             
         Returns:
             Tuple of (customized_blocks, total_cost_usd)
@@ -201,49 +280,62 @@ class ToneService:
         start_time = time.time()
         customized_blocks: List[TranslatedBlock] = []
         total_cost = 0.0
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        chunk_size = chunk_size or len(blocks)
         
         info(
             "Starting batch tone customization",
             total_blocks=len(blocks),
             tone=tone,
+            concurrency=concurrency,
+            chunk_size=chunk_size,
         )
         
-        # Process each block
-        for block_idx, block in enumerate(blocks):
-            try:
-                customized_text, cost = await self.apply_tone(
-                    text=block.translated_text,
-                    tone=tone,
-                    target_lang=block.target_lang,
-                )
-                
-                # Create new block with customized text
-                customized_block = TranslatedBlock(
-                    original=block.original,
-                    translated_text=customized_text,
-                    source_lang=block.source_lang,
-                    target_lang=block.target_lang,
-                    billed_characters=block.billed_characters,
-                )
-                
+        async def customize(block_idx: int, block: TranslatedBlock) -> tuple[TranslatedBlock, float]:
+            async with semaphore:
+                try:
+                    customized_text, cost = await self.apply_tone(
+                        text=block.translated_text,
+                        tone=tone,
+                        target_lang=block.target_lang,
+                    )
+                except Exception as e:
+                    warning(
+                        "Failed to customize block tone, using original",
+                        exc=e,
+                        block_idx=block_idx,
+                    )
+                    # Use original block if customization fails
+                    return block, 0.0
+            
+            info(
+                "Block tone customized",
+                block_idx=block_idx + 1,
+                total_blocks=len(blocks),
+                cost_usd=f"${cost:.6f}",
+            )
+            
+            # Create new block with customized text
+            return TranslatedBlock(
+                original=block.original,
+                translated_text=customized_text,
+                source_lang=block.source_lang,
+                target_lang=block.target_lang,
+                billed_characters=block.billed_characters,
+            ), cost
+        
+        # Process blocks chunk by chunk
+        for chunk_start in range(0, len(blocks), chunk_size):
+            chunk = blocks[chunk_start:chunk_start + chunk_size]
+            results = await asyncio.gather(
+                *(customize(chunk_start + offset, block) for offset, block in enumerate(chunk))
+            )
+            for customized_block, cost in results:
                 customized_blocks.append(customized_block)
                 total_cost += cost
-                
-                info(
-                    "Block tone customized",
-                    block_idx=block_idx + 1,
-                    total_blocks=len(blocks),
-                    cost_usd=f"${cost:.6f}",
-                )
-                
-            except Exception as e:
-                warning(
-                    "Failed to customize block tone, using original",
-                    exc=e,
-                    block_idx=block_idx,
-                )
-                # Use original block if customization fails
-                customized_blocks.append(block)
+            
+            if on_chunk_complete:
+                await on_chunk_complete(len(customized_blocks), len(blocks))
         
         elapsed_ms = int((time.time() - start_time) * 1000)
         
@@ -256,12 +348,13 @@ class ToneService:
         
         return customized_blocks, total_cost
 
-    def get_cost_estimate(self, character_count: int) -> float:
+    def get_cost_estimate(self, character_count: int, batch: bool = False) -> float:
         """
         Estimate cost for tone customization based on character count.
         
         Args:
             character_count: Number of characters to process
+            batch: True if the job will run through the Message Batches API
             
         Returns:
             Estimated cost in USD
@@ -274,6 +367,8 @@ class ToneService:
             estimated_input_tokens * self.COST_PER_INPUT_TOKEN +
             estimated_output_tokens * self.COST_PER_OUTPUT_TOKEN
         )
+        if batch:
+            estimated_cost *= self.BATCH_DISCOUNT
         
         return estimated_cost
 
@@ -0,0 +1,111 @@
+"""Upload deduplication: reuse a finished translation of a byte-identical document"""
+
+from datetime import datetime
+from typing import Optional
+
+from redis.asyncio import Redis
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import Cache, CacheKeys
+from app.logger import info
+from app.models.translation import Translation, TranslationStatus
+from app.s3 import S3Keys, copy_file
+
+# Per-job pipeline output copied to the clone (extracted blocks, the
+# translated payload and the layout IR)
+CLONED_CACHE_KEYS = (CacheKeys.blocks, CacheKeys.translated_blocks, CacheKeys.document_ir)
+
+# Same lifetime the pipeline gives these keys
+CLONE_CACHE_EXPIRATION_SECONDS = 24 * 60 * 60
+
+
+class UploadDeduplicator:
+    """
+    Completes a new upload from an earlier translation of the same file.
+
+    Features:
+    - Matches on tenant, SHA-256 of the upload and language pair, among
+      completed jobs that haven't expired and have no tone applied (new
+      uploads start without one)
+    - Copies the source's result PDF server-side and its cached pipeline
+      output to the new job, so the clone owns its data and expires or is
+      deleted independently of the source
+    - Per-user edits (block updates) are not copied
+    """
+
+    def __init__(self, db: AsyncSession, redis: Redis):
+        self.db = db
+        self.cache = Cache(redis)
+
+    async def find_source(self, translation: Translation) -> Optional[Translation]:
+        """
+        Find the latest reusable translation of the same document.
+
+        Args:
+            translation: New (unsaved) translation with content_hash set
+
+        Returns:
+            Matching completed translation, or None
+        """
+        result = await self.db.execute(
+            select(Translation)
+            .where(
+                Translation.tenant_id == translation.tenant_id,
+                Translation.content_hash == translation.content_hash,
+                Translation.source_language == translation.source_language,
+                Translation.target_language == translation.target_language,
+                Translation.status == TranslationStatus.COMPLETED,
+                Translation.result_file_path.is_not(None),
+                Translation.tone_preset.is_(None),
+                Translation.custom_tone.is_(None),
+                Translation.expires_at > datetime.utcnow(),
+            )
+            .order_by(Translation.completed_at.desc())
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
+    async def clone(self, source: Translation, translation: Translation) -> bool:
+        """
+        Copy the source's results to a new translation and mark it completed.
+
+        Args:
+            source: Completed translation found by find_source
+            translation: New translation (the caller saves it)
+
+        Returns:
+            False if the source's cached results have expired (nothing is
+            copied; the caller runs the pipeline instead)
+
+        Raises:
+            ClientError: If the result PDF can't be copied
+        """
+        source_id = str(source.id)
+        job_id = str(translation.id)
+        cached = {key: await self.cache.get(key(source_id)) for key in CLONED_CACHE_KEYS}
+        if cached[CacheKeys.translated_blocks] is None:
+            return False
+
+        translation.result_file_path = await copy_file(
+            source.result_file_path,
+            S3Keys.result_path(
+                user_id=str(translation.user_id),
+                job_id=job_id,
+                filename=translation.file_name,
+            ),
+        )
+        for key, value in cached.items():
+            if value is not None:
+                await self.cache.set(key(job_id), value, expire_seconds=CLONE_CACHE_EXPIRATION_SECONDS)
+
+        now = datetime.utcnow()
+        translation.status = TranslationStatus.COMPLETED
+        translation.progress_percent = 100
+        translation.page_count = source.page_count
+        translation.translation_cost = 0.0
+        translation.started_at = now
+        translation.completed_at = now
+
+        info("Upload cloned from identical translation", job_id=job_id, source_job_id=source_id)
+        return True
@@ -0,0 +1,160 @@
+"""Storage backend interface implemented by S3Storage (app.s3) and LocalStorage"""
+
+from abc import ABC, abstractmethod
+from typing import BinaryIO, List, Optional, Tuple
+
+
+class StorageWriter(ABC):
+    """
+    Stores a file of unknown size while it is being read.
+
+    Nothing is visible under the key until ``complete``.
+    """
+
+    @abstractmethod
+    def write(self, data: bytes) -> None:
+        """Append data"""
+
+    @abstractmethod
+    def complete(self) -> None:
+        """Store the remaining data and create the object"""
+
+    @abstractmethod
+    def abort(self) -> None:
+        """Discard everything written so far"""
+
+
+class Storage(ABC):
+    """
+    Object storage addressed by bucket and key.
+
+    Methods are blocking; app.s3 runs them on its I/O pool and records
+    their timing, and callers use the app.s3 functions rather than a
+    backend directly.
+
+    Direct uploads (clients sending parts straight to storage through
+    presigned URLs) are optional: backends without them leave
+    ``supports_direct_uploads`` False and the multipart methods raise
+    NotImplementedError.
+    """
+
+    supports_direct_uploads = False
+
+    @abstractmethod
+    def write(
+        self,
+        data: bytes | BinaryIO,
+        key: str,
+        bucket: str,
+        content_type: str = "application/octet-stream",
+        content_encoding: Optional[str] = None,
+        cache_control: Optional[str] = None,
+    ) -> None:
+        """Store bytes or the rest of a file-like object"""
+
+    @abstractmethod
+    def write_from_path(
+        self,
+        source_path: str,
+        key: str,
+        bucket: str,
+        content_type: str = "application/octet-stream",
+    ) -> None:
+        """Store a copy of a local file"""
+
+    @abstractmethod
+    def open_writer(
+        self,
+        key: str,
+        bucket: str,
+        content_type: str,
+        part_size: int,
+    ) -> StorageWriter:
+        """Start storing a file of unknown size, holding at most ``part_size`` bytes in memory"""
+
+    @abstractmethod
+    def read(self, key: str, bucket: str) -> bytes:
+        """Whole object"""
+
+    @abstractmethod
+    def read_range(self, key: str, start: int, end: int, bucket: str) -> bytes:
+        """Bytes [start, end] (inclusive, clamped to the file size)"""
+
+    @abstractmethod
+    def open_range(self, key: str, start: int, end: Optional[int], bucket: str) -> BinaryIO:
+        """
+        Readable stream positioned at ``start``.
+
+        It may run past ``end`` (None for the end of the object); the
+        caller stops reading there and closes it.
+        """
+
+    @abstractmethod
+    def stat(self, key: str, bucket: str) -> Tuple[int, str]:
+        """Size and quoted entity tag (changes whenever the content does)"""
+
+    def size(self, key: str, bucket: str) -> int:
+        return self.stat(key, bucket)[0]
+
+    @abstractmethod
+    def exists(self, key: str, bucket: str) -> bool:
+        """Whether the object exists"""
+
+    @abstractmethod
+    def delete(self, key: str, bucket: str) -> None:
+        """Remove an object (missing objects count as deleted)"""
+
+    def delete_many(self, keys: List[str], bucket: str) -> List[str]:
+        """
+        Remove objects.
+
+        Returns:
+            Keys that could not be deleted
+        """
+        for key in keys:
+            self.delete(key, bucket)
+        return []
+
+    @abstractmethod
+    def copy(self, source_key: str, dest_key: str, bucket: str) -> None:
+        """Store an object under a second key without sending it through the caller"""
+
+    @abstractmethod
+    def list(self, prefix: str, bucket: str) -> List[str]:
+        """Keys starting with ``prefix``"""
+
+    @abstractmethod
+    def create_bucket(self, bucket: str) -> None:
+        """Create the bucket unless it exists"""
+
+    @abstractmethod
+    def signed_url(
+        self,
+        key: str,
+        bucket: str,
+        expires_in: int,
+        filename: Optional[str] = None,
+    ) -> str:
+        """Expiring download link (``filename`` sets the Content-Disposition)"""
+
+    def create_multipart_upload(self, key: str, bucket: str, content_type: str) -> str:
+        """Start an upload whose parts are sent by the client; returns its upload ID"""
+        raise NotImplementedError(f"{type(self).__name__} has no direct uploads")
+
+    def presigned_url(self, key: str, bucket: str, method: str, params: dict, expires_in: int) -> str:
+        """Expiring URL for a client to call ``method`` (e.g. 'upload_part') with ``params`` on an object"""
+        raise NotImplementedError(f"{type(self).__name__} has no direct uploads")
+
+    def complete_multipart_upload(
+        self,
+        key: str,
+        upload_id: str,
+        parts: List[Tuple[int, str]],
+        bucket: str,
+    ) -> None:
+        """Assemble the uploaded ``(part_number, etag)`` parts into the object"""
+        raise NotImplementedError(f"{type(self).__name__} has no direct uploads")
+
+    def abort_multipart_upload(self, key: str, upload_id: str, bucket: str) -> None:
+        """Discard an upload and its parts"""
+        raise NotImplementedError(f"{type(self).__name__} has no direct uploads")
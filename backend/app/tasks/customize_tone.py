@@ -1,5 +1,6 @@
 """Tone customization Celery task"""
 
+from datetime import datetime
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -7,9 +8,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.celery_app import celery_app
 from app.cache import Cache, CacheKeys, get_redis_client
 from app.database import get_db
-from app.logger import error as log_error, info
+from app.logger import error as log_error, info, warning
 from app.models.translation import Translation, TranslationStatus
 from app.schemas.pdf import Block, Coordinates
+from app.services.block_store import TranslatedBlockStore
+from app.services.tone_batch_service import ToneBatchService, get_tone_batch_provider
+from app.services.tone_planner import TonePlanner
 from app.services.tone_service import ToneService
 from app.services.translation_service import TranslatedBlock
 
@@ -53,20 +57,24 @@ async def customize_tone_sync(
     job_id: str,
     tone: str,
     db: AsyncSession,
+    tone_service: ToneService | None = None,
 ) -> dict:
     """
     Synchronous tone customization function (can be called directly or from Celery).
     
     This function:
     1. Loads translated blocks from Redis cache
-    2. Applies tone customization using Claude API
-    3. Stores tone-customized blocks back in cache
-    4. Updates translation record with cost
+    2. Plans the run (cost, duration, concurrency) from learned usage stats
+    3. Applies tone customization using Claude API
+    4. Stores tone-customized blocks back in cache
+    5. Updates translation record with cost and the usage stats with the
+       job's measured token counts and latencies
     
     Args:
         job_id: Translation job ID
         tone: Tone preset or custom description
         db: Database session
+        tone_service: Optional ToneService (defaults to a new instance)
         
     Returns:
         dict with tone customization results
@@ -110,43 +118,39 @@ async def customize_tone_sync(
             )
             
             # Convert dict blocks to TranslatedBlock objects
-            translated_blocks: list[TranslatedBlock] = []
-            for block_data in blocks_data:
-                original_data = block_data.get("original", {})
-                coords_data = original_data.get("coordinates", {})
-                
-                original_block = Block(
-                    page=original_data.get("page", 0),
-                    block_id=original_data.get("block_id", 0),
-                    text=original_data.get("text", ""),
-                    coordinates=Coordinates(
-                        x=coords_data.get("x", 0),
-                        y=coords_data.get("y", 0),
-                        width=coords_data.get("width", 0),
-                        height=coords_data.get("height", 0),
-                    ),
-                    font_size=original_data.get("font_size", 12),
-                    font_name=original_data.get("font_name", "Unknown"),
-                    is_bold=original_data.get("is_bold", False),
-                    is_italic=original_data.get("is_italic", False),
-                    rotation=original_data.get("rotation", 0),
-                )
-                
-                translated_block = TranslatedBlock(
-                    original=original_block,
-                    translated_text=block_data.get("translated_text", ""),
-                    source_lang=block_data.get("source_lang", "auto"),
-                    target_lang=block_data.get("target_lang", "en"),
-                    billed_characters=block_data.get("billed_characters", 0),
-                )
-                translated_blocks.append(translated_block)
+            translated_blocks = _deserialize_translated_blocks(blocks_data)
+            
+            # Size the run from learned per-language token and latency stats
+            planner = TonePlanner(redis)
+            plan = await planner.plan(
+                [block.translated_text for block in translated_blocks],
+                translation.target_language,
+            )
+            info(
+                "Tone job planned",
+                job_id=job_id,
+                estimated_cost_usd=f"${plan.cost_usd:.6f}",
+                estimated_seconds=plan.wall_clock_seconds,
+                concurrency=plan.concurrency,
+                chunk_size=plan.chunk_size,
+                stats_samples=plan.samples,
+            )
+            
+            async def report_progress(done: int, total: int) -> None:
+                # Tone runs between 85% and 90% (see _record_tone_on_translation)
+                translation.progress_percent = 85 + (4 * done) // total
+                await db.commit()
             
             # Apply tone customization with graceful degradation
-            tone_service = ToneService()
+            tone_service = tone_service or ToneService()
             try:
+                started_at = datetime.utcnow()
                 customized_blocks, total_cost = await tone_service.batch_apply_tone(
                     blocks=translated_blocks,
                     tone=tone,
+                    concurrency=plan.concurrency,
+                    chunk_size=plan.chunk_size,
+                    on_chunk_complete=report_progress,
                 )
                 
                 info(
@@ -154,7 +158,12 @@ async def customize_tone_sync(
                     job_id=job_id,
                     block_count=len(customized_blocks),
                     cost_usd=f"${total_cost:.6f}",
+                    estimated_cost_usd=f"${plan.cost_usd:.6f}",
+                    elapsed_seconds=(datetime.utcnow() - started_at).total_seconds(),
+                    estimated_seconds=plan.wall_clock_seconds,
                 )
+                
+                await planner.record(translation.target_language, tone_service.observations)
             except Exception as tone_error:
                 # Graceful degradation: if tone customization fails, use original translated blocks
                 warning(
@@ -175,39 +184,13 @@ async def customize_tone_sync(
                 )
             
             # Store tone-customized blocks in cache
-            # Add tone_customized_text to existing cache structure
-            tone_customized_data = {
-                "blocks": [
-                    {
-                        "original": {
-                            "page": tb.original.page,
-                            "block_id": tb.original.block_id,
-                            "text": tb.original.text,
-                            "coordinates": {
-                                "x": tb.original.coordinates.x,
-                                "y": tb.original.coordinates.y,
-                                "width": tb.original.coordinates.width,
-                                "height": tb.original.coordinates.height,
-                            },
-                            "font_size": tb.original.font_size,
-                            "font_name": tb.original.font_name,
-                            "is_bold": tb.original.is_bold,
-                            "is_italic": tb.original.is_italic,
-                            "rotation": tb.original.rotation,
-                        },
-                        "translated_text": tb.translated_text,
-                        "tone_customized_text": cb.translated_text,  # New field
-                        "source_lang": tb.source_lang,
-                        "target_lang": tb.target_lang,
-                        "billed_characters": tb.billed_characters,
-                    }
-                    for tb, cb in zip(translated_blocks, customized_blocks)
-                ],
-                "total_cost": cached_translation.get("total_cost", 0) + total_cost,
-                "total_blocks": len(customized_blocks),
-                "tone": tone,
-                "tone_cost": total_cost,
-            }
+            tone_customized_data = _build_tone_customized_data(
+                translated_blocks=translated_blocks,
+                customized_texts=[cb.translated_text for cb in customized_blocks],
+                cached_translation=cached_translation,
+                tone=tone,
+                total_cost=total_cost,
+            )
             
             # Update cache with tone-customized blocks
             await cache.set_json(
@@ -215,17 +198,11 @@ async def customize_tone_sync(
                 tone_customized_data,
                 expire_seconds=24 * 60 * 60,  # 24 hours
             )
+            # The document-wide tone supersedes earlier scoped (per-block) tone runs
+            await TranslatedBlockStore(redis).clear_block_tones(job_id)
             
             # Update translation record
-            # After tone customization, move to reconstructing (or completed if no reconstruction needed)
-            translation.status = TranslationStatus.RECONSTRUCTING
-            translation.progress_percent = 90
-            # Store tone information
-            if tone in ['professional', 'casual', 'technical', 'creative']:
-                translation.tone_preset = tone
-            else:
-                translation.custom_tone = tone
-            translation.tone_cost = total_cost
+            _record_tone_on_translation(translation, tone, total_cost)
             await db.commit()
             
             info(
@@ -262,3 +239,537 @@ async def customize_tone_sync(
         
         raise
 
+
+
+def _deserialize_translated_blocks(blocks_data: list[dict]) -> list[TranslatedBlock]:
+    """Convert cached block dicts to TranslatedBlock objects"""
+    translated_blocks: list[TranslatedBlock] = []
+    for block_data in blocks_data:
+        original_data = block_data.get("original", {})
+        coords_data = original_data.get("coordinates", {})
+        
+        original_block = Block(
+            page=original_data.get("page", 0),
+            block_id=original_data.get("block_id", 0),
+            text=original_data.get("text", ""),
+            coordinates=Coordinates(
+                x=coords_data.get("x", 0),
+                y=coords_data.get("y", 0),
+                width=coords_data.get("width", 0),
+                height=coords_data.get("height", 0),
+            ),
+            font_size=original_data.get("font_size", 12),
+            font_name=original_data.get("font_name", "Unknown"),
+            is_bold=original_data.get("is_bold", False),
+            is_italic=original_data.get("is_italic", False),
+            rotation=original_data.get("rotation", 0),
+        )
+        
+        translated_blocks.append(
+            TranslatedBlock(
+                original=original_block,
+                translated_text=block_data.get("translated_text", ""),
+                source_lang=block_data.get("source_lang", "auto"),
+                target_lang=block_data.get("target_lang", "en"),
+                billed_characters=block_data.get("billed_characters", 0),
+            )
+        )
+    return translated_blocks
+
+
+def _build_tone_customized_data(
+    translated_blocks: list[TranslatedBlock],
+    customized_texts: list[str],
+    cached_translation: dict,
+    tone: str,
+    total_cost: float,
+) -> dict:
+    """
+    Build the `_translated` cache payload with tone_customized_text added.
+    
+    Args:
+        translated_blocks: Blocks as loaded from the translated cache
+        customized_texts: Tone-customized text per block (same order)
+        cached_translation: Previously cached payload (for total_cost)
+        tone: Tone preset or custom description
+        total_cost: Tone customization cost in USD
+        
+    Returns:
+        dict ready to be stored with Cache.set_json
+    """
+    return {
+        "blocks": [
+            {
+                "original": {
+                    "page": tb.original.page,
+                    "block_id": tb.original.block_id,
+                    "text": tb.original.text,
+                    "coordinates": {
+                        "x": tb.original.coordinates.x,
+                        "y": tb.original.coordinates.y,
+                        "width": tb.original.coordinates.width,
+                        "height": tb.original.coordinates.height,
+                    },
+                    "font_size": tb.original.font_size,
+                    "font_name": tb.original.font_name,
+                    "is_bold": tb.original.is_bold,
+                    "is_italic": tb.original.is_italic,
+                    "rotation": tb.original.rotation,
+                },
+                "translated_text": tb.translated_text,
+                "tone_customized_text": customized_text,
+                "source_lang": tb.source_lang,
+                "target_lang": tb.target_lang,
+                "billed_characters": tb.billed_characters,
+            }
+            for tb, customized_text in zip(translated_blocks, customized_texts)
+        ],
+        "total_cost": cached_translation.get("total_cost", 0) + total_cost,
+        "total_blocks": len(translated_blocks),
+        "tone": tone,
+        "tone_cost": total_cost,
+        "toned_at": datetime.utcnow().isoformat(),
+    }
+
+
+def _record_tone_on_translation(
+    translation: Translation,
+    tone: str,
+    total_cost: float,
+) -> None:
+    """Store tone information on the translation record (caller commits)"""
+    # After tone customization, move to reconstructing (or completed if no reconstruction needed)
+    translation.status = TranslationStatus.RECONSTRUCTING
+    translation.progress_percent = 90
+    if tone in ['professional', 'casual', 'technical', 'creative']:
+        translation.tone_preset = tone
+    else:
+        translation.custom_tone = tone
+    translation.tone_cost = total_cost
+
+
+@celery_app.task(
+    name="submit_tone_batch",
+    bind=True,
+    max_retries=3,
+    default_retry_delay=60,  # 1 minute delay between retries
+    time_limit=300,  # Submission only - results are collected by poll_tone_batches
+)
+def submit_tone_batch_task(self, job_id: str, tone: str) -> dict:
+    """
+    Celery task to submit a job's tone prompts as one provider batch.
+    
+    Args:
+        job_id: Translation job ID
+        tone: Tone preset or custom description
+        
+    Returns:
+        dict with submission results
+    """
+    import asyncio
+    
+    try:
+        return asyncio.run(_submit_tone_batch_async(job_id, tone))
+    except Exception as e:
+        log_error("Submit tone batch task failed", exc=e, job_id=job_id)
+        raise self.retry(exc=e)
+
+
+async def _submit_tone_batch_async(job_id: str, tone: str) -> dict:
+    """Async wrapper for tone batch submission"""
+    from app.database import get_async_session
+    
+    async with get_async_session() as db:
+        return await submit_tone_batch_sync(job_id, tone, db)
+
+
+async def submit_tone_batch_sync(
+    job_id: str,
+    tone: str,
+    db: AsyncSession,
+    batch_service: ToneBatchService | None = None,
+) -> dict:
+    """
+    Submit all of a job's tone prompts as one provider batch.
+    
+    This function:
+    1. Loads translated blocks from Redis cache
+    2. Submits one tone request per non-empty block in a single batch
+    3. Persists the batch handle and marks the job as awaiting results
+    
+    Results are stitched back by `poll_tone_batches`, so no worker waits
+    on the provider while the batch is processed. If submission fails the
+    job falls back to the per-request `customize_tone` task.
+    
+    Args:
+        job_id: Translation job ID
+        tone: Tone preset or custom description
+        db: Database session
+        batch_service: Optional ToneBatchService (defaults to configured provider)
+        
+    Returns:
+        dict with submission results
+    """
+    info("Submitting tone batch", job_id=job_id, tone=tone)
+    
+    translation = await db.get(Translation, UUID(job_id))
+    
+    if not translation:
+        log_error("Translation not found", job_id=job_id)
+        raise ValueError(f"Translation {job_id} not found")
+    
+    translation.status = TranslationStatus.APPLYING_TONE
+    translation.progress_percent = 85
+    await db.commit()
+    
+    redis = get_redis_client()
+    cache = Cache(redis)
+    
+    try:
+        cache_key = CacheKeys.translated_blocks(job_id)
+        cached_translation = await cache.get_json(cache_key)
+        
+        if not cached_translation:
+            log_error("Translated blocks not found in cache", job_id=job_id)
+            raise ValueError(f"No translated blocks found for job {job_id}")
+        
+        texts = [
+            block.get("translated_text", "")
+            for block in cached_translation.get("blocks", [])
+        ]
+        
+        try:
+            batch_service = batch_service or ToneBatchService()
+            handle = batch_service.submit(texts, tone)
+        except Exception as e:
+            # Graceful degradation: run the job through the per-request path
+            warning(
+                "Tone batch submission failed, falling back to per-request tone task",
+                exc=e,
+                job_id=job_id,
+            )
+            customize_tone_task.delay(job_id, tone)
+            return {
+                "success": True,
+                "job_id": job_id,
+                "batch_id": None,
+                "fallback": True,
+            }
+        
+        handle["job_id"] = job_id
+        handle["submitted_at"] = datetime.utcnow().isoformat()
+        
+        await cache.set_json(
+            CacheKeys.tone_batch(job_id),
+            handle,
+            expire_seconds=24 * 60 * 60,  # Provider batches finish within 24 hours
+        )
+        await redis.sadd(CacheKeys.TONE_BATCHES_PENDING, job_id)
+        
+        return {
+            "success": True,
+            "job_id": job_id,
+            "batch_id": handle["batch_id"],
+            "request_count": handle["request_count"],
+        }
+    finally:
+        await redis.aclose()
+
+
+@celery_app.task(
+    name="poll_tone_batches",
+    time_limit=120,  # Lightweight: status checks plus result stitching
+)
+def poll_tone_batches_task() -> dict:
+    """
+    Periodic Celery task that collects finished tone batches.
+    
+    Scheduled by Celery beat (see `tone_batch_poll_interval_seconds`).
+    
+    Returns:
+        dict with counts of pending and finalized jobs
+    """
+    import asyncio
+    
+    return asyncio.run(_poll_tone_batches_async())
+
+
+async def _poll_tone_batches_async() -> dict:
+    """Async wrapper for tone batch polling"""
+    from app.database import get_async_session
+    
+    async with get_async_session() as db:
+        return await poll_tone_batches_sync(db)
+
+
+async def poll_tone_batches_sync(db: AsyncSession) -> dict:
+    """
+    Check every pending tone batch and stitch finished ones into their jobs.
+    
+    Errors for one job are logged and retried on the next tick; they never
+    block the other pending jobs.
+    
+    Args:
+        db: Database session
+        
+    Returns:
+        dict with counts of pending and finalized jobs
+    """
+    redis = get_redis_client()
+    
+    try:
+        job_ids = await redis.smembers(CacheKeys.TONE_BATCHES_PENDING)
+        finalized = 0
+        
+        for job_id in job_ids:
+            try:
+                if await finalize_tone_batch(job_id, db, redis):
+                    finalized += 1
+            except Exception as e:
+                log_error("Failed to finalize tone batch", exc=e, job_id=job_id)
+        
+        if job_ids:
+            info(
+                "Tone batches polled",
+                pending=len(job_ids) - finalized,
+                finalized=finalized,
+            )
+        
+        return {"pending": len(job_ids) - finalized, "finalized": finalized}
+    finally:
+        await redis.aclose()
+
+
+async def finalize_tone_batch(
+    job_id: str,
+    db: AsyncSession,
+    redis,
+    batch_service: ToneBatchService | None = None,
+) -> bool:
+    """
+    Stitch a finished tone batch back into the job's translated blocks.
+    
+    Args:
+        job_id: Translation job ID
+        db: Database session
+        redis: Redis client
+        batch_service: Optional ToneBatchService (defaults to the handle's provider)
+        
+    Returns:
+        True if the batch was finalized (or dropped), False if still processing
+    """
+    cache = Cache(redis)
+    handle_key = CacheKeys.tone_batch(job_id)
+    handle = await cache.get_json(handle_key)
+    
+    if not handle:
+        warning("Tone batch handle missing, dropping pending job", job_id=job_id)
+        await redis.srem(CacheKeys.TONE_BATCHES_PENDING, job_id)
+        return True
+    
+    # Checked before collecting: without the blocks the results can't be
+    # stitched, so the batch is dropped instead of downloaded on every poll
+    cache_key = CacheKeys.translated_blocks(job_id)
+    cached_translation = await cache.get_json(cache_key)
+    
+    if not cached_translation:
+        log_error("Translated blocks expired before tone batch finished", job_id=job_id)
+        translation = await db.get(Translation, UUID(job_id))
+        if translation:
+            translation.status = TranslationStatus.FAILED
+            translation.error_message = "Tone customization error: translated blocks expired before the batch finished"
+            await db.commit()
+        await redis.srem(CacheKeys.TONE_BATCHES_PENDING, job_id)
+        await cache.delete(handle_key)
+        return True
+    
+    batch_service = batch_service or ToneBatchService(
+        get_tone_batch_provider(handle.get("provider"))
+    )
+    translated_blocks = _deserialize_translated_blocks(cached_translation.get("blocks", []))
+    collected = batch_service.collect(handle, [tb.translated_text for tb in translated_blocks])
+    
+    if collected is None:
+        return False
+    
+    customized_by_idx, total_cost = collected
+    tone = handle["tone"]
+    
+    customized_texts = [
+        customized_by_idx.get(idx, tb.translated_text)
+        for idx, tb in enumerate(translated_blocks)
+    ]
+    
+    await cache.set_json(
+        cache_key,
+        _build_tone_customized_data(
+            translated_blocks=translated_blocks,
+            customized_texts=customized_texts,
+            cached_translation=cached_translation,
+            tone=tone,
+            total_cost=total_cost,
+        ),
+        expire_seconds=24 * 60 * 60,  # 24 hours
+    )
+    await TranslatedBlockStore(redis).clear_block_tones(job_id)
+    
+    translation = await db.get(Translation, UUID(job_id))
+    if translation:
+        _record_tone_on_translation(translation, tone, total_cost)
+        await db.commit()
+        
+        # Token usage only: batch requests have no per-call latency
+        await TonePlanner(redis).record(translation.target_language, batch_service.observations)
+    
+    await redis.srem(CacheKeys.TONE_BATCHES_PENDING, job_id)
+    await cache.delete(handle_key)
+    
+    info(
+        "Tone batch stitched into job",
+        job_id=job_id,
+        batch_id=handle.get("batch_id"),
+        block_count=len(translated_blocks),
+        customized_blocks=len(customized_by_idx),
+        cost_usd=f"${total_cost:.6f}",
+    )
+    
+    return True
+
+
+@celery_app.task(
+    name="customize_tone_blocks",
+    bind=True,
+    max_retries=3,
+    default_retry_delay=60,  # 1 minute delay between retries
+    time_limit=900,  # 15 minutes max
+)
+def customize_tone_blocks_task(self, job_id: str, tone: str, block_indices: list[int]) -> dict:
+    """
+    Celery task to apply tone customization to selected blocks only.
+    
+    Args:
+        job_id: Translation job ID
+        tone: Tone preset or custom description
+        block_indices: Indices of the blocks to re-tone
+        
+    Returns:
+        dict with tone customization results
+    """
+    import asyncio
+    
+    try:
+        return asyncio.run(_customize_tone_blocks_async(job_id, tone, block_indices))
+    except Exception as e:
+        log_error("Customize tone blocks task failed", exc=e, job_id=job_id)
+        raise self.retry(exc=e)
+
+
+async def _customize_tone_blocks_async(job_id: str, tone: str, block_indices: list[int]) -> dict:
+    """Async wrapper for scoped tone customization"""
+    from app.database import get_async_session
+    
+    async with get_async_session() as db:
+        return await customize_tone_blocks_sync(job_id, tone, block_indices, db)
+
+
+async def customize_tone_blocks_sync(
+    job_id: str,
+    tone: str,
+    block_indices: list[int],
+    db: AsyncSession,
+    tone_service: ToneService | None = None,
+) -> dict:
+    """
+    Apply tone customization to a selection of blocks.
+    
+    Unlike `customize_tone_sync`, this never rewrites the `_translated`
+    payload: each block's result is written to the per-block update hash as
+    soon as it is ready. Blocks with a user edit are re-toned from the
+    edited text. The job status is left unchanged and the cost is added to
+    the job's tone cost.
+    
+    Args:
+        job_id: Translation job ID
+        tone: Tone preset or custom description
+        block_indices: Indices of the blocks to re-tone
+        db: Database session
+        tone_service: Optional ToneService (defaults to a new instance)
+        
+    Returns:
+        dict with tone customization results
+    """
+    info(
+        "Starting scoped tone customization",
+        job_id=job_id,
+        tone=tone,
+        block_count=len(block_indices),
+    )
+    
+    translation = await db.get(Translation, UUID(job_id))
+    
+    if not translation:
+        log_error("Translation not found", job_id=job_id)
+        raise ValueError(f"Translation {job_id} not found")
+    
+    redis = get_redis_client()
+    store = TranslatedBlockStore(redis)
+    
+    try:
+        data = await store.load(job_id)
+        
+        if not data:
+            log_error("Translated blocks not found in cache", job_id=job_id)
+            raise ValueError(f"No translated blocks found for job {job_id}")
+        
+        blocks = data.get("blocks", [])
+        tone_service = tone_service or ToneService()
+        total_cost = 0.0
+        customized = 0
+        
+        for block_idx in block_indices:
+            if not 0 <= block_idx < len(blocks):
+                continue
+            block = blocks[block_idx]
+            source_text = block.get("edited_text") or block.get("translated_text", "")
+            
+            try:
+                customized_text, cost = await tone_service.apply_tone(
+                    text=source_text,
+                    tone=tone,
+                    target_lang=block.get("target_lang", "en"),
+                )
+            except Exception as e:
+                warning(
+                    "Failed to customize block tone, keeping previous text",
+                    exc=e,
+                    job_id=job_id,
+                    block_idx=block_idx,
+                )
+                continue
+            
+            await store.set_block_tone(job_id, block_idx, customized_text, tone)
+            total_cost += cost
+            customized += 1
+        
+        translation.tone_cost = (translation.tone_cost or 0) + total_cost
+        await db.commit()
+        
+        await TonePlanner(redis).record(translation.target_language, tone_service.observations)
+        
+        info(
+            "Scoped tone customization complete",
+            job_id=job_id,
+            requested_blocks=len(block_indices),
+            customized_blocks=customized,
+            cost_usd=f"${total_cost:.6f}",
+        )
+        
+        return {
+            "success": True,
+            "job_id": job_id,
+            "block_count": customized,
+            "cost_usd": total_cost,
+            "tone": tone,
+        }
+    finally:
+        await redis.aclose()
@@ -1,17 +1,26 @@
 """PDF Reconstruction Celery task"""
 
+import os
+import tempfile
 from datetime import datetime
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.celery_app import celery_app
-from app.cache import Cache, CacheKeys, get_redis_client
+from app.cache import get_redis_client
+from app.config import get_settings
 from app.database import get_db
-from app.logger import error as log_error, info
+from app.logger import error as log_error, info, warning
 from app.models.translation import Translation, TranslationStatus
-from app.s3 import S3Keys, download_file, upload_file
+from app.s3 import S3Keys, download_file, upload_file_from_path
+from app.services.block_store import TranslatedBlockStore
+from app.services.document_ir import DocumentIRStore
+from app.services.page_cache import PageArtifactCache
 from app.services.pdf_reconstruction import PDFReconstructionService
+from app.services.save_profiles import get_save_profile
+from app.services.text_layer import TextLayerPublisher
+from app.tasks.render_previews import trigger_preview_rendering
 
 
 @celery_app.task(
@@ -58,8 +67,8 @@ async def reconstruct_pdf_sync(
     This function:
     1. Loads original PDF from S3
     2. Loads translated blocks from Redis cache
-    3. Reconstructs PDF using PyMuPDF
-    4. Uploads reconstructed PDF to S3
+    3. Reconstructs PDF using PyMuPDF into a temporary file
+    4. Streams the reconstructed PDF to S3 (multipart for large files)
     5. Updates translation record with result path
     
     Args:
@@ -89,7 +98,6 @@ async def reconstruct_pdf_sync(
         
         # Get Redis client for loading cached blocks
         redis = get_redis_client()
-        cache = Cache(redis)
         
         try:
             # Load original PDF from S3
@@ -107,9 +115,8 @@ async def reconstruct_pdf_sync(
                 size_bytes=len(original_pdf_bytes),
             )
             
-            # Load translated blocks from Redis cache
-            cache_key = f"{CacheKeys.blocks(job_id)}_translated"
-            cached_translation = await cache.get_json(cache_key)
+            # Load translated blocks from Redis cache (with per-block updates applied)
+            cached_translation = await TranslatedBlockStore(redis).load(job_id)
             
             if not cached_translation:
                 log_error("Translated blocks not found in cache", job_id=job_id)
@@ -122,33 +129,49 @@ async def reconstruct_pdf_sync(
                 block_count=len(blocks),
             )
             
-            # Reconstruct PDF with translated text
-            info("Reconstructing PDF", job_id=job_id, block_count=len(blocks))
-            reconstructed_pdf_bytes = PDFReconstructionService.reconstruct_pdf_with_tone(
-                original_pdf_bytes=original_pdf_bytes,
-                translated_blocks=blocks,
-                use_tone=False,  # Tone customization handled in Story 3.2
-            )
-            
-            info(
-                "PDF reconstructed successfully",
-                job_id=job_id,
-                output_size=len(reconstructed_pdf_bytes),
-            )
+            # Layout analysed at extraction time, so the PDF isn't parsed again
+            document_ir = await DocumentIRStore(redis).load(job_id)
             
-            # Upload reconstructed PDF to S3
             result_s3_key = S3Keys.result_path(
                 user_id=str(translation.user_id),
                 job_id=job_id,
                 filename=translation.file_name,
             )
             
-            info("Uploading reconstructed PDF to S3", job_id=job_id, s3_key=result_s3_key)
-            uploaded_key = await upload_file(
-                file_data=reconstructed_pdf_bytes,
-                key=result_s3_key,
-                content_type="application/pdf",
-            )
+            # Reconstruct into a temporary file and stream it to S3, so the
+            # output is never held in memory
+            with tempfile.TemporaryDirectory(prefix="transkeep-reconstruct-") as work_dir:
+                output_path = os.path.join(work_dir, "output.pdf")
+                info("Reconstructing PDF", job_id=job_id, block_count=len(blocks))
+                # Goes through the page cache so the first download only renders edited pages
+                file_size = await PageArtifactCache(redis).reconstruct_to_file(
+                    job_id=job_id,
+                    user_id=str(translation.user_id),
+                    original_pdf_bytes=original_pdf_bytes,
+                    translated_blocks=PDFReconstructionService.blocks_with_tone(
+                        blocks,
+                        use_tone=False,  # Tone customization handled in Story 3.2
+                    ),
+                    output_path=output_path,
+                    document_ir=document_ir,
+                    save_profile=get_save_profile(get_settings().pdf_pipeline_save_profile),
+                    linearize=get_settings().pdf_linearize_output,
+                )
+                # The original is no longer needed while uploading
+                del original_pdf_bytes
+                
+                info(
+                    "PDF reconstructed successfully",
+                    job_id=job_id,
+                    output_size=file_size,
+                )
+                
+                info("Uploading reconstructed PDF to S3", job_id=job_id, s3_key=result_s3_key)
+                uploaded_key = await upload_file_from_path(
+                    path=output_path,
+                    key=result_s3_key,
+                    content_type="application/pdf",
+                )
             
             info(
                 "Reconstructed PDF uploaded to S3",
@@ -156,6 +179,18 @@ async def reconstruct_pdf_sync(
                 s3_key=uploaded_key,
             )
             
+            # Static text layer for the viewer; the API publishes it on
+            # first request if this fails
+            try:
+                await TextLayerPublisher(redis).publish(job_id, str(translation.user_id))
+            except Exception as e:
+                warning("Failed to publish text layer", exc=e, job_id=job_id)
+            
+            try:
+                trigger_preview_rendering(job_id, "translated")
+            except Exception as e:
+                warning("Failed to trigger preview rendering", exc=e, job_id=job_id)
+            
             # Update translation record
             translation.result_file_path = uploaded_key
             translation.status = TranslationStatus.COMPLETED
@@ -173,7 +208,7 @@ async def reconstruct_pdf_sync(
                 "success": True,
                 "job_id": job_id,
                 "uploaded_key": uploaded_key,
-                "file_size": len(reconstructed_pdf_bytes),
+                "file_size": file_size,
             }
             
         finally:
@@ -0,0 +1,106 @@
+"""Page preview rendering Celery task"""
+
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.celery_app import celery_app
+from app.cache import get_redis_client
+from app.logger import error as log_error, info
+from app.models.translation import Translation
+from app.s3 import download_file
+from app.services.previews import PreviewRenderer
+
+
+@celery_app.task(
+    name="render_previews",
+    bind=True,
+    max_retries=2,
+    default_retry_delay=30,  # 30 seconds delay between retries
+    time_limit=600,  # 10 minutes max
+)
+def render_previews_task(self, job_id: str, kind: str) -> dict:
+    """
+    Celery task to render page previews of a job's PDF.
+
+    Args:
+        job_id: Translation job ID
+        kind: "original" (queued at upload) or "translated" (queued after
+            reconstruction)
+
+    Returns:
+        dict with rendering results
+    """
+    import asyncio
+
+    try:
+        return asyncio.run(_render_previews_async(job_id, kind))
+    except Exception as e:
+        log_error("Render previews task failed", exc=e, job_id=job_id, kind=kind)
+        raise self.retry(exc=e)
+
+
+async def _render_previews_async(job_id: str, kind: str) -> dict:
+    """Async wrapper for preview rendering"""
+    from app.database import get_async_session
+
+    async with get_async_session() as db:
+        return await render_previews_sync(job_id, kind, db)
+
+
+async def render_previews_sync(job_id: str, kind: str, db: AsyncSession) -> dict:
+    """
+    Render and upload page previews of a job's original or translated PDF.
+
+    Runs alongside the translation pipeline and never changes the job's
+    status.
+
+    Args:
+        job_id: Translation job ID
+        kind: "original" or "translated"
+        db: Database session
+
+    Returns:
+        dict with rendering results
+
+    Raises:
+        ValueError: If the job or its PDF doesn't exist
+    """
+    translation = await db.get(Translation, UUID(job_id))
+    if not translation:
+        raise ValueError(f"Translation {job_id} not found")
+
+    s3_key = translation.original_file_path if kind == "original" else translation.result_file_path
+    if not s3_key:
+        raise ValueError(f"No {kind} PDF for job {job_id}")
+
+    pdf_bytes = await download_file(s3_key)
+    redis = get_redis_client()
+    try:
+        manifest = await PreviewRenderer(redis).render(job_id, str(translation.user_id), kind, pdf_bytes)
+    finally:
+        await redis.aclose()
+
+    return {
+        "success": True,
+        "job_id": job_id,
+        "kind": kind,
+        "version": manifest["version"],
+        "page_count": len(manifest["pages"]),
+    }
+
+
+def trigger_preview_rendering(job_id: str, kind: str) -> str:
+    """
+    Queue preview rendering for one of a job's PDFs.
+
+    Args:
+        job_id: Translation job ID
+        kind: "original" or "translated"
+
+    Returns:
+        Celery task ID
+    """
+    task = render_previews_task.delay(job_id, kind)
+    info("Preview rendering triggered", job_id=job_id, kind=kind, task_id=task.id)
+    return task.id
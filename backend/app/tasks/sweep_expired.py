@@ -0,0 +1,59 @@
+"""Periodic deletion of expired translation jobs"""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.celery_app import celery_app
+from app.cache import get_redis_client
+from app.config import get_settings
+from app.services.expiry_sweeper import ExpirySweeper
+
+
+@celery_app.task(
+    name="sweep_expired_translations",
+    time_limit=1800,  # A capped number of batches per run
+)
+def sweep_expired_translations_task() -> dict:
+    """
+    Periodic Celery task that deletes expired translations.
+    
+    Scheduled by Celery beat (see `expiry_sweep_interval_seconds`).
+    
+    Returns:
+        dict with counts of deleted and retained jobs
+    """
+    import asyncio
+    
+    return asyncio.run(_sweep_expired_async())
+
+
+async def _sweep_expired_async() -> dict:
+    """Async wrapper for the expiry sweep"""
+    from app.database import get_async_session
+    
+    async with get_async_session() as db:
+        return await sweep_expired_sync(db)
+
+
+async def sweep_expired_sync(db: AsyncSession) -> dict:
+    """
+    Delete expired translations with their files and cache keys.
+    
+    Args:
+        db: Database session
+        
+    Returns:
+        dict with counts of deleted and retained jobs
+    """
+    settings = get_settings()
+    redis = get_redis_client()
+    
+    try:
+        return await ExpirySweeper(
+            db,
+            redis,
+            batch_size=settings.expiry_sweep_batch_size,
+            max_batches=settings.expiry_sweep_max_batches,
+            pause_seconds=settings.expiry_sweep_pause_seconds,
+        ).sweep()
+    finally:
+        await redis.aclose()
@@ -0,0 +1,34 @@
+"""Add content_hash column to translations table
+
+Revision ID: 003_add_content_hash
+Revises: 002_add_started_at
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "003_add_content_hash"
+down_revision: Union[str, None] = "002_add_started_at"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "translations",
+        sa.Column("content_hash", sa.String(64), nullable=True),
+    )
+    op.create_index(
+        "ix_translations_tenant_hash",
+        "translations",
+        ["tenant_id", "content_hash"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_translations_tenant_hash", table_name="translations")
+    op.drop_column("translations", "content_hash")
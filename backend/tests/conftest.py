@@ -2,16 +2,24 @@
 
 import asyncio
 import os
+import uuid
 from collections.abc import AsyncGenerator
+from datetime import datetime
 from typing import Generator
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
+from app import s3
 from app.database import Base, get_db
+from app.local_storage import LocalStorage
 from app.main import app
+from app.middleware.auth_middleware import get_current_user
+from app.models.translation import Translation, TranslationStatus
+from app.models.user import SubscriptionTier, User
 
 # Test database URL - use environment variable or default to test database
 TEST_DATABASE_URL = os.getenv(
@@ -80,3 +88,184 @@ async def client(test_session: AsyncSession) -> AsyncGenerator[AsyncClient, None
     
     app.dependency_overrides.clear()
 
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for redis.asyncio.Redis (strings, hashes, sets and pipelines)"""
+
+    def __init__(self):
+        self.store: dict = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.store:
+            return None
+        self.store[key] = value
+        return True
+
+    async def setex(self, key, seconds, value):
+        self.store[key] = value
+        return True
+
+    async def delete(self, *keys):
+        return sum(1 for key in keys if self.store.pop(key, None) is not None)
+
+    async def exists(self, key):
+        return int(key in self.store)
+
+    async def expire(self, key, seconds):
+        return key in self.store
+
+    async def incr(self, key):
+        self.store[key] = int(self.store.get(key, 0)) + 1
+        return self.store[key]
+
+    async def hset(self, key, field, value):
+        fields = self.store.setdefault(key, {})
+        is_new = field not in fields
+        fields[field] = value
+        return int(is_new)
+
+    async def hget(self, key, field):
+        return self.store.get(key, {}).get(field)
+
+    async def hgetall(self, key):
+        return dict(self.store.get(key, {}))
+
+    async def hincrby(self, key, field, amount=1):
+        fields = self.store.setdefault(key, {})
+        fields[field] = str(int(fields.get(field, 0)) + amount)
+        return int(fields[field])
+
+    async def hdel(self, key, *fields):
+        hash_fields = self.store.get(key, {})
+        return sum(1 for field in fields if hash_fields.pop(field, None) is not None)
+
+    async def sadd(self, key, *members):
+        members_set = self.store.setdefault(key, set())
+        before = len(members_set)
+        members_set.update(members)
+        return len(members_set) - before
+
+    async def srem(self, key, *members):
+        members_set = self.store.get(key, set())
+        removed = len(members_set & set(members))
+        members_set.difference_update(members)
+        return removed
+
+    async def smembers(self, key):
+        return set(self.store.get(key, set()))
+
+    async def unlink(self, *keys):
+        return await self.delete(*keys)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def aclose(self):
+        pass
+
+
+class FakePipeline:
+    """Queues FakeRedis commands and runs them in order on execute()"""
+
+    def __init__(self, redis: FakeRedis):
+        self.redis = redis
+        self.commands: list = []
+
+    def __getattr__(self, name):
+        method = getattr(self.redis, name)
+
+        def queue(*args, **kwargs):
+            self.commands.append((method, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self):
+        results = [await method(*args, **kwargs) for method, args, kwargs in self.commands]
+        self.commands = []
+        return results
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.commands = []
+
+
+@pytest.fixture
+def fake_redis() -> FakeRedis:
+    """In-memory Redis replacement for unit tests that don't need a server"""
+    return FakeRedis()
+
+
+@pytest.fixture
+def local_storage(tmp_path, monkeypatch) -> LocalStorage:
+    """LocalStorage under tmp_path, used as the app's storage backend"""
+    local = LocalStorage(str(tmp_path), "secret", "http://test")
+    monkeypatch.setattr(s3, "storage", local)
+    return local
+
+
+@pytest.fixture
+def mock_user() -> User:
+    """Create a mock user for testing"""
+    return User(
+        id=uuid.uuid4(),
+        tenant_id=uuid.uuid4(),
+        google_id="test_google_id",
+        email="test@example.com",
+        name="Test User",
+        subscription_tier=SubscriptionTier.FREE,
+        usage_this_month=0,
+    )
+
+
+@pytest.fixture
+def completed_translation(mock_user) -> Translation:
+    """Completed job owned by mock_user (report.pdf, en -> ja)"""
+    job_id = uuid.uuid4()
+    return Translation(
+        id=job_id,
+        tenant_id=mock_user.tenant_id,
+        user_id=mock_user.id,
+        file_name="report.pdf",
+        file_size_bytes=2048,
+        source_language="en",
+        target_language="ja",
+        status=TranslationStatus.COMPLETED,
+        original_file_path=f"uploads/{mock_user.id}/{job_id}/report.pdf",
+        created_at=datetime(2026, 1, 1),
+    )
+
+
+@pytest_asyncio.fixture
+async def completed_job_client(
+    fake_redis,
+    local_storage,
+    mock_user,
+    completed_translation,
+) -> AsyncGenerator[AsyncClient, None]:
+    """
+    HTTP client signed in as mock_user, without a database server.
+
+    Job lookups return completed_translation, the translation router uses
+    fake_redis and files live in local_storage.
+    """
+    session = AsyncMock()
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = completed_translation
+    session.execute.return_value = result
+
+    async def override_get_db():
+        yield session
+
+    app.dependency_overrides[get_current_user] = lambda: mock_user
+    app.dependency_overrides[get_db] = override_get_db
+    with patch("app.routers.translation.get_redis_client", return_value=fake_redis):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            yield ac
+    app.dependency_overrides.clear()
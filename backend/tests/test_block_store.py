@@ -0,0 +1,202 @@
+"""Tests for per-block edits and scoped tone runs"""
+
+import asyncio
+import json
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+import pytest_asyncio
+
+from app.cache import CacheKeys
+from app.models.translation import Translation, TranslationStatus
+from app.services.block_store import (
+    TranslatedBlockStore,
+    block_display_text,
+    select_block_indices,
+)
+from app.tasks.customize_tone import customize_tone_blocks_sync
+
+
+@pytest.fixture
+def job_id() -> str:
+    return str(uuid.uuid4())
+
+
+@pytest.fixture
+def translated_cache() -> dict:
+    """Cached `_translated` payload with three blocks over two pages"""
+    def block(block_id: int, page: int, text: str) -> dict:
+        return {
+            "original": {"page": page, "block_id": block_id, "text": f"original {block_id}"},
+            "translated_text": text,
+            "source_lang": "en",
+            "target_lang": "ja",
+        }
+
+    return {
+        "blocks": [block(0, 0, "first"), block(1, 0, "second"), block(2, 1, "third")],
+        "total_cost": 0.01,
+        "total_blocks": 3,
+    }
+
+
+@pytest_asyncio.fixture
+async def store(fake_redis, job_id, translated_cache) -> TranslatedBlockStore:
+    await fake_redis.set(CacheKeys.translated_blocks(job_id), json.dumps(translated_cache))
+    return TranslatedBlockStore(fake_redis)
+
+
+class TestTranslatedBlockStore:
+    """Tests for loading and updating translated blocks"""
+
+    @pytest.mark.asyncio
+    async def test_load_missing_returns_none(self, fake_redis):
+        assert await TranslatedBlockStore(fake_redis).load("missing") is None
+
+    @pytest.mark.asyncio
+    async def test_edit_merged_on_load(self, store, job_id, fake_redis, translated_cache):
+        await store.set_block_edit(job_id, 1, "edited second")
+
+        data = await store.load(job_id)
+
+        assert data["blocks"][1]["edited_text"] == "edited second"
+        assert "edited_at" in data["blocks"][1]
+        assert "edited_text" not in data["blocks"][0]
+        # The full payload is never rewritten by a block update
+        raw = json.loads(await fake_redis.get(CacheKeys.translated_blocks(job_id)))
+        assert raw == translated_cache
+
+    @pytest.mark.asyncio
+    async def test_tone_and_edit_share_block_entry(self, store, job_id):
+        await store.set_block_edit(job_id, 0, "edited")
+        await store.set_block_tone(job_id, 0, "EDITED", "casual")
+
+        block = (await store.load(job_id))["blocks"][0]
+
+        assert block["edited_text"] == "edited"
+        assert block["tone_customized_text"] == "EDITED"
+        assert block["tone"] == "casual"
+
+    @pytest.mark.asyncio
+    async def test_clear_block_tones_keeps_edits(self, store, job_id):
+        await store.set_block_edit(job_id, 0, "edited")
+        await store.set_block_tone(job_id, 0, "EDITED", "casual")
+        await store.set_block_tone(job_id, 2, "THIRD", "casual")
+
+        await store.clear_block_tones(job_id)
+
+        updates = await store.get_updates(job_id)
+        assert list(updates) == [0]
+        assert updates[0]["edited_text"] == "edited"
+        assert "tone_customized_text" not in updates[0]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_edit_and_tone_both_kept(self, store, job_id, fake_redis):
+        await asyncio.gather(
+            store.set_block_edit(job_id, 0, "edited"),
+            store.set_block_tone(job_id, 0, "TONED", "casual"),
+        )
+
+        fields = await fake_redis.hgetall(CacheKeys.block_updates(job_id))
+        assert sorted(fields) == ["0:edit", "0:tone"]
+        block = (await store.load(job_id))["blocks"][0]
+        assert block["edited_text"] == "edited"
+        assert block["tone_customized_text"] == "TONED"
+
+    @pytest.mark.asyncio
+    async def test_out_of_range_update_ignored(self, store, job_id):
+        await store.set_block_edit(job_id, 10, "ghost")
+
+        data = await store.load(job_id)
+
+        assert len(data["blocks"]) == 3
+
+
+class TestBlockSelection:
+    """Tests for resolving block selectors"""
+
+    def test_select_by_ids_and_pages(self, translated_cache):
+        assert select_block_indices(translated_cache, block_ids=[2, 7]) == [2]
+        assert select_block_indices(translated_cache, pages=[0]) == [0, 1]
+        assert select_block_indices(translated_cache, block_ids=[2], pages=[0]) == [0, 1, 2]
+
+    def test_select_edited_since_last_tone(self, translated_cache):
+        blocks = translated_cache["blocks"]
+        translated_cache["toned_at"] = "2024-01-02T00:00:00"
+        blocks[0]["edited_at"] = "2024-01-01T00:00:00"  # Edited before document tone
+        blocks[1]["edited_at"] = "2024-01-03T00:00:00"  # Edited after document tone
+        blocks[2]["edited_at"] = "2024-01-03T00:00:00"
+        blocks[2]["toned_at"] = "2024-01-04T00:00:00"  # Re-toned after edit
+
+        assert select_block_indices(translated_cache, edited_since_last_tone=True) == [1]
+
+    def test_empty_selector_selects_nothing(self, translated_cache):
+        assert select_block_indices(translated_cache) == []
+
+    def test_display_text_prefers_newest_change(self):
+        block = {"translated_text": "t", "tone_customized_text": "T"}
+        assert block_display_text(block) == "T"
+
+        block.update(edited_text="e", edited_at="2024-01-02T00:00:00", toned_at="2024-01-01T00:00:00")
+        assert block_display_text(block) == "e"
+
+        block["toned_at"] = "2024-01-03T00:00:00"
+        assert block_display_text(block) == "T"
+
+
+class TestCustomizeToneBlocks:
+    """Tests for scoped tone runs"""
+
+    @pytest.fixture
+    def mock_db(self, job_id):
+        translation = Translation(
+            id=uuid.UUID(job_id),
+            tenant_id=uuid.uuid4(),
+            user_id=uuid.uuid4(),
+            file_name="test.pdf",
+            file_size_bytes=1024,
+            source_language="en",
+            target_language="ja",
+            status=TranslationStatus.COMPLETED,
+            progress_percent=100,
+            original_file_path="uploads/test.pdf",
+            tone_cost=0.5,
+        )
+        db = MagicMock()
+        db.get = AsyncMock(return_value=translation)
+        db.commit = AsyncMock()
+        return db
+
+    @pytest.mark.asyncio
+    async def test_tones_only_selected_blocks(self, store, job_id, fake_redis, mock_db):
+        await store.set_block_edit(job_id, 1, "edited second")
+        tone_service = MagicMock()
+        tone_service.apply_tone = AsyncMock(side_effect=lambda text, tone, target_lang: (text.upper(), 0.1))
+
+        with patch("app.tasks.customize_tone.get_redis_client", return_value=fake_redis):
+            result = await customize_tone_blocks_sync(
+                job_id, "casual", [1, 2], mock_db, tone_service=tone_service
+            )
+
+        assert result["block_count"] == 2
+        data = await store.load(job_id)
+        assert "tone_customized_text" not in data["blocks"][0]
+        assert data["blocks"][1]["tone_customized_text"] == "EDITED SECOND"
+        assert data["blocks"][2]["tone_customized_text"] == "THIRD"
+        translation = mock_db.get.return_value
+        assert translation.tone_cost == pytest.approx(0.7)
+        assert translation.status == TranslationStatus.COMPLETED
+
+    @pytest.mark.asyncio
+    async def test_failed_block_keeps_previous_text(self, store, job_id, fake_redis, mock_db):
+        tone_service = MagicMock()
+        tone_service.apply_tone = AsyncMock(side_effect=RuntimeError("api down"))
+
+        with patch("app.tasks.customize_tone.get_redis_client", return_value=fake_redis):
+            result = await customize_tone_blocks_sync(
+                job_id, "casual", [0], mock_db, tone_service=tone_service
+            )
+
+        assert result["block_count"] == 0
+        assert await store.get_updates(job_id) == {}
@@ -0,0 +1,170 @@
+"""Tests for bulk alternatives generation"""
+
+import asyncio
+import re
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.services.alternatives_service import AlternativesService, BulkAlternativesParser
+
+
+def _response_for(params: dict, skip: tuple = ()) -> str:
+    """Build a well-formed bulk response echoing each section's text"""
+    content = params["messages"][0]["content"]
+    sections = re.findall(r"^### (\d+)\n(.*)$", content, flags=re.MULTILINE)
+    lines = []
+    for header, text in sections:
+        if int(header) in skip:
+            continue
+        lines.append(f"### {header}")
+        lines.append(f"1. {text} A")
+        lines.append(f'2. "{text} B"')
+    return "\n".join(lines)
+
+
+def _streaming(responder, chunk_size: int = 7):
+    """Fake _stream_completion yielding the response in small chunks"""
+    async def stream(params, usage):
+        response = responder(params)
+        for start in range(0, len(response), chunk_size):
+            yield response[start:start + chunk_size]
+        usage["input_tokens"] = 100
+        usage["output_tokens"] = 50
+
+    return stream
+
+
+@pytest.fixture
+def service() -> AlternativesService:
+    return AlternativesService(api_key="test_key")
+
+
+async def _collect(service, texts, count=2):
+    return [result async for result in service.stream_bulk_alternatives(texts, "JA", count)]
+
+
+class TestBulkAlternativesParser:
+    """Tests for incremental response parsing"""
+
+    def test_block_completed_by_next_header(self):
+        parser = BulkAlternativesParser()
+
+        assert parser.feed("### 0\n1. a\n2. b\n### ") == []
+        assert parser.feed("1\n") == [(0, ["1. a", "2. b"])]
+        assert parser.feed("1. c\n") == []
+        assert parser.close() == [(1, ["1. c"])]
+
+    def test_last_line_without_newline_flushed_on_close(self):
+        parser = BulkAlternativesParser()
+
+        parser.feed("### 2\n1. x")
+
+        assert parser.close() == [(2, ["1. x"])]
+
+    def test_text_before_first_header_ignored(self):
+        parser = BulkAlternativesParser()
+
+        parser.feed("Here you go:\n### 5\n1. y\n")
+
+        assert parser.close() == [(5, ["1. y"])]
+
+
+class TestPackPrompts:
+    """Tests for token-budgeted prompt packing"""
+
+    def test_small_blocks_share_one_prompt(self):
+        assert AlternativesService.pack_prompts(["a", "b", "", "c"], 3) == [[0, 1, 3]]
+
+    def test_input_budget_splits_prompts(self):
+        # Each block is ~1000 estimated input tokens
+        texts = ["x" * 2000] * 5
+
+        prompts = AlternativesService.pack_prompts(texts, 1)
+
+        assert [idx for prompt in prompts for idx in prompt] == [0, 1, 2, 3, 4]
+        assert all(len(prompt) <= 2 for prompt in prompts)
+
+    def test_oversized_block_gets_own_prompt(self):
+        prompts = AlternativesService.pack_prompts(["short", "x" * 50_000, "short"], 5)
+
+        assert prompts == [[0], [1], [2]]
+
+
+class TestStreamBulkAlternatives:
+    """Tests for streaming bulk alternatives"""
+
+    @pytest.mark.asyncio
+    async def test_streams_every_block_then_done(self, service):
+        service._stream_completion = _streaming(_response_for)
+
+        results = await _collect(service, ["hello", "", "world"])
+
+        done = results[-1]
+        assert done["done"] is True
+        assert done["cost_usd"] == pytest.approx(AlternativesService.calculate_cost(100, 50))
+        by_index = {result["index"]: result["alternatives"] for result in results[:-1]}
+        assert by_index == {
+            0: ["hello A", "hello B"],
+            1: [],
+            2: ["world A", "world B"],
+        }
+
+    @pytest.mark.asyncio
+    async def test_missing_block_falls_back_to_single_call(self, service):
+        service._stream_completion = _streaming(lambda params: _response_for(params, skip=(1,)))
+        service.generate_alternatives = AsyncMock(return_value=(["single A", "single B"], 0.5))
+
+        results = await _collect(service, ["hello", "world"])
+
+        by_index = {result["index"]: result["alternatives"] for result in results[:-1]}
+        assert by_index[1] == ["single A", "single B"]
+        service.generate_alternatives.assert_awaited_once_with("world", "JA", 2)
+        assert results[-1]["cost_usd"] == pytest.approx(AlternativesService.calculate_cost(100, 50) + 0.5)
+
+    @pytest.mark.asyncio
+    async def test_fallbacks_run_concurrently(self, service):
+        service._stream_completion = _streaming(lambda params: _response_for(params, skip=(0, 1, 2)))
+        in_flight = 0
+        peak = 0
+
+        async def generate(text, target_lang, count):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return [f"{text} single"], 0.5
+
+        service.generate_alternatives = generate
+
+        results = await _collect(service, ["a", "b", "c"])
+
+        assert peak == 3
+        assert sorted(result["index"] for result in results[:-1]) == [0, 1, 2]
+        assert results[-1]["cost_usd"] == pytest.approx(AlternativesService.calculate_cost(100, 50) + 1.5)
+
+    @pytest.mark.asyncio
+    async def test_single_call_uses_async_client(self, service):
+        message = MagicMock(content=[MagicMock(text="1. a\n2. b")], usage=MagicMock(input_tokens=10, output_tokens=5))
+        service.async_client = MagicMock()
+        service.async_client.messages.create = AsyncMock(return_value=message)
+
+        alternatives, _ = await service.generate_alternatives("hello", "JA", 2)
+
+        assert alternatives == ["a", "b"]
+        service.async_client.messages.create.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_prompt_reports_undelivered_blocks(self, service):
+        async def failing(params, usage):
+            yield "### 0\n1. a\n2. b\n### 1\n"
+            raise RuntimeError("stream dropped")
+
+        service._stream_completion = failing
+
+        results = await _collect(service, ["hello", "world"])
+
+        assert results[0] == {"index": 0, "alternatives": ["a", "b"]}
+        assert results[1] == {"index": 1, "alternatives": [], "error": "generation_failed"}
+        assert results[-1]["done"] is True
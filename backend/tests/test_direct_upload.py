@@ -0,0 +1,236 @@
+"""Tests for direct-to-storage uploads"""
+
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import pytest_asyncio
+from botocore.exceptions import ClientError
+from fastapi import status
+from httpx import ASGITransport, AsyncClient
+
+from app import s3
+from app.cache import CacheKeys, get_redis
+from app.database import get_db
+from app.local_storage import LocalStorage
+from app.main import app
+from app.middleware.auth_middleware import get_current_user
+from app.services.direct_upload import PendingUploadStore, presign_upload_parts, verify_uploaded_pdf
+
+MB = 1024 * 1024
+PDF_HEADER = b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n1 0 obj"
+
+
+@pytest.fixture
+def mock_session():
+    session = AsyncMock()
+    session.add = MagicMock()
+    return session
+
+
+@pytest_asyncio.fixture
+async def client(mock_user, mock_session, fake_redis):
+    """HTTP client with the user, database and Redis dependencies replaced"""
+    async def override_get_db():
+        yield mock_session
+
+    async def override_get_redis():
+        yield fake_redis
+
+    app.dependency_overrides[get_current_user] = lambda: mock_user
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_redis] = override_get_redis
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
+    app.dependency_overrides.clear()
+
+
+async def _start(client, file_size=40 * MB):
+    with patch("app.routers.upload.create_multipart_upload", new_callable=AsyncMock) as mock_create:
+        mock_create.return_value = "upload-1"
+        return await client.post(
+            "/api/v1/uploads",
+            json={"file_name": "report.pdf", "file_size_bytes": file_size, "target_language": "JA"},
+        )
+
+
+class TestPresignUploadParts:
+    """Tests for presign_upload_parts"""
+
+    def test_one_url_per_part(self):
+        parts = presign_upload_parts("uploads/u/j/a.pdf", "upload-1", 40 * MB, 16 * MB, 600)
+
+        assert [part["part_number"] for part in parts] == [1, 2, 3]
+        query = parse_qs(urlparse(parts[2]["url"]).query)
+        assert query["uploadId"] == ["upload-1"]
+        assert query["partNumber"] == ["3"]
+
+    def test_small_file_single_part(self):
+        assert len(presign_upload_parts("k", "upload-1", 1024, 16 * MB, 600)) == 1
+
+
+class TestVerifyUploadedPdf:
+    """Tests for verify_uploaded_pdf"""
+
+    @pytest.mark.asyncio
+    async def test_accepts_pdf_of_declared_size(self):
+        with patch("app.services.direct_upload.get_file_size", AsyncMock(return_value=2048)), \
+             patch("app.services.direct_upload.download_range", AsyncMock(return_value=PDF_HEADER)) as mock_range:
+            await verify_uploaded_pdf("k", 2048)
+
+        # Only the header is read
+        mock_range.assert_awaited_once_with("k", 0, 1023)
+
+    @pytest.mark.asyncio
+    async def test_rejects_size_mismatch(self):
+        with patch("app.services.direct_upload.get_file_size", AsyncMock(return_value=4096)), \
+             patch("app.services.direct_upload.download_range", AsyncMock(return_value=PDF_HEADER)):
+            with pytest.raises(ValueError, match="expected 2048"):
+                await verify_uploaded_pdf("k", 2048)
+
+    @pytest.mark.asyncio
+    async def test_rejects_non_pdf(self):
+        with patch("app.services.direct_upload.get_file_size", AsyncMock(return_value=2048)), \
+             patch("app.services.direct_upload.download_range", AsyncMock(return_value=b"PK\x03\x04")):
+            with pytest.raises(ValueError, match="not a PDF"):
+                await verify_uploaded_pdf("k", 2048)
+
+
+class TestDirectUploadEndpoints:
+    """Tests for POST /uploads and POST /uploads/{job_id}/complete"""
+
+    @pytest.mark.asyncio
+    async def test_start_returns_part_urls(self, client, fake_redis, mock_user):
+        response = await _start(client)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        result = response.json()
+        assert result["upload_id"] == "upload-1"
+        assert len(result["parts"]) == 3
+        pending = await PendingUploadStore(fake_redis, 60).load(result["job_id"])
+        assert pending["user_id"] == str(mock_user.id)
+        assert pending["target_language"] == "ja"
+
+    @pytest.mark.asyncio
+    async def test_start_rejects_too_large(self, client):
+        response = await _start(client, file_size=101 * MB)
+
+        assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+
+    @pytest.mark.asyncio
+    async def test_start_unavailable_with_local_storage(self, client, tmp_path, monkeypatch):
+        monkeypatch.setattr(s3, "storage", LocalStorage(str(tmp_path), "secret", "http://test"))
+
+        with patch("app.routers.upload.create_multipart_upload", new_callable=AsyncMock) as mock_create:
+            response = await client.post(
+                "/api/v1/uploads",
+                json={"file_name": "report.pdf", "file_size_bytes": 40 * MB, "target_language": "JA"},
+            )
+
+        assert response.status_code == status.HTTP_501_NOT_IMPLEMENTED
+        mock_create.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_complete_creates_translation(self, client, fake_redis, mock_session):
+        job_id = (await _start(client)).json()["job_id"]
+
+        with patch("app.routers.upload.complete_multipart_upload", new_callable=AsyncMock) as mock_complete, \
+             patch("app.routers.upload.verify_uploaded_pdf", new_callable=AsyncMock), \
+             patch("app.routers.upload.trigger_preview_rendering") as mock_previews, \
+             patch("app.routers.upload.trigger_translation_pipeline", return_value="task-1") as mock_trigger:
+            response = await client.post(
+                f"/api/v1/uploads/{job_id}/complete",
+                json={"parts": [{"part_number": n, "etag": f'"etag-{n}"'} for n in (2, 1, 3)]},
+            )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.json()["file_size_bytes"] == 40 * MB
+        assert mock_complete.await_args.kwargs["parts"] == [(2, '"etag-2"'), (1, '"etag-1"'), (3, '"etag-3"')]
+        mock_session.add.assert_called_once()
+        mock_trigger.assert_called_once_with(job_id)
+        mock_previews.assert_called_once_with(job_id, "original")
+        assert not await fake_redis.exists(CacheKeys.pending_upload(job_id))
+
+    @pytest.mark.asyncio
+    async def test_complete_with_missing_parts_can_retry(self, client, fake_redis, mock_session):
+        job_id = (await _start(client)).json()["job_id"]
+        error = ClientError({"Error": {"Code": "InvalidPart", "Message": "missing"}}, "CompleteMultipartUpload")
+
+        with patch("app.routers.upload.complete_multipart_upload", AsyncMock(side_effect=error)):
+            response = await client.post(
+                f"/api/v1/uploads/{job_id}/complete",
+                json={"parts": [{"part_number": 1, "etag": '"etag-1"'}]},
+            )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert await fake_redis.exists(CacheKeys.pending_upload(job_id))
+        mock_session.add.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_complete_rejects_non_pdf(self, client, fake_redis, mock_session):
+        job_id = (await _start(client)).json()["job_id"]
+
+        with patch("app.routers.upload.complete_multipart_upload", new_callable=AsyncMock), \
+             patch("app.routers.upload.verify_uploaded_pdf", AsyncMock(side_effect=ValueError("Uploaded file is not a PDF"))), \
+             patch("app.routers.upload.delete_file", new_callable=AsyncMock) as mock_delete:
+            response = await client.post(
+                f"/api/v1/uploads/{job_id}/complete",
+                json={"parts": [{"part_number": 1, "etag": '"etag-1"'}]},
+            )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        mock_delete.assert_awaited_once()
+        mock_session.add.assert_not_called()
+        assert not await fake_redis.exists(CacheKeys.pending_upload(job_id))
+
+    @pytest.mark.asyncio
+    async def test_verify_storage_error_can_retry(self, client, fake_redis, mock_session):
+        job_id = (await _start(client)).json()["job_id"]
+        body = {"parts": [{"part_number": 1, "etag": '"etag-1"'}]}
+
+        with patch("app.routers.upload.complete_multipart_upload", new_callable=AsyncMock) as mock_complete, \
+             patch("app.routers.upload.delete_file", new_callable=AsyncMock) as mock_delete, \
+             patch("app.routers.upload.trigger_preview_rendering"), \
+             patch("app.routers.upload.trigger_translation_pipeline", return_value="task-1"):
+            with patch("app.routers.upload.verify_uploaded_pdf", AsyncMock(side_effect=ConnectionError("down"))):
+                response = await client.post(f"/api/v1/uploads/{job_id}/complete", json=body)
+
+            assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+            assert await fake_redis.exists(CacheKeys.pending_upload(job_id))
+            mock_delete.assert_not_awaited()
+
+            with patch("app.routers.upload.verify_uploaded_pdf", new_callable=AsyncMock):
+                response = await client.post(f"/api/v1/uploads/{job_id}/complete", json=body)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        # The parts were assembled once; the retry only verified
+        mock_complete.assert_awaited_once()
+        mock_session.add.assert_called_once()
+        assert not await fake_redis.exists(CacheKeys.pending_upload(job_id))
+
+    @pytest.mark.asyncio
+    async def test_failed_record_discards_upload(self, client, fake_redis, mock_session):
+        job_id = (await _start(client)).json()["job_id"]
+        mock_session.commit.side_effect = ConnectionError("db down")
+
+        with patch("app.routers.upload.complete_multipart_upload", new_callable=AsyncMock), \
+             patch("app.routers.upload.verify_uploaded_pdf", new_callable=AsyncMock), \
+             patch("app.routers.upload.delete_file", new_callable=AsyncMock) as mock_delete:
+            response = await client.post(
+                f"/api/v1/uploads/{job_id}/complete",
+                json={"parts": [{"part_number": 1, "etag": '"etag-1"'}]},
+            )
+
+        assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+        mock_delete.assert_awaited()
+        assert not await fake_redis.exists(CacheKeys.pending_upload(job_id))
+
+    @pytest.mark.asyncio
+    async def test_complete_unknown_upload(self, client):
+        response = await client.post(
+            f"/api/v1/uploads/{uuid.uuid4()}/complete",
+            json={"parts": [{"part_number": 1, "etag": '"etag-1"'}]},
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,142 @@
+"""Tests for the extraction-time document IR"""
+
+import dataclasses
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import fitz
+import pytest
+
+from app.cache import CacheKeys
+from app.schemas.pdf import DocumentIR, TranslatedBlock
+from app.services.document_ir import DocumentIRBuilder, DocumentIRStore
+from app.services.pdf_reconstruction import PDFReconstructionService
+from app.services.pdf_service import PDFService
+from app.services.save_profiles import ARCHIVAL
+
+
+@pytest.fixture
+def sample_pdf_path(tmp_path):
+    """Two-page PDF with three text blocks"""
+    pdf_path = tmp_path / "ir.pdf"
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((72, 100), "First block", fontsize=12)
+    page.insert_text((72, 300), "Second block", fontsize=14)
+    doc.new_page().insert_text((72, 100), "Third block", fontsize=12)
+    doc.save(str(pdf_path))
+    doc.close()
+    return str(pdf_path)
+
+
+def _document_ir() -> DocumentIR:
+    builder = DocumentIRBuilder(engine="pymupdf")
+    builder.add_page(0, 612, 792)
+    builder.add_span(0, 0, (72.123, 90.0, 150.456, 104.0), "Helvetica", 12)
+    builder.add_span(0, 1, (72.0, 290.0, 160.0, 306.0), "Helvetica", 14)
+    return builder.build()
+
+
+class TestDocumentIR:
+    """Tests for DocumentIR serialization"""
+
+    def test_round_trip_through_json(self):
+        document_ir = _document_ir()
+
+        restored = DocumentIR.from_dict(json.loads(json.dumps(document_ir.to_dict())))
+
+        assert restored == document_ir
+        assert restored.pages[0].spans[0] == [[72.12, 90.0, 150.46, 104.0, 0, 12]]
+        assert restored.fonts == ["Helvetica"]
+
+    def test_other_version_is_ignored(self):
+        data = _document_ir().to_dict()
+        data["version"] = DocumentIR.VERSION + 1
+
+        assert DocumentIR.from_dict(data) is None
+
+
+class TestDocumentIRStore:
+    """Tests for DocumentIRStore"""
+
+    @pytest.mark.asyncio
+    async def test_save_and_load(self, fake_redis):
+        store = DocumentIRStore(fake_redis)
+
+        await store.save("job-1", _document_ir())
+
+        assert await fake_redis.exists(CacheKeys.document_ir("job-1"))
+        assert await store.load("job-1") == _document_ir()
+        assert await store.load("job-2") is None
+
+    @pytest.mark.asyncio
+    async def test_redis_failure_degrades_to_no_ir(self):
+        redis = MagicMock()
+        redis.get = AsyncMock(side_effect=ConnectionError("down"))
+        redis.setex = AsyncMock(side_effect=ConnectionError("down"))
+        store = DocumentIRStore(redis)
+
+        await store.save("job-1", _document_ir())
+
+        assert await store.load("job-1") is None
+
+
+class TestExtractionIR:
+    """Extraction records the layout it parsed"""
+
+    def test_spans_recorded_per_block(self, sample_pdf_path):
+        result = PDFService._extract_with_pymupdf(sample_pdf_path, 0.0)
+
+        document_ir = result.document_ir
+        assert document_ir.engine == "pymupdf"
+        assert sorted(document_ir.pages) == [0, 1]
+        assert document_ir.pages[0].width == fitz.paper_size("a4")[0]
+        for block in result.blocks:
+            assert document_ir.pages[block.page].spans[block.block_id]
+
+
+class TestReconstructionWithIR:
+    """Reconstruction reuses the IR instead of analysing the PDF again"""
+
+    def test_redaction_uses_ir_spans(self, sample_pdf_path):
+        result = PDFService._extract_with_pymupdf(sample_pdf_path, 0.0)
+        # Reconstruction reads 1-indexed block pages; the IR follows Block.page
+        document_ir = result.document_ir
+        document_ir.pages = {number + 1: page for number, page in document_ir.pages.items()}
+        blocks = [
+            TranslatedBlock(
+                original=dataclasses.replace(block, page=block.page + 1),
+                translated_text=f"Translated {block.block_id}",
+            )
+            for block in result.blocks
+        ]
+        with open(sample_pdf_path, "rb") as f:
+            pdf_bytes = f.read()
+
+        with patch(
+            "app.services.pdf_reconstruction.PageTextIndex.from_page",
+            side_effect=AssertionError("page text analysed again"),
+        ):
+            output = PDFReconstructionService._reconstruct_with_pymupdf(
+                pdf_bytes, blocks, document_ir
+            )
+
+        doc = fitz.open(stream=output, filetype="pdf")
+        assert "block" not in doc[0].get_text() + doc[1].get_text()
+        assert "Translated" in doc[1].get_text()
+
+    def test_pdf2zh_path_skips_parse_with_ir(self, sample_pdf_path):
+        result = PDFService._extract_with_pymupdf(sample_pdf_path, 0.0)
+        blocks = [TranslatedBlock(original=block, translated_text="X") for block in result.blocks]
+        with open(sample_pdf_path, "rb") as f:
+            pdf_bytes = f.read()
+
+        with patch.object(
+            PDFReconstructionService, "_reconstruct_with_pymupdf", return_value=b"pdf"
+        ) as pymupdf:
+            output = PDFReconstructionService._reconstruct_with_pdf2zh(
+                pdf_bytes, blocks, result.document_ir
+            )
+
+        assert output == b"pdf"
+        pymupdf.assert_called_once_with(pdf_bytes, blocks, result.document_ir, ARCHIVAL)
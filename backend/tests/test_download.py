@@ -11,6 +11,15 @@ from app.models.translation import Translation, TranslationStatus
 from app.models.user import SubscriptionTier, User
 
 
+def _write_output(content: bytes):
+    """Stand-in for PageArtifactCache.reconstruct_to_file that writes fixed content"""
+    async def reconstruct_to_file(*args, output_path, **kwargs):
+        with open(output_path, "wb") as f:
+            f.write(content)
+        return len(content)
+    return reconstruct_to_file
+
+
 @pytest.fixture
 def mock_user():
     """Create a mock user for testing"""
@@ -108,9 +117,9 @@ class TestDownloadEndpoint:
              patch("app.routers.download.get_db") as mock_db, \
              patch("app.routers.download.get_redis_client") as mock_redis, \
              patch("app.routers.download.download_file", new_callable=AsyncMock) as mock_download, \
-             patch("app.routers.download.upload_file", new_callable=AsyncMock) as mock_upload, \
+             patch("app.routers.download.upload_file_from_path", new_callable=AsyncMock) as mock_upload, \
              patch("app.routers.download.get_presigned_url") as mock_presigned, \
-             patch("app.routers.download.PDFReconstructionService.reconstruct_pdf") as mock_reconstruct:
+             patch("app.routers.download.PageArtifactCache.reconstruct_to_file", new_callable=AsyncMock) as mock_reconstruct:
             
             # Setup mocks
             mock_session = AsyncMock()
@@ -125,7 +134,7 @@ class TestDownloadEndpoint:
             mock_redis_client = AsyncMock()
             mock_redis.return_value = mock_redis_client
             mock_cache = AsyncMock()
-            mock_cache.get_json = AsyncMock(return_value=mock_translated_blocks)
+            mock_cache.load = AsyncMock(return_value=mock_translated_blocks)
             mock_redis_client.aclose = AsyncMock()
             
             # Mock S3 operations
@@ -135,10 +144,10 @@ class TestDownloadEndpoint:
             
             # Mock PDF reconstruction
             reconstructed_bytes = b"reconstructed_pdf_content"
-            mock_reconstruct.return_value = reconstructed_bytes
+            mock_reconstruct.side_effect = _write_output(reconstructed_bytes)
             
             # Create cache mock
-            with patch("app.routers.download.Cache", return_value=mock_cache):
+            with patch("app.routers.download.TranslatedBlockStore", return_value=mock_cache):
                 # Make request with edits
                 response = await async_client.post(
                     f"/api/v1/download/{job_id}",
@@ -294,13 +303,13 @@ class TestDownloadEndpoint:
             mock_redis_client = AsyncMock()
             mock_redis.return_value = mock_redis_client
             mock_cache = AsyncMock()
-            mock_cache.get_json = AsyncMock(return_value=None)  # No blocks found
+            mock_cache.load = AsyncMock(return_value=None)  # No blocks found
             mock_redis_client.aclose = AsyncMock()
             
             # Mock S3 download
             mock_download.return_value = mock_pdf_bytes
             
-            with patch("app.routers.download.Cache", return_value=mock_cache):
+            with patch("app.routers.download.TranslatedBlockStore", return_value=mock_cache):
                 response = await async_client.post(
                     f"/api/v1/download/{job_id}",
                     json={"edits": []},
@@ -326,9 +335,9 @@ class TestDownloadEndpoint:
              patch("app.routers.download.get_db") as mock_db, \
              patch("app.routers.download.get_redis_client") as mock_redis, \
              patch("app.routers.download.download_file", new_callable=AsyncMock) as mock_download, \
-             patch("app.routers.download.upload_file", new_callable=AsyncMock) as mock_upload, \
+             patch("app.routers.download.upload_file_from_path", new_callable=AsyncMock) as mock_upload, \
              patch("app.routers.download.get_presigned_url") as mock_presigned, \
-             patch("app.routers.download.PDFReconstructionService.reconstruct_pdf") as mock_reconstruct:
+             patch("app.routers.download.PageArtifactCache.reconstruct_to_file", new_callable=AsyncMock) as mock_reconstruct:
             
             # Setup mocks
             mock_session = AsyncMock()
@@ -343,7 +352,7 @@ class TestDownloadEndpoint:
             mock_redis_client = AsyncMock()
             mock_redis.return_value = mock_redis_client
             mock_cache = AsyncMock()
-            mock_cache.get_json = AsyncMock(return_value=mock_translated_blocks)
+            mock_cache.load = AsyncMock(return_value=mock_translated_blocks)
             mock_redis_client.aclose = AsyncMock()
             
             # Mock S3 operations
@@ -353,9 +362,9 @@ class TestDownloadEndpoint:
             
             # Mock PDF reconstruction
             reconstructed_bytes = b"reconstructed_pdf_content"
-            mock_reconstruct.return_value = reconstructed_bytes
+            mock_reconstruct.side_effect = _write_output(reconstructed_bytes)
             
-            with patch("app.routers.download.Cache", return_value=mock_cache):
+            with patch("app.routers.download.TranslatedBlockStore", return_value=mock_cache):
                 # Make request with multiple edits
                 response = await async_client.post(
                     f"/api/v1/download/{job_id}",
@@ -0,0 +1,71 @@
+"""Tests for the download artifact cache"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.schemas.pdf import OutputLayout
+from app.services.download_cache import DownloadArtifactCache
+from app.services.pdf_reconstruction import PDFReconstructionService
+from app.services.save_profiles import INTERACTIVE
+
+
+class TestDownloadDigest:
+    """Tests for DownloadArtifactCache.digest"""
+
+    def test_same_content_same_digest(self):
+        assert DownloadArtifactCache.digest("job", ["a", "b"]) == \
+            DownloadArtifactCache.digest("job", ("a", "b"))
+
+    def test_edits_and_jobs_change_digest(self):
+        base = DownloadArtifactCache.digest("job", ["a", "b"])
+
+        assert DownloadArtifactCache.digest("job", ["a", "edited"]) != base
+        assert DownloadArtifactCache.digest("other-job", ["a", "b"]) != base
+
+    def test_layout_changes_digest(self):
+        base = DownloadArtifactCache.digest("job", ["a"])
+
+        assert DownloadArtifactCache.digest("job", ["a"], OutputLayout.TRANSLATED) == base
+        assert DownloadArtifactCache.digest("job", ["a"], OutputLayout.SIDE_BY_SIDE) != base
+
+    def test_output_settings_change_digest(self):
+        base = DownloadArtifactCache.digest("job", ["a"])
+
+        assert DownloadArtifactCache.digest("job", ["a"], save_profile=INTERACTIVE) != base
+        assert DownloadArtifactCache.digest("job", ["a"], linearize=True) != base
+        assert DownloadArtifactCache.digest("job", ["a"], engine="pdf2zh") != base
+
+    def test_render_version_changes_digest(self):
+        base = DownloadArtifactCache.digest("job", ["a"])
+
+        with patch.object(PDFReconstructionService, "RENDER_VERSION", PDFReconstructionService.RENDER_VERSION + 1):
+            assert DownloadArtifactCache.digest("job", ["a"]) != base
+
+
+class TestDownloadArtifactCache:
+    """Tests for artifact lookup and recording"""
+
+    @pytest.mark.asyncio
+    async def test_put_then_get(self, fake_redis):
+        cache = DownloadArtifactCache(fake_redis)
+        digest = DownloadArtifactCache.digest("job", ["a"])
+
+        assert await cache.get("job", digest) is None
+        await cache.put("job", digest, "downloads/u/job/abc/test.pdf", 1234)
+
+        assert await cache.get("job", digest) == {
+            "s3_key": "downloads/u/job/abc/test.pdf",
+            "file_size": 1234,
+        }
+
+    @pytest.mark.asyncio
+    async def test_redis_failure_is_a_miss(self):
+        broken_redis = AsyncMock()
+        broken_redis.get.side_effect = ConnectionError("redis down")
+        broken_redis.setex.side_effect = ConnectionError("redis down")
+        cache = DownloadArtifactCache(broken_redis)
+
+        await cache.put("job", "digest", "key", 1)
+
+        assert await cache.get("job", "digest") is None
@@ -0,0 +1,118 @@
+"""Tests for the expired translation sweeper"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql import Select
+
+from app.cache import CacheKeys
+from app.services.expiry_sweeper import ExpirySweeper
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _jobs(count: int) -> list:
+    """Expired (job_id, user_id, expires_at) rows in keyset order"""
+    return [
+        (uuid.uuid4(), uuid.uuid4(), NOW - timedelta(days=1, minutes=count - i))
+        for i in range(count)
+    ]
+
+
+class FakeSession:
+    """Serves expired rows in batches and records the other statements"""
+
+    def __init__(self, batches: list):
+        self.batches = list(batches)
+        self.selects = []
+        self.deleted_ids = []
+        self.commit = AsyncMock()
+
+    async def execute(self, statement):
+        if isinstance(statement, Select):
+            self.selects.append(statement)
+            result = MagicMock()
+            result.all.return_value = self.batches.pop(0) if self.batches else []
+            return result
+        params = statement.compile(dialect=postgresql.dialect()).params
+        self.deleted_ids.extend(value for value in params.values() for value in value)
+        return MagicMock()
+
+
+@pytest.fixture
+def s3_files():
+    """Two stored files per job; delete_files reports no failures"""
+    async def list_keys(prefix):
+        return [f"{prefix}a.pdf"] if prefix.startswith(("uploads/", "downloads/")) else []
+
+    with patch("app.services.expiry_sweeper.list_keys", side_effect=list_keys), \
+         patch("app.services.expiry_sweeper.delete_files", new_callable=AsyncMock) as mock_delete:
+        mock_delete.return_value = []
+        yield mock_delete
+
+
+class TestExpirySweeper:
+    """Tests for ExpirySweeper.sweep"""
+
+    @pytest.mark.asyncio
+    async def test_deletes_files_cache_and_rows(self, fake_redis, s3_files):
+        jobs = _jobs(2)
+        for job_id, _, _ in jobs:
+            await fake_redis.set(CacheKeys.translated_blocks(str(job_id)), "{}")
+            await fake_redis.hset(CacheKeys.page_artifacts(str(job_id)), "0", "fp")
+        await fake_redis.set("unrelated", "1")
+        db = FakeSession([jobs])
+
+        result = await ExpirySweeper(db, fake_redis, batch_size=10, max_batches=5).sweep(NOW)
+
+        assert result == {"deleted": 2, "kept": 0, "batches": 1}
+        # One DeleteObjects pass for the whole batch
+        s3_files.assert_awaited_once()
+        assert len(s3_files.await_args.args[0]) == 4
+        assert list(fake_redis.store) == ["unrelated"]
+        assert sorted(db.deleted_ids) == sorted(job_id for job_id, _, _ in jobs)
+        db.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_job_with_undeleted_files_kept(self, fake_redis, s3_files):
+        jobs = _jobs(2)
+        failed_job, _, _ = jobs[0]
+        s3_files.return_value = [f"uploads/{jobs[0][1]}/{failed_job}/a.pdf"]
+        await fake_redis.set(CacheKeys.translated_blocks(str(failed_job)), "{}")
+        db = FakeSession([jobs])
+
+        result = await ExpirySweeper(db, fake_redis, batch_size=10, max_batches=5).sweep(NOW)
+
+        assert result == {"deleted": 1, "kept": 1, "batches": 1}
+        assert db.deleted_ids == [jobs[1][0]]
+        # Retried next run with its cache intact
+        assert await fake_redis.exists(CacheKeys.translated_blocks(str(failed_job)))
+
+    @pytest.mark.asyncio
+    async def test_batches_capped_with_keyset_pagination(self, fake_redis, s3_files):
+        jobs = _jobs(6)
+        db = FakeSession([jobs[0:2], jobs[2:4], jobs[4:6]])
+
+        with patch("app.services.expiry_sweeper.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            result = await ExpirySweeper(
+                db, fake_redis, batch_size=2, max_batches=2, pause_seconds=0.5
+            ).sweep(NOW)
+
+        assert result == {"deleted": 4, "kept": 0, "batches": 2}
+        mock_sleep.assert_awaited_once_with(0.5)
+        # The second page starts after the last row of the first
+        params = db.selects[1].compile(dialect=postgresql.dialect()).params
+        assert jobs[1][0] in params.values()
+        assert jobs[1][2] in params.values()
+
+    @pytest.mark.asyncio
+    async def test_nothing_expired(self, fake_redis, s3_files):
+        db = FakeSession([])
+
+        result = await ExpirySweeper(db, fake_redis, batch_size=10, max_batches=5).sweep(NOW)
+
+        assert result == {"deleted": 0, "kept": 0, "batches": 0}
+        s3_files.assert_not_awaited()
@@ -0,0 +1,142 @@
+"""Tests for streaming PDFs through the API"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+import pytest_asyncio
+from fastapi import status
+
+from app import s3
+from app.models.translation import TranslationStatus
+from app.services.file_proxy import etag_matches, parse_range
+
+CONTENT = bytes(range(256)) * 4096  # 1 MB, several stream chunks
+
+
+@pytest_asyncio.fixture
+async def client(completed_job_client, mock_user, completed_translation):
+    """completed_job_client with the job's translated PDF stored"""
+    await s3.upload_file(
+        CONTENT,
+        s3.S3Keys.result_path(str(mock_user.id), str(completed_translation.id), completed_translation.file_name),
+    )
+    return completed_job_client
+
+
+class TestParseRange:
+    """Tests for parse_range"""
+
+    @pytest.mark.parametrize(
+        "header,expected",
+        [
+            (None, None),
+            ("bytes=0-99", (0, 99)),
+            ("bytes=900-", (900, 999)),
+            ("bytes=-100", (900, 999)),
+            ("bytes=-5000", (0, 999)),
+            ("bytes=950-5000", (950, 999)),
+            # Ignored: the whole file is sent
+            ("bytes=0-99,200-299", None),
+            ("items=0-5", None),
+            ("bytes=50-10", None),
+            ("bytes=-", None),
+        ],
+    )
+    def test_ranges(self, header, expected):
+        assert parse_range(header, 1000) == expected
+
+    @pytest.mark.parametrize("header", ["bytes=1000-", "bytes=-0"])
+    def test_unsatisfiable(self, header):
+        with pytest.raises(ValueError):
+            parse_range(header, 1000)
+
+
+class TestEtagMatches:
+    """Tests for etag_matches"""
+
+    def test_matches(self):
+        assert etag_matches('"a", "b"', '"b"')
+        assert etag_matches('W/"b"', '"b"')
+        assert etag_matches("*", '"b"')
+        assert not etag_matches('"a"', '"b"')
+        assert not etag_matches(None, '"b"')
+
+
+class TestStreamTranslationFile:
+    """Tests for GET /translation/{job_id}/file/{kind}"""
+
+    @pytest.mark.asyncio
+    async def test_full_file(self, client, completed_translation):
+        response = await client.get(f"/api/v1/translation/{completed_translation.id}/file/translated")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content == CONTENT
+        assert response.headers["content-length"] == str(len(CONTENT))
+        assert response.headers["accept-ranges"] == "bytes"
+        assert response.headers["etag"]
+
+    @pytest.mark.asyncio
+    async def test_range(self, client, completed_translation):
+        response = await client.get(
+            f"/api/v1/translation/{completed_translation.id}/file/translated",
+            headers={"Range": "bytes=300000-300099"},
+        )
+
+        assert response.status_code == status.HTTP_206_PARTIAL_CONTENT
+        assert response.content == CONTENT[300000:300100]
+        assert response.headers["content-range"] == f"bytes 300000-300099/{len(CONTENT)}"
+        assert response.headers["content-length"] == "100"
+
+    @pytest.mark.asyncio
+    async def test_unsatisfiable_range(self, client, completed_translation):
+        response = await client.get(
+            f"/api/v1/translation/{completed_translation.id}/file/translated",
+            headers={"Range": f"bytes={len(CONTENT)}-"},
+        )
+
+        assert response.status_code == status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+        assert response.headers["content-range"] == f"bytes */{len(CONTENT)}"
+
+    @pytest.mark.asyncio
+    async def test_not_modified(self, client, completed_translation):
+        url = f"/api/v1/translation/{completed_translation.id}/file/translated"
+        etag = (await client.get(url)).headers["etag"]
+
+        response = await client.get(url, headers={"If-None-Match": etag})
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b""
+
+    @pytest.mark.asyncio
+    async def test_stale_if_range_sends_whole_file(self, client, completed_translation):
+        response = await client.get(
+            f"/api/v1/translation/{completed_translation.id}/file/translated",
+            headers={"Range": "bytes=0-99", "If-Range": '"old"'},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.content) == len(CONTENT)
+
+    @pytest.mark.asyncio
+    async def test_missing_file(self, client, completed_translation):
+        response = await client.get(f"/api/v1/translation/{completed_translation.id}/file/original")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    @pytest.mark.asyncio
+    async def test_translated_requires_completion(self, client, completed_translation):
+        completed_translation.status = TranslationStatus.TRANSLATING
+
+        response = await client.get(f"/api/v1/translation/{completed_translation.id}/file/translated")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    @pytest.mark.asyncio
+    async def test_details_link_to_proxy(self, client, completed_translation):
+        with patch("app.routers.translation.get_settings", return_value=MagicMock(proxy_file_downloads=True)):
+            response = await client.get(f"/api/v1/translation/{completed_translation.id}")
+
+        assert response.status_code == status.HTTP_200_OK
+        result = response.json()
+        assert result["original_pdf_url"] == f"http://test/api/v1/translation/{completed_translation.id}/file/original"
+        assert result["translated_pdf_url"] == f"http://test/api/v1/translation/{completed_translation.id}/file/translated"
@@ -0,0 +1,137 @@
+"""Tests for font loading, embedding and subsetting"""
+
+from unittest.mock import patch
+
+import fitz
+import pytest
+
+from app.schemas.pdf import Block, Coordinates, TranslatedBlock
+from app.services.font_manager import BUILTIN_UNICODE_FONT, DocumentFonts, FontManager
+from app.services.pdf_reconstruction import PDFReconstructionService
+
+CJK_TEXT = "日本語の翻訳テキストです。"
+
+
+@pytest.fixture
+def unicode_fonts():
+    """Reset the per-process Unicode font list around a test"""
+    FontManager._unicode_fonts = None
+    yield
+    FontManager._unicode_fonts = None
+
+
+def _blocks(page_count: int, text: str) -> list:
+    return [
+        TranslatedBlock(
+            original=Block(
+                page=page + 1,
+                block_id=0,
+                text="Hello world",
+                coordinates=Coordinates(x=8, y=6, width=60, height=5),
+                font_size=12,
+                font_name="helv",
+                is_bold=False,
+                is_italic=False,
+                rotation=0,
+            ),
+            translated_text=text,
+        )
+        for page in range(page_count)
+    ]
+
+
+def _source_pdf(page_count: int) -> bytes:
+    doc = fitz.open()
+    for _ in range(page_count):
+        doc.new_page().insert_text((50, 60), "Hello world", fontsize=12)
+    return doc.tobytes()
+
+
+class TestFontManager:
+    """Tests for FontManager"""
+
+    def test_font_loaded_once(self):
+        assert FontManager.font(BUILTIN_UNICODE_FONT) is FontManager.font(BUILTIN_UNICODE_FONT)
+
+    def test_latin_text_keeps_base_font(self, unicode_fonts):
+        assert FontManager.select("Café crème", "Helvetica-Bold") == "Helvetica-Bold"
+
+    def test_cjk_text_uses_unicode_font(self, unicode_fonts):
+        assert FontManager.select(CJK_TEXT, "helv") == BUILTIN_UNICODE_FONT
+
+    def test_missing_configured_font_skipped(self, unicode_fonts):
+        with patch("app.services.font_manager.get_settings") as mock_settings:
+            mock_settings.return_value.pdf_unicode_fonts = "/nonexistent/NotoSans.ttf"
+
+            assert FontManager.unicode_fonts() == [BUILTIN_UNICODE_FONT]
+
+
+class TestDocumentFonts:
+    """Tests for per-document font registration"""
+
+    def test_font_embedded_once_per_document(self):
+        doc = fitz.open()
+        for _ in range(5):
+            doc.new_page()
+        fonts = DocumentFonts(doc)
+
+        with patch.object(FontManager, "buffer", wraps=FontManager.buffer) as buffer:
+            for page in doc:
+                alias = fonts.register(page, BUILTIN_UNICODE_FONT)
+                assert page.insert_textbox(page.rect, CJK_TEXT, fontname=alias) >= 0
+
+        assert buffer.call_count == 1
+        assert {font[0] for page in doc for font in page.get_fonts()} == {fonts.xrefs[BUILTIN_UNICODE_FONT]}
+
+    def test_base14_font_not_embedded(self):
+        doc = fitz.open()
+        page = doc.new_page()
+
+        assert DocumentFonts(doc).register(page, "helv") == "helv"
+        assert page.get_fonts() == []
+
+
+class TestNonLatinReconstruction:
+    """Reconstruction with non-Latin translations"""
+
+    def test_cjk_text_embedded_and_subset(self, unicode_fonts):
+        output = PDFReconstructionService._reconstruct_with_pymupdf(
+            _source_pdf(20), _blocks(20, CJK_TEXT)
+        )
+
+        doc = fitz.open(stream=output, filetype="pdf")
+        assert CJK_TEXT in doc[10].get_text().replace("\n", "")
+        embedded = {font[0]: font[3] for page in doc for font in page.get_fonts() if font[1] == "ttf"}
+        # One subset font for the whole document, not the full font file
+        assert len(embedded) == 1
+        assert "+" in next(iter(embedded.values()))
+        assert len(output) < 100_000
+
+    def test_output_deterministic(self, unicode_fonts):
+        source, blocks = _source_pdf(3), _blocks(3, CJK_TEXT)
+
+        assert PDFReconstructionService._reconstruct_with_pymupdf(source, blocks) == \
+            PDFReconstructionService._reconstruct_with_pymupdf(source, blocks)
+
+    def test_assembled_artifacts_share_one_subset(self, unicode_fonts):
+        texts = ["日本語の翻訳テキストです。", "東京と大阪の天気", "こんにちは世界", "さようなら友達"]
+        source = _source_pdf(4)
+        blocks = [_blocks(page + 1, text)[-1] for page, text in enumerate(texts)]
+        artifacts = PDFReconstructionService.render_page_artifacts(
+            source, PDFReconstructionService._group_blocks_by_page(blocks)
+        )
+
+        output = PDFReconstructionService.assemble_pages(source, artifacts)
+
+        doc = fitz.open(stream=output, filetype="pdf")
+        for page, text in enumerate(texts):
+            assert text in doc[page].get_text().replace("\n", "")
+        font_files = {
+            value
+            for xref in range(1, doc.xref_length())
+            for key in ("FontFile2", "FontFile3")
+            if (value := doc.xref_get_key(xref, key))[0] == "xref"
+        }
+        assert len(font_files) == 1
+        # One subset instead of one per page
+        assert len(output) < 2 * max(len(artifact) for artifact in artifacts.values())
@@ -0,0 +1,93 @@
+"""Tests for linearized PDF output"""
+
+from unittest.mock import patch
+
+import fitz
+import pytest
+
+from app.services import linearize
+from app.services.linearize import linearization_params, linearize_pdf
+
+
+def _write_pdf(path, page_count: int = 20) -> None:
+    doc = fitz.open()
+    for page_num in range(page_count):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Page {page_num + 1}")
+    doc.save(str(path), garbage=1, deflate=True)
+    doc.close()
+
+
+def _linearized_header(size: int) -> bytes:
+    header = b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n1 0 obj\n" + (
+        b"<< /Linearized 1 /L %d /H [ 640 150 ] /O 4 /E 900 /N 20 /T 5000 >>\nendobj\n" % size
+    )
+    return header.ljust(size, b" ")
+
+
+class TestLinearizationParams:
+    """Tests for linearization_params"""
+
+    def test_reads_parameters(self, tmp_path):
+        path = tmp_path / "linear.pdf"
+        path.write_bytes(_linearized_header(2000))
+
+        assert linearization_params(str(path)) == {
+            "L": 2000, "O": 4, "E": 900, "N": 20, "T": 5000, "H": [640, 150],
+        }
+
+    def test_changed_after_linearization(self, tmp_path):
+        path = tmp_path / "linear.pdf"
+        path.write_bytes(_linearized_header(2000) + b"% appended update\n")
+
+        assert linearization_params(str(path)) is None
+
+    def test_plain_pdf(self, tmp_path):
+        path = tmp_path / "plain.pdf"
+        _write_pdf(path)
+
+        assert linearization_params(str(path)) is None
+
+
+class TestLinearizePdf:
+    """Tests for linearize_pdf"""
+
+    def test_without_pikepdf_leaves_file(self, tmp_path):
+        path = tmp_path / "plain.pdf"
+        _write_pdf(path)
+        before = path.read_bytes()
+
+        with patch.object(linearize, "PIKEPDF_AVAILABLE", False):
+            assert not linearize_pdf(str(path))
+
+        assert path.read_bytes() == before
+
+    def test_writes_valid_hint_tables(self, tmp_path):
+        pikepdf = pytest.importorskip("pikepdf")
+        path = tmp_path / "output.pdf"
+        _write_pdf(path, page_count=20)
+
+        assert linearize_pdf(str(path))
+
+        params = linearization_params(str(path))
+        assert params["N"] == 20
+        # Page 1 ends well before the file does: one small range renders it
+        assert params["E"] < params["L"]
+        # The hint stream (page offset and shared object tables) lies inside the file
+        hint_offset, hint_length = params["H"][:2]
+        assert hint_offset + hint_length <= params["L"]
+        with pikepdf.open(path) as pdf:
+            assert pdf.is_linearized
+            assert pdf.check_linearization()
+            assert len(pdf.pages) == 20
+
+    def test_deterministic(self, tmp_path):
+        pytest.importorskip("pikepdf")
+        first, second = tmp_path / "a.pdf", tmp_path / "b.pdf"
+        _write_pdf(first)
+        second.write_bytes(first.read_bytes())
+
+        linearize_pdf(str(first))
+        linearize_pdf(str(second))
+
+        assert first.read_bytes() == second.read_bytes()
@@ -0,0 +1,148 @@
+"""Tests for the local filesystem storage backend"""
+
+import os
+import time
+from urllib.parse import parse_qs, unquote, urlparse
+
+import pytest
+from fastapi import HTTPException
+from fastapi.responses import FileResponse
+
+from app import s3
+from app.local_storage import LocalStorage
+from app.routers.files import get_stored_file
+
+BUCKET = "test-bucket"
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    """Route app.s3 to a local storage root for the test"""
+    local = LocalStorage(root=str(tmp_path), secret="secret", public_url="http://api.test/")
+    monkeypatch.setattr(s3, "storage", local)
+    return local
+
+
+def _link_params(url: str) -> dict:
+    """Endpoint arguments from a signed link"""
+    parsed = urlparse(url)
+    query = {name: values[0] for name, values in parse_qs(parsed.query).items()}
+    bucket, _, key = unquote(parsed.path).removeprefix("/api/v1/files/").partition("/")
+    return {
+        "bucket": bucket,
+        "key": key,
+        "expires": int(query["expires"]),
+        "signature": query["signature"],
+        "filename": query.get("filename"),
+    }
+
+
+class TestLocalStorage:
+    """app.s3 operations with STORAGE_BACKEND=local"""
+
+    @pytest.mark.asyncio
+    async def test_round_trip(self, storage):
+        await s3.upload_file(b"%PDF-1.7 hello", "uploads/u/j/a.pdf", bucket=BUCKET)
+
+        assert await s3.file_exists("uploads/u/j/a.pdf", bucket=BUCKET)
+        assert await s3.download_file("uploads/u/j/a.pdf", bucket=BUCKET) == b"%PDF-1.7 hello"
+        assert await s3.download_range("uploads/u/j/a.pdf", 0, 3, bucket=BUCKET) == b"%PDF"
+        assert await s3.get_file_size("uploads/u/j/a.pdf", bucket=BUCKET) == 14
+
+        await s3.delete_file("uploads/u/j/a.pdf", bucket=BUCKET)
+        assert not await s3.file_exists("uploads/u/j/a.pdf", bucket=BUCKET)
+
+    @pytest.mark.asyncio
+    async def test_upload_from_path_leaves_no_temporary_files(self, storage, tmp_path):
+        source = tmp_path / "output.pdf"
+        source.write_bytes(b"x" * 4096)
+
+        await s3.upload_file_from_path(str(source), "results/u/j/a.pdf", bucket=BUCKET)
+
+        assert os.listdir(tmp_path / BUCKET / "results/u/j") == ["a.pdf"]
+        assert await s3.list_keys("results/u/", bucket=BUCKET) == ["results/u/j/a.pdf"]
+
+    @pytest.mark.asyncio
+    async def test_copy_is_hard_link(self, storage):
+        await s3.upload_file(b"result", "results/u/a/a.pdf", bucket=BUCKET)
+
+        await s3.copy_file("results/u/a/a.pdf", "results/u/b/a.pdf", bucket=BUCKET)
+
+        source = storage.path("results/u/a/a.pdf", BUCKET)
+        copy = storage.path("results/u/b/a.pdf", BUCKET)
+        assert os.stat(source).st_ino == os.stat(copy).st_ino
+        # Either name can go without affecting the other
+        assert await s3.delete_files(["results/u/a/a.pdf"], bucket=BUCKET) == []
+        assert await s3.download_file("results/u/b/a.pdf", bucket=BUCKET) == b"result"
+
+    @pytest.mark.asyncio
+    async def test_writer(self, storage):
+        writer = s3.MultipartUploadWriter(key="uploads/u/j/a.pdf", bucket=BUCKET)
+        await writer.write(b"%PDF-")
+        await writer.write(b"1.7")
+        assert not await s3.file_exists("uploads/u/j/a.pdf", bucket=BUCKET)
+
+        await writer.complete()
+
+        assert writer.size == 8
+        assert await s3.download_file("uploads/u/j/a.pdf", bucket=BUCKET) == b"%PDF-1.7"
+
+    @pytest.mark.asyncio
+    async def test_aborted_writer_leaves_nothing(self, storage):
+        writer = s3.MultipartUploadWriter(key="uploads/u/j/a.pdf", bucket=BUCKET)
+        await writer.write(b"%PDF-1.7")
+
+        await writer.abort()
+
+        assert await s3.list_keys("uploads/", bucket=BUCKET) == []
+        assert os.listdir(storage.path("uploads/u/j", BUCKET)) == []
+
+    def test_rejects_keys_outside_bucket(self, storage):
+        with pytest.raises(ValueError):
+            storage.path("../other-bucket/a.pdf", BUCKET)
+
+    @pytest.mark.asyncio
+    async def test_direct_uploads_unsupported(self, storage):
+        assert not s3.supports_direct_uploads()
+        with pytest.raises(NotImplementedError):
+            await s3.create_multipart_upload("uploads/u/j/a.pdf", bucket=BUCKET)
+
+
+class TestStoredFileEndpoint:
+    """Tests for GET /files/{bucket}/{key} (signed local links)"""
+
+    @pytest.mark.asyncio
+    async def test_serves_file_from_disk(self, storage):
+        await s3.upload_file(b"%PDF-1.7", "downloads/u/j/d/a b.pdf", bucket=BUCKET)
+        url = s3.get_presigned_download_url("downloads/u/j/d/a b.pdf", bucket=BUCKET, filename="a b.pdf")
+
+        assert url.startswith("http://api.test/api/v1/files/test-bucket/downloads/u/j/d/a%20b.pdf?")
+        response = await get_stored_file(**_link_params(url))
+
+        assert isinstance(response, FileResponse)
+        assert response.path == storage.path("downloads/u/j/d/a b.pdf", BUCKET)
+        assert response.media_type == "application/pdf"
+        assert "a%20b.pdf" in response.headers["content-disposition"]
+
+    @pytest.mark.asyncio
+    async def test_rejects_tampered_link(self, storage):
+        await s3.upload_file(b"%PDF-1.7", "downloads/u/j/d/a.pdf", bucket=BUCKET)
+        params = _link_params(s3.get_presigned_url("downloads/u/j/d/a.pdf", bucket=BUCKET))
+        params["key"] = "downloads/u/other/d/a.pdf"
+
+        with pytest.raises(HTTPException) as exc_info:
+            await get_stored_file(**params)
+
+        assert exc_info.value.status_code == 403
+
+    @pytest.mark.asyncio
+    async def test_rejects_expired_link(self, storage):
+        await s3.upload_file(b"%PDF-1.7", "downloads/u/j/d/a.pdf", bucket=BUCKET)
+        params = _link_params(s3.get_presigned_url("downloads/u/j/d/a.pdf", bucket=BUCKET, expires_in=60))
+        params["expires"] = int(time.time()) - 1
+        params["signature"] = storage._signature(params["key"], BUCKET, params["expires"], None)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await get_stored_file(**params)
+
+        assert exc_info.value.status_code == 403
@@ -0,0 +1,247 @@
+"""Tests for page-level reconstruction caching"""
+
+import dataclasses
+import threading
+from unittest.mock import MagicMock, patch
+
+import fitz
+import pytest
+
+from app.cache import CacheKeys
+from app.schemas.pdf import Block, Coordinates, OutputLayout, TranslatedBlock
+from app.services.page_cache import PageArtifactCache
+from app.services.pdf_reconstruction import PDFReconstructionService
+
+JOB_ID = "job-1"
+USER_ID = "user-1"
+
+
+def _block(page: int, text: str, block_id: int = 0) -> TranslatedBlock:
+    original = Block(
+        page=page,
+        block_id=block_id,
+        text=f"Page {page} Text",
+        coordinates=Coordinates(x=5, y=3, width=60, height=5),
+        font_size=12,
+        font_name="helv",
+        is_bold=False,
+        is_italic=False,
+        rotation=0,
+    )
+    return TranslatedBlock(original=original, translated_text=text)
+
+
+@pytest.fixture
+def source_pdf() -> bytes:
+    """6-page PDF"""
+    doc = fitz.open()
+    for i in range(6):
+        doc.new_page().insert_text((50, 50), f"Page {i + 1} Text")
+    return doc.tobytes()
+
+
+@pytest.fixture
+def blocks() -> list:
+    """Translated blocks on pages 1, 3 and 4 (1-indexed)"""
+    return [_block(page, f"Translated {page}") for page in (1, 3, 4)]
+
+
+@pytest.fixture
+def s3_store():
+    """In-memory stand-in for the S3 helpers used by the page cache"""
+    store = {}
+
+    async def upload_file(file_data, key, content_type=None):
+        store[key] = file_data
+        return key
+
+    async def download_file(key):
+        return store[key]
+
+    async def delete_file(key):
+        store.pop(key, None)
+        return True
+
+    with patch("app.services.page_cache.upload_file", upload_file), \
+         patch("app.services.page_cache.download_file", download_file), \
+         patch("app.services.page_cache.delete_file", delete_file):
+        yield store
+
+
+@pytest.fixture
+def rendered_pages():
+    """Record the pages rendered by each reconstruction"""
+    calls = []
+    render = PDFReconstructionService.render_page_artifacts
+
+    def recording(original_pdf_bytes, blocks_by_page, document_ir=None):
+        calls.append(sorted(blocks_by_page))
+        return render(original_pdf_bytes, blocks_by_page, document_ir)
+
+    with patch.object(PDFReconstructionService, "render_page_artifacts", recording):
+        yield calls
+
+
+class TestPageFingerprint:
+    """Tests for PDFReconstructionService.page_fingerprint"""
+
+    def test_changes_with_text(self):
+        assert PDFReconstructionService.page_fingerprint([_block(1, "a")]) != \
+            PDFReconstructionService.page_fingerprint([_block(1, "b")])
+
+    def test_ignores_block_id(self):
+        assert PDFReconstructionService.page_fingerprint([_block(1, "a", block_id=0)]) == \
+            PDFReconstructionService.page_fingerprint([_block(1, "a", block_id=7)])
+
+
+class TestPageArtifactCache:
+    """Tests for PageArtifactCache.reconstruct"""
+
+    @pytest.mark.asyncio
+    async def test_only_edited_page_rerendered(self, fake_redis, s3_store, rendered_pages, source_pdf, blocks):
+        cache = PageArtifactCache(fake_redis)
+
+        await cache.reconstruct(JOB_ID, USER_ID, source_pdf, blocks)
+        edited = [blocks[0], dataclasses.replace(blocks[1], translated_text="Edited 3"), blocks[2]]
+        result = await cache.reconstruct(JOB_ID, USER_ID, source_pdf, edited)
+
+        assert rendered_pages == [[0, 2, 3], [2]]
+        doc = fitz.open(stream=result, filetype="pdf")
+        assert doc.page_count == 6
+        assert "Edited 3" in doc[2].get_text()
+        assert "Translated 4" in doc[3].get_text()
+        assert "Page 2 Text" in doc[1].get_text()
+        # The replaced artifact is deleted
+        assert len(s3_store) == 3
+
+    @pytest.mark.asyncio
+    async def test_cached_output_matches_full_render(self, fake_redis, s3_store, source_pdf, blocks):
+        cache = PageArtifactCache(fake_redis)
+
+        first = await cache.reconstruct(JOB_ID, USER_ID, source_pdf, blocks)
+        second = await cache.reconstruct(JOB_ID, USER_ID, source_pdf, blocks)
+
+        assert first == second
+        full = fitz.open(
+            stream=PDFReconstructionService._reconstruct_with_pymupdf(source_pdf, blocks),
+            filetype="pdf",
+        )
+        assembled = fitz.open(stream=second, filetype="pdf")
+        for page_num in range(6):
+            assert assembled[page_num].get_text() == full[page_num].get_text()
+
+    @pytest.mark.asyncio
+    async def test_matches_parallel_reconstruction(self, fake_redis, s3_store, source_pdf, blocks):
+        with patch("app.services.pdf_reconstruction.get_settings") as mock_settings:
+            mock_settings.return_value = MagicMock(pdf_reconstruction_workers=2, pdf_parallel_min_pages=6)
+            full = PDFReconstructionService._reconstruct_with_pymupdf(source_pdf, blocks)
+            cached = await PageArtifactCache(fake_redis).reconstruct(JOB_ID, USER_ID, source_pdf, blocks)
+
+        assert cached == full
+        # One object per rendered page
+        assert len(s3_store) == 3
+
+    @pytest.mark.asyncio
+    async def test_missing_artifact_is_rerendered(self, fake_redis, s3_store, rendered_pages, source_pdf, blocks):
+        cache = PageArtifactCache(fake_redis)
+        await cache.reconstruct(JOB_ID, USER_ID, source_pdf, blocks)
+        s3_store.pop(next(key for key in s3_store if "/3-" in key))
+
+        result = await cache.reconstruct(JOB_ID, USER_ID, source_pdf, blocks)
+
+        assert rendered_pages[-1] == [3]
+        assert "Translated 4" in fitz.open(stream=result, filetype="pdf")[3].get_text()
+
+    @pytest.mark.asyncio
+    async def test_reconstruct_to_file(self, fake_redis, s3_store, source_pdf, blocks, tmp_path):
+        cache = PageArtifactCache(fake_redis)
+        expected = await cache.reconstruct(JOB_ID, USER_ID, source_pdf, blocks)
+        output_path = tmp_path / "output.pdf"
+
+        size = await cache.reconstruct_to_file(JOB_ID, USER_ID, source_pdf, blocks, str(output_path))
+
+        assert size == len(expected)
+        assert output_path.read_bytes() == expected
+
+    @pytest.mark.asyncio
+    async def test_reconstruct_to_file_linearized(self, fake_redis, s3_store, source_pdf, blocks, tmp_path):
+        output_path = tmp_path / "output.pdf"
+
+        with patch("app.services.page_cache.linearize_pdf") as mock_linearize:
+            await PageArtifactCache(fake_redis).reconstruct_to_file(
+                JOB_ID, USER_ID, source_pdf, blocks, str(output_path), linearize=True
+            )
+
+        mock_linearize.assert_called_once_with(str(output_path))
+
+    @pytest.mark.asyncio
+    async def test_pdf2zh_runs_off_event_loop(self, fake_redis, s3_store, source_pdf, blocks):
+        threads = []
+
+        def reconstruct_pdf(original_pdf_bytes, translated_blocks, save_profile=None):
+            threads.append(threading.current_thread())
+            return original_pdf_bytes
+
+        with patch("app.services.page_cache.PDF2ZH_AVAILABLE", True), \
+             patch.object(PDFReconstructionService, "reconstruct_pdf", reconstruct_pdf):
+            result = await PageArtifactCache(fake_redis).reconstruct(JOB_ID, USER_ID, source_pdf, blocks)
+
+        assert result == source_pdf
+        assert threads and threads[0] is not threading.main_thread()
+
+    @pytest.mark.asyncio
+    async def test_index_records_page_fingerprints(self, fake_redis, s3_store, source_pdf, blocks):
+        await PageArtifactCache(fake_redis).reconstruct(JOB_ID, USER_ID, source_pdf, blocks)
+
+        index = await fake_redis.hgetall(CacheKeys.page_artifacts(JOB_ID))
+        assert index == {
+            str(block.original.page - 1): PDFReconstructionService.page_fingerprint([block])
+            for block in blocks
+        }
+
+
+class TestBilingualLayout:
+    """Bilingual documents composed from the page artifacts"""
+
+    @pytest.mark.asyncio
+    async def test_side_by_side(self, fake_redis, s3_store, rendered_pages, source_pdf, blocks):
+        cache = PageArtifactCache(fake_redis)
+        await cache.reconstruct(JOB_ID, USER_ID, source_pdf, blocks)
+
+        result = await cache.reconstruct(
+            JOB_ID, USER_ID, source_pdf, blocks, layout=OutputLayout.SIDE_BY_SIDE
+        )
+
+        # Composed from the cached artifacts, nothing rendered again
+        assert rendered_pages == [[0, 2, 3], []]
+        doc = fitz.open(stream=result, filetype="pdf")
+        source = fitz.open(stream=source_pdf, filetype="pdf")
+        assert doc.page_count == 6
+        assert doc[0].rect.width == source[0].rect.width * 2
+        left = fitz.Rect(0, 0, source[0].rect.width, source[0].rect.height)
+        assert "Page 3 Text" in doc[2].get_text(clip=left)
+        assert "Translated 3" in doc[2].get_text()
+        assert "Translated 3" not in doc[2].get_text(clip=left)
+
+    @pytest.mark.asyncio
+    async def test_interleaved(self, fake_redis, s3_store, source_pdf, blocks):
+        result = await PageArtifactCache(fake_redis).reconstruct(
+            JOB_ID, USER_ID, source_pdf, blocks, layout=OutputLayout.INTERLEAVED
+        )
+
+        doc = fitz.open(stream=result, filetype="pdf")
+        assert doc.page_count == 12
+        assert "Page 1 Text" in doc[0].get_text()
+        assert "Translated 1" in doc[1].get_text()
+        assert "Page 2 Text" in doc[3].get_text()
+
+    def test_untouched_page_stored_once(self, source_pdf):
+        result = PDFReconstructionService.assemble_pages(
+            source_pdf, {}, layout=OutputLayout.SIDE_BY_SIDE
+        )
+
+        doc = fitz.open(stream=result, filetype="pdf")
+        # Both halves place the same page content
+        shown = [xref for xref, _, invoker, _ in doc[1].get_xobjects() if invoker]
+        assert len(shown) == 2
+        assert len(set(shown)) == 1
@@ -13,6 +13,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.cache import Cache, CacheKeys
 from app.models.translation import Translation, TranslationStatus
 from app.services.pdf_reconstruction import PDFReconstructionService
+from app.services.save_profiles import ARCHIVAL, INTERACTIVE, get_save_profile
 from app.tasks.reconstruct_pdf import reconstruct_pdf_sync
 from app.schemas.pdf import Block, Coordinates, TranslatedBlock
 
@@ -221,8 +222,10 @@ class TestReconstructPDFTask:
 
         with patch("app.tasks.reconstruct_pdf.get_redis_client") as mock_redis, \
              patch("app.tasks.reconstruct_pdf.download_file", new_callable=AsyncMock) as mock_download, \
-             patch("app.tasks.reconstruct_pdf.upload_file", new_callable=AsyncMock) as mock_upload, \
-             patch("app.tasks.reconstruct_pdf.Cache") as mock_cache_class:
+             patch("app.tasks.reconstruct_pdf.upload_file_from_path", new_callable=AsyncMock) as mock_upload, \
+             patch("app.services.page_cache.upload_file", new_callable=AsyncMock) as mock_page_upload, \
+             patch("app.tasks.reconstruct_pdf.trigger_preview_rendering") as mock_previews, \
+             patch("app.tasks.reconstruct_pdf.TranslatedBlockStore") as mock_cache_class:
 
             # Setup mocks
             mock_redis_client = AsyncMock()
@@ -235,7 +238,7 @@ class TestReconstructPDFTask:
             mock_cache_instance = AsyncMock()
             mock_cache_class.return_value = mock_cache_instance
             cache_key = f"{CacheKeys.blocks(str(mock_translation.id))}_translated"
-            mock_cache_instance.get_json = AsyncMock(
+            mock_cache_instance.load = AsyncMock(
                 return_value=cached_translated_blocks
             )
 
@@ -247,6 +250,9 @@ class TestReconstructPDFTask:
             assert result["job_id"] == str(mock_translation.id)
             assert result["uploaded_key"] == "results/user123/job456/test.pdf"
             assert result["file_size"] > 0
+            # The rendered page is cached for later downloads
+            mock_page_upload.assert_called_once()
+            mock_previews.assert_called_once_with(str(mock_translation.id), "translated")
 
             # Verify database was updated
             assert mock_translation.status == TranslationStatus.COMPLETED
@@ -285,7 +291,7 @@ class TestReconstructPDFTask:
 
         with patch("app.tasks.reconstruct_pdf.get_redis_client") as mock_redis, \
              patch("app.tasks.reconstruct_pdf.download_file", new_callable=AsyncMock) as mock_download, \
-             patch("app.tasks.reconstruct_pdf.Cache") as mock_cache_class:
+             patch("app.tasks.reconstruct_pdf.TranslatedBlockStore") as mock_cache_class:
 
             # Setup mocks - cache returns None (blocks not found)
             mock_redis_client = AsyncMock()
@@ -296,7 +302,7 @@ class TestReconstructPDFTask:
 
             mock_cache_instance = AsyncMock()
             mock_cache_class.return_value = mock_cache_instance
-            mock_cache_instance.get_json = AsyncMock(return_value=None)
+            mock_cache_instance.load = AsyncMock(return_value=None)
 
             # Execute - should raise error
             with pytest.raises(ValueError, match="No translated blocks found"):
@@ -413,3 +419,179 @@ class TestReconstructionIntegration:
         
         # Performance check: should complete in reasonable time (< 10 seconds for 50 pages)
         assert elapsed < 10.0, f"Reconstruction took {elapsed:.2f}s, expected < 10s"
+
+
+class TestParallelReconstruction:
+    """Tests for page-parallel reconstruction"""
+
+    @pytest.fixture
+    def long_pdf(self):
+        """40-page PDF with one translated block on every third page"""
+        doc = fitz.open()
+        for i in range(40):
+            page = doc.new_page()
+            page.insert_text((50, 50), f"Page {i+1} Text")
+        pdf_bytes = doc.tobytes()
+
+        blocks = []
+        for page_num in range(1, 41, 3):
+            original = Block(
+                page=page_num,
+                block_id=f"block_{page_num}",
+                text=f"Page {page_num} Text",
+                coordinates=Coordinates(x=5, y=3, width=60, height=5),
+                font_size=12,
+                font_name="helv",
+                is_bold=False,
+                is_italic=False,
+                rotation=0,
+            )
+            blocks.append(
+                TranslatedBlock(
+                    original=original,
+                    translated_text=f"Translated {page_num}",
+                )
+            )
+        return pdf_bytes, blocks
+
+    def _reconstruct(self, pdf_bytes, blocks, workers):
+        with patch("app.services.pdf_reconstruction.get_settings") as mock_settings:
+            mock_settings.return_value = MagicMock(
+                pdf_reconstruction_workers=workers,
+                pdf_parallel_min_pages=10,
+            )
+            return PDFReconstructionService._reconstruct_with_pymupdf(pdf_bytes, blocks)
+
+    def test_parallel_matches_serial_text(self, long_pdf):
+        pdf_bytes, blocks = long_pdf
+
+        serial = fitz.open(stream=self._reconstruct(pdf_bytes, blocks, workers=1), filetype="pdf")
+        parallel = fitz.open(stream=self._reconstruct(pdf_bytes, blocks, workers=2), filetype="pdf")
+
+        assert parallel.page_count == serial.page_count == 40
+        for page_num in range(40):
+            assert parallel[page_num].get_text() == serial[page_num].get_text()
+        assert "Translated 4" in parallel[3].get_text()
+        assert "Page 4 Text" not in parallel[3].get_text()
+        assert "Page 5 Text" in parallel[4].get_text()
+
+    def test_parallel_output_is_byte_stable(self, long_pdf):
+        pdf_bytes, blocks = long_pdf
+
+        first = self._reconstruct(pdf_bytes, blocks, workers=2)
+        second = self._reconstruct(pdf_bytes, blocks, workers=3)
+
+        assert first == second
+
+    def test_serial_output_is_byte_stable(self, long_pdf):
+        pdf_bytes, blocks = long_pdf
+
+        assert self._reconstruct(pdf_bytes, blocks, workers=1) == \
+            self._reconstruct(pdf_bytes, blocks, workers=1)
+
+    def test_pool_failure_falls_back_to_serial(self, long_pdf):
+        pdf_bytes, blocks = long_pdf
+
+        with patch(
+            "app.services.pdf_reconstruction._get_process_pool",
+            side_effect=AssertionError("daemonic processes are not allowed to have children"),
+        ):
+            result = self._reconstruct(pdf_bytes, blocks, workers=4)
+
+        assert fitz.open(stream=result, filetype="pdf").page_count == 40
+
+
+class TestSaveProfiles:
+    """Output and timing of the save profiles (benchmark: compare timings per endpoint)"""
+
+    @pytest.fixture
+    def dense_pdf(self):
+        """60 text-heavy pages with a translated block on every third page"""
+        doc = fitz.open()
+        for i in range(60):
+            page = doc.new_page()
+            for line in range(40):
+                page.insert_text((50, 20 + line * 18), f"Page {i + 1} line {line} lorem ipsum dolor sit amet")
+        pdf_bytes = doc.tobytes(deflate=True)
+
+        blocks = []
+        for page_num in range(1, 61, 3):
+            original = Block(
+                page=page_num,
+                block_id=page_num,
+                text=f"Page {page_num} line 0 lorem ipsum dolor sit amet",
+                coordinates=Coordinates(x=5, y=1, width=80, height=3),
+                font_size=12,
+                font_name="helv",
+                is_bold=False,
+                is_italic=False,
+                rotation=0,
+            )
+            blocks.append(TranslatedBlock(original=original, translated_text=f"Translated {page_num}"))
+        return pdf_bytes, blocks
+
+    def _reconstruct(self, pdf_bytes, blocks, save_profile):
+        with patch("app.services.pdf_reconstruction.get_settings") as mock_settings:
+            mock_settings.return_value = MagicMock(
+                pdf_reconstruction_workers=1,
+                pdf_parallel_min_pages=1000,
+            )
+            return PDFReconstructionService._reconstruct_with_pymupdf(
+                pdf_bytes, blocks, save_profile=save_profile
+            )
+
+    @pytest.mark.parametrize("save_profile", [INTERACTIVE, ARCHIVAL], ids=lambda profile: profile.name)
+    def test_profile_timing(self, dense_pdf, save_profile, record_property):
+        import time
+
+        pdf_bytes, blocks = dense_pdf
+
+        start_time = time.perf_counter()
+        result = self._reconstruct(pdf_bytes, blocks, save_profile)
+        elapsed = time.perf_counter() - start_time
+
+        record_property(f"{save_profile.name}_seconds", round(elapsed, 3))
+        record_property(f"{save_profile.name}_bytes", len(result))
+        doc = fitz.open(stream=result, filetype="pdf")
+        assert doc.page_count == 60
+        assert "Translated 31" in doc[30].get_text()
+        assert elapsed < 10.0, f"{save_profile.name} save took {elapsed:.2f}s, expected < 10s"
+
+    def test_interactive_appends_to_original(self, dense_pdf):
+        pdf_bytes, blocks = dense_pdf
+
+        import tempfile
+
+        temp_paths = []
+        real_mkstemp = tempfile.mkstemp
+
+        def mkstemp(**kwargs):
+            fd, path = real_mkstemp(**kwargs)
+            temp_paths.append(path)
+            return fd, path
+
+        with patch("app.services.pdf_reconstruction.tempfile.mkstemp", side_effect=mkstemp):
+            result = self._reconstruct(pdf_bytes, blocks, INTERACTIVE)
+
+        # Incremental update: the original bytes are kept as-is
+        assert result.startswith(pdf_bytes)
+        assert "Page 4 line 0" not in fitz.open(stream=result, filetype="pdf")[3].get_text()
+        assert len(temp_paths) == 1
+        assert not Path(temp_paths[0]).exists()
+        assert self._reconstruct(pdf_bytes, blocks, INTERACTIVE) == result
+
+    def test_archival_output_smaller(self, dense_pdf):
+        pdf_bytes, blocks = dense_pdf
+
+        assert len(self._reconstruct(pdf_bytes, blocks, ARCHIVAL)) < \
+            len(self._reconstruct(pdf_bytes, blocks, INTERACTIVE))
+
+    def test_unknown_profile_falls_back_to_archival(self):
+        assert get_save_profile("fastest") is ARCHIVAL
+
+    def test_pdf2zh_fallback_keeps_profile(self):
+        # A missing pdf2zh API or a pdf2zh error both fall back to PyMuPDF
+        with patch.object(PDFReconstructionService, "_reconstruct_with_pymupdf", return_value=b"%PDF") as mock_pymupdf:
+            PDFReconstructionService._reconstruct_with_pdf2zh(b"%PDF", [], save_profile=INTERACTIVE)
+
+        mock_pymupdf.assert_called_once_with(b"%PDF", [], None, INTERACTIVE)
@@ -0,0 +1,204 @@
+"""Tests for page thumbnail and tile rendering"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import fitz
+import pytest
+from fastapi import status
+
+from app import s3
+from app.models.translation import TranslationStatus
+from app.services.previews import PreviewOptions, PreviewRenderer, render_page_previews
+from app.tasks.render_previews import render_previews_sync
+
+OPTIONS = PreviewOptions(thumbnail_width=60, zoom_levels=(0.5, 1.0), tile_size=256)
+USER_ID = "user-1"
+
+
+def _pdf(page_count: int = 6) -> bytes:
+    doc = fitz.open()
+    for page_num in range(page_count):
+        page = doc.new_page(width=612, height=792)
+        page.insert_text((72, 72), f"Page {page_num}")
+        # Red square straddling the tile boundary at zoom 1
+        page.draw_rect(fitz.Rect(250, 250, 300, 300), fill=(1, 0, 0))
+    return doc.tobytes()
+
+
+def _settings(workers: int) -> MagicMock:
+    return MagicMock(preview_workers=workers)
+
+
+class TestRenderPagePreviews:
+    """Tests for render_page_previews"""
+
+    def test_thumbnail_and_tile_grid(self):
+        with fitz.open(stream=_pdf(1), filetype="pdf") as doc:
+            entry, files = render_page_previews(doc[0], OPTIONS)
+
+        assert entry["page"] == 0
+        assert entry["levels"] == [
+            {"zoom": 0.5, "width": 306, "height": 396, "columns": 2, "rows": 2},
+            {"zoom": 1.0, "width": 612, "height": 792, "columns": 3, "rows": 4},
+        ]
+        images = dict(files)
+        assert len(images) == 1 + 4 + 12
+        assert fitz.Pixmap(images["0/thumbnail.png"]).width == 60
+        # Edge tiles are cropped to the page
+        assert (fitz.Pixmap(images["0/1/2-3.png"]).width, fitz.Pixmap(images["0/1/2-3.png"]).height) == (100, 24)
+
+    def test_tiles_match_full_render(self):
+        with fitz.open(stream=_pdf(1), filetype="pdf") as doc:
+            _, files = render_page_previews(doc[0], OPTIONS)
+
+        tile = fitz.Pixmap(dict(files)["0/1/1-1.png"])
+        # Page point (260, 260) lands at (4, 4) in the tile starting at (256, 256)
+        assert tile.pixel(4, 4) == (255, 0, 0)
+
+    def test_webp(self):
+        pytest.importorskip("PIL")
+        options = PreviewOptions(thumbnail_width=60, zoom_levels=(0.5,), tile_size=256, image_format="webp")
+        with fitz.open(stream=_pdf(1), filetype="pdf") as doc:
+            _, files = render_page_previews(doc[0], options)
+
+        assert all(name.endswith(".webp") and data[8:12] == b"WEBP" for name, data in files)
+
+
+class TestPreviewRenderer:
+    """Tests for PreviewRenderer"""
+
+    @pytest.mark.asyncio
+    async def test_render_uploads_images_and_manifest(self, fake_redis, local_storage):
+        renderer = PreviewRenderer(fake_redis, OPTIONS)
+
+        with patch("app.services.previews.get_settings", return_value=_settings(1)):
+            manifest = await renderer.render("job-1", USER_ID, "original", _pdf())
+
+        assert [page["page"] for page in manifest["pages"]] == list(range(6))
+        assert await renderer.load_manifest("job-1", "original") == manifest
+        prefix = f"previews/{USER_ID}/job-1/original/{manifest['version']}/"
+        keys = await s3.list_keys(prefix)
+        assert len(keys) == 6 * 17 + 1
+        stored = json.loads(await s3.download_file(prefix + "manifest.json"))
+        assert stored == manifest
+        assert manifest["tile"].format(page=5, zoom="0.5", column=1, row=1) == "5/0.5/1-1.png"
+        assert prefix + "5/0.5/1-1.png" in keys
+
+    @pytest.mark.asyncio
+    async def test_same_pdf_not_rendered_again(self, fake_redis, local_storage):
+        renderer = PreviewRenderer(fake_redis, OPTIONS)
+        pdf = _pdf(2)
+        with patch("app.services.previews.get_settings", return_value=_settings(1)):
+            await renderer.render("job-1", USER_ID, "original", pdf)
+
+            with patch("app.services.previews.upload_file", new_callable=AsyncMock) as mock_upload:
+                await renderer.render("job-1", USER_ID, "original", pdf)
+
+        mock_upload.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_parallel_ranges(self, fake_redis, local_storage):
+        # Threads stand in for processes (same executor interface)
+        with ThreadPoolExecutor(max_workers=3) as pool, \
+             patch("app.services.previews.get_settings", return_value=_settings(3)), \
+             patch("app.services.previews._get_process_pool", return_value=pool) as mock_pool:
+            manifest = await PreviewRenderer(fake_redis, OPTIONS).render("job-1", USER_ID, "original", _pdf(10))
+
+        mock_pool.assert_called_once_with(3)
+        assert [page["page"] for page in manifest["pages"]] == list(range(10))
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_serial_without_pool(self, fake_redis, local_storage):
+        with patch("app.services.previews.get_settings", return_value=_settings(4)), \
+             patch("app.services.previews._get_process_pool", side_effect=AssertionError("daemonic")):
+            manifest = await PreviewRenderer(fake_redis, OPTIONS).render("job-1", USER_ID, "original", _pdf(10))
+
+        assert len(manifest["pages"]) == 10
+
+
+@pytest.fixture
+def translation(completed_translation):
+    """Job still being translated"""
+    completed_translation.status = TranslationStatus.TRANSLATING
+    return completed_translation
+
+
+class TestRenderPreviewsTask:
+    """Tests for render_previews_sync"""
+
+    @pytest.mark.asyncio
+    async def test_renders_original_during_translation(self, fake_redis, local_storage, translation):
+        await s3.upload_file(_pdf(1), translation.original_file_path)
+        db = AsyncMock()
+        db.get.return_value = translation
+
+        with patch("app.tasks.render_previews.get_redis_client", return_value=fake_redis), \
+             patch("app.services.previews.get_settings", return_value=MagicMock(
+                 preview_workers=1,
+                 preview_thumbnail_width=60,
+                 preview_zoom_levels="0.5",
+                 preview_tile_size=256,
+                 preview_image_format="png",
+             )):
+            result = await render_previews_sync(str(translation.id), "original", db)
+
+        assert result["success"] is True
+        assert result["page_count"] == 1
+        assert translation.status == TranslationStatus.TRANSLATING
+
+    def test_routed_to_previews_queue(self):
+        from app.celery_app import celery_app
+
+        assert celery_app.amqp.router.route({}, "render_previews")["queue"].name == "previews"
+
+    @pytest.mark.asyncio
+    async def test_translated_requires_result(self, translation):
+        db = AsyncMock()
+        db.get.return_value = translation
+
+        with pytest.raises(ValueError):
+            await render_previews_sync(str(translation.id), "translated", db)
+
+
+class TestPreviewsEndpoint:
+    """Tests for GET /translation/{job_id}/previews/{kind}"""
+
+    @pytest.mark.asyncio
+    async def test_not_ready(self, completed_job_client, translation):
+        response = await completed_job_client.get(f"/api/v1/translation/{translation.id}/previews/translated")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["ready"] is False
+        assert response.json()["pages"] == []
+
+    @pytest.mark.asyncio
+    async def test_ready(self, completed_job_client, fake_redis, local_storage, mock_user, translation):
+        job_id = str(translation.id)
+        with patch("app.services.previews.get_settings", return_value=_settings(1)):
+            manifest = await PreviewRenderer(fake_redis, OPTIONS).render(
+                job_id, str(mock_user.id), "original", _pdf(2)
+            )
+
+        settings = MagicMock(static_public_url="https://cdn.example.com")
+        with patch("app.routers.translation.get_settings", return_value=settings):
+            response = await completed_job_client.get(f"/api/v1/translation/{job_id}/previews/original")
+
+        assert response.status_code == status.HTTP_200_OK
+        result = response.json()
+        base = f"https://cdn.example.com/previews/{mock_user.id}/{job_id}/original/{manifest['version']}/"
+        assert result["ready"] is True
+        assert result["manifest_url"] == base + "manifest.json"
+        assert result["pages"][1]["thumbnail_url"] == base + "1/thumbnail.png"
+        level = result["pages"][1]["levels"][1]
+        assert (level["columns"], level["rows"]) == (3, 4)
+        assert len(level["tile_urls"]) == 12
+        # Row by row
+        assert level["tile_urls"][3] == base + "1/1/0-1.png"
+
+    @pytest.mark.asyncio
+    async def test_unknown_kind(self, completed_job_client, translation):
+        response = await completed_job_client.get(f"/api/v1/translation/{translation.id}/previews/other")
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
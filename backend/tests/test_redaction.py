@@ -0,0 +1,99 @@
+"""Tests for spatial redaction lookup"""
+
+import fitz
+import pytest
+
+from app.schemas.pdf import Block, Coordinates, TranslatedBlock
+from app.services.pdf_reconstruction import PDFReconstructionService
+from app.services.redaction import PageTextIndex, merge_overlapping
+
+
+@pytest.fixture
+def table_page():
+    """Page with a 30-row, 3-column grid of cells"""
+    doc = fitz.open()
+    page = doc.new_page()
+    for row in range(30):
+        for col in range(3):
+            page.insert_text((50 + col * 180, 60 + row * 24), f"Cell {row}-{col}", fontsize=10)
+    return doc, page
+
+
+class TestMergeOverlapping:
+    """Tests for merge_overlapping"""
+
+    def test_disjoint_boxes_kept(self):
+        boxes = [(0, 0, 10, 10), (20, 0, 30, 10)]
+
+        assert merge_overlapping(boxes) == boxes
+
+    def test_overlapping_boxes_merged(self):
+        assert merge_overlapping([(0, 0, 10, 10), (5, 0, 15, 10), (14, 0, 20, 10)]) == [(0, 0, 20, 10)]
+
+    def test_contained_box_absorbed(self):
+        assert merge_overlapping([(2, 2, 4, 4), (0, 0, 10, 10)]) == [(0, 0, 10, 10)]
+
+    def test_l_shaped_overlap_not_merged(self):
+        # Bounding box would redact a large area neither rectangle covers
+        boxes = [(0, 0, 100, 10), (90, 0, 100, 100)]
+
+        assert merge_overlapping(boxes) == boxes
+
+
+class TestPageTextIndex:
+    """Tests for PageTextIndex"""
+
+    def test_query_returns_line_boxes_of_covered_text(self, table_page):
+        _, page = table_page
+        index = PageTextIndex.from_page(page)
+
+        hit = page.search_for("Cell 4-1")[0]
+        boxes = index.query((hit.x0 + 2, hit.y0 + 2, hit.x1 - 2, hit.y1 - 2))
+
+        assert len(boxes) == 1
+        assert fitz.Rect(boxes[0]).contains(fitz.Rect(hit.x0 + 2, hit.y0 + 2, hit.x1 - 2, hit.y1 - 2))
+        assert page.get_textbox(fitz.Rect(boxes[0])).strip() == "Cell 4-1"
+
+    def test_empty_area_returns_nothing(self, table_page):
+        _, page = table_page
+        index = PageTextIndex.from_page(page)
+
+        assert index.query((0, 0, 40, 40)) == []
+
+
+class TestDensePageRedaction:
+    """Reconstruction of a dense page through the spatial index"""
+
+    def test_every_cell_replaced(self, table_page):
+        doc, page = table_page
+        rect = page.rect
+        blocks = []
+        for row in range(30):
+            for col in range(3):
+                hit = page.search_for(f"Cell {row}-{col}")[0]
+                original = Block(
+                    page=1,
+                    block_id=row * 3 + col,
+                    text=f"Cell {row}-{col}",
+                    coordinates=Coordinates(
+                        x=hit.x0 / rect.width * 100,
+                        y=hit.y0 / rect.height * 100,
+                        width=hit.width / rect.width * 100,
+                        height=hit.height / rect.height * 100,
+                    ),
+                    font_size=8,
+                    font_name="helv",
+                    is_bold=False,
+                    is_italic=False,
+                    rotation=0,
+                )
+                blocks.append(TranslatedBlock(original=original, translated_text=f"T{row}.{col}"))
+
+        result = fitz.open(
+            stream=PDFReconstructionService._reconstruct_with_pymupdf(doc.tobytes(), blocks),
+            filetype="pdf",
+        )
+
+        text = result[0].get_text()
+        assert "Cell" not in text
+        assert "T29.2" in text
@@ -1,10 +1,15 @@
 """S3/MinIO integration tests for TransKeep"""
 
+import asyncio
+import io
 import os
+import time
+from unittest.mock import patch
 
 import pytest
 import pytest_asyncio
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config
 from botocore.exceptions import ClientError
 
@@ -13,12 +18,16 @@ from app.s3 import (
     S3Keys,
     create_bucket_if_not_exists,
     delete_file,
+    delete_files,
     download_file,
     file_exists,
     get_presigned_download_url,
     get_presigned_url,
+    get_s3_metrics,
     s3_client,
+    stream_file,
     upload_file,
+    upload_file_from_path,
 )
 
 # Test configuration
@@ -85,6 +94,26 @@ class TestFileOperations:
         response = s3_client.head_object(Bucket=test_bucket, Key=key)
         assert response["ContentLength"] == len(content)
 
+    @pytest.mark.asyncio
+    async def test_upload_large_file_from_path(self, test_bucket: str, tmp_path):
+        """Test a file above the multipart threshold is uploaded in parts"""
+        content = os.urandom(12 * 1024 * 1024)
+        path = tmp_path / "large.pdf"
+        path.write_bytes(content)
+        key = "test/large.pdf"
+
+        with patch("app.s3._transfer_config", TransferConfig(
+            multipart_threshold=5 * 1024 * 1024,
+            multipart_chunksize=5 * 1024 * 1024,
+        )):
+            result = await upload_file_from_path(str(path), key, bucket=test_bucket)
+        assert result == key
+
+        response = s3_client.head_object(Bucket=test_bucket, Key=key)
+        assert response["ContentLength"] == len(content)
+        # Multipart ETags end with the part count
+        assert response["ETag"].strip('"').endswith("-3")
+
     @pytest.mark.asyncio
     async def test_download_file(self, test_bucket: str):
         """Test downloading a file"""
@@ -202,6 +231,17 @@ class TestS3Keys:
         )
         assert path == "results/user-123/job-456/translated.pdf"
 
+    def test_text_layer_paths(self):
+        """Test text-layer shard and manifest path generation"""
+        assert (
+            S3Keys.text_layer_shard_path("user-123", "job-456", 3, "abc")
+            == "text-layers/user-123/job-456/pages/3-abc.json.gz"
+        )
+        assert (
+            S3Keys.text_layer_manifest_path("user-123", "job-456", "v1")
+            == "text-layers/user-123/job-456/manifest-v1.json.gz"
+        )
+
 
 class TestLargeFiles:
     """Test handling of larger files"""
@@ -275,3 +315,85 @@ class TestContentTypes:
         response = s3_client.head_object(Bucket=test_bucket, Key=key)
         assert response["ContentType"] == "application/json"
 
+    @pytest.mark.asyncio
+    async def test_upload_precompressed_immutable(self, test_bucket: str):
+        """Test uploading with Content-Encoding and Cache-Control"""
+        key = "test/data.json.gz"
+
+        await upload_file(
+            b"\x1f\x8b",
+            key,
+            bucket=test_bucket,
+            content_type="application/json",
+            content_encoding="gzip",
+            cache_control="public, max-age=31536000, immutable",
+        )
+
+        response = s3_client.head_object(Bucket=test_bucket, Key=key)
+        assert response["ContentEncoding"] == "gzip"
+        assert response["CacheControl"] == "public, max-age=31536000, immutable"
+
+
+
+class TestNonBlockingIO:
+    """S3 calls run off the event loop (no MinIO needed)"""
+
+    @pytest.mark.asyncio
+    async def test_slow_download_does_not_block_event_loop(self):
+        def slow_get_object(Bucket, Key):
+            time.sleep(0.3)
+            return {"Body": io.BytesIO(b"slow content")}
+
+        ticks = 0
+
+        async def poll():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        poller = asyncio.create_task(poll())
+        with patch.object(s3_client, "get_object", side_effect=slow_get_object):
+            content = await download_file("test/slow.pdf")
+        poller.cancel()
+
+        assert content == b"slow content"
+        # The loop kept serving other tasks during the transfer
+        assert ticks >= 10
+
+    @pytest.mark.asyncio
+    async def test_operations_are_timed(self):
+        before = get_s3_metrics().get("delete", {"count": 0, "errors": 0})
+
+        with patch.object(s3_client, "delete_object"):
+            await delete_file("test/a.pdf")
+        with patch.object(s3_client, "delete_object", side_effect=ConnectionError("down")):
+            with pytest.raises(ConnectionError):
+                await delete_file("test/b.pdf")
+
+        after = get_s3_metrics()["delete"]
+        assert after["count"] == before["count"] + 2
+        assert after["errors"] == before["errors"] + 1
+        assert after["max_seconds"] >= 0
+
+    @pytest.mark.asyncio
+    async def test_delete_files_in_batches(self):
+        keys = [f"test/{i}.pdf" for i in range(2500)]
+        responses = [{}, {"Errors": [{"Key": "test/1500.pdf", "Code": "AccessDenied"}]}, {}]
+
+        with patch.object(s3_client, "delete_objects", side_effect=responses) as mock_delete:
+            failed = await delete_files(keys)
+
+        assert failed == ["test/1500.pdf"]
+        assert [len(c.kwargs["Delete"]["Objects"]) for c in mock_delete.call_args_list] == [1000, 1000, 500]
+
+    @pytest.mark.asyncio
+    async def test_stream_file_range_in_chunks(self):
+        body = io.BytesIO(b"x" * 2500)
+        body.close = lambda: None
+
+        with patch.object(s3_client, "get_object", return_value={"Body": body}) as mock_get:
+            chunks = [chunk async for chunk in stream_file("test/a.pdf", 100, 2599, chunk_size=1000)]
+
+        assert mock_get.call_args.kwargs["Range"] == "bytes=100-2599"
+        assert [len(chunk) for chunk in chunks] == [1000, 1000, 500]
@@ -0,0 +1,111 @@
+"""Tests for single-flight request coalescing"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.cache import CacheKeys
+from app.services.single_flight import SingleFlight, content_hash
+
+
+def _counting_call(result, delay: float = 0.05):
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return result
+
+    return fn, calls
+
+
+class TestContentHash:
+    """Tests for request content hashing"""
+
+    def test_same_parts_same_hash(self):
+        assert content_hash("text", "JA", 3) == content_hash("text", "JA", 3)
+
+    def test_different_parts_different_hash(self):
+        assert content_hash("text", "JA", 3) != content_hash("text", "JA", 2)
+        assert content_hash("a", "bc") != content_hash("ab", "c")
+
+
+class TestSingleFlight:
+    """Tests for SingleFlight.do"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_flight(self, fake_redis):
+        fn, calls = _counting_call({"value": 1})
+        flight = SingleFlight(fake_redis, "test")
+
+        results = await asyncio.gather(*(flight.do("k1", fn) for _ in range(5)))
+
+        assert len(calls) == 1
+        assert all(result == {"value": 1} for result, _ in results)
+        assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+
+    @pytest.mark.asyncio
+    async def test_result_cached_for_later_calls(self, fake_redis):
+        fn, calls = _counting_call(["a", "b"])
+        flight = SingleFlight(fake_redis, "test")
+
+        assert await flight.do("k2", fn) == (["a", "b"], False)
+        assert await flight.do("k2", fn) == (["a", "b"], True)
+        assert len(calls) == 1
+        assert json.loads(await fake_redis.get(CacheKeys.single_flight_result("test", "k2"))) == ["a", "b"]
+        assert await fake_redis.get(CacheKeys.single_flight_lock("test", "k2")) is None
+
+    @pytest.mark.asyncio
+    async def test_failure_propagates_and_is_not_cached(self, fake_redis):
+        async def failing():
+            await asyncio.sleep(0.05)
+            raise RuntimeError("provider down")
+
+        flight = SingleFlight(fake_redis, "test")
+
+        results = await asyncio.gather(
+            flight.do("k3", failing), flight.do("k3", failing), return_exceptions=True
+        )
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert await fake_redis.get(CacheKeys.single_flight_result("test", "k3")) is None
+        assert await fake_redis.get(CacheKeys.single_flight_lock("test", "k3")) is None
+
+    @pytest.mark.asyncio
+    async def test_waits_for_other_replica(self, fake_redis):
+        # Another replica holds the lock and publishes its result shortly
+        await fake_redis.set(CacheKeys.single_flight_lock("test", "k4"), "other-replica")
+        fn, calls = _counting_call("mine")
+        flight = SingleFlight(fake_redis, "test", poll_interval_seconds=0.01)
+
+        async def publish():
+            await asyncio.sleep(0.05)
+            await fake_redis.set(CacheKeys.single_flight_result("test", "k4"), json.dumps("theirs"))
+
+        result, _ = await asyncio.gather(flight.do("k4", fn), publish())
+
+        assert result == ("theirs", True)
+        assert calls == []
+
+    @pytest.mark.asyncio
+    async def test_wait_timeout_calls_provider(self, fake_redis):
+        await fake_redis.set(CacheKeys.single_flight_lock("test", "k5"), "stuck-replica")
+        fn, calls = _counting_call("mine", delay=0)
+        flight = SingleFlight(fake_redis, "test", wait_timeout_seconds=0.05, poll_interval_seconds=0.01)
+
+        assert await flight.do("k5", fn) == ("mine", False)
+        assert len(calls) == 1
+        # Another replica's lock is left alone
+        assert await fake_redis.get(CacheKeys.single_flight_lock("test", "k5")) == "stuck-replica"
+
+    @pytest.mark.asyncio
+    async def test_redis_unavailable_calls_provider(self):
+        broken_redis = AsyncMock()
+        broken_redis.get.side_effect = ConnectionError("redis down")
+        broken_redis.set.side_effect = ConnectionError("redis down")
+        fn, calls = _counting_call("value", delay=0)
+
+        assert await SingleFlight(broken_redis, "test").do("k6", fn) == ("value", False)
+        assert len(calls) == 1
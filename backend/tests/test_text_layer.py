@@ -0,0 +1,199 @@
+"""Tests for the viewer text layer published as static page shards"""
+
+import gzip
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+import pytest_asyncio
+from fastapi import status
+
+from app import s3
+from app.cache import CacheKeys
+from app.routers.files import get_stored_file
+from app.services.block_store import TranslatedBlockStore
+from app.services.text_layer import TextLayerPublisher, build_page_shards, encode_shard
+
+USER_ID = "user-1"
+
+
+def _block(page: int, text: str, translated: str, x: float = 10.0) -> dict:
+    return {
+        "original": {
+            "page": page,
+            "block_id": f"{page}-{text}",
+            "text": text,
+            "coordinates": {"x": x, "y": 20.456, "width": 100.0, "height": 12.0},
+        },
+        "translated_text": translated,
+        "tone_customized_text": None,
+    }
+
+
+@pytest.fixture
+def translated_cache() -> dict:
+    return {
+        "blocks": [
+            _block(1, "Hello", "こんにちは"),
+            _block(1, "World", "世界", x=10.12345),
+            _block(2, "Bye", "さようなら"),
+        ]
+    }
+
+
+@pytest_asyncio.fixture
+async def job_id(fake_redis, translated_cache, completed_translation) -> str:
+    job_id = str(completed_translation.id)
+    await fake_redis.set(CacheKeys.translated_blocks(job_id), json.dumps(translated_cache))
+    return job_id
+
+
+async def _read_json(key: str) -> dict:
+    return json.loads(gzip.decompress(await s3.download_file(key)))
+
+
+class TestBuildPageShards:
+    """Tests for build_page_shards and encode_shard"""
+
+    def test_groups_blocks_by_page(self, translated_cache):
+        translated_cache["blocks"][0]["tone_customized_text"] = "やあ"
+        translated_cache["blocks"][2]["edited_text"] = "またね"
+
+        shards = build_page_shards(translated_cache)
+
+        assert list(shards) == [1, 2]
+        assert shards[1]["blocks"] == [
+            {"id": 0, "box": [10.0, 20.46, 100.0, 12.0], "src": "Hello", "dst": "こんにちは", "tone": "やあ"},
+            {"id": 1, "box": [10.12, 20.46, 100.0, 12.0], "src": "World", "dst": "世界"},
+        ]
+        assert shards[2]["blocks"][0]["edit"] == "またね"
+
+    def test_encoding_is_deterministic(self, translated_cache):
+        shard = build_page_shards(translated_cache)[1]
+
+        digest, data = encode_shard(shard)
+
+        assert encode_shard(shard) == (digest, data)
+        assert json.loads(gzip.decompress(data)) == shard
+        # Minified, with text kept as UTF-8
+        assert b", " not in gzip.decompress(data)
+        assert "こんにちは".encode() in gzip.decompress(data)
+
+
+class TestTextLayerPublisher:
+    """Tests for TextLayerPublisher"""
+
+    @pytest.mark.asyncio
+    async def test_publish_writes_shards_and_manifest(self, fake_redis, local_storage, job_id):
+        manifest = await TextLayerPublisher(fake_redis).publish(job_id, USER_ID)
+
+        assert sorted(manifest["pages"]) == [1, 2]
+        stored = await _read_json(s3.S3Keys.text_layer_manifest_path(USER_ID, job_id, manifest["version"]))
+        assert stored["version"] == manifest["version"]
+        assert stored["pages"][0] == {"page": 1, "path": f"pages/1-{manifest['pages'][1]}.json.gz"}
+        page_2 = await _read_json(s3.S3Keys.text_layer_shard_path(USER_ID, job_id, 2, manifest["pages"][2]))
+        assert page_2["blocks"][0]["dst"] == "さようなら"
+        assert await TextLayerPublisher(fake_redis).load_manifest(job_id) == manifest
+
+    @pytest.mark.asyncio
+    async def test_missing_blocks(self, fake_redis, local_storage):
+        assert await TextLayerPublisher(fake_redis).publish("missing", USER_ID) is None
+
+    @pytest.mark.asyncio
+    async def test_edit_republishes_only_changed_page(self, fake_redis, local_storage, job_id):
+        publisher = TextLayerPublisher(fake_redis)
+        first = await publisher.publish(job_id, USER_ID)
+
+        await TranslatedBlockStore(fake_redis).set_block_edit(job_id, 2, "またね")
+        assert await publisher.load_manifest(job_id) is None
+
+        with patch("app.services.text_layer.upload_file", wraps=s3.upload_file) as mock_upload:
+            second = await publisher.publish(job_id, USER_ID)
+
+        assert second["version"] != first["version"]
+        assert second["pages"][1] == first["pages"][1]
+        assert second["pages"][2] != first["pages"][2]
+        uploaded = [call.kwargs["key"] for call in mock_upload.call_args_list]
+        assert uploaded == [
+            s3.S3Keys.text_layer_shard_path(USER_ID, job_id, 2, second["pages"][2]),
+            s3.S3Keys.text_layer_manifest_path(USER_ID, job_id, second["version"]),
+        ]
+        # Viewers holding the first manifest can still load its shards
+        assert await s3.file_exists(s3.S3Keys.text_layer_shard_path(USER_ID, job_id, 2, first["pages"][2]))
+
+    @pytest.mark.asyncio
+    async def test_update_during_publish_leaves_manifest_stale(self, fake_redis, local_storage, job_id):
+        store = TranslatedBlockStore(fake_redis)
+        original_load = store.load
+
+        async def load_then_edit(job):
+            data = await original_load(job)
+            await store.set_block_edit(job, 0, "edited mid-publish")
+            return data
+
+        with patch("app.services.text_layer.TranslatedBlockStore", return_value=MagicMock(load=load_then_edit)):
+            await TextLayerPublisher(fake_redis).publish(job_id, USER_ID)
+
+        assert await TextLayerPublisher(fake_redis).load_manifest(job_id) is None
+
+    @pytest.mark.asyncio
+    async def test_shards_served_gzip_encoded_locally(self, fake_redis, local_storage, job_id):
+        manifest = await TextLayerPublisher(fake_redis).publish(job_id, USER_ID)
+        key = s3.S3Keys.text_layer_shard_path(USER_ID, job_id, 1, manifest["pages"][1])
+        link = local_storage.signed_url(key, s3.DEFAULT_BUCKET, 60)
+        params = dict(item.split("=") for item in link.split("?")[1].split("&"))
+
+        response = await get_stored_file(
+            bucket=s3.DEFAULT_BUCKET,
+            key=key,
+            expires=int(params["expires"]),
+            signature=params["signature"],
+        )
+
+        assert response.media_type == "application/json"
+        assert response.headers["content-encoding"] == "gzip"
+
+
+class TestTextLayerEndpoint:
+    """Tests for GET /translation/{job_id}/text-layer"""
+
+    @pytest.mark.asyncio
+    async def test_publishes_on_first_request(self, completed_job_client, fake_redis, mock_user, job_id):
+        response = await completed_job_client.get(f"/api/v1/translation/{job_id}/text-layer")
+
+        assert response.status_code == status.HTTP_200_OK
+        result = response.json()
+        manifest = await TextLayerPublisher(fake_redis).load_manifest(job_id)
+        assert result["version"] == manifest["version"]
+        assert [page["page"] for page in result["pages"]] == [1, 2]
+        # Local storage hands out signed links
+        shard_key = s3.S3Keys.text_layer_shard_path(str(mock_user.id), job_id, 1, manifest["pages"][1])
+        assert result["pages"][0]["url"].startswith(f"http://test/api/v1/files/{s3.DEFAULT_BUCKET}/{shard_key}?")
+
+    @pytest.mark.asyncio
+    async def test_public_url(self, completed_job_client, mock_user, job_id):
+        settings = MagicMock(static_public_url="https://cdn.example.com/")
+        with patch("app.routers.translation.get_settings", return_value=settings):
+            result = (await completed_job_client.get(f"/api/v1/translation/{job_id}/text-layer")).json()
+
+        prefix = f"https://cdn.example.com/text-layers/{mock_user.id}/{job_id}/"
+        assert result["manifest_url"] == f"{prefix}manifest-{result['version']}.json.gz"
+        assert result["pages"][1]["url"].startswith(f"{prefix}pages/2-")
+
+    @pytest.mark.asyncio
+    async def test_current_manifest_is_not_republished(self, completed_job_client, fake_redis, job_id):
+        await TextLayerPublisher(fake_redis).publish(job_id, USER_ID)
+
+        with patch.object(TextLayerPublisher, "publish") as mock_publish:
+            response = await completed_job_client.get(f"/api/v1/translation/{job_id}/text-layer")
+
+        assert response.status_code == status.HTTP_200_OK
+        mock_publish.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_blocks_not_available(self, completed_job_client, fake_redis, job_id):
+        await fake_redis.delete(CacheKeys.translated_blocks(job_id))
+
+        response = await completed_job_client.get(f"/api/v1/translation/{job_id}/text-layer")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,126 @@
+"""Tests for text fitting"""
+
+import fitz
+import pytest
+
+from app.schemas.pdf import Block, Coordinates, TranslatedBlock
+from app.services.pdf_reconstruction import PDFReconstructionService
+from app.services.text_layout import GlyphMetrics, TextFitter, break_units, wrap_text
+
+
+class TestBreakUnits:
+    """Tests for line break opportunities"""
+
+    def test_latin_words_stay_whole(self):
+        assert break_units("hello big world") == ["hello", " ", "big", " ", "world"]
+
+    def test_cjk_breaks_between_characters(self):
+        assert break_units("日本語") == ["日", "本", "語"]
+
+    def test_kinsoku_keeps_punctuation_attached(self):
+        units = break_units("「翻訳」です。")
+
+        assert units == ["「翻", "訳」", "で", "す。"]
+
+
+class TestWrapText:
+    """Tests for greedy wrapping"""
+
+    def test_lines_never_exceed_width(self):
+        metrics = GlyphMetrics.for_font("helv")
+        text = "The quick brown fox jumps over the lazy dog " * 5
+
+        lines = wrap_text(text, 10, metrics)
+
+        assert len(lines) > 1
+        assert all(metrics.text_width(line) <= 10 for line in lines)
+        assert " ".join(lines).split() == text.split()
+
+    def test_long_word_broken_between_characters(self):
+        metrics = GlyphMetrics.for_font("helv")
+
+        lines = wrap_text("internationalization", 3, metrics)
+
+        assert "".join(lines) == "internationalization"
+        assert all(metrics.text_width(line) <= 3 for line in lines)
+
+    def test_existing_newlines_kept(self):
+        assert wrap_text("a\nb", 100, GlyphMetrics.for_font("helv")) == ["a", "b"]
+
+
+class TestTextFitter:
+    """Tests for font size selection"""
+
+    def test_short_text_keeps_original_size(self):
+        fit = TextFitter("helv").fit("Hello", 200, 30, max_font_size=12)
+
+        assert fit.font_size == 12
+        assert fit.lines == ["Hello"]
+        assert not fit.truncated
+
+    def test_long_text_shrinks_to_fit(self):
+        fitter = TextFitter("helv")
+        text = "translated sentence " * 20
+
+        fit = fitter.fit(text, 200, 40, max_font_size=12)
+
+        assert TextFitter.MIN_FONT_SIZE <= fit.font_size < 12
+        assert fitter.metrics.text_height(len(fit.lines), fit.font_size) <= 40
+        # Close to the largest size that fits
+        larger = fit.font_size + 2 * TextFitter.SIZE_PRECISION
+        assert fitter.metrics.text_height(len(fitter._layout(text, 200, larger)), larger) > 40
+
+    def test_overlong_text_truncated(self):
+        fit = TextFitter("helv").fit("word " * 500, 50, 10, max_font_size=12)
+
+        assert fit.truncated
+        assert fit.lines[-1].endswith(TextFitter.ELLIPSIS)
+
+    @pytest.mark.parametrize("text", ["long english text " * 30, "日本語の翻訳テキスト。" * 20])
+    def test_single_insertion_accepted(self, text):
+        page = fitz.open().new_page()
+        rect = fitz.Rect(50, 50, 250, 90)
+
+        fit = TextFitter("helv").fit(text, rect.width, rect.height, max_font_size=14)
+
+        result = page.insert_textbox(
+            rect, "\n".join(fit.lines), fontsize=fit.font_size, fontname="helv", lineheight=fit.line_height
+        )
+        assert result >= 0
+
+
+class TestFittedReconstruction:
+    """Fitted text stays inside its block"""
+
+    def test_long_translation_stays_in_block(self):
+        doc = fitz.open()
+        doc.new_page().insert_text((50, 60), "Short", fontsize=12)
+        original = Block(
+            page=1,
+            block_id=0,
+            text="Short",
+            coordinates=Coordinates(x=8, y=6, width=30, height=3),
+            font_size=12,
+            font_name="helv",
+            is_bold=False,
+            is_italic=False,
+            rotation=0,
+        )
+        block = TranslatedBlock(original=original, translated_text="A much longer translated sentence " * 3)
+
+        result = fitz.open(
+            stream=PDFReconstructionService._reconstruct_with_pymupdf(doc.tobytes(), [block]),
+            filetype="pdf",
+        )
+
+        page = result[0]
+        block_rect = fitz.Rect(
+            0.08 * page.rect.width,
+            0.06 * page.rect.height,
+            0.38 * page.rect.width,
+            0.09 * page.rect.height,
+        )
+        words = page.get_text("words")
+        assert words
+        assert all(fitz.Rect(word[:4]).x1 <= block_rect.x1 + 1 for word in words)
+        assert "longer" in page.get_text()
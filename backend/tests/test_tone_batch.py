@@ -0,0 +1,296 @@
+"""Tests for bulk tone customization via batch submission"""
+
+import json
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.cache import CacheKeys
+from app.models.translation import Translation, TranslationStatus
+from app.services.tone_batch_service import (
+    LocalToneBatchProvider,
+    ToneBatchService,
+    get_tone_batch_provider,
+)
+from app.services.tone_service import ToneService
+from app.tasks.customize_tone import (
+    finalize_tone_batch,
+    poll_tone_batches_sync,
+    submit_tone_batch_sync,
+)
+
+
+def _uppercase_responder(params: dict) -> str:
+    return LocalToneBatchProvider._echo(params).upper()
+
+
+@pytest.fixture
+def job_id() -> str:
+    return str(uuid.uuid4())
+
+
+@pytest.fixture
+def translated_cache() -> dict:
+    """Cached `_translated` payload with one empty block"""
+    def block(block_id: int, text: str) -> dict:
+        return {
+            "original": {
+                "page": 0,
+                "block_id": block_id,
+                "text": f"original {block_id}",
+                "coordinates": {"x": 10, "y": 10 * block_id, "width": 50, "height": 5},
+                "font_size": 12,
+                "font_name": "helv",
+                "is_bold": False,
+                "is_italic": False,
+                "rotation": 0,
+            },
+            "translated_text": text,
+            "source_lang": "en",
+            "target_lang": "ja",
+            "billed_characters": 10,
+        }
+
+    return {
+        "blocks": [block(0, "first block"), block(1, ""), block(2, "third block")],
+        "total_cost": 0.01,
+        "total_blocks": 3,
+    }
+
+
+@pytest.fixture
+def mock_db(job_id):
+    translation = Translation(
+        id=uuid.UUID(job_id),
+        tenant_id=uuid.uuid4(),
+        user_id=uuid.uuid4(),
+        file_name="test.pdf",
+        file_size_bytes=1024,
+        source_language="en",
+        target_language="ja",
+        status=TranslationStatus.COMPLETED,
+        progress_percent=100,
+        original_file_path="uploads/test.pdf",
+    )
+    db = MagicMock()
+    db.get = AsyncMock(return_value=translation)
+    db.commit = AsyncMock()
+    return db
+
+
+class TestToneBatchService:
+    """Tests for ToneBatchService with the local provider"""
+
+    def test_submit_skips_empty_blocks(self):
+        service = ToneBatchService(LocalToneBatchProvider())
+
+        handle = service.submit(["hello", "", "  ", "world"], "casual")
+
+        assert handle["provider"] == "local"
+        assert handle["request_count"] == 2
+        assert handle["batch_id"].startswith("localbatch_")
+
+    def test_submit_uses_shared_prompt(self):
+        provider = MagicMock()
+        provider.name = "mock"
+        provider.submit.return_value = "batch_1"
+
+        ToneBatchService(provider).submit(["hello"], "professional")
+
+        requests = provider.submit.call_args.args[0]
+        assert requests == [
+            {
+                "custom_id": "block-0",
+                "params": ToneService.build_message_params("hello", "professional"),
+            }
+        ]
+
+    def test_collect_returns_none_while_processing(self):
+        service = ToneBatchService(LocalToneBatchProvider(polls_until_complete=1))
+        handle = service.submit(["hello"], "casual")
+
+        assert service.collect(handle) is None
+        customized, cost = service.collect(handle)
+
+        assert customized == {0: "hello"}
+        assert cost > 0
+
+    def test_collect_maps_results_by_block_index(self):
+        service = ToneBatchService(LocalToneBatchProvider(responder=_uppercase_responder))
+        handle = service.submit(["a", "", "c"], "casual")
+
+        customized, _ = service.collect(handle)
+
+        assert customized == {0: "A", 2: "C"}
+
+    def test_collect_omits_failed_requests(self):
+        def responder(params):
+            text = LocalToneBatchProvider._echo(params)
+            return None if text == "bad" else text
+
+        service = ToneBatchService(LocalToneBatchProvider(responder=responder))
+        handle = service.submit(["good", "bad"], "casual")
+
+        customized, _ = service.collect(handle)
+
+        assert customized == {0: "good"}
+
+    def test_collect_empty_batch(self):
+        service = ToneBatchService(LocalToneBatchProvider())
+        handle = service.submit(["", ""], "casual")
+
+        assert handle["batch_id"] is None
+        assert service.collect(handle) == ({}, 0.0)
+
+    def test_batch_cost_is_discounted(self):
+        full = ToneService.calculate_cost(1000, 1000)
+        batch = ToneService.calculate_cost(1000, 1000, batch=True)
+
+        assert batch == pytest.approx(full * ToneService.BATCH_DISCOUNT)
+
+    def test_get_provider_unknown_raises(self):
+        with pytest.raises(ValueError, match="Unknown tone batch provider"):
+            get_tone_batch_provider("nope")
+
+    def test_get_provider_local(self):
+        assert isinstance(get_tone_batch_provider("local"), LocalToneBatchProvider)
+
+
+class TestToneBatchTasks:
+    """Tests for batch submission, polling and stitching"""
+
+    @pytest.mark.asyncio
+    async def test_submit_persists_handle(self, job_id, mock_db, fake_redis, translated_cache):
+        await fake_redis.set(f"{CacheKeys.blocks(job_id)}_translated", json.dumps(translated_cache))
+
+        with patch("app.tasks.customize_tone.get_redis_client", return_value=fake_redis):
+            result = await submit_tone_batch_sync(
+                job_id,
+                "casual",
+                mock_db,
+                batch_service=ToneBatchService(LocalToneBatchProvider()),
+            )
+
+        assert result["success"] is True
+        assert result["request_count"] == 2
+        handle = json.loads(await fake_redis.get(CacheKeys.tone_batch(job_id)))
+        assert handle["batch_id"] == result["batch_id"]
+        assert handle["tone"] == "casual"
+        assert job_id in await fake_redis.smembers(CacheKeys.TONE_BATCHES_PENDING)
+        assert mock_db.get.return_value.status == TranslationStatus.APPLYING_TONE
+
+    @pytest.mark.asyncio
+    async def test_submit_failure_falls_back_to_per_request_task(
+        self, job_id, mock_db, fake_redis, translated_cache
+    ):
+        await fake_redis.set(f"{CacheKeys.blocks(job_id)}_translated", json.dumps(translated_cache))
+        failing_service = MagicMock()
+        failing_service.submit.side_effect = RuntimeError("provider down")
+
+        with patch("app.tasks.customize_tone.get_redis_client", return_value=fake_redis), \
+             patch("app.tasks.customize_tone.customize_tone_task") as mock_task:
+            result = await submit_tone_batch_sync(job_id, "casual", mock_db, batch_service=failing_service)
+
+        assert result["fallback"] is True
+        mock_task.delay.assert_called_once_with(job_id, "casual")
+        assert not await fake_redis.smembers(CacheKeys.TONE_BATCHES_PENDING)
+
+    @pytest.mark.asyncio
+    async def test_finalize_stitches_results(self, job_id, mock_db, fake_redis, translated_cache):
+        cache_key = f"{CacheKeys.blocks(job_id)}_translated"
+        await fake_redis.set(cache_key, json.dumps(translated_cache))
+        service = ToneBatchService(LocalToneBatchProvider(responder=_uppercase_responder))
+
+        with patch("app.tasks.customize_tone.get_redis_client", return_value=fake_redis):
+            await submit_tone_batch_sync(job_id, "professional", mock_db, batch_service=service)
+
+        finalized = await finalize_tone_batch(job_id, mock_db, fake_redis, batch_service=service)
+
+        assert finalized is True
+        stitched = json.loads(await fake_redis.get(cache_key))
+        assert [b["tone_customized_text"] for b in stitched["blocks"]] == [
+            "FIRST BLOCK",
+            "",
+            "THIRD BLOCK",
+        ]
+        assert stitched["tone"] == "professional"
+        assert stitched["total_cost"] == pytest.approx(0.01 + stitched["tone_cost"])
+        translation = mock_db.get.return_value
+        assert translation.status == TranslationStatus.RECONSTRUCTING
+        assert translation.tone_preset == "professional"
+        assert await fake_redis.get(CacheKeys.tone_batch(job_id)) is None
+        assert not await fake_redis.smembers(CacheKeys.TONE_BATCHES_PENDING)
+        # Token usage of the two non-empty requests feeds the planner
+        stats = json.loads(await fake_redis.get(CacheKeys.tone_stats(ToneService.MODEL, "ja")))
+        assert stats["samples"] == 2
+
+    @pytest.mark.asyncio
+    async def test_finalize_waits_for_processing_batch(self, job_id, mock_db, fake_redis, translated_cache):
+        cache_key = f"{CacheKeys.blocks(job_id)}_translated"
+        await fake_redis.set(cache_key, json.dumps(translated_cache))
+        service = ToneBatchService(LocalToneBatchProvider(polls_until_complete=1))
+
+        with patch("app.tasks.customize_tone.get_redis_client", return_value=fake_redis):
+            await submit_tone_batch_sync(job_id, "casual", mock_db, batch_service=service)
+
+        assert await finalize_tone_batch(job_id, mock_db, fake_redis, batch_service=service) is False
+        assert job_id in await fake_redis.smembers(CacheKeys.TONE_BATCHES_PENDING)
+        assert await finalize_tone_batch(job_id, mock_db, fake_redis, batch_service=service) is True
+
+    @pytest.mark.asyncio
+    async def test_finalize_fails_job_when_blocks_expired(self, job_id, mock_db, fake_redis, translated_cache):
+        cache_key = f"{CacheKeys.blocks(job_id)}_translated"
+        await fake_redis.set(cache_key, json.dumps(translated_cache))
+        provider = LocalToneBatchProvider()
+        service = ToneBatchService(provider)
+
+        with patch("app.tasks.customize_tone.get_redis_client", return_value=fake_redis):
+            await submit_tone_batch_sync(job_id, "casual", mock_db, batch_service=service)
+        await fake_redis.delete(cache_key)
+
+        with patch.object(provider, "get_results", wraps=provider.get_results) as mock_results:
+            finalized = await finalize_tone_batch(job_id, mock_db, fake_redis, batch_service=service)
+
+        assert finalized is True
+        # Results aren't downloaded when they can't be stitched
+        mock_results.assert_not_called()
+        translation = mock_db.get.return_value
+        assert translation.status == TranslationStatus.FAILED
+        assert "expired" in translation.error_message
+        assert await fake_redis.get(CacheKeys.tone_batch(job_id)) is None
+        assert not await fake_redis.smembers(CacheKeys.TONE_BATCHES_PENDING)
+
+    def test_local_results_can_be_collected_again(self):
+        provider = LocalToneBatchProvider()
+        batch_id = provider.submit([{
+            "custom_id": "block-0",
+            "params": {"system": "s", "messages": [{"content": "Text to rewrite:\nhello"}]},
+        }])
+
+        assert provider.get_results(batch_id) == provider.get_results(batch_id)
+
+    @pytest.mark.asyncio
+    async def test_poll_drops_jobs_without_handle(self, job_id, mock_db, fake_redis):
+        await fake_redis.sadd(CacheKeys.TONE_BATCHES_PENDING, job_id)
+
+        with patch("app.tasks.customize_tone.get_redis_client", return_value=fake_redis):
+            result = await poll_tone_batches_sync(mock_db)
+
+        assert result == {"pending": 0, "finalized": 1}
+        assert not await fake_redis.smembers(CacheKeys.TONE_BATCHES_PENDING)
+
+    @pytest.mark.asyncio
+    async def test_poll_finalizes_local_batches(self, job_id, mock_db, fake_redis, translated_cache):
+        await fake_redis.set(f"{CacheKeys.blocks(job_id)}_translated", json.dumps(translated_cache))
+
+        with patch("app.tasks.customize_tone.get_redis_client", return_value=fake_redis):
+            await submit_tone_batch_sync(
+                job_id,
+                "casual",
+                mock_db,
+                batch_service=ToneBatchService(LocalToneBatchProvider()),
+            )
+            result = await poll_tone_batches_sync(mock_db)
+
+        assert result == {"pending": 0, "finalized": 1}
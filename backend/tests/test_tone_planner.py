@@ -0,0 +1,196 @@
+"""Tests for tone job cost and latency planning"""
+
+import asyncio
+import dataclasses
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.cache import CacheKeys
+from app.schemas.pdf import Block, Coordinates
+from app.services.tone_planner import TonePlanner, ToneUsageModel
+from app.services.tone_service import ToneCallObservation, ToneService
+from app.services.translation_service import TranslatedBlock
+
+# Ground truth used to generate observations
+TRUE_MODEL = ToneUsageModel(
+    input_base_tokens=120.0,
+    input_tokens_per_char=1.1,
+    output_tokens_per_char=1.05,
+    base_seconds=0.5,
+    seconds_per_output_token=0.012,
+)
+
+
+def _observations(sizes, model: ToneUsageModel = TRUE_MODEL):
+    observations = []
+    for chars in sizes:
+        input_tokens, output_tokens, seconds = model.predict(chars)
+        observations.append(
+            ToneCallObservation(
+                chars=chars,
+                input_tokens=round(input_tokens),
+                output_tokens=round(output_tokens),
+                seconds=seconds,
+            )
+        )
+    return observations
+
+
+@pytest.fixture
+def planner(fake_redis) -> TonePlanner:
+    return TonePlanner(fake_redis, max_concurrency=8, target_seconds=10)
+
+
+class TestTonePlanner:
+    """Tests for TonePlanner"""
+
+    def test_cjk_defaults_use_more_tokens_per_char(self):
+        assert TonePlanner.default_model("JA").input_tokens_per_char > \
+            TonePlanner.default_model("en").input_tokens_per_char
+
+    @pytest.mark.asyncio
+    async def test_learned_estimate_is_accurate(self, planner):
+        await planner.record("ja", _observations([40, 80, 200, 350, 600, 900]))
+
+        texts = ["あ" * chars for chars in (50, 120, 300, 700)]
+        plan = await planner.plan(texts, "ja")
+
+        true_input = sum(TRUE_MODEL.predict(len(text))[0] for text in texts)
+        true_output = sum(TRUE_MODEL.predict(len(text))[1] for text in texts)
+        true_cost = ToneService.calculate_cost(true_input, true_output)
+        assert plan.cost_usd == pytest.approx(true_cost, rel=0.02)
+        assert plan.samples == 6
+
+    @pytest.mark.asyncio
+    async def test_same_sized_blocks_keep_prompt_overhead(self, planner):
+        prior = TonePlanner.default_model("en")
+
+        updated = await planner.record("en", _observations([100, 100, 100]))
+
+        assert updated.input_base_tokens == pytest.approx(prior.input_base_tokens)
+        assert updated.output_tokens_per_char == pytest.approx(1.05, rel=0.01)
+
+    @pytest.mark.asyncio
+    async def test_rolling_update_blends_jobs(self, planner, fake_redis):
+        await planner.record("ko", _observations([50, 500]))
+        faster = ToneUsageModel(**{**TRUE_MODEL.__dict__, "seconds_per_output_token": 0.006})
+
+        updated = await planner.record("ko", _observations([50, 500], model=faster))
+
+        assert 0.006 < updated.seconds_per_output_token < 0.012
+        assert updated.samples == 4
+        stored = json.loads(await fake_redis.get(CacheKeys.tone_stats(ToneService.MODEL, "ko")))
+        assert stored["samples"] == 4
+
+    @pytest.mark.asyncio
+    async def test_batch_observations_keep_latency(self, planner):
+        prior = TonePlanner.default_model("ja")
+        untimed = [dataclasses.replace(obs, seconds=None) for obs in _observations([40, 200, 900])]
+
+        updated = await planner.record("ja", untimed)
+
+        assert updated.output_tokens_per_char == pytest.approx(1.05, rel=0.01)
+        assert updated.base_seconds == prior.base_seconds
+        assert updated.seconds_per_output_token == prior.seconds_per_output_token
+
+    @pytest.mark.asyncio
+    async def test_concurrent_records_all_counted(self, planner, fake_redis):
+        await asyncio.gather(*(planner.record("zh", _observations([50, 500])) for _ in range(4)))
+
+        stored = json.loads(await fake_redis.get(CacheKeys.tone_stats(ToneService.MODEL, "zh")))
+        assert stored["samples"] == 8
+        assert await fake_redis.get(CacheKeys.tone_stats_lock(ToneService.MODEL, "zh")) is None
+
+    @pytest.mark.asyncio
+    async def test_busy_lock_skips_update(self, planner, fake_redis):
+        await fake_redis.set(CacheKeys.tone_stats_lock(ToneService.MODEL, "ja"), "other-job")
+
+        with patch.object(TonePlanner, "STATS_LOCK_WAIT_SECONDS", 0.1):
+            assert await planner.record("ja", _observations([50, 500])) is None
+
+        assert await fake_redis.get(CacheKeys.tone_stats(ToneService.MODEL, "ja")) is None
+
+    @pytest.mark.asyncio
+    async def test_concurrency_sized_to_target(self, planner):
+        await planner.record("ja", _observations([100, 1000]))
+
+        small = await planner.plan(["短い"], "ja")
+        large = await planner.plan(["あ" * 500] * 40, "ja")
+
+        assert small.concurrency == 1
+        assert 1 < large.concurrency <= 8
+        assert large.chunk_size % large.concurrency == 0
+
+    @pytest.mark.asyncio
+    async def test_batch_plan_is_discounted_without_duration(self, planner):
+        realtime = await planner.plan(["hello world"] * 3, "en")
+        batch = await planner.plan(["hello world"] * 3, "en", batch=True)
+
+        assert batch.cost_usd == pytest.approx(realtime.cost_usd * ToneService.BATCH_DISCOUNT)
+        assert batch.wall_clock_seconds is None
+
+    @pytest.mark.asyncio
+    async def test_empty_blocks_not_counted(self, planner):
+        plan = await planner.plan(["", "  ", "abc"], "en")
+
+        assert plan.block_count == 1
+        assert plan.character_count == 3
+
+
+class TestConcurrentBatchApplyTone:
+    """Tests for planner-sized batch_apply_tone"""
+
+    @pytest.mark.asyncio
+    async def test_order_preserved_and_chunks_reported(self):
+        block = Block(
+            page=0,
+            block_id=0,
+            text="x",
+            coordinates=Coordinates(x=0, y=0, width=1, height=1),
+            font_size=12,
+            font_name="helv",
+            is_bold=False,
+            is_italic=False,
+            rotation=0,
+        )
+        blocks = [
+            TranslatedBlock(
+                original=block,
+                translated_text=f"text {idx}",
+                source_lang="en",
+                target_lang="ja",
+                billed_characters=6,
+            )
+            for idx in range(7)
+        ]
+        in_flight = 0
+        peak = 0
+
+        async def apply_tone(text, tone, target_lang):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01 if text.endswith("0") else 0)
+            in_flight -= 1
+            return text.upper(), 0.1
+
+        progress = []
+
+        async def on_chunk(done, total):
+            progress.append((done, total))
+
+        with patch("app.services.tone_service.get_settings") as mock_settings:
+            mock_settings.return_value = MagicMock(claude_api_key="test_key")
+            service = ToneService()
+        service.apply_tone = apply_tone
+
+        customized, cost = await service.batch_apply_tone(
+            blocks, "casual", concurrency=3, chunk_size=3, on_chunk_complete=on_chunk
+        )
+
+        assert [b.translated_text for b in customized] == [f"TEXT {idx}" for idx in range(7)]
+        assert cost == pytest.approx(0.7)
+        assert peak == 3
+        assert progress == [(3, 7), (6, 7), (7, 7)]
@@ -1,11 +1,14 @@
 """Tests for upload endpoint"""
 
+import hashlib
 import io
+import tempfile
 import uuid
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-from fastapi import status
+from fastapi import HTTPException, status
 from httpx import AsyncClient
 
 from app.models.translation import Translation, TranslationStatus
@@ -54,7 +57,7 @@ class TestUploadEndpoint:
     ):
         """Test successful file upload"""
         with patch("app.routers.upload.get_current_user", return_value=mock_user), \
-             patch("app.routers.upload.upload_file", new_callable=AsyncMock) as mock_upload, \
+             patch("app.s3.upload_file", new_callable=AsyncMock) as mock_upload, \
              patch("app.routers.upload.get_db") as mock_db:
             
             # Setup mocks
@@ -235,7 +238,7 @@ class TestUploadEndpoint:
     ):
         """Test upload when S3 upload fails"""
         with patch("app.routers.upload.get_current_user", return_value=mock_user), \
-             patch("app.routers.upload.upload_file", new_callable=AsyncMock) as mock_upload:
+             patch("app.s3.upload_file", new_callable=AsyncMock) as mock_upload:
             
             # Setup mock to raise exception
             mock_upload.side_effect = Exception("S3 error")
@@ -268,7 +271,7 @@ class TestUploadEndpoint:
     ):
         """Test that unsafe filenames are sanitized"""
         with patch("app.routers.upload.get_current_user", return_value=mock_user), \
-             patch("app.routers.upload.upload_file", new_callable=AsyncMock) as mock_upload, \
+             patch("app.s3.upload_file", new_callable=AsyncMock) as mock_upload, \
              patch("app.routers.upload.get_db") as mock_db:
             
             # Setup mocks
@@ -309,7 +312,7 @@ class TestUploadEndpoint:
     ):
         """Test that S3 key follows correct format"""
         with patch("app.routers.upload.get_current_user", return_value=mock_user), \
-             patch("app.routers.upload.upload_file", new_callable=AsyncMock) as mock_upload, \
+             patch("app.s3.upload_file", new_callable=AsyncMock) as mock_upload, \
              patch("app.routers.upload.get_db") as mock_db:
             
             # Setup mocks
@@ -351,7 +354,7 @@ class TestUploadEndpoint:
     ):
         """Test upload with auto-detect source language"""
         with patch("app.routers.upload.get_current_user", return_value=mock_user), \
-             patch("app.routers.upload.upload_file", new_callable=AsyncMock), \
+             patch("app.s3.upload_file", new_callable=AsyncMock), \
              patch("app.routers.upload.get_db") as mock_db:
             
             # Setup mocks
@@ -422,3 +425,92 @@ class TestFilenameStrReplace:
         long_name = "a" * 300 + ".pdf"
         result = sanitize_filename(long_name)
         assert len(result) <= 255
+
+
+@pytest.fixture
+def mock_s3_multipart():
+    """Record the multipart calls made on the S3 client"""
+    from app.s3 import s3_client
+
+    parts = []
+
+    def upload_part(Bucket, Key, UploadId, PartNumber, Body):
+        parts.append(len(Body))
+        return {"ETag": f'"etag-{PartNumber}"'}
+
+    with patch.object(s3_client, "create_multipart_upload", return_value={"UploadId": "upload-1"}), \
+         patch.object(s3_client, "upload_part", side_effect=upload_part), \
+         patch.object(s3_client, "complete_multipart_upload") as mock_complete, \
+         patch.object(s3_client, "abort_multipart_upload") as mock_abort, \
+         patch.object(s3_client, "upload_fileobj") as mock_put:
+        yield SimpleNamespace(parts=parts, complete=mock_complete, abort=mock_abort, put=mock_put)
+
+
+def _upload(content: bytes):
+    """UploadFile over an in-memory spooled file, as Starlette builds for small bodies"""
+    from starlette.datastructures import UploadFile
+
+    spooled = tempfile.SpooledTemporaryFile(max_size=len(content) + 1)
+    spooled.write(content)
+    spooled.seek(0)
+    return UploadFile(spooled, size=len(content), filename="test.pdf")
+
+
+class TestStreamToStorage:
+    """Test streaming validation and forwarding of proxied uploads"""
+
+    @pytest.mark.asyncio
+    async def test_large_file_forwarded_in_parts(self, mock_s3_multipart):
+        """Test each full part is uploaded as it is read"""
+        from app.routers.upload import stream_to_storage
+
+        content = b"%PDF-1.7\n" + b"x" * (12 * 1024 * 1024)
+
+        file_size, content_hash = await stream_to_storage(_upload(content), "uploads/u/j/test.pdf")
+
+        assert file_size == len(content)
+        assert content_hash == hashlib.sha256(content).hexdigest()
+        part_size = 5 * 1024 * 1024
+        assert mock_s3_multipart.parts == [part_size, part_size, len(content) - 2 * part_size]
+        parts = mock_s3_multipart.complete.call_args.kwargs["MultipartUpload"]["Parts"]
+        assert [part["PartNumber"] for part in parts] == [1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_small_file_single_put(self, mock_s3_multipart):
+        """Test a file smaller than one part skips the multipart upload"""
+        from app.routers.upload import stream_to_storage
+
+        file_size, _ = await stream_to_storage(_upload(b"%PDF-1.4\n%%EOF"), "uploads/u/j/test.pdf")
+
+        assert file_size == 14
+        mock_s3_multipart.put.assert_called_once()
+        assert mock_s3_multipart.parts == []
+
+    @pytest.mark.asyncio
+    async def test_oversized_file_aborted(self, mock_s3_multipart):
+        """Test the size limit is enforced while reading, discarding uploaded parts"""
+        from app.routers.upload import stream_to_storage
+
+        content = b"%PDF-1.7\n" + b"x" * (12 * 1024 * 1024)
+
+        with patch("app.routers.upload.MAX_FILE_SIZE", 8 * 1024 * 1024):
+            with pytest.raises(HTTPException) as exc_info:
+                await stream_to_storage(_upload(content), "uploads/u/j/test.pdf")
+
+        assert exc_info.value.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        # Stopped before reading the whole file
+        assert len(mock_s3_multipart.parts) == 1
+        mock_s3_multipart.abort.assert_called_once()
+        mock_s3_multipart.complete.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_non_pdf_rejected_from_first_chunk(self, mock_s3_multipart):
+        """Test content without a PDF header is rejected before anything is stored"""
+        from app.routers.upload import stream_to_storage
+
+        with pytest.raises(HTTPException) as exc_info:
+            await stream_to_storage(_upload(b"PK\x03\x04" + b"x" * 1024), "uploads/u/j/test.pdf")
+
+        assert exc_info.value.status_code == status.HTTP_400_BAD_REQUEST
+        mock_s3_multipart.put.assert_not_called()
+        assert mock_s3_multipart.parts == []
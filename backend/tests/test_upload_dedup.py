@@ -0,0 +1,180 @@
+"""Tests for reusing translations of identical uploads"""
+
+import uuid
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.cache import CacheKeys
+from app.models.translation import Translation, TranslationStatus
+from app.models.user import SubscriptionTier, User
+from app.routers.upload import _create_translation
+from app.services.upload_dedup import UploadDeduplicator
+
+CONTENT_HASH = "ab" * 32
+
+
+@pytest.fixture
+def mock_user():
+    """Create a mock user for testing"""
+    return User(
+        id=uuid.uuid4(),
+        tenant_id=uuid.uuid4(),
+        google_id="test_google_id",
+        email="test@example.com",
+        name="Test User",
+        subscription_tier=SubscriptionTier.FREE,
+        usage_this_month=0,
+    )
+
+
+@pytest.fixture
+def source(mock_user):
+    """Completed translation of the same document"""
+    source_id = uuid.uuid4()
+    return Translation(
+        id=source_id,
+        tenant_id=mock_user.tenant_id,
+        user_id=uuid.uuid4(),
+        file_name="report.pdf",
+        file_size_bytes=2048,
+        page_count=12,
+        source_language="en",
+        target_language="ja",
+        status=TranslationStatus.COMPLETED,
+        original_file_path=f"uploads/u/{source_id}/report.pdf",
+        result_file_path=f"results/u/{source_id}/report.pdf",
+        content_hash=CONTENT_HASH,
+        completed_at=datetime.utcnow(),
+    )
+
+
+@pytest.fixture
+def translation(mock_user):
+    """New upload of the same document"""
+    job_id = uuid.uuid4()
+    return Translation(
+        id=job_id,
+        tenant_id=mock_user.tenant_id,
+        user_id=mock_user.id,
+        file_name="report.pdf",
+        file_size_bytes=2048,
+        source_language="en",
+        target_language="ja",
+        status=TranslationStatus.PENDING,
+        progress_percent=0,
+        original_file_path=f"uploads/{mock_user.id}/{job_id}/report.pdf",
+        content_hash=CONTENT_HASH,
+    )
+
+
+def _session(found=None):
+    session = AsyncMock()
+    session.add = MagicMock()
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = found
+    session.execute.return_value = result
+    return session
+
+
+class TestUploadDeduplicator:
+    """Tests for UploadDeduplicator"""
+
+    @pytest.mark.asyncio
+    async def test_find_source_matches_document_and_settings(self, fake_redis, translation):
+        db = _session()
+
+        await UploadDeduplicator(db, fake_redis).find_source(translation)
+
+        query = db.execute.await_args.args[0]
+        sql = str(query.compile(dialect=postgresql.dialect()))
+        params = query.compile(dialect=postgresql.dialect()).params
+        assert "translations.tone_preset IS NULL" in sql
+        assert "translations.custom_tone IS NULL" in sql
+        assert CONTENT_HASH in params.values()
+        assert translation.tenant_id in params.values()
+        assert "ja" in params.values()
+
+    @pytest.mark.asyncio
+    async def test_clone_copies_results(self, fake_redis, source, translation):
+        source_id, job_id = str(source.id), str(translation.id)
+        await fake_redis.set(CacheKeys.translated_blocks(source_id), '{"blocks": []}')
+        await fake_redis.set(CacheKeys.document_ir(source_id), '{"pages": []}')
+        await fake_redis.hset(CacheKeys.block_updates(source_id), "0", '{"edited_text": "mine"}')
+
+        with patch("app.services.upload_dedup.copy_file", new_callable=AsyncMock) as mock_copy:
+            mock_copy.side_effect = lambda source_key, dest_key: dest_key
+            cloned = await UploadDeduplicator(_session(), fake_redis).clone(source, translation)
+
+        assert cloned
+        mock_copy.assert_awaited_once_with(
+            source.result_file_path,
+            f"results/{translation.user_id}/{job_id}/report.pdf",
+        )
+        assert translation.status == TranslationStatus.COMPLETED
+        assert translation.result_file_path == f"results/{translation.user_id}/{job_id}/report.pdf"
+        assert translation.page_count == 12
+        assert await fake_redis.get(CacheKeys.translated_blocks(job_id)) == '{"blocks": []}'
+        assert await fake_redis.get(CacheKeys.document_ir(job_id)) == '{"pages": []}'
+        # The source user's edits stay with the source
+        assert not await fake_redis.exists(CacheKeys.block_updates(job_id))
+
+    @pytest.mark.asyncio
+    async def test_clone_skipped_when_results_expired(self, fake_redis, source, translation):
+        with patch("app.services.upload_dedup.copy_file", new_callable=AsyncMock) as mock_copy:
+            cloned = await UploadDeduplicator(_session(), fake_redis).clone(source, translation)
+
+        assert not cloned
+        mock_copy.assert_not_awaited()
+        assert translation.status == TranslationStatus.PENDING
+
+
+class TestCreateTranslationDedup:
+    """Tests for deduplication in _create_translation"""
+
+    async def _create(self, db, redis, user):
+        return await _create_translation(
+            db=db,
+            current_user=user,
+            job_id=uuid.uuid4(),
+            file_name="report.pdf",
+            file_size=2048,
+            source_language="EN",
+            target_language="ja",
+            s3_key="uploads/u/j/report.pdf",
+            content_hash=CONTENT_HASH,
+            redis=redis,
+        )
+
+    @pytest.mark.asyncio
+    async def test_identical_upload_skips_pipeline(self, fake_redis, mock_user, source):
+        await fake_redis.set(CacheKeys.translated_blocks(str(source.id)), '{"blocks": []}')
+        db = _session(found=source)
+
+        with patch("app.services.upload_dedup.copy_file", AsyncMock(side_effect=lambda s, d: d)), \
+             patch("app.routers.upload.trigger_preview_rendering") as mock_previews, \
+             patch("app.routers.upload.trigger_translation_pipeline") as mock_trigger:
+            translation = await self._create(db, fake_redis, mock_user)
+
+        assert translation.status == TranslationStatus.COMPLETED
+        assert translation.content_hash == CONTENT_HASH
+        db.add.assert_called_once_with(translation)
+        mock_trigger.assert_not_called()
+        # Both PDFs already exist
+        assert [call.args[1] for call in mock_previews.call_args_list] == ["original", "translated"]
+
+    @pytest.mark.asyncio
+    async def test_failed_clone_runs_pipeline(self, fake_redis, mock_user, source):
+        await fake_redis.set(CacheKeys.translated_blocks(str(source.id)), '{"blocks": []}')
+        db = _session(found=source)
+
+        with patch("app.services.upload_dedup.copy_file", AsyncMock(side_effect=ConnectionError("down"))), \
+             patch("app.routers.upload.trigger_preview_rendering") as mock_previews, \
+             patch("app.routers.upload.trigger_translation_pipeline", return_value="task-1") as mock_trigger:
+            translation = await self._create(db, fake_redis, mock_user)
+
+        assert translation.status == TranslationStatus.PENDING
+        mock_trigger.assert_called_once_with(str(translation.id))
+        mock_previews.assert_called_once_with(str(translation.id), "original")